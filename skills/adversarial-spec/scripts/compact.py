@@ -0,0 +1,119 @@
+"""Compact critique JSON for agents that read it into their context window.
+
+Full ``--json`` output repeats every revised spec inside each model's raw
+response and again in its ``spec`` field, indented. With five models and a
+100 KB spec that is over 1 MB per round. ``--compact`` rewrites the output:
+
+- ``response`` is dropped for models that returned a revised spec and
+  replaced by ``critique``, the response without the [SPEC] block.
+- ``spec`` (and ``merge.spec``) become content references like
+  ``sha256:1f2e...``. Each distinct spec is described once in the top-level
+  ``specs`` table, as a unified diff against the input spec (default) or as
+  full text. The diff applies with ``patch`` or ``git apply``. A spec identical to the input is just ``input_spec``'s reference.
+- With ``--side-files DIR`` every revised spec is written to
+  ``DIR/<hash>.md`` and critiques over SIDE_FILE_THRESHOLD bytes to
+  ``DIR/round-<n>-<model>-critique.md``; the output carries their paths
+  instead of the text.
+- The JSON is printed without indentation.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Any, Optional
+
+from convergence import critique_text
+from diff_engine import DEFAULT_DIFF_ENGINE, patch_diff
+
+SPEC_FORMATS = ("diff", "full")
+SIDE_FILE_THRESHOLD = 8192  # bytes of critique text kept inline with --side-files
+REF_HEX_LENGTH = 16
+COMPACT_SEPARATORS = (",", ":")
+
+_UNSAFE_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def spec_ref(text: str) -> str:
+    """Content reference for a spec: sha256 prefix of its UTF-8 bytes."""
+    return "sha256:" + hashlib.sha256(text.encode("utf-8")).hexdigest()[:REF_HEX_LENGTH]
+
+
+def _write_side_file(directory: Path, name: str, text: str) -> str:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    path.write_text(text)
+    return str(path)
+
+
+def compact_output(
+    output: dict[str, Any],
+    input_spec: str,
+    spec_format: str = "diff",
+    side_dir: Optional[Path] = None,
+    diff_engine: str = DEFAULT_DIFF_ENGINE,
+) -> dict[str, Any]:
+    """
+    Rewrite critique JSON output so each payload appears once.
+
+    Args:
+        output: The document output_results builds for --json; modified in place.
+        input_spec: The spec the models reviewed.
+        spec_format: "diff" against the input spec, or "full" text.
+        side_dir: Directory for side files, or None to keep payloads inline.
+        diff_engine: Backend for spec diffs.
+
+    Returns:
+        The compacted output.
+    """
+    if spec_format not in SPEC_FORMATS:
+        raise ValueError(f"Unknown spec format: {spec_format}")
+    input_ref = spec_ref(input_spec)
+    specs: dict[str, dict[str, Any]] = {}
+
+    def reference(text: str) -> str:
+        ref = spec_ref(text)
+        if ref == input_ref or ref in specs:
+            return ref
+        entry: dict[str, Any] = {"bytes": len(text.encode("utf-8"))}
+        if spec_format == "diff":
+            entry["diff"] = patch_diff(input_spec, text, engine=diff_engine)
+        if side_dir is not None:
+            entry["path"] = _write_side_file(
+                side_dir, f"{ref.split(':', 1)[1]}.md", text
+            )
+        elif spec_format == "full":
+            entry["text"] = text
+        specs[ref] = entry
+        return ref
+
+    for result in output.get("results", []):
+        if result.get("spec"):
+            response = result.pop("response", None)
+            # None when --digest already replaced the critique
+            result["critique"] = (
+                critique_text(response).strip() if response is not None else None
+            )
+            result["spec"] = reference(result["spec"])
+        text_key = "critique" if "critique" in result else "response"
+        text = result.get(text_key)
+        if (
+            side_dir is not None
+            and text
+            and len(text.encode("utf-8")) > SIDE_FILE_THRESHOLD
+        ):
+            name = _UNSAFE_RE.sub("-", result.get("model", "model"))
+            round_num = output.get("round", 0)
+            result[f"{text_key}_path"] = _write_side_file(
+                side_dir, f"round-{round_num}-{name}-{text_key}.md", text
+            )
+            del result[text_key]
+
+    merge = output.get("merge")
+    if merge and merge.get("spec"):
+        merge["spec"] = reference(merge["spec"])
+
+    output["input_spec"] = input_ref
+    output["specs"] = specs
+    return output
@@ -0,0 +1,263 @@
+"""Local BM25 index over project documents for automatic context selection.
+
+``debate.py context-index --docs DIR`` chunks every text file under DIR
+(Markdown by heading, other files by line windows), computes term
+frequencies and saves the index as JSON. ``critique --auto-context`` then
+scores the chunks against the spec with Okapi BM25 and includes the best
+ones under a token budget. Everything runs locally; nothing is sent over
+the network to build or query the index.
+
+Rebuilding an index reuses the chunks of files whose modification time and
+size are unchanged.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+from context_pack import ContextFile, count_tokens, expand_context_paths
+
+INDEX_FORMAT = 1
+DEFAULT_INDEX_PATH = Path(".adversarial-spec") / "context-index.json"
+DEFAULT_TOP_K = 8
+DEFAULT_TOKEN_BUDGET = 8000
+MAX_CHUNK_LINES = 80
+MAX_FILE_BYTES = 2 << 20  # larger files (dumps, generated code) are skipped
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_CAMEL_RE = re.compile(r"([a-z0-9])([A-Z])")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have if in into is it its of on or "
+    "that the their then there these this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase terms, splitting camelCase and snake_case identifiers."""
+    words = _WORD_RE.findall(_CAMEL_RE.sub(r"\1 \2", text).lower())
+    return [w for w in words if len(w) > 1 and w not in STOP_WORDS]
+
+
+@dataclass
+class Chunk:
+    """A contiguous range of lines from one indexed file."""
+
+    path: str
+    start: int  # 1-based, inclusive
+    end: int
+    heading: str
+    text: str
+    tokens: int
+    terms: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def length(self) -> int:
+        return sum(self.terms.values())
+
+    @property
+    def label(self) -> str:
+        return f"{self.path}:{self.start}-{self.end}"
+
+
+def _line_windows(
+    lines: list[str], offset: int
+) -> Iterable[tuple[int, int, list[str]]]:
+    for i in range(0, len(lines), MAX_CHUNK_LINES):
+        window = lines[i : i + MAX_CHUNK_LINES]
+        yield offset + i + 1, offset + i + len(window), window
+
+
+def chunk_file(path: str, text: str) -> list[Chunk]:
+    """
+    Split a file into chunks.
+
+    Markdown files are split at headings (outside code fences) and long
+    sections into windows of MAX_CHUNK_LINES; other files into windows only.
+    Chunks without any indexable term are skipped.
+    """
+    lines = text.splitlines()
+    sections: list[tuple[int, list[str]]] = []
+    start = 0
+    if path.endswith(".md"):
+        in_fence = False
+        for i, line in enumerate(lines):
+            if line.startswith("```"):
+                in_fence = not in_fence
+            elif not in_fence and line.startswith("#") and i > start:
+                sections.append((start, lines[start:i]))
+                start = i
+    sections.append((start, lines[start:]))
+
+    chunks = []
+    for offset, section_lines in sections:
+        first = section_lines[0] if section_lines else ""
+        heading = first.strip() if first.startswith("#") else ""
+        for start, end, window in _line_windows(section_lines, offset):
+            body = "\n".join(window)
+            terms = dict(Counter(tokenize(body)))
+            if terms:
+                chunks.append(
+                    Chunk(path, start, end, heading, body, count_tokens(body), terms)
+                )
+    return chunks
+
+
+@dataclass
+class ContextIndex:
+    """Chunks of indexed files with BM25 statistics."""
+
+    roots: list[str]
+    files: dict[str, dict[str, int]] = field(default_factory=dict)
+    chunks: list[Chunk] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        for index, chunk in enumerate(self.chunks):
+            for term, count in chunk.terms.items():
+                self._postings.setdefault(term, []).append((index, count))
+        self._lengths = [chunk.length for chunk in self.chunks]
+        total = sum(self._lengths)
+        self._avg_length = total / len(self.chunks) if self.chunks else 0.0
+
+    def search(self, query: str) -> list[tuple[float, Chunk]]:
+        """Chunks matching any query term, best BM25 score first."""
+        n = len(self.chunks)
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for index, count in postings:
+                norm = 1 - BM25_B + BM25_B * self._lengths[index] / self._avg_length
+                score = idf * count * (BM25_K1 + 1) / (count + BM25_K1 * norm)
+                scores[index] = scores.get(index, 0.0) + score
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(score, self.chunks[index]) for index, score in ranked]
+
+    def to_dict(self) -> dict:
+        """Serialize for saving."""
+        return {
+            "format": INDEX_FORMAT,
+            "roots": self.roots,
+            "files": self.files,
+            "chunks": [asdict(chunk) for chunk in self.chunks],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ContextIndex":
+        if data.get("format") != INDEX_FORMAT:
+            raise ValueError("Unsupported index format; rebuild with context-index")
+        return cls(
+            roots=data["roots"],
+            files=data["files"],
+            chunks=[Chunk(**chunk) for chunk in data["chunks"]],
+        )
+
+    def save(self, path: Path) -> None:
+        """Write the index atomically."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.to_dict()))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "ContextIndex":
+        """
+        Load a saved index.
+
+        Raises:
+            FileNotFoundError: If no index exists at path.
+            ValueError: If the file is not a readable index.
+        """
+        try:
+            data = json.loads(path.read_text())
+            return cls.from_dict(data)
+        except FileNotFoundError:
+            raise
+        except (OSError, KeyError, TypeError, json.JSONDecodeError) as e:
+            raise ValueError(f"Invalid context index {path}: {e}")
+
+
+def build_index(
+    roots: list[str], previous: Optional[ContextIndex] = None
+) -> tuple[ContextIndex, int]:
+    """
+    Index every text file under the given directories or patterns.
+
+    Args:
+        roots: Directories, files or glob patterns to index.
+        previous: Earlier index whose chunks are reused for unchanged files.
+
+    Returns:
+        Tuple of (index, number of files reused from previous).
+    """
+    old_chunks: dict[str, list[Chunk]] = {}
+    if previous is not None:
+        for chunk in previous.chunks:
+            old_chunks.setdefault(chunk.path, []).append(chunk)
+
+    files: dict[str, dict[str, int]] = {}
+    chunks: list[Chunk] = []
+    reused = 0
+    for path in expand_context_paths(roots):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        if stat.st_size > MAX_FILE_BYTES or not os.path.isfile(path):
+            continue
+        signature = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        if previous is not None and previous.files.get(path) == signature:
+            chunks.extend(old_chunks.get(path, []))
+            reused += 1
+        else:
+            try:
+                text = Path(path).read_text()
+            except (OSError, UnicodeDecodeError):
+                continue
+            chunks.extend(chunk_file(path, text))
+        files[path] = signature
+    return ContextIndex(roots=list(roots), files=files, chunks=chunks), reused
+
+
+def select_chunks(
+    index: ContextIndex,
+    spec: str,
+    max_tokens: int = DEFAULT_TOKEN_BUDGET,
+    top_k: int = DEFAULT_TOP_K,
+    exclude: Iterable[str] = (),
+) -> list[ContextFile]:
+    """
+    Pick the chunks most relevant to a spec that fit a token budget.
+
+    Args:
+        index: Index to search.
+        spec: Spec text used as the query.
+        max_tokens: Total tokens the selected chunks may use.
+        top_k: Maximum number of chunks.
+        exclude: Files already included as context; their chunks are skipped.
+
+    Returns:
+        Selected chunks as context files, best match first.
+    """
+    excluded = {os.path.realpath(path) for path in exclude}
+    selected: list[ContextFile] = []
+    remaining = max_tokens
+    for _score, chunk in index.search(spec):
+        if len(selected) >= top_k:
+            break
+        if chunk.tokens > remaining or os.path.realpath(chunk.path) in excluded:
+            continue
+        selected.append(ContextFile(chunk.label, chunk.text, tokens=chunk.tokens))
+        remaining -= chunk.tokens
+    return selected
@@ -0,0 +1,350 @@
+"""Fit --context files into each model's context window.
+
+Context files, directories and glob patterns are expanded, read concurrently
+and measured once; each file is cached by (path, mtime, size) for the life of
+the process. For each model the files are packed in priority order (the order
+given on the command line, with CONSTITUTION.md first): files are included
+whole while they fit, the first file that does not fit is truncated to the
+remaining budget with an outline of what was cut, and files that no longer
+fit at all are dropped. Models with an unknown context window receive every
+file unchanged.
+"""
+
+from __future__ import annotations
+
+import glob
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from pricing import get_model_info
+
+CONTEXT_HEADER = (
+    "## Additional Context\nThe following documents are provided as context:\n\n"
+)
+PROMPT_OVERHEAD_TOKENS = 4000  # system prompt, review template, focus text
+SAFETY_MARGIN = 0.1  # tokenizers differ between model families
+DEFAULT_OUTPUT_RESERVE = 8192
+MIN_TRUNCATED_TOKENS = 200  # below this a truncated file is dropped instead
+MAX_OUTLINE_HEADINGS = 40
+MMAP_THRESHOLD = 1 << 20  # files at least this large are decoded from a mmap
+MAX_READ_WORKERS = 8
+BINARY_SNIFF_BYTES = 8192
+GLOB_CHARS = "*?["
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens with litellm's bundled tiktoken encoding.
+
+    The same count is used for every model; SAFETY_MARGIN absorbs the
+    difference between tokenizers. Falls back to ~4 characters per token.
+    """
+    try:
+        import litellm
+
+        encoding: Any = litellm.encoding
+        return len(encoding.encode(text, disallowed_special=()))
+    except Exception:
+        return len(text) // 4 + 1
+
+
+@dataclass
+class ContextFile:
+    """One --context file, read and measured once."""
+
+    path: str
+    content: Optional[str] = None
+    error: Optional[str] = None
+    tokens: int = 0
+    _section: Optional[str] = field(default=None, repr=False, compare=False)
+
+    def section(self, content: Optional[str] = None) -> str:
+        """Format as a prompt section, optionally with replacement content.
+
+        The full-content section is rendered once and reused, so later
+        rounds and other models share the same string.
+        """
+        if self.error is not None:
+            return f"### Context: {self.path}\n[Error loading file: {self.error}]"
+        if content is not None:
+            return f"### Context: {self.path}\n```\n{content}\n```"
+        if self._section is None:
+            self._section = f"### Context: {self.path}\n```\n{self.content}\n```"
+        return self._section
+
+
+def _is_glob(path: str) -> bool:
+    return any(c in path for c in GLOB_CHARS)
+
+
+def _is_binary(path: str) -> bool:
+    """Sniff the start of a file for NUL bytes."""
+    try:
+        with open(path, "rb") as f:
+            return b"\0" in f.read(BINARY_SNIFF_BYTES)
+    except OSError:
+        return False
+
+
+def _walk_directory(directory: str) -> list[str]:
+    """Text files under a directory in sorted order, skipping hidden entries."""
+    files = []
+    for root, dirs, names in os.walk(directory):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in names:
+            path = os.path.join(root, name)
+            if not name.startswith(".") and not _is_binary(path):
+                files.append(path)
+    return sorted(files)
+
+
+def expand_context_paths(paths: list[str]) -> list[str]:
+    """
+    Expand directories and glob patterns given to --context.
+
+    Directories contribute their text files recursively (hidden and binary
+    files skipped); patterns are expanded with ``**`` support. Order is kept
+    and a file named twice is included once. Arguments that match nothing
+    are kept so reading them reports the error.
+    """
+    expanded: list[str] = []
+    seen: set[str] = set()
+    for raw in paths:
+        path = os.path.expanduser(raw)
+        if _is_glob(path):
+            matches = sorted(glob.glob(path, recursive=True))
+            candidates = []
+            for match in matches:
+                if os.path.isdir(match):
+                    candidates.extend(_walk_directory(match))
+                else:
+                    candidates.append(match)
+        elif os.path.isdir(path):
+            candidates = _walk_directory(path)
+        else:
+            candidates = [raw]
+        if not candidates:
+            candidates = [raw]
+        for candidate in candidates:
+            key = os.path.realpath(os.path.expanduser(candidate))
+            if key not in seen:
+                seen.add(key)
+                expanded.append(candidate)
+    return expanded
+
+
+_context_cache: dict[str, tuple[tuple[int, int], ContextFile]] = {}
+
+
+def _read_text(path: str, size: int) -> str:
+    """Read a file, decoding large files straight from a memory map."""
+    if size < MMAP_THRESHOLD:
+        return Path(path).read_text()
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return str(mapped, "utf-8")
+
+
+def _read_context_file(path: str) -> ContextFile:
+    """Read and measure one file, reusing the cached copy if unchanged."""
+    resolved = os.path.abspath(os.path.expanduser(path))
+    try:
+        stat = os.stat(resolved)
+    except OSError as e:
+        _context_cache.pop(resolved, None)
+        if _is_glob(path):
+            return ContextFile(path, error="No files match pattern")
+        return ContextFile(path, error=str(e))
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _context_cache.get(resolved)
+    if cached is not None and cached[0] == signature and cached[1].path == path:
+        return cached[1]
+    try:
+        content = _read_text(resolved, stat.st_size)
+    except Exception as e:
+        return ContextFile(path, error=str(e))
+    file = ContextFile(path, content, tokens=count_tokens(content))
+    _context_cache[resolved] = (signature, file)
+    return file
+
+
+def read_context_files(paths: list[str]) -> list[ContextFile]:
+    """
+    Read context files concurrently, recording read errors instead of raising.
+
+    Directories and glob patterns are expanded first. Each file is cached by
+    (path, mtime, size), so unchanged files are not re-read or re-tokenized
+    within a process.
+    """
+    expanded = expand_context_paths(paths)
+    if len(expanded) <= 1:
+        return [_read_context_file(path) for path in expanded]
+    workers = min(MAX_READ_WORKERS, len(expanded))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_read_context_file, expanded))
+
+
+def clear_context_cache() -> None:
+    """Forget all cached context files."""
+    _context_cache.clear()
+
+
+def format_context(sections: list[str]) -> str:
+    """Join formatted sections under the Additional Context header."""
+    if not sections:
+        return ""
+    return CONTEXT_HEADER + "\n\n".join(sections)
+
+
+@dataclass
+class ContextPack:
+    """The context one model receives and what was cut to fit it."""
+
+    model: str
+    context: str
+    budget: Optional[int] = None
+    tokens: int = 0
+    truncated: list[dict] = field(default_factory=list)
+    dropped: list[dict] = field(default_factory=list)
+
+    @property
+    def reduced(self) -> bool:
+        return bool(self.truncated or self.dropped)
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON output (without the context text)."""
+        return {
+            "budget": self.budget,
+            "tokens": self.tokens,
+            "truncated": self.truncated,
+            "dropped": self.dropped,
+        }
+
+
+def context_budget(model: str, prompt_tokens: int) -> Optional[int]:
+    """Tokens available for context files, or None if the window is unknown."""
+    info = get_model_info(model)
+    window = info.context_window
+    if not window:
+        return None
+    output_reserve = min(info.max_output_tokens or DEFAULT_OUTPUT_RESERVE, window // 4)
+    usable = int(window * (1 - SAFETY_MARGIN))
+    return max(0, usable - output_reserve - prompt_tokens - PROMPT_OVERHEAD_TOKENS)
+
+
+def _outline(text: str) -> list[str]:
+    """Markdown headings of the omitted part of a file."""
+    headings = []
+    in_fence = False
+    for line in text.splitlines():
+        if line.startswith("```"):
+            in_fence = not in_fence
+        elif not in_fence and line.startswith("#"):
+            headings.append(line.strip())
+    return headings[:MAX_OUTLINE_HEADINGS]
+
+
+def truncate_to_tokens(text: str, max_tokens: int, total_tokens: int) -> str:
+    """Cut text at a line boundary so it fits in max_tokens."""
+    if total_tokens <= max_tokens:
+        return text
+    end = int(len(text) * max_tokens / total_tokens)
+    while end > 0:
+        cut = text.rfind("\n", 0, end)
+        head = text[: cut if cut > end // 2 else end]
+        if count_tokens(head) <= max_tokens:
+            return head
+        end = int(end * 0.9)
+    return ""
+
+
+def _truncated_section(file: ContextFile, budget: int) -> tuple[str, int]:
+    """Section with the head of the file and an outline of the cut part."""
+    assert file.content is not None
+    notice_tokens = 60
+    # Reserve room for the outline (at most a quarter of the budget) up front
+    outline_reserve = 0
+    if file.path.endswith(".md"):
+        outline_reserve = min(
+            count_tokens("\n".join(_outline(file.content))), budget // 4
+        )
+    head = truncate_to_tokens(
+        file.content, budget - notice_tokens - outline_reserve, file.tokens
+    )
+    kept = count_tokens(head)
+    notice = f"[... truncated: {file.tokens - kept} of {file.tokens} tokens omitted"
+    headings = _outline(file.content[len(head) :]) if outline_reserve else []
+    if headings:
+        outline = "\n".join(headings)
+        if count_tokens(outline) + notice_tokens <= budget - kept:
+            notice += "; omitted sections:\n" + outline
+    notice += " ...]"
+    return file.section(f"{head}\n{notice}"), kept
+
+
+def pack_context(files: list[ContextFile], model: str, spec_tokens: int) -> ContextPack:
+    """
+    Pack context files into the budget left by a model's context window.
+
+    Args:
+        files: Context files in priority order.
+        model: Target model identifier.
+        spec_tokens: Tokens of the spec, which shares the window.
+
+    Returns:
+        The packed context and a record of truncated and dropped files.
+    """
+    budget = context_budget(model, spec_tokens)
+    total = sum(f.tokens for f in files)
+    if budget is None or total <= budget:
+        return ContextPack(
+            model, format_context([f.section() for f in files]), budget, total
+        )
+
+    pack = ContextPack(model, "", budget)
+    sections = []
+    remaining = budget
+    for file in files:
+        if file.error is not None:
+            sections.append(file.section())
+        elif file.tokens <= remaining:
+            sections.append(file.section())
+            remaining -= file.tokens
+            pack.tokens += file.tokens
+        elif remaining >= MIN_TRUNCATED_TOKENS:
+            section, kept = _truncated_section(file, remaining)
+            sections.append(section)
+            remaining = 0
+            pack.tokens += kept
+            pack.truncated.append(
+                {"path": file.path, "kept_tokens": kept, "tokens": file.tokens}
+            )
+        else:
+            pack.dropped.append({"path": file.path, "tokens": file.tokens})
+    pack.context = format_context(sections)
+    return pack
+
+
+def pack_for_models(
+    files: list[ContextFile], models: list[str], spec: str
+) -> dict[str, ContextPack]:
+    """Pack context for every model of a round."""
+    spec_tokens = count_tokens(spec)
+    return {model: pack_context(files, model, spec_tokens) for model in models}
+
+
+def format_pack_warning(pack: ContextPack) -> str:
+    """One-line stderr summary of what was cut for a model."""
+    parts = []
+    if pack.dropped:
+        parts.append("dropped " + ", ".join(d["path"] for d in pack.dropped))
+    if pack.truncated:
+        parts.append("truncated " + ", ".join(t["path"] for t in pack.truncated))
+    return (
+        f"Warning: context for {pack.model} trimmed to fit "
+        f"{pack.budget:,} tokens: {'; '.join(parts)}"
+    )
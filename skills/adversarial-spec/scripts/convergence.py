@@ -0,0 +1,222 @@
+"""Per-round convergence metrics and early-stop prediction for debates."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass
+from itertools import combinations
+from typing import Optional
+
+from diff_engine import myers_opcodes
+
+DEFAULT_CONVERGENCE_THRESHOLD = 0.02  # share of spec lines changed in a round
+SPARK_CHARS = " ▁▂▃▄▅▆▇█"
+SHINGLE_SIZE = 3
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class RoundMetrics:
+    """How much a single round moved the spec and how aligned the models were."""
+
+    round: int
+    edit_distance: int
+    change_ratio: float
+    sections_changed: int
+    agreement: float
+    critique_overlap: float
+    responses: int = 0  # models that answered without an error
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON output and session history."""
+        return asdict(self)
+
+
+@dataclass
+class ConvergencePrediction:
+    """Recommendation for the next step of the debate."""
+
+    recommendation: str  # continue, press, stop
+    reason: str
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON output and session history."""
+        return asdict(self)
+
+
+def critique_text(response: str) -> str:
+    """Return the critique portion of a response, without the revised spec."""
+    spec_start = response.find("[SPEC]")
+    return response[:spec_start] if spec_start >= 0 else response
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[str]:
+    """Lower-cased word shingles used for cheap lexical similarity."""
+    tokens = TOKEN_RE.findall(text.lower())
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def critique_overlap(critiques: list[str]) -> float:
+    """Mean pairwise Jaccard similarity between critiques (0.0 to 1.0)."""
+    sets = [shingles(c) for c in critiques if c.strip()]
+    if len(sets) < 2:
+        return 0.0
+    scores = []
+    for a, b in combinations(sets, 2):
+        union = len(a | b)
+        scores.append(len(a & b) / union if union else 0.0)
+    return sum(scores) / len(scores)
+
+
+def line_edit_distance(previous: str, current: str) -> int:
+    """Number of inserted plus deleted lines between two specs."""
+    if previous == current:
+        return 0
+    opcodes = myers_opcodes(previous.splitlines(), current.splitlines())
+    return sum(
+        (i2 - i1) + (j2 - j1) for tag, i1, i2, j1, j2 in opcodes if tag != "equal"
+    )
+
+
+def compute_round_metrics(
+    round_num: int,
+    spec: str,
+    latest_spec: str,
+    results: list,
+    sections_changed: int = 0,
+) -> RoundMetrics:
+    """
+    Compute convergence metrics for one round.
+
+    Args:
+        round_num: Round number.
+        spec: Spec sent to the models.
+        latest_spec: Spec carried into the next round.
+        results: ModelResponse objects for the round.
+        sections_changed: Number of sections that changed this round.
+
+    Returns:
+        Metrics for the round.
+    """
+    distance = line_edit_distance(spec, latest_spec)
+    total_lines = max(spec.count("\n"), latest_spec.count("\n"), 1)
+    successful = [r for r in results if not r.error]
+    agreement = (
+        sum(1 for r in successful if r.agreed) / len(successful) if successful else 0.0
+    )
+    overlap = critique_overlap(
+        [critique_text(r.response) for r in successful if not r.agreed]
+    )
+    return RoundMetrics(
+        round=round_num,
+        edit_distance=distance,
+        change_ratio=round(min(distance / (2 * total_lines), 1.0), 4),
+        sections_changed=sections_changed,
+        agreement=round(agreement, 4),
+        critique_overlap=round(overlap, 4),
+        responses=len(successful),
+    )
+
+
+def predict_convergence(
+    history: list[dict], threshold: float = DEFAULT_CONVERGENCE_THRESHOLD
+) -> ConvergencePrediction:
+    """
+    Recommend whether to continue, press, or stop based on recent rounds.
+
+    Args:
+        history: Round metrics dicts, oldest first.
+        threshold: Change ratio below which a round counts as cosmetic.
+
+    Returns:
+        Prediction with a short reason.
+    """
+    if not history:
+        return ConvergencePrediction("continue", "No rounds recorded yet.")
+
+    latest = history[-1]
+    # Metrics recorded before the responses field existed had responses
+    if latest.get("responses", 1) == 0:
+        return ConvergencePrediction(
+            "continue",
+            "Insufficient data: no model responded successfully last round.",
+        )
+    cosmetic = latest["change_ratio"] <= threshold
+    if latest["agreement"] >= 1.0 and cosmetic:
+        return ConvergencePrediction(
+            "stop", "All models agree and the last round barely changed the spec."
+        )
+    if not cosmetic:
+        if len(history) >= 2 and latest["change_ratio"] > history[-2]["change_ratio"]:
+            return ConvergencePrediction(
+                "continue", "Changes grew since the previous round; not converging yet."
+            )
+        return ConvergencePrediction(
+            "continue",
+            f"Round changed {latest['change_ratio']:.1%} of the spec "
+            f"(threshold {threshold:.1%}).",
+        )
+    if latest["agreement"] < 0.5:
+        return ConvergencePrediction(
+            "continue", "Changes are small but most models still disagree."
+        )
+    if (
+        len(history) >= 2
+        and history[-2].get("responses", 1) > 0
+        and history[-2]["change_ratio"] <= threshold
+    ):
+        return ConvergencePrediction(
+            "stop",
+            "Two consecutive rounds produced only cosmetic changes; further rounds "
+            "are unlikely to improve the spec.",
+        )
+    return ConvergencePrediction(
+        "press",
+        "Most models agree and changes are cosmetic; use --press to confirm "
+        "agreement or surface remaining issues.",
+    )
+
+
+def sparkline(values: list[float], ceiling: Optional[float] = None) -> str:
+    """Render values as a unicode sparkline scaled to the maximum value."""
+    if not values:
+        return ""
+    top = ceiling if ceiling is not None else max(values)
+    if top <= 0:
+        return SPARK_CHARS[1] * len(values)
+    steps = len(SPARK_CHARS) - 1
+    return "".join(
+        SPARK_CHARS[max(1, min(steps, round(v / top * steps)))] for v in values
+    )
+
+
+def format_convergence(history: list[dict]) -> str:
+    """Render per-round metrics and curves for the sessions action."""
+    metrics = [h["metrics"] for h in history if h.get("metrics")]
+    if not metrics:
+        return "  No convergence metrics recorded."
+    lines = [
+        f"  {'round':>5} {'changed':>8} {'edits':>6} {'sections':>8} "
+        f"{'agree':>6} {'overlap':>7}"
+    ]
+    for m in metrics:
+        lines.append(
+            f"  {m['round']:>5} {m['change_ratio']:>8.1%} {m['edit_distance']:>6} "
+            f"{m['sections_changed']:>8} {m['agreement']:>6.0%} "
+            f"{m['critique_overlap']:>7.2f}"
+        )
+    lines.append("")
+    lines.append(f"  change    {sparkline([m['change_ratio'] for m in metrics])}")
+    lines.append(
+        f"  agreement {sparkline([m['agreement'] for m in metrics], ceiling=1.0)}"
+    )
+    prediction = history[-1].get("convergence")
+    if prediction:
+        lines.append("")
+        lines.append(
+            f"  Recommendation: {prediction['recommendation']} - {prediction['reason']}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,290 @@
+"""
+Long-running debate daemon with a JSON-RPC API on a Unix socket.
+
+`debate.py serve` imports litellm, loads config, prompts and the pricing
+table once and then serves requests, so each agent step skips interpreter
+startup and imports. Every connection carries one newline-terminated
+JSON-RPC 2.0 request and receives one response line.
+
+Methods:
+    critique, diff, export-tasks, sessions
+        params: {"args": [...CLI args after the action], "stdin": str,
+                 "cwd": str, "env": {name: value}}
+        result: {"exit_code": int, "stdout": str, "stderr": str}
+        With "env", the request runs with the caller's API keys and settings
+        (variables matched by daemon_client.is_forwarded_env()); the
+        daemon's own values for those variables are hidden meanwhile.
+    resume
+        params: {"session": str, "args": [...], "cwd": str}
+        Same as critique with --resume.
+    cost
+        result: cumulative tokens and cost of all requests since start
+    ping
+        result: {"pid": int, "uptime": float, "requests": int}
+
+CLI requests run one at a time because they share the process's working
+directory, environment and standard streams; cost and ping are answered concurrently.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+import debate
+from daemon_client import FORWARDED_ACTIONS, connect, is_forwarded_env
+from models import CostTracker, cost_tracker
+from pricing import load_litellm_table
+from prompt_library import get_library
+from providers import load_global_config
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+MAX_REQUEST_BYTES = 64 << 20
+
+
+class InvalidParamsError(ValueError):
+    """Request parameters do not match the method."""
+
+
+def _string_list(value: Any, name: str) -> list[str]:
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise InvalidParamsError(f"{name} must be a list of strings")
+    return value
+
+
+@contextlib.contextmanager
+def _request_env(env: Optional[dict[str, str]]) -> Iterator[None]:
+    """Replace the daemon's forwarded variables with the request's, then restore."""
+    if env is None:
+        yield
+        return
+    saved = {
+        name: value for name, value in os.environ.items() if is_forwarded_env(name)
+    }
+    try:
+        for name in saved:
+            del os.environ[name]
+        os.environ.update(env)
+        yield
+    finally:
+        for name in [n for n in os.environ if is_forwarded_env(n)]:
+            del os.environ[name]
+        os.environ.update(saved)
+
+
+class DebateDaemon:
+    """Runs CLI actions in-process and tracks usage across requests."""
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.requests = 0
+        self.lifetime_cost = CostTracker()
+        self._run_lock = threading.Lock()
+        self.methods: dict[str, Callable[[dict[str, Any]], Any]] = {
+            action: self._action_method(action) for action in FORWARDED_ACTIONS
+        }
+        self.methods["resume"] = self.resume
+        self.methods["cost"] = self.cost
+        self.methods["ping"] = self.ping
+
+    def warm_up(self) -> None:
+        """Load config, prompts and the pricing table before the first request."""
+        load_global_config()
+        get_library()
+        load_litellm_table()
+
+    def _action_method(self, action: str) -> Callable[[dict[str, Any]], Any]:
+        def method(params: dict[str, Any]) -> dict[str, Any]:
+            args = _string_list(params.get("args", []), "args")
+            return self.run_cli([action, *args], params)
+
+        return method
+
+    def resume(self, params: dict[str, Any]) -> dict[str, Any]:
+        session = params.get("session")
+        if not isinstance(session, str) or not session:
+            raise InvalidParamsError("session is required")
+        args = _string_list(params.get("args", []), "args")
+        return self.run_cli(["critique", "--resume", session, *args], params)
+
+    def cost(self, params: dict[str, Any]) -> dict[str, Any]:
+        tracker = self.lifetime_cost
+        return {
+            "total": tracker.total_cost,
+            "input_tokens": tracker.total_input_tokens,
+            "output_tokens": tracker.total_output_tokens,
+            "by_model": tracker.by_model,
+        }
+
+    def ping(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "uptime": time.monotonic() - self.started,
+            "requests": self.requests,
+        }
+
+    def run_cli(self, argv: list[str], params: dict[str, Any]) -> dict[str, Any]:
+        """
+        Run debate.main() with the request's stdin, cwd and captured output.
+
+        Args:
+            argv: Action and arguments.
+            params: Request parameters (stdin, cwd, env).
+
+        Returns:
+            Exit code and captured stdout and stderr.
+        """
+        stdin = params.get("stdin", "")
+        cwd = params.get("cwd")
+        if not isinstance(stdin, str):
+            raise InvalidParamsError("stdin must be a string")
+        if cwd is not None and (not isinstance(cwd, str) or not os.path.isdir(cwd)):
+            raise InvalidParamsError("cwd must be an existing directory")
+        env = params.get("env")
+        if env is not None and (
+            not isinstance(env, dict)
+            or not all(
+                isinstance(k, str) and isinstance(v, str) and is_forwarded_env(k)
+                for k, v in env.items()
+            )
+        ):
+            raise InvalidParamsError("env must map forwarded variable names to strings")
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        exit_code = 0
+        with self._run_lock:
+            self.requests += 1
+            previous_cwd = os.getcwd()
+            previous_stdin = sys.stdin
+            try:
+                if cwd:
+                    os.chdir(cwd)
+                sys.stdin = io.StringIO(stdin)
+                with (
+                    _request_env(env),
+                    contextlib.redirect_stdout(stdout),
+                    contextlib.redirect_stderr(stderr),
+                ):
+                    try:
+                        debate.main(argv)
+                    except SystemExit as e:
+                        exit_code = e.code if isinstance(e.code, int) else 1
+                        if e.code is not None and not isinstance(e.code, int):
+                            print(e.code, file=sys.stderr)
+                    except Exception as e:
+                        exit_code = 1
+                        print(f"Error: {e}", file=sys.stderr)
+            finally:
+                sys.stdin = previous_stdin
+                os.chdir(previous_cwd)
+                self.lifetime_cost.merge(cost_tracker)
+                cost_tracker.reset()
+        return {
+            "exit_code": exit_code,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }
+
+    def handle(self, request: Any) -> dict[str, Any]:
+        """Dispatch one decoded JSON-RPC request and build the response."""
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        method = self.methods.get(request["method"])
+        if method is None:
+            return _error(
+                request_id, METHOD_NOT_FOUND, f"Unknown method: {request['method']}"
+            )
+        params = request.get("params", {})
+        if not isinstance(params, dict):
+            return _error(request_id, INVALID_PARAMS, "params must be an object")
+        try:
+            result = method(params)
+        except InvalidParamsError as e:
+            return _error(request_id, INVALID_PARAMS, str(e))
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+def _error(request_id: Any, code: int, message: str) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    daemon: DebateDaemon
+
+    def handle(self) -> None:
+        line = self.rfile.readline(MAX_REQUEST_BYTES)
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            response = _error(None, PARSE_ERROR, "Parse error")
+        else:
+            response = self.daemon.handle(request)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _remove_stale_socket(path: Path) -> None:
+    """Remove a socket left by a daemon that is no longer running.
+
+    Raises:
+        RuntimeError: If another daemon is listening on the socket.
+    """
+    if not path.exists():
+        return
+    try:
+        connect(path).close()
+    except OSError:
+        path.unlink()
+        return
+    raise RuntimeError(f"A daemon is already listening on {path}")
+
+
+def create_server(path: Path, daemon: Optional[DebateDaemon] = None) -> DaemonServer:
+    """Bind the daemon socket, readable and writable only by the current user."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _remove_stale_socket(path)
+    handler = type(
+        "RequestHandler", (_RequestHandler,), {"daemon": daemon or DebateDaemon()}
+    )
+    previous_umask = os.umask(0o177)
+    try:
+        return DaemonServer(str(path), handler)
+    finally:
+        os.umask(previous_umask)
+
+
+def serve(path: Path) -> None:
+    """Warm up and serve until interrupted, then remove the socket."""
+    daemon = DebateDaemon()
+    server = create_server(path, daemon)
+    daemon.warm_up()
+    print(f"Debate daemon listening on {path} (pid {os.getpid()})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping daemon.", file=sys.stderr)
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
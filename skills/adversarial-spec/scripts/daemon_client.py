@@ -0,0 +1,179 @@
+"""
+Thin client for the `debate.py serve` daemon.
+
+debate.py calls forward_to_daemon() before its slow imports (litellm,
+providers, config). If a daemon is listening on the socket, the invocation
+is sent to it over JSON-RPC and its output is replayed locally; otherwise
+the CLI runs in-process as usual. Only the standard library is used here so
+forwarding stays fast.
+
+The caller's API keys and settings travel with the request: variables
+matched by is_forwarded_env() are sent, and the daemon runs the request
+with exactly those values, not its own.
+
+Environment:
+    ADVERSARIAL_SPEC_SOCKET     - Daemon socket path (default: ~/.config/adversarial-spec/daemon.sock)
+    ADVERSARIAL_SPEC_NO_DAEMON  - Set to 1 to always run in-process
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+DEFAULT_SOCKET_PATH = Path.home() / ".config" / "adversarial-spec" / "daemon.sock"
+
+# CLI actions served by the daemon; each is also a JSON-RPC method
+FORWARDED_ACTIONS = frozenset({"critique", "diff", "export-tasks", "sessions"})
+STDIN_ACTIONS = frozenset({"critique", "export-tasks"})
+# Flags whose output must reach the caller while the run is in progress
+# (event streaming, interactive Telegram polling); the daemon returns output
+# only when a request finishes, so these runs stay in-process
+LOCAL_FLAGS = ("--events", "--telegram", "-t")
+
+# Environment that decides credentials and settings for a request
+FORWARDED_ENV_PREFIXES = ("ADVERSARIAL_SPEC_", "TELEGRAM_", "AWS_")
+FORWARDED_ENV_SUFFIXES = ("_API_KEY", "_API_BASE")
+
+_ids = itertools.count(1)
+
+
+def get_socket_path() -> Path:
+    """Socket path from ADVERSARIAL_SPEC_SOCKET or the default."""
+    configured = os.environ.get("ADVERSARIAL_SPEC_SOCKET")
+    return Path(configured).expanduser() if configured else DEFAULT_SOCKET_PATH
+
+
+def is_forwarded_env(name: str) -> bool:
+    """Whether an environment variable is sent to the daemon with a request."""
+    return name.startswith(FORWARDED_ENV_PREFIXES) or name.endswith(
+        FORWARDED_ENV_SUFFIXES
+    )
+
+
+def needs_local_run(args: list[str]) -> bool:
+    """Whether the arguments ask for output that streams while the run is going."""
+    for arg in args:
+        if arg == "--":
+            break
+        name = arg.split("=", 1)[0]
+        if name in LOCAL_FLAGS:
+            return True
+        # argparse accepts unambiguous prefixes of long options
+        if name.startswith("--") and len(name) > 2:
+            if any(flag.startswith(name) for flag in LOCAL_FLAGS):
+                return True
+    return False
+
+
+def forwarded_env() -> dict[str, str]:
+    """The caller's environment variables that apply to a forwarded request."""
+    return {name: value for name, value in os.environ.items() if is_forwarded_env(name)}
+
+
+class DaemonError(RuntimeError):
+    """The daemon returned a JSON-RPC error or the connection failed."""
+
+
+def connect(path: Optional[Path] = None, timeout: float = 1.0) -> socket.socket:
+    """
+    Connect to the daemon socket.
+
+    Raises:
+        OSError: If no daemon is listening.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path or get_socket_path()))
+    except OSError:
+        sock.close()
+        raise
+    sock.settimeout(None)
+    return sock
+
+
+def call(
+    method: str,
+    params: Optional[dict[str, Any]] = None,
+    sock: Optional[socket.socket] = None,
+    path: Optional[Path] = None,
+) -> Any:
+    """
+    Make one JSON-RPC call and return its result.
+
+    Args:
+        method: Method name.
+        params: Method parameters.
+        sock: An already connected socket; it is closed afterwards.
+        path: Socket path when sock is not given.
+
+    Raises:
+        DaemonError: If the call fails or the daemon returns an error.
+    """
+    request = {"jsonrpc": "2.0", "id": next(_ids), "method": method}
+    if params is not None:
+        request["params"] = params
+    try:
+        sock = sock or connect(path)
+    except OSError as e:
+        raise DaemonError(f"Daemon not reachable: {e}")
+    try:
+        with sock, sock.makefile("rwb") as stream:
+            stream.write(json.dumps(request).encode("utf-8") + b"\n")
+            stream.flush()
+            line = stream.readline()
+    except OSError as e:
+        raise DaemonError(f"Daemon connection lost: {e}")
+    if not line:
+        raise DaemonError("Daemon closed the connection")
+    response = json.loads(line)
+    if "error" in response:
+        raise DaemonError(response["error"].get("message", "Daemon error"))
+    return response.get("result")
+
+
+def forward_to_daemon(argv: list[str]) -> Optional[int]:
+    """
+    Run a CLI invocation on the daemon if one is listening.
+
+    Args:
+        argv: Command-line arguments without the program name.
+
+    Returns:
+        The exit code, or None if the invocation should run in-process.
+    """
+    if os.environ.get("ADVERSARIAL_SPEC_NO_DAEMON", "") not in ("", "0"):
+        return None
+    if not argv or argv[0] not in FORWARDED_ACTIONS:
+        return None
+    if needs_local_run(argv[1:]):
+        return None
+    try:
+        sock = connect()
+    except OSError:
+        return None
+
+    stdin = ""
+    if argv[0] in STDIN_ACTIONS and "--resume" not in argv and not sys.stdin.isatty():
+        stdin = sys.stdin.read()
+    params = {
+        "args": argv[1:],
+        "stdin": stdin,
+        "cwd": os.getcwd(),
+        "env": forwarded_env(),
+    }
+    try:
+        result = call(argv[0], params, sock=sock)
+    except DaemonError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    sys.stdout.write(result.get("stdout", ""))
+    sys.stderr.write(result.get("stderr", ""))
+    sys.stdout.flush()
+    return int(result.get("exit_code", 0))
@@ -13,12 +13,18 @@ Usage:
     echo "spec" | python3 debate.py critique --models gpt-4o --profile strict-security
     echo "spec" | python3 debate.py critique --models gpt-4o --preserve-intent
     echo "spec" | python3 debate.py critique --models gpt-4o --session my-debate
+    echo "spec" | python3 debate.py critique --models gpt-4o,gemini/gemini-2.0-flash --merge
+    echo "spec" | python3 debate.py critique --models gpt-4o,gemini/gemini-2.0-flash --digest
     python3 debate.py critique --resume my-debate
     echo "spec" | python3 debate.py diff --previous prev.md --current current.md
+    python3 debate.py diff --previous prev.md --current current.md --sections
+    python3 debate.py diff --previous prev.md --current current.md --diff-engine myers --word-diff
+    python3 debate.py diff --previous prev.md --current current.md --benchmark
     echo "spec" | python3 debate.py export-tasks --doc-type prd
     python3 debate.py providers
     python3 debate.py profiles
     python3 debate.py sessions
+    python3 debate.py sessions --session my-debate
 
 Supported providers (set corresponding API key):
     OpenAI:     OPENAI_API_KEY       models: gpt-4o, gpt-4-turbo, o1, etc.
@@ -47,6 +53,7 @@ Exit codes:
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import os
 import sys
@@ -55,6 +62,15 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+if __name__ == "__main__":
+    # Hand the invocation to a running `debate.py serve` daemon, if any,
+    # before paying for the litellm import below.
+    from daemon_client import forward_to_daemon
+
+    _daemon_exit_code = forward_to_daemon(sys.argv[1:])
+    if _daemon_exit_code is not None:
+        sys.exit(_daemon_exit_code)
+
 warnings.filterwarnings("ignore", message="Pydantic serializer warnings")
 os.environ["LITELLM_LOG"] = "ERROR"
 
@@ -67,6 +83,37 @@ except ImportError:
     )
     sys.exit(1)
 
+from compact import COMPACT_SEPARATORS, SPEC_FORMATS, compact_output  # noqa: E402
+from context_index import (  # noqa: E402
+    DEFAULT_INDEX_PATH,
+    DEFAULT_TOKEN_BUDGET,
+    DEFAULT_TOP_K,
+    ContextIndex,
+    build_index,
+    select_chunks,
+)
+from context_pack import (  # noqa: E402
+    ContextFile,
+    format_context,
+    format_pack_warning,
+    pack_for_models,
+    read_context_files,
+)
+from convergence import (  # noqa: E402
+    DEFAULT_CONVERGENCE_THRESHOLD,
+    critique_text,
+    format_convergence,
+)
+from daemon_client import get_socket_path  # noqa: E402
+from diff_engine import (  # noqa: E402
+    DEFAULT_DIFF_ENGINE,
+    DIFF_ENGINES,
+    benchmark_engines,
+    format_benchmark,
+)
+from digest import CritiqueCluster, cluster_critiques, format_digest  # noqa: E402
+from events import EVENT_FORMATS, configure_events, emit, events_enabled  # noqa: E402
+from merge import MergeResult, format_merge_report, merge_specs  # noqa: E402
 from models import (  # noqa: E402
     ModelResponse,
     call_models_parallel,
@@ -75,13 +122,14 @@ from models import (  # noqa: E402
     generate_diff,
     get_critique_summary,
     is_o_series_model,
-    load_context_files,
 )
-from prompts import EXPORT_TASKS_PROMPT, get_doc_type_name  # noqa: E402
+from prompt_library import get_library  # noqa: E402
+from prompts import get_doc_type_name  # noqa: E402
 from providers import (  # noqa: E402
     DEFAULT_CODEX_REASONING,
     get_bedrock_config,
     get_default_model,
+    get_provider,
     handle_bedrock_command,
     list_focus_areas,
     list_personas,
@@ -92,11 +140,110 @@ from providers import (  # noqa: E402
     validate_bedrock_models,
     validate_model_credentials,
 )
-from session import SESSIONS_DIR, SessionState, save_checkpoint  # noqa: E402
+from response_cache import SharedCache, configure_shared_cache, using_cache  # noqa: E402
+from selection import format_selection, select_models  # noqa: E402
+from service import DEFAULT_SERVICE_PORT, DEFAULT_WORKERS, run_service  # noqa: E402
+from session import (  # noqa: E402
+    SESSIONS_DIR,
+    TELEGRAM_MESSAGE_IDS_KEPT,
+    SessionState,
+    round_history_entry,
+    save_checkpoint,
+)
+from spec_doc import (  # noqa: E402
+    SpecDocument,
+    diff_sections,
+    format_section_changes,
+    summarize_changes,
+)
+from speculation import (  # noqa: E402
+    claim_speculation,
+    format_speculation,
+    prefetched_usage,
+    spec_hash,
+    speculation_key,
+    start_speculation,
+)
+from speculation import discard as discard_speculation  # noqa: E402
+
+
+def format_round_notification(round_num: int, results: list[ModelResponse]) -> str:
+    """Telegram summary of a round: status, cost and one line per model."""
+    summaries = []
+    all_agreed = True
+    for r in results:
+        if r.error:
+            summaries.append(f"`{r.model}`: ERROR - {r.error[:100]}")
+            all_agreed = False
+        elif r.agreed:
+            summaries.append(f"`{r.model}`: AGREE")
+        else:
+            all_agreed = False
+            summary = get_critique_summary(r.response, 200)
+            summaries.append(f"`{r.model}`: {summary}")
+
+    status = "ALL AGREE" if all_agreed else "Critiques received"
+    notification = f"""*Round {round_num} complete*
+
+Status: {status}
+Models: {len(results)}
+Cost: ${cost_tracker.total_cost:.4f}
+
+"""
+    return notification + "\n\n".join(summaries)
+
+
+def send_async_telegram_notification(
+    round_num: int, results: list[ModelResponse]
+) -> Optional[list[int]]:
+    """Send the round's Telegram notification without waiting for a reply.
+
+    Replies are collected by the next round's FeedbackWorker.
+
+    Args:
+        round_num: Current round number.
+        results: List of model responses.
+
+    Returns:
+        IDs of the sent messages, which the next round's worker takes
+        replies to in webhook mode, or None if nothing was sent.
+    """
+    try:
+        script_dir = Path(__file__).parent
+        sys.path.insert(0, str(script_dir))
+        import telegram_bot
+
+        token, chat_id = telegram_bot.get_config()
+        if not token or not chat_id:
+            print(
+                "Warning: Telegram not configured. Skipping notification.",
+                file=sys.stderr,
+            )
+            return None
+        notification = format_round_notification(round_num, results) + (
+            "\n\n_Reply to this message any time; "
+            "feedback is picked up by the next round._"
+        )
+        message_ids = telegram_bot.send_long_message_ids(token, chat_id, notification)
+        if message_ids is None:
+            print("Warning: Failed to send Telegram notification.", file=sys.stderr)
+        return message_ids
+    except ImportError:
+        print(
+            "Warning: telegram_bot.py not found. Skipping notification.",
+            file=sys.stderr,
+        )
+        return None
+    except Exception as e:
+        print(f"Warning: Telegram error: {e}", file=sys.stderr)
+        return None
 
 
 def send_telegram_notification(
-    models: list[str], round_num: int, results: list[ModelResponse], poll_timeout: int
+    models: list[str],
+    round_num: int,
+    results: list[ModelResponse],
+    poll_timeout: int,
 ) -> Optional[str]:
     """Send Telegram notification with all model responses and poll for feedback.
 
@@ -122,35 +269,26 @@ def send_telegram_notification(
             )
             return None
 
-        summaries = []
-        all_agreed = True
-        for r in results:
-            if r.error:
-                summaries.append(f"`{r.model}`: ERROR - {r.error[:100]}")
-                all_agreed = False
-            elif r.agreed:
-                summaries.append(f"`{r.model}`: AGREE")
-            else:
-                all_agreed = False
-                summary = get_critique_summary(r.response, 200)
-                summaries.append(f"`{r.model}`: {summary}")
-
-        status = "ALL AGREE" if all_agreed else "Critiques received"
-        notification = f"""*Round {round_num} complete*
-
-Status: {status}
-Models: {len(results)}
-Cost: ${cost_tracker.total_cost:.4f}
-
-"""
-        notification += "\n\n".join(summaries)
-
-        last_update = telegram_bot.get_last_update_id(token)
-
+        notification = format_round_notification(round_num, results)
         full_notification = (
             notification
             + f"\n\n_Reply within {poll_timeout}s to add feedback, or wait to continue._"
         )
+
+        relay_url, _ = telegram_bot.get_relay_config()
+        if relay_url:
+            # Webhook mode: the relay routes replies to this notification here
+            message_ids = telegram_bot.send_long_message_ids(
+                token, chat_id, full_notification
+            )
+            if message_ids is None:
+                print("Warning: Failed to send Telegram notification.", file=sys.stderr)
+                return None
+            return telegram_bot.wait_for_reply(
+                token, chat_id, poll_timeout, reply_to=message_ids
+            )
+
+        last_update = telegram_bot.get_last_update_id(token)
         if not telegram_bot.send_long_message(token, chat_id, full_notification):
             print("Warning: Failed to send Telegram notification.", file=sys.stderr)
             return None
@@ -171,16 +309,58 @@ Cost: ${cost_tracker.total_cost:.4f}
         return None
 
 
+def start_feedback_worker(
+    offset: Optional[int], reply_to: Optional[list[int]] = None
+) -> Optional[Any]:
+    """Start a background Telegram FeedbackWorker for the current round.
+
+    Args:
+        offset: Telegram update offset saved by the previous round, if any.
+        reply_to: Message IDs of the session's earlier async notifications;
+            in webhook mode only replies to these are collected.
+
+    Returns:
+        The running worker, or None if Telegram is not configured.
+    """
+    try:
+        script_dir = Path(__file__).parent
+        sys.path.insert(0, str(script_dir))
+        import telegram_bot
+
+        token, chat_id = telegram_bot.get_config()
+        if not token or not chat_id:
+            print(
+                "Warning: Telegram not configured. Skipping notification.",
+                file=sys.stderr,
+            )
+            return None
+        relay_url, secret = telegram_bot.get_relay_config()
+        relay = (relay_url, secret) if relay_url else None
+        return telegram_bot.FeedbackWorker(
+            token, chat_id, offset, relay=relay, reply_to=reply_to
+        ).start()
+    except ImportError:
+        print(
+            "Warning: telegram_bot.py not found. Skipping notification.",
+            file=sys.stderr,
+        )
+        return None
+
+
 def send_final_spec_to_telegram(
-    spec: str, rounds: int, models: list[str], doc_type: str
+    spec: str, rounds: int, models: list[str], doc_type: str, compress: bool = False
 ) -> bool:
     """Send the final converged spec to Telegram.
 
+    Specs that fit in one message are sent inline. Larger specs are uploaded
+    as a single document after a short summary message.
+
     Args:
         spec: The final spec content.
         rounds: Number of rounds completed.
         models: List of model identifiers used.
         doc_type: Document type (prd or tech).
+        compress: Gzip the uploaded document.
 
     Returns:
         True on success, False on failure.
@@ -205,15 +385,31 @@ def send_final_spec_to_telegram(
 Document: {doc_type_name}
 Rounds: {rounds}
 Models: Codex vs {models_str}
-Total cost: ${cost_tracker.total_cost:.4f}
-
-Final document:
----"""
-
-        if not telegram_bot.send_message(token, chat_id, header):
+Total cost: ${cost_tracker.total_cost:.4f}"""
+
+        if len(spec) <= telegram_bot.MAX_MESSAGE_LENGTH:
+            if not telegram_bot.send_message(
+                token, chat_id, header + "\n\nFinal document:\n---"
+            ):
+                return False
+            return telegram_bot.send_long_message(token, chat_id, spec)
+
+        sections = len(SpecDocument.parse(spec).sections)
+        size_kb = len(spec.encode("utf-8")) / 1024
+        summary = (
+            f"{header}\n\nFinal document attached "
+            f"({size_kb:.0f} KB, {sections} sections)."
+        )
+        if not telegram_bot.send_message(token, chat_id, summary):
             return False
-
-        return telegram_bot.send_long_message(token, chat_id, spec)
+        return telegram_bot.send_document(
+            token,
+            chat_id,
+            f"{doc_type}-final.md",
+            spec,
+            caption=f"Final {doc_type_name}",
+            compress=compress,
+        )
 
     except Exception as e:
         print(f"Warning: Failed to send final spec to Telegram: {e}", file=sys.stderr)
@@ -249,9 +445,59 @@ def add_core_arguments(parser: argparse.ArgumentParser) -> None:
 def add_output_arguments(parser: argparse.ArgumentParser) -> None:
     """Add output formatting arguments to parser."""
     parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+    parser.add_argument(
+        "--events",
+        choices=EVENT_FORMATS,
+        help="Stream typed progress events to stdout as they happen (jsonl); "
+        "the final result is the round_completed event",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Compact JSON: critiques without the spec copy, specs referenced by "
+        "hash and listed once, no indentation (implies --json)",
+    )
+    parser.add_argument(
+        "--spec-format",
+        choices=SPEC_FORMATS,
+        default="diff",
+        help="How --compact lists revised specs: diff against the input or full "
+        "text (default: diff)",
+    )
+    parser.add_argument(
+        "--side-files",
+        metavar="DIR",
+        help="With --compact, write revised specs and large critiques to files "
+        "in DIR and output their paths",
+    )
     parser.add_argument(
         "--show-cost", action="store_true", help="Show cost summary after critique"
     )
+    parser.add_argument(
+        "--digest",
+        action="store_true",
+        help="Replace full critiques with a de-duplicated digest of points ranked by "
+        "how many models raised them",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="In later rounds of a session, ask only dissenting models plus one "
+        "verifier and skip models whose critiques repeat the others",
+    )
+    parser.add_argument(
+        "--speculate",
+        action="store_true",
+        help="After a round with a revised spec, critique that spec as the next "
+        "round in the background; the next round returns at once if it matches",
+    )
+    parser.add_argument(
+        "--shared-cache",
+        action="store_true",
+        help="Share model responses with other processes through an on-disk cache; "
+        "concurrent identical calls wait for one upstream call "
+        "(dir: $ADVERSARIAL_SPEC_CACHE_DIR or ~/.config/adversarial-spec/cache/responses)",
+    )
 
 
 def add_telegram_arguments(parser: argparse.ArgumentParser) -> None:
@@ -268,6 +514,17 @@ def add_telegram_arguments(parser: argparse.ArgumentParser) -> None:
         default=60,
         help="Seconds to wait for Telegram reply (default: 60)",
     )
+    parser.add_argument(
+        "--telegram-gzip",
+        action="store_true",
+        help="Gzip large documents uploaded to Telegram (send-final)",
+    )
+    parser.add_argument(
+        "--telegram-async",
+        action="store_true",
+        help="Collect Telegram feedback in the background instead of blocking "
+        "for --poll-timeout after each round",
+    )
 
 
 def add_critique_modifiers(parser: argparse.ArgumentParser) -> None:
@@ -292,13 +549,25 @@ def add_critique_modifiers(parser: argparse.ArgumentParser) -> None:
         "-c",
         action="append",
         default=[],
-        help="Additional context file(s) to include (can be used multiple times)",
+        help="Additional context file, directory or glob to include (repeatable)",
     )
     parser.add_argument(
         "--preserve-intent",
         action="store_true",
         help="Require explicit justification for any removal or substantial modification",
     )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="Three-way merge every model's revised spec instead of keeping only the first",
+    )
+    parser.add_argument(
+        "--convergence-threshold",
+        type=float,
+        default=DEFAULT_CONVERGENCE_THRESHOLD,
+        help="Share of spec lines changed per round below which a round counts as "
+        f"cosmetic (default: {DEFAULT_CONVERGENCE_THRESHOLD})",
+    )
 
 
 def add_session_arguments(parser: argparse.ArgumentParser) -> None:
@@ -320,6 +589,27 @@ def add_diff_arguments(parser: argparse.ArgumentParser) -> None:
     """Add diff command arguments to parser."""
     parser.add_argument("--previous", help="Previous spec file (for diff action)")
     parser.add_argument("--current", help="Current spec file (for diff action)")
+    parser.add_argument(
+        "--sections",
+        action="store_true",
+        help="Report section-level changes (added/removed/moved/edited) for diff action",
+    )
+    parser.add_argument(
+        "--diff-engine",
+        choices=DIFF_ENGINES,
+        default=DEFAULT_DIFF_ENGINE,
+        help=f"Diff backend for diff action (default: {DEFAULT_DIFF_ENGINE})",
+    )
+    parser.add_argument(
+        "--word-diff",
+        action="store_true",
+        help="Highlight changed words inside modified lines ([-old-]{+new+})",
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Time every available diff engine on --previous/--current",
+    )
 
 
 def add_codex_arguments(parser: argparse.ArgumentParser) -> None:
@@ -347,8 +637,71 @@ def add_bedrock_arguments(parser: argparse.ArgumentParser) -> None:
     )
 
 
+def add_context_index_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add context index and auto-context arguments to parser."""
+    parser.add_argument(
+        "--docs",
+        action="append",
+        default=[],
+        help="Directory, file or glob to index (for context-index action, repeatable)",
+    )
+    parser.add_argument(
+        "--index",
+        help=f"Context index file (default: {DEFAULT_INDEX_PATH})",
+    )
+    parser.add_argument(
+        "--auto-context",
+        action="store_true",
+        help="Add the indexed chunks most relevant to the spec as context",
+    )
+    parser.add_argument(
+        "--auto-context-tokens",
+        type=int,
+        default=DEFAULT_TOKEN_BUDGET,
+        help=f"Token budget for --auto-context chunks (default: {DEFAULT_TOKEN_BUDGET})",
+    )
+    parser.add_argument(
+        "--auto-context-k",
+        type=int,
+        default=DEFAULT_TOP_K,
+        help=f"Maximum chunks for --auto-context (default: {DEFAULT_TOP_K})",
+    )
+
+
 def add_misc_arguments(parser: argparse.ArgumentParser) -> None:
     """Add miscellaneous arguments to parser."""
+    parser.add_argument(
+        "--socket",
+        help="Unix socket for the serve action (default: $ADVERSARIAL_SPEC_SOCKET "
+        "or ~/.config/adversarial-spec/daemon.sock)",
+    )
+    parser.add_argument(
+        "--http",
+        action="store_true",
+        help="Serve the team HTTP job API instead of the local socket daemon",
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Interface for serve --http (default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_SERVICE_PORT,
+        help=f"Port for serve --http (default: {DEFAULT_SERVICE_PORT})",
+    )
+    parser.add_argument(
+        "--users",
+        help="Users file with tokens and limits for serve --http "
+        "(default: single local user, loopback only)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Jobs run at once by serve --http (default: {DEFAULT_WORKERS})",
+    )
     parser.add_argument(
         "--timeout",
         type=int,
@@ -372,8 +725,15 @@ Examples:
   echo "spec" | python3 debate.py critique --models gpt-4o --focus security
   echo "spec" | python3 debate.py critique --models gpt-4o --persona "security engineer"
   echo "spec" | python3 debate.py critique --models gpt-4o --context ./api.md
+  python3 debate.py context-index --docs ./docs
+  python3 debate.py serve                                    # Warm daemon; later calls forward to it
+  python3 debate.py serve --http --users team.json --host 0.0.0.0   # Shared team job service
+  echo "spec" | python3 debate.py critique --models gpt-4o --auto-context
   echo "spec" | python3 debate.py critique --profile my-security-profile
   python3 debate.py diff --previous old.md --current new.md
+  python3 debate.py diff --previous old.md --current new.md --sections
+  python3 debate.py diff --previous old.md --current new.md --diff-engine myers
+  python3 debate.py diff --previous old.md --current new.md --benchmark
   echo "spec" | python3 debate.py export-tasks --doc-type prd
   python3 debate.py providers
   python3 debate.py focus-areas
@@ -410,6 +770,8 @@ Document types:
             "save-profile",
             "sessions",
             "bedrock",
+            "context-index",
+            "serve",
         ],
         help="Action to perform",
     )
@@ -429,6 +791,7 @@ Document types:
     add_diff_arguments(parser)
     add_codex_arguments(parser)
     add_bedrock_arguments(parser)
+    add_context_index_arguments(parser)
     add_misc_arguments(parser)
 
     return parser
@@ -460,6 +823,16 @@ def handle_info_command(args: argparse.Namespace) -> bool:
         return True
 
     if args.action == "sessions":
+        if args.session:
+            try:
+                state = SessionState.load(args.session)
+            except (FileNotFoundError, ValueError) as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(2)
+            print(f"Session {state.session_id} (round {state.round}):\n")
+            print(format_convergence(state.history))
+            return True
+
         sessions = SessionState.list_sessions()
         print("Saved Sessions:\n")
         if not sessions:
@@ -480,7 +853,7 @@ def handle_info_command(args: argparse.Namespace) -> bool:
 
 
 def handle_utility_command(args: argparse.Namespace) -> bool:
-    """Handle utility commands (bedrock, save-profile, diff).
+    """Handle utility commands (bedrock, save-profile, diff, context-index, serve).
 
     Args:
         args: Parsed command-line arguments.
@@ -508,6 +881,14 @@ def handle_utility_command(args: argparse.Namespace) -> bool:
         save_profile(args.profile_name, config)
         return True
 
+    if args.action == "context-index":
+        handle_context_index(args)
+        return True
+
+    if args.action == "serve":
+        handle_serve(args)
+        return True
+
     if args.action == "diff":
         if not args.previous or not args.current:
             print("Error: --previous and --current required for diff", file=sys.stderr)
@@ -515,7 +896,38 @@ def handle_utility_command(args: argparse.Namespace) -> bool:
         try:
             prev_content = Path(args.previous).read_text()
             curr_content = Path(args.current).read_text()
-            diff = generate_diff(prev_content, curr_content)
+            if args.benchmark:
+                rows = benchmark_engines(prev_content, curr_content)
+                if args.json:
+                    print(json.dumps({"benchmark": rows}, indent=2))
+                else:
+                    print(format_benchmark(rows, prev_content, curr_content))
+                return True
+            if args.sections or args.json:
+                changes = diff_sections(prev_content, curr_content)
+                if args.json:
+                    print(
+                        json.dumps(
+                            {
+                                "summary": summarize_changes(changes),
+                                "sections": [
+                                    {**c.to_dict(), "diff": c.diff} for c in changes
+                                ],
+                            },
+                            indent=2,
+                        )
+                    )
+                elif changes:
+                    print(format_section_changes(changes))
+                else:
+                    print("No differences found.")
+                return True
+            diff = generate_diff(
+                prev_content,
+                curr_content,
+                engine=args.diff_engine,
+                word_level=args.word_diff,
+            )
             if diff:
                 print(diff)
             else:
@@ -637,6 +1049,122 @@ def add_project_constitution_context(args: argparse.Namespace) -> None:
     args.context = [constitution_resolved] + existing_context
 
 
+def handle_context_index(args: argparse.Namespace) -> None:
+    """Build or refresh the local context index.
+
+    Args:
+        args: Parsed command-line arguments.
+    """
+    index_path = Path(args.index) if args.index else DEFAULT_INDEX_PATH
+    previous = None
+    try:
+        previous = ContextIndex.load(index_path)
+    except FileNotFoundError:
+        pass
+    except ValueError as e:
+        print(f"Warning: {e}; rebuilding from scratch", file=sys.stderr)
+
+    roots = args.docs or (previous.roots if previous else [])
+    if not roots:
+        print("Error: --docs required for context-index", file=sys.stderr)
+        sys.exit(1)
+
+    index, reused = build_index(roots, previous)
+    try:
+        index.save(index_path)
+    except OSError as e:
+        print(f"Error writing index: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    summary = {
+        "index": str(index_path),
+        "files": len(index.files),
+        "reused_files": reused,
+        "chunks": len(index.chunks),
+        "tokens": sum(chunk.tokens for chunk in index.chunks),
+    }
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(
+            f"Indexed {summary['files']} files ({reused} unchanged) into "
+            f"{summary['chunks']} chunks, {summary['tokens']:,} tokens: {index_path}"
+        )
+
+
+def handle_serve(args: argparse.Namespace) -> None:
+    """Run the JSON-RPC daemon, or the HTTP job service, until interrupted.
+
+    Args:
+        args: Parsed command-line arguments.
+    """
+    if args.http:
+        users = Path(args.users).expanduser() if args.users else None
+        try:
+            run_service(args.host, args.port, users, args.workers)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    import daemon
+
+    path = Path(args.socket).expanduser() if args.socket else get_socket_path()
+    try:
+        daemon.serve(path)
+    except (OSError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def add_auto_context(
+    args: argparse.Namespace,
+    spec: str,
+    context_files: Optional[list[ContextFile]],
+) -> Optional[list[ContextFile]]:
+    """Append the indexed chunks most relevant to the spec to the context.
+
+    Chunks come after explicit --context files, so packing for small
+    context windows trims them first.
+
+    Args:
+        args: Parsed command-line arguments.
+        spec: The specification used as the search query.
+        context_files: Context files already loaded from --context.
+
+    Returns:
+        Context files including the selected chunks.
+    """
+    index_path = Path(args.index) if args.index else DEFAULT_INDEX_PATH
+    try:
+        index = ContextIndex.load(index_path)
+    except FileNotFoundError:
+        print(
+            f"Error: No context index at {index_path}. "
+            "Build one with: debate.py context-index --docs DIR",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    explicit = context_files or []
+    chunks = select_chunks(
+        index,
+        spec,
+        max_tokens=args.auto_context_tokens,
+        top_k=args.auto_context_k,
+        exclude=[f.path for f in explicit],
+    )
+    tokens = sum(chunk.tokens for chunk in chunks)
+    print(
+        f"Auto-context: {len(chunks)} chunks ({tokens:,} tokens) from {index_path}",
+        file=sys.stderr,
+    )
+    return (explicit + chunks) or None
+
+
 def setup_bedrock(
     args: argparse.Namespace, models: list[str]
 ) -> tuple[list[str], bool, Optional[str]]:
@@ -704,7 +1232,9 @@ def handle_send_final(args: argparse.Namespace, models: list[str]) -> None:
     if not spec:
         print("Error: No spec provided via stdin", file=sys.stderr)
         sys.exit(1)
-    if send_final_spec_to_telegram(spec, args.rounds, models, args.doc_type):
+    if send_final_spec_to_telegram(
+        spec, args.rounds, models, args.doc_type, compress=args.telegram_gzip
+    ):
         print("Final document sent to Telegram.")
     else:
         print("Failed to send final document to Telegram.", file=sys.stderr)
@@ -724,7 +1254,11 @@ def handle_export_tasks(args: argparse.Namespace, models: list[str]) -> None:
         sys.exit(1)
 
     doc_type_name = get_doc_type_name(args.doc_type)
-    prompt = EXPORT_TASKS_PROMPT.format(doc_type_name=doc_type_name, spec=spec)
+    prompt = (
+        get_library()
+        .templates["export-tasks"]
+        .format(doc_type_name=doc_type_name, spec=spec)
+    )
 
     try:
         # Build completion kwargs
@@ -829,6 +1363,7 @@ def run_critique(
     context: Optional[str],
     bedrock_mode: bool,
     bedrock_region: Optional[str],
+    context_files: Optional[list[ContextFile]] = None,
 ) -> None:
     """Execute the critique workflow and output results.
 
@@ -840,7 +1375,21 @@ def run_critique(
         context: Optional context string.
         bedrock_mode: Whether Bedrock mode is enabled.
         bedrock_region: AWS region for Bedrock.
+        context_files: Optional context files to pack per model context window.
     """
+    selection = None
+    if args.adaptive:
+        if session_state:
+            selection = select_models(models, session_state.history, args.press)
+            print(format_selection(selection), file=sys.stderr)
+            models = selection.selected
+        else:
+            print(
+                "Warning: --adaptive needs --session or --resume for model history; "
+                "asking every model",
+                file=sys.stderr,
+            )
+
     mode = "pressing for confirmation" if args.press else "critiquing"
     focus_info = f" (focus: {args.focus})" if args.focus else ""
     persona_info = f" (persona: {args.persona})" if args.persona else ""
@@ -851,22 +1400,79 @@ def run_critique(
         file=sys.stderr,
     )
 
-    results = call_models_parallel(
-        models,
-        spec,
-        args.round,
-        args.doc_type,
-        args.press,
-        args.focus,
-        args.persona,
-        context,
-        args.preserve_intent,
-        args.codex_reasoning,
-        args.codex_search,
-        args.timeout,
-        bedrock_mode,
-        bedrock_region,
+    feedback_worker = None
+    if args.telegram and args.telegram_async:
+        feedback_worker = start_feedback_worker(
+            session_state.telegram_offset if session_state else None,
+            session_state.telegram_message_ids if session_state else None,
+        )
+
+    packs = pack_for_models(context_files, models, spec) if context_files else {}
+    reduced = {model: pack for model, pack in packs.items() if pack.reduced}
+    for pack in reduced.values():
+        print(format_pack_warning(pack), file=sys.stderr)
+
+    session_id = session_state.session_id if session_state else args.session
+    contexts = {model: pack.context for model, pack in packs.items()} or None
+    call_options = {
+        "models": models,
+        "doc_type": args.doc_type,
+        "press": args.press,
+        "focus": args.focus,
+        "persona": args.persona,
+        "context": context,
+        "preserve_intent": args.preserve_intent,
+        "codex_reasoning": args.codex_reasoning,
+        "codex_search": args.codex_search,
+        "timeout": args.timeout,
+        "bedrock_mode": bedrock_mode,
+        "bedrock_region": bedrock_region,
+        "contexts": contexts,
+    }
+    speculation_slot = speculation_key(session_id)
+    previous_speculation, speculation_cache = claim_speculation(
+        speculation_slot, spec, args.round, call_options
     )
+    if previous_speculation:
+        print(format_speculation(previous_speculation), file=sys.stderr)
+
+    with (
+        using_cache(SharedCache(speculation_cache))
+        if speculation_cache
+        else contextlib.nullcontext()
+    ):
+        results = call_models_parallel(
+            models,
+            spec,
+            args.round,
+            args.doc_type,
+            args.press,
+            args.focus,
+            args.persona,
+            context,
+            args.preserve_intent,
+            args.codex_reasoning,
+            args.codex_search,
+            args.timeout,
+            bedrock_mode,
+            bedrock_region,
+            contexts=contexts,
+        )
+    if speculation_cache:
+        # Prefetched responses come back as free cache hits; the round still
+        # paid for them, in the worker, and took the worker's time
+        prefetched = [r for r in results if r.cached]
+        usage = prefetched_usage(speculation_slot, [r.model for r in prefetched])
+        for r in prefetched:
+            spent = usage.get(r.model)
+            if spent is None:
+                continue
+            r.input_tokens = spent["input_tokens"]
+            r.output_tokens = spent["output_tokens"]
+            r.cost = spent["cost"]
+            r.latency = spent["latency"]
+            cost_tracker.credit(r.model, r.input_tokens, r.output_tokens, r.cost)
+        discard_speculation(speculation_slot)
 
     errors = [r for r in results if r.error]
     for err_result in errors:
@@ -875,43 +1481,146 @@ def run_critique(
             file=sys.stderr,
         )
 
+    cached = [r.model for r in results if r.cached]
+    if cached and not speculation_cache:
+        print(
+            f"Served from shared cache (no cost): {', '.join(cached)}",
+            file=sys.stderr,
+        )
+
     successful = [r for r in results if not r.error]
     all_agreed = all(r.agreed for r in successful) if successful else False
+    # Skipped models have not seen this spec; the next round asks everyone
+    confirmation_pending = all_agreed and bool(selection and selection.skipped)
+    if confirmation_pending:
+        all_agreed = False
 
-    session_id = session_state.session_id if session_state else args.session
     if session_id or args.session:
-        save_checkpoint(spec, args.round, session_id)
+        path = save_checkpoint(spec, args.round, session_id)
+        emit(
+            "checkpoint_saved",
+            kind="checkpoint",
+            round=args.round,
+            session=session_id,
+            path=str(path),
+        )
 
     latest_spec = spec
-    for r in successful:
-        if r.spec:
-            latest_spec = r.spec
-            break
+    merge_result = None
+    if args.merge:
+        order = {m: i for i, m in enumerate(models)}
+        revisions = sorted(
+            (r for r in successful if r.spec),
+            key=lambda r: order.get(r.model, len(order)),
+        )
+        if revisions:
+            merge_result = merge_specs(spec, [(r.model, r.spec) for r in revisions])
+            latest_spec = merge_result.spec
+    else:
+        for r in successful:
+            if r.spec:
+                latest_spec = r.spec
+                break
+
+    entry = round_history_entry(
+        args.round,
+        spec,
+        latest_spec,
+        results,
+        all_agreed,
+        session_state.history if session_state else [],
+        args.convergence_threshold,
+    )
 
     if session_state:
         session_state.spec = latest_spec
         session_state.round = args.round + 1
         session_state.history.append(
-            {
-                "round": args.round,
-                "all_agreed": all_agreed,
-                "models": [
-                    {"model": r.model, "agreed": r.agreed, "error": r.error}
-                    for r in results
-                ],
+            {**entry, "confirmation_pending": confirmation_pending}
+        )
+        if merge_result:
+            session_state.history[-1]["merge"] = merge_result.summary()
+        if selection:
+            session_state.history[-1]["selection"] = selection.to_dict()
+        path = session_state.save()
+        emit(
+            "checkpoint_saved",
+            kind="session",
+            round=args.round,
+            session=session_state.session_id,
+            path=str(path),
+        )
+
+    speculation = None
+    if previous_speculation:
+        speculation = {"previous": previous_speculation}
+    if args.speculate and not all_agreed and latest_spec != spec:
+        pid = start_speculation(
+            speculation_slot, latest_spec, args.round + 1, call_options
+        )
+        if pid is not None:
+            print(
+                f"Speculating round {args.round + 1} against the revised spec "
+                f"in the background (pid {pid})",
+                file=sys.stderr,
+            )
+            speculation = {
+                **(speculation or {}),
+                "next_round": args.round + 1,
+                "spec_hash": spec_hash(latest_spec),
             }
+
+    digest = None
+    if args.digest:
+        digest = cluster_critiques(
+            [(r.model, critique_text(r.response)) for r in successful if not r.agreed]
         )
-        session_state.save()
 
     user_feedback = None
-    if args.telegram:
+    feedback_late = False
+    if feedback_worker:
+        message_ids = send_async_telegram_notification(args.round, results)
+        replies, offset = feedback_worker.drain()
+        feedback_worker.stop()
+        if replies:
+            # Replies to an earlier round that arrived while this one ran
+            user_feedback = "\n\n".join(replies)
+            feedback_late = True
+            print(f"Received feedback: {user_feedback}", file=sys.stderr)
+        if session_state:
+            if offset is not None:
+                session_state.telegram_offset = offset
+            if message_ids:
+                session_state.telegram_message_ids = (
+                    session_state.telegram_message_ids + message_ids
+                )[-TELEGRAM_MESSAGE_IDS_KEPT:]
+            session_state.save()
+    elif args.telegram:
         user_feedback = send_telegram_notification(
             models, args.round, results, args.poll_timeout
         )
         if user_feedback:
             print(f"Received feedback: {user_feedback}", file=sys.stderr)
+    if user_feedback:
+        emit("feedback_received", text=user_feedback, late=feedback_late)
 
-    output_results(args, results, models, all_agreed, user_feedback, session_state)
+    output_results(
+        args,
+        results,
+        models,
+        all_agreed,
+        user_feedback,
+        session_state,
+        merge_result=merge_result,
+        convergence={**entry["convergence"], "metrics": entry["metrics"]},
+        digest=digest,
+        feedback_late=feedback_late,
+        context_packing={model: pack.to_dict() for model, pack in reduced.items()},
+        input_spec=spec,
+        speculation=speculation,
+        selection=selection.to_dict() if selection else None,
+        confirmation_pending=confirmation_pending,
+    )
 
 
 def output_results(
@@ -921,6 +1630,15 @@ def output_results(
     all_agreed: bool,
     user_feedback: Optional[str],
     session_state: Optional[SessionState],
+    merge_result: Optional[MergeResult] = None,
+    convergence: Optional[dict] = None,
+    digest: Optional[list[CritiqueCluster]] = None,
+    feedback_late: bool = False,
+    context_packing: Optional[dict[str, dict]] = None,
+    input_spec: Optional[str] = None,
+    speculation: Optional[dict] = None,
+    selection: Optional[dict] = None,
+    confirmation_pending: bool = False,
 ) -> None:
     """Output critique results in JSON or text format.
 
@@ -931,8 +1649,22 @@ def output_results(
         all_agreed: Whether all models agreed.
         user_feedback: Optional user feedback from Telegram.
         session_state: Optional session state.
+        merge_result: Optional merge of every model's revised spec.
+        convergence: Optional round metrics and next-step recommendation.
+        digest: Optional clustered critique points; replaces full critiques.
+        feedback_late: Feedback arrived while the round was already running, so
+            the round should be re-run with it.
+        context_packing: Per-model record of context files truncated or
+            dropped to fit the model's context window.
+        input_spec: The spec the models reviewed; --compact diffs against it.
+        speculation: Outcome of the previous speculative round and the round
+            now being prefetched.
+        selection: The --adaptive decision: models asked, models skipped and
+            why, and the per-model stats behind it.
+        confirmation_pending: Every model asked agreed, but --adaptive skipped
+            others, so all_agreed stays False until a round asks every model.
     """
-    if args.json:
+    if args.json or args.compact or events_enabled():
         output: dict[str, Any] = {
             "all_agreed": all_agreed,
             "round": args.round,
@@ -946,12 +1678,15 @@ def output_results(
                 {
                     "model": r.model,
                     "agreed": r.agreed,
-                    "response": r.response,
+                    "response": None
+                    if digest is not None and not r.agreed
+                    else r.response,
                     "spec": r.spec,
                     "error": r.error,
                     "input_tokens": r.input_tokens,
                     "output_tokens": r.output_tokens,
                     "cost": r.cost,
+                    "cached": r.cached,
                 }
                 for r in results
             ],
@@ -964,7 +1699,34 @@ def output_results(
         }
         if user_feedback:
             output["user_feedback"] = user_feedback
-        print(json.dumps(output, indent=2))
+            output["rerun_with_feedback"] = feedback_late
+        if merge_result:
+            output["merge"] = {**merge_result.to_dict(), "spec": merge_result.spec}
+        if convergence:
+            output["convergence"] = convergence
+        if digest is not None:
+            output["digest"] = [c.to_dict() for c in digest]
+        if context_packing:
+            output["context_packing"] = context_packing
+        if speculation:
+            output["speculation"] = speculation
+        if selection:
+            output["selection"] = selection
+            output["confirmation_pending"] = confirmation_pending
+        if args.compact and input_spec is not None:
+            compact_output(
+                output,
+                input_spec,
+                args.spec_format,
+                Path(args.side_files) if args.side_files else None,
+                args.diff_engine,
+            )
+        if events_enabled():
+            emit("round_completed", **output)
+        elif args.compact:
+            print(json.dumps(output, separators=COMPACT_SEPARATORS))
+        else:
+            print(json.dumps(output, indent=2))
     else:
         doc_type_name = get_doc_type_name(args.doc_type)
         print(f"\n=== Round {args.round} Results ({doc_type_name}) ===\n")
@@ -975,12 +1737,24 @@ def output_results(
                 print(f"ERROR: {r.error}")
             elif r.agreed:
                 print("[AGREE]")
+            elif digest is not None:
+                print("[CRITIQUED - see digest]")
             else:
                 print(r.response)
             print()
 
+        if digest is not None:
+            print(format_digest(digest, len(models)))
+            print()
+
         if all_agreed:
             print("=== ALL MODELS AGREE ===")
+        elif confirmation_pending:
+            print(
+                "=== ALL ASKED MODELS AGREE ===\n"
+                "Skipped models have not seen this spec; "
+                "run another round to confirm with every model."
+            )
         else:
             successful = [r for r in results if not r.error]
             agreed_models = [r.model for r in successful if r.agreed]
@@ -989,11 +1763,36 @@ def output_results(
                 print(f"Agreed: {', '.join(agreed_models)}")
             if disagreed_models:
                 print(f"Critiqued: {', '.join(disagreed_models)}")
+        if selection and selection["skipped"]:
+            print(f"Skipped (adaptive): {', '.join(selection['skipped'])}")
+
+        if merge_result:
+            print()
+            print(format_merge_report(merge_result))
+            print()
+            print(merge_result.spec)
+
+        if convergence:
+            metrics = convergence["metrics"]
+            print()
+            print(
+                f"Convergence: {metrics['change_ratio']:.1%} of lines changed, "
+                f"{metrics['sections_changed']} section(s), "
+                f"{metrics['agreement']:.0%} agreement"
+            )
+            print(
+                f"Recommendation: {convergence['recommendation']} - {convergence['reason']}"
+            )
 
         if user_feedback:
             print()
             print("=== User Feedback ===")
             print(user_feedback)
+            if feedback_late:
+                print(
+                    "\n(Arrived while this round was running; re-run the round "
+                    "with this feedback.)"
+                )
 
         if args.show_cost:
             print(cost_tracker.summary())
@@ -1016,30 +1815,9 @@ def validate_models_before_run(models: list[str], bedrock_mode: bool) -> None:
     if invalid:
         print("Error: The following models lack required API keys:", file=sys.stderr)
         for model in invalid:
-            # Determine which key is needed
-            if model.startswith("gpt-") or model.startswith("o1"):
-                print(f"  - {model} (requires OPENAI_API_KEY)", file=sys.stderr)
-            elif model.startswith("claude-"):
-                print(f"  - {model} (requires ANTHROPIC_API_KEY)", file=sys.stderr)
-            elif model.startswith("gemini/"):
-                print(f"  - {model} (requires GEMINI_API_KEY)", file=sys.stderr)
-            elif model.startswith("xai/"):
-                print(f"  - {model} (requires XAI_API_KEY)", file=sys.stderr)
-            elif model.startswith("mistral/"):
-                print(f"  - {model} (requires MISTRAL_API_KEY)", file=sys.stderr)
-            elif model.startswith("groq/"):
-                print(f"  - {model} (requires GROQ_API_KEY)", file=sys.stderr)
-            elif model.startswith("deepseek/"):
-                print(f"  - {model} (requires DEEPSEEK_API_KEY)", file=sys.stderr)
-            elif model.startswith("zhipu/"):
-                print(f"  - {model} (requires ZHIPUAI_API_KEY)", file=sys.stderr)
-            elif model.startswith("codex/"):
-                print(
-                    f"  - {model} (requires Codex CLI: npm install -g @openai/codex && codex login)",
-                    file=sys.stderr,
-                )
-            else:
-                print(f"  - {model} (unknown provider)", file=sys.stderr)
+            provider = get_provider(model)
+            requirement = provider.requirement() if provider else "unknown provider"
+            print(f"  - {model} ({requirement})", file=sys.stderr)
 
         print(
             "\nRun 'python3 debate.py providers' to see which API keys are configured.",
@@ -1048,10 +1826,15 @@ def validate_models_before_run(models: list[str], bedrock_mode: bool) -> None:
         sys.exit(2)
 
 
-def main() -> None:
-    """Entry point for the debate CLI."""
+def main(argv: Optional[list[str]] = None) -> None:
+    """Entry point for the debate CLI.
+
+    Args:
+        argv: Arguments without the program name; defaults to sys.argv[1:].
+    """
     parser = create_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    configure_events(args.events)
 
     if handle_info_command(args):
         return
@@ -1062,7 +1845,10 @@ def main() -> None:
     apply_profile(args)
     add_project_constitution_context(args)
     models = parse_models(args)
-    context = load_context_files(args.context) if args.context else None
+    context_files = read_context_files(args.context) if args.context else None
+    context = (
+        format_context([f.section() for f in context_files]) if context_files else None
+    )
     models, bedrock_mode, bedrock_region = setup_bedrock(args, models)
 
     # Validate models have required credentials
@@ -1076,9 +1862,33 @@ def main() -> None:
         handle_export_tasks(args, models)
         return
 
+    if args.telegram_async and not (args.session or args.resume):
+        # The update offset lives in the session; without it replies sent
+        # between rounds would be skipped by the next round's worker
+        print(
+            "Error: --telegram-async requires --session or --resume",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+
     spec, session_state, models = load_or_resume_session(args, models)
+    configure_shared_cache(args.shared_cache)
+    if args.auto_context:
+        context_files = add_auto_context(args, spec, context_files)
+        context = (
+            format_context([f.section() for f in context_files])
+            if context_files
+            else None
+        )
     run_critique(
-        args, spec, models, session_state, context, bedrock_mode, bedrock_region
+        args,
+        spec,
+        models,
+        session_state,
+        context,
+        bedrock_mode,
+        bedrock_region,
+        context_files=context_files,
     )
 
 
@@ -0,0 +1,546 @@
+"""Pluggable diff backends for spec comparison.
+
+Backends:
+    difflib - Python's SequenceMatcher (reference implementation)
+    myers   - Linear-space Myers diff anchored on lines unique to both sides
+    git     - ``git diff --no-index --histogram`` when git is installed
+"""
+
+from __future__ import annotations
+
+import difflib
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Optional
+
+DIFF_ENGINES = ("difflib", "myers", "git")
+DEFAULT_DIFF_ENGINE = "difflib"
+DIFF_CONTEXT_LINES = 3
+
+# Check if git is available for the git backend
+GIT_AVAILABLE = shutil.which("git") is not None
+
+WORD_RE = re.compile(r"\s+|\w+|[^\w\s]")
+
+Opcode = tuple[str, int, int, int, int]
+NO_NEWLINE_MARKER = "\\ No newline at end of file"
+
+
+def _split_lines(text: str) -> list[str]:
+    """Split text into newline-terminated lines."""
+    lines = text.splitlines(keepends=True)
+    if lines and not lines[-1].endswith("\n"):
+        lines[-1] += "\n"
+    return lines
+
+
+def _middle_snake(
+    a: list[int], a0: int, n: int, b: list[int], b0: int, m: int
+) -> tuple[int, int, int, int]:
+    """
+    Find the middle snake of the shortest edit script for a[a0:a0+n], b[b0:b0+m].
+
+    Runs the forward and reverse Myers searches simultaneously and stops when
+    they overlap, using O(n + m) space.
+
+    Returns:
+        (x, y, u, v) relative to the region: the snake runs from (x, y) to (u, v).
+    """
+    total = n + m
+    size = 2 * min(n, m) + 2
+    delta = n - m
+    forward = [0] * size
+    backward = [0] * size
+    for h in range(total // 2 + (total % 2) + 1):
+        for forward_pass in (True, False):
+            c, d = (forward, backward) if forward_pass else (backward, forward)
+            o = 1 if forward_pass else 0
+            low = -(h - 2 * max(0, h - m))
+            high = h - 2 * max(0, h - n)
+            for k in range(low, high + 1, 2):
+                if k == -h or (k != h and c[(k - 1) % size] < c[(k + 1) % size]):
+                    x = c[(k + 1) % size]
+                else:
+                    x = c[(k - 1) % size] + 1
+                y = x - k
+                start_x, start_y = x, y
+                if forward_pass:
+                    while x < n and y < m and a[a0 + x] == b[b0 + y]:
+                        x += 1
+                        y += 1
+                else:
+                    while x < n and y < m and a[a0 + n - x - 1] == b[b0 + m - y - 1]:
+                        x += 1
+                        y += 1
+                c[k % size] = x
+                z = -(k - delta)
+                if (
+                    total % 2 == o
+                    and -(h - o) <= z <= h - o
+                    and c[k % size] + d[z % size] >= n
+                ):
+                    if forward_pass:
+                        return start_x, start_y, x, y
+                    return n - x, m - y, n - start_x, m - start_y
+    raise AssertionError("middle snake not found")  # pragma: no cover
+
+
+def _myers_region(
+    a: list[int],
+    b: list[int],
+    a0: int,
+    a1: int,
+    b0: int,
+    b1: int,
+    deleted: bytearray,
+    inserted: bytearray,
+) -> None:
+    """Mark deleted/inserted lines for a region using divide-and-conquer Myers."""
+    stack = [(a0, a1, b0, b1)]
+    while stack:
+        a0, a1, b0, b1 = stack.pop()
+        while a0 < a1 and b0 < b1 and a[a0] == b[b0]:
+            a0 += 1
+            b0 += 1
+        while a0 < a1 and b0 < b1 and a[a1 - 1] == b[b1 - 1]:
+            a1 -= 1
+            b1 -= 1
+        if a0 == a1:
+            inserted[b0:b1] = b"\x01" * (b1 - b0)
+            continue
+        if b0 == b1:
+            deleted[a0:a1] = b"\x01" * (a1 - a0)
+            continue
+        # After trimming, both sides are non-empty and differ, so the edit
+        # distance is at least 2 and both halves are strictly smaller.
+        x, y, u, v = _middle_snake(a, a0, a1 - a0, b, b0, b1 - b0)
+        stack.append((a0 + u, a1, b0 + v, b1))
+        stack.append((a0, a0 + x, b0, b0 + y))
+
+
+def _unique_anchors(
+    a: list[int], b: list[int], a0: int, a1: int, b0: int, b1: int
+) -> list[tuple[int, int]]:
+    """
+    Pair lines occurring exactly once on each side, in increasing order.
+
+    Uses patience sorting to find the longest increasing subsequence of the
+    unique pairs, which become fixed anchors for the Myers passes between them.
+    """
+    counts: dict[int, list[int]] = {}
+    for i in range(a0, a1):
+        entry = counts.get(a[i])
+        if entry is None:
+            counts[a[i]] = [1, 0, i, 0]
+        else:
+            entry[0] += 1
+    for j in range(b0, b1):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[1] += 1
+            entry[3] = j
+
+    pairs = sorted(
+        (entry[3], entry[2])
+        for entry in counts.values()
+        if entry[0] == 1 and entry[1] == 1
+    )
+    if not pairs:
+        return []
+
+    # Longest increasing subsequence of old-side positions (patience sort)
+    tails: list[int] = []
+    tail_index: list[int] = []
+    previous: list[int] = [-1] * len(pairs)
+    for index, (_, i) in enumerate(pairs):
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if tails[mid] < i:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo > 0:
+            previous[index] = tail_index[lo - 1]
+        if lo == len(tails):
+            tails.append(i)
+            tail_index.append(index)
+        else:
+            tails[lo] = i
+            tail_index[lo] = index
+
+    anchors = []
+    index = tail_index[-1]
+    while index != -1:
+        j, i = pairs[index]
+        anchors.append((i, j))
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def myers_opcodes(a_lines: list[str], b_lines: list[str]) -> list[Opcode]:
+    """
+    Compute SequenceMatcher-style opcodes with the anchored Myers algorithm.
+
+    Lines are interned to integers, lines unique to both sides are matched as
+    anchors, and linear-space Myers runs on the gaps between anchors.
+
+    Args:
+        a_lines: Previous lines.
+        b_lines: Current lines.
+
+    Returns:
+        List of (tag, i1, i2, j1, j2) tuples covering both sequences.
+    """
+    ids: dict[str, int] = {}
+    a = [ids.setdefault(line, len(ids)) for line in a_lines]
+    b = [ids.setdefault(line, len(ids)) for line in b_lines]
+    n, m = len(a), len(b)
+    deleted = bytearray(n)
+    inserted = bytearray(m)
+
+    start = 0
+    while start < n and start < m and a[start] == b[start]:
+        start += 1
+    end_a, end_b = n, m
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+
+    prev_i, prev_j = start, start
+    for i, j in _unique_anchors(a, b, start, end_a, start, end_b):
+        _myers_region(a, b, prev_i, i, prev_j, j, deleted, inserted)
+        prev_i, prev_j = i + 1, j + 1
+    _myers_region(a, b, prev_i, end_a, prev_j, end_b, deleted, inserted)
+
+    return _opcodes_from_marks(deleted, inserted)
+
+
+def _opcodes_from_marks(deleted: bytearray, inserted: bytearray) -> list[Opcode]:
+    """Convert per-line delete/insert marks into opcodes."""
+    n, m = len(deleted), len(inserted)
+    opcodes: list[Opcode] = []
+    i = j = 0
+    while i < n or j < m:
+        i1, j1 = i, j
+        while i < n and j < m and not deleted[i] and not inserted[j]:
+            i += 1
+            j += 1
+        if i > i1:
+            opcodes.append(("equal", i1, i, j1, j))
+            continue
+        while i < n and deleted[i]:
+            i += 1
+        while j < m and inserted[j]:
+            j += 1
+        if i > i1 and j > j1:
+            opcodes.append(("replace", i1, i, j1, j))
+        elif i > i1:
+            opcodes.append(("delete", i1, i, j1, j))
+        elif j > j1:
+            opcodes.append(("insert", i1, i, j1, j))
+        else:  # pragma: no cover - marks are always consistent
+            raise AssertionError("inconsistent diff marks")
+    return opcodes
+
+
+def _group_opcodes(opcodes: Sequence[Opcode], n: int) -> list[list[Opcode]]:
+    """Group opcodes into hunks with up to n lines of context (as difflib does)."""
+    codes = list(opcodes) or [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    groups: list[list[Opcode]] = []
+    group: list[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > 2 * n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        groups.append(group)
+    return groups
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a unified diff hunk range."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def word_diff(old: str, new: str) -> str:
+    """
+    Render an intra-line word diff in ``git --word-diff=plain`` style.
+
+    Args:
+        old: Previous line (without newline).
+        new: Current line (without newline).
+
+    Returns:
+        The line with removed words as ``[-...-]`` and added words as ``{+...+}``.
+    """
+    old_tokens = WORD_RE.findall(old)
+    new_tokens = WORD_RE.findall(new)
+    matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    parts = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            parts.append("".join(old_tokens[i1:i2]))
+            continue
+        if i2 > i1:
+            parts.append("[-" + "".join(old_tokens[i1:i2]) + "-]")
+        if j2 > j1:
+            parts.append("{+" + "".join(new_tokens[j1:j2]) + "+}")
+    return "".join(parts)
+
+
+def format_unified(
+    a: list[str],
+    b: list[str],
+    opcodes: Sequence[Opcode],
+    fromfile: str = "previous",
+    tofile: str = "current",
+    n: int = DIFF_CONTEXT_LINES,
+    word_level: bool = False,
+) -> str:
+    """
+    Format opcodes as a unified diff.
+
+    With ``word_level``, replaced lines are paired up and printed once with
+    intra-line word markers instead of as separate ``-``/``+`` lines.
+    """
+    out: list[str] = []
+
+    def emit(prefix: str, lines: list[str]) -> None:
+        for line in lines:
+            out.append(prefix + line)
+            if not line.endswith("\n"):
+                # Only the last line of a text can lack one (patch_diff)
+                out.append("\n" + NO_NEWLINE_MARKER + "\n")
+
+    for group in _group_opcodes(opcodes, n):
+        if not out:
+            out.append(f"--- {fromfile}\n")
+            out.append(f"+++ {tofile}\n")
+        first, last = group[0], group[-1]
+        old_range = _format_range(first[1], last[2])
+        new_range = _format_range(first[3], last[4])
+        out.append(f"@@ -{old_range} +{new_range} @@\n")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                emit(" ", a[i1:i2])
+                continue
+            if word_level and tag == "replace":
+                paired = min(i2 - i1, j2 - j1)
+                for offset in range(paired):
+                    old_line = a[i1 + offset].rstrip("\n")
+                    new_line = b[j1 + offset].rstrip("\n")
+                    out.append("~" + word_diff(old_line, new_line) + "\n")
+                emit("-", a[i1 + paired : i2])
+                emit("+", b[j1 + paired : j2])
+                continue
+            emit("-", a[i1:i2])
+            emit("+", b[j1:j2])
+    return "".join(out).rstrip("\n")
+
+
+def git_diff(previous: str, current: str, word_level: bool = False) -> str:
+    """
+    Diff two texts with ``git diff --no-index --histogram``.
+
+    Raises:
+        RuntimeError: If git is unavailable or fails.
+    """
+    if not GIT_AVAILABLE:
+        raise RuntimeError("git not found in PATH")
+
+    with tempfile.TemporaryDirectory(prefix="adversarial-spec-diff-") as tmp:
+        prev_path = Path(tmp) / "previous"
+        curr_path = Path(tmp) / "current"
+        prev_path.write_text("".join(_split_lines(previous)))
+        curr_path.write_text("".join(_split_lines(current)))
+        cmd = [
+            "git",
+            "diff",
+            "--no-index",
+            "--no-color",
+            "--no-ext-diff",
+            "--histogram",
+            f"-U{DIFF_CONTEXT_LINES}",
+        ]
+        if word_level:
+            cmd.append("--word-diff=plain")
+        cmd += [str(prev_path), str(curr_path)]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise RuntimeError(f"git diff failed: {e}")
+
+    # Exit code 1 means "differences found"
+    if result.returncode not in (0, 1):
+        raise RuntimeError(f"git diff failed: {result.stderr.strip()}")
+    if not result.stdout:
+        return ""
+
+    lines = result.stdout.splitlines()
+    for index, line in enumerate(lines):
+        if line.startswith("--- "):
+            body = lines[index + 2 :]
+            return "\n".join(["--- previous", "+++ current"] + body)
+    return ""
+
+
+def generate_diff(
+    previous: str,
+    current: str,
+    engine: str = DEFAULT_DIFF_ENGINE,
+    word_level: bool = False,
+) -> str:
+    """
+    Generate a unified diff between two specs with the selected backend.
+
+    Args:
+        previous: Previous spec text.
+        current: Current spec text.
+        engine: One of DIFF_ENGINES.
+        word_level: Highlight changed words inside replaced lines.
+
+    Returns:
+        Unified diff text, or an empty string if the specs are identical.
+
+    Raises:
+        ValueError: If the engine is unknown.
+    """
+    if engine not in DIFF_ENGINES:
+        raise ValueError(
+            f"Unknown diff engine '{engine}'. Choose from: {', '.join(DIFF_ENGINES)}"
+        )
+    if previous == current:
+        return ""
+
+    if engine == "git":
+        if GIT_AVAILABLE:
+            try:
+                return git_diff(previous, current, word_level)
+            except RuntimeError as e:
+                print(f"Warning: {e}. Falling back to myers.", file=sys.stderr)
+        else:
+            print(
+                "Warning: git not found. Falling back to myers diff engine.",
+                file=sys.stderr,
+            )
+        engine = "myers"
+
+    a = _split_lines(previous)
+    b = _split_lines(current)
+    opcodes: Sequence[Opcode]
+    if engine == "myers":
+        opcodes = myers_opcodes(a, b)
+    else:
+        opcodes = difflib.SequenceMatcher(None, a, b).get_opcodes()
+    return format_unified(a, b, opcodes, word_level=word_level)
+
+
+def patch_diff(previous: str, current: str, engine: str = DEFAULT_DIFF_ENGINE) -> str:
+    """
+    Unified diff that ``patch`` and ``git apply`` reproduce current from.
+
+    Unlike generate_diff, the text ends with a newline and a missing final
+    newline on either side is kept and flagged with NO_NEWLINE_MARKER. The
+    git engine is served by myers, whose output has the same shape.
+
+    Returns:
+        Patch text, or an empty string if the texts are identical.
+    """
+    if engine not in DIFF_ENGINES:
+        raise ValueError(
+            f"Unknown diff engine '{engine}'. Choose from: {', '.join(DIFF_ENGINES)}"
+        )
+    if previous == current:
+        return ""
+    a = previous.splitlines(keepends=True)
+    b = current.splitlines(keepends=True)
+    opcodes: Sequence[Opcode]
+    if engine == "difflib":
+        opcodes = difflib.SequenceMatcher(None, a, b).get_opcodes()
+    else:
+        opcodes = myers_opcodes(a, b)
+    # Every diff line starts with a prefix, so rstrip only took the final newline
+    return format_unified(a, b, opcodes) + "\n"
+
+
+def available_engines() -> list[str]:
+    """List diff engines usable in this environment."""
+    return [e for e in DIFF_ENGINES if e != "git" or GIT_AVAILABLE]
+
+
+def benchmark_engines(
+    previous: str,
+    current: str,
+    engines: Optional[list[str]] = None,
+    repeat: int = 3,
+) -> list[dict]:
+    """
+    Time each diff backend on the same pair of specs.
+
+    Args:
+        previous: Previous spec text.
+        current: Current spec text.
+        engines: Engines to compare (default: all available).
+        repeat: Runs per engine; the best time is reported.
+
+    Returns:
+        One dict per engine with best/mean seconds and diff size in lines.
+    """
+    rows = []
+    for engine in engines or available_engines():
+        timings = []
+        diff = ""
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            diff = generate_diff(previous, current, engine=engine)
+            timings.append(time.perf_counter() - started)
+        rows.append(
+            {
+                "engine": engine,
+                "best_seconds": min(timings),
+                "mean_seconds": sum(timings) / len(timings),
+                "diff_lines": diff.count("\n") + 1 if diff else 0,
+            }
+        )
+    return rows
+
+
+def format_benchmark(rows: list[dict], previous: str, current: str) -> str:
+    """Render benchmark results as a table."""
+    lines = [
+        "=== Diff Engine Benchmark ===",
+        f"Input: {previous.count(chr(10)) + 1:,} -> {current.count(chr(10)) + 1:,} lines "
+        f"({len(previous):,} -> {len(current):,} bytes)",
+        "",
+        f"  {'engine':10} {'best':>10} {'mean':>10} {'diff lines':>12}",
+    ]
+    for row in rows:
+        lines.append(
+            f"  {row['engine']:10} {row['best_seconds']:>9.3f}s "
+            f"{row['mean_seconds']:>9.3f}s {row['diff_lines']:>12,}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,216 @@
+"""Cluster equivalent critique points across models into a compact digest."""
+
+from __future__ import annotations
+
+import random
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from hashlib import blake2b
+
+from convergence import TOKEN_RE
+
+DEFAULT_SIMILARITY = 0.3  # estimated Jaccard at which two points are the same
+MIN_POINT_WORDS = 4
+NUM_PERM = 64
+BAND_ROWS = 2
+POINT_SHINGLE_SIZE = 2
+EXCERPT_CHARS = 80  # member text kept in JSON output
+MERSENNE_PRIME = (1 << 61) - 1
+
+BULLET_RE = re.compile(r"^\s*(?:[-*+•]|\d+[.)])\s+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or should "
+    "that the this to was were will with".split()
+)
+
+_rng = random.Random(1)
+_PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+
+@dataclass
+class CritiqueCluster:
+    """Equivalent critique points raised by one or more models."""
+
+    point: str
+    models: list[str]
+    members: list[dict] = field(default_factory=list)  # model and full point
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON output, with each member cut to a short excerpt."""
+        return {
+            "point": self.point,
+            "models": self.models,
+            "members": [
+                {"model": m["model"], "excerpt": excerpt(m["point"])}
+                for m in self.members
+            ],
+        }
+
+
+def excerpt(text: str, limit: int = EXCERPT_CHARS) -> str:
+    """First limit characters of text, cut at a word boundary."""
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit)
+    return text[: cut if cut > 0 else limit].rstrip(" ,;:") + "…"
+
+
+def split_points(critique: str) -> list[str]:
+    """
+    Split a critique into individual points.
+
+    Bullets and numbered items start a new point, blank lines and headings end
+    one, and wrapped lines are joined to the point they continue. Code blocks
+    and very short fragments are dropped.
+    """
+    points: list[str] = []
+    current: list[str] = []
+
+    def flush() -> None:
+        text = " ".join(current).strip()
+        if len(text.split()) >= MIN_POINT_WORDS:
+            points.append(text)
+        current.clear()
+
+    in_fence = False
+    for line in critique.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            flush()
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        if not stripped or stripped.startswith("#") or stripped == "[AGREE]":
+            flush()
+            continue
+        if BULLET_RE.match(line):
+            flush()
+            stripped = BULLET_RE.sub("", line).strip()
+        current.append(stripped)
+    flush()
+    return points
+
+
+def point_shingles(text: str) -> set[str]:
+    """Word-pair shingles of a point, ignoring case and stopwords."""
+    tokens = [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+    if len(tokens) < POINT_SHINGLE_SIZE:
+        return set(tokens)
+    return {
+        " ".join(tokens[i : i + POINT_SHINGLE_SIZE])
+        for i in range(len(tokens) - POINT_SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(shingle_set: set[str]) -> tuple[int, ...]:
+    """MinHash signature of a shingle set (empty tuple for an empty set)."""
+    if not shingle_set:
+        return ()
+    hashes = [
+        int.from_bytes(blake2b(s.encode(), digest_size=8).digest(), "big")
+        for s in shingle_set
+    ]
+    return tuple(
+        min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS
+    )
+
+
+def estimate_similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    if not a or not b:
+        return 0.0
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def cluster_critiques(
+    critiques: list[tuple[str, str]], threshold: float = DEFAULT_SIMILARITY
+) -> list[CritiqueCluster]:
+    """
+    Group equivalent critique points across models.
+
+    Points are compared with MinHash signatures. Each point joins the
+    existing cluster it is most similar to on average over the cluster's
+    points, if that average reaches the threshold, or starts a new cluster.
+    Locality-sensitive banding proposes the candidate clusters, so most
+    dissimilar points are never compared. Averaging over every member rather
+    than taking the closest one keeps A~B and B~C from chaining an unrelated
+    A and C into one cluster.
+
+    Args:
+        critiques: (model, critique_text) pairs.
+        threshold: Estimated Jaccard similarity required to join two points.
+
+    Returns:
+        Clusters ranked by how many models raised them, then by size.
+    """
+    points: list[tuple[str, str]] = [
+        (model, point) for model, text in critiques for point in split_points(text)
+    ]
+    signatures = [minhash(point_shingles(point)) for _, point in points]
+
+    # Band -> clusters (keyed by first point) with a member in that band
+    buckets: dict[tuple, set[int]] = defaultdict(set)
+    members: dict[int, list[int]] = {}
+    for index, signature in enumerate(signatures):
+        bands = [
+            (start, signature[start : start + BAND_ROWS])
+            for start in range(0, NUM_PERM, BAND_ROWS)
+            if signature
+        ]
+        best, best_score = index, threshold
+        for cluster in sorted(set().union(*(buckets[band] for band in bands))):
+            score = sum(
+                estimate_similarity(signature, signatures[j]) for j in members[cluster]
+            ) / len(members[cluster])
+            if score >= best_score and (best == index or score > best_score):
+                best, best_score = cluster, score
+        members.setdefault(best, []).append(index)
+        for band in bands:
+            buckets[band].add(best)
+
+    clusters = []
+    for indexes in members.values():
+        # Representative: the point most similar to the rest of its cluster
+        best = max(
+            indexes,
+            key=lambda i: sum(
+                estimate_similarity(signatures[i], signatures[j]) for j in indexes
+            ),
+        )
+        models = list(dict.fromkeys(points[i][0] for i in indexes))
+        clusters.append(
+            (
+                indexes[0],
+                CritiqueCluster(
+                    point=points[best][1],
+                    models=models,
+                    members=[
+                        {"model": points[i][0], "point": points[i][1]} for i in indexes
+                    ],
+                ),
+            )
+        )
+
+    clusters.sort(key=lambda c: (-len(c[1].models), -len(c[1].members), c[0]))
+    return [cluster for _, cluster in clusters]
+
+
+def format_digest(clusters: list[CritiqueCluster], total_models: int) -> str:
+    """Render clusters as a de-duplicated critique digest."""
+    shared = sum(1 for c in clusters if len(c.models) > 1)
+    lines = [
+        "=== Critique Digest ===",
+        f"{len(clusters)} distinct point(s), {shared} raised by more than one model",
+        "",
+    ]
+    for cluster in clusters:
+        lines.append(
+            f"[{len(cluster.models)}/{total_models}] {cluster.point} "
+            f"({', '.join(cluster.models)})"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,58 @@
+"""Structured progress events for orchestrating agents.
+
+With ``critique --events jsonl`` each event is written to stdout as one JSON
+line as soon as it happens, instead of one JSON document after the slowest
+model finishes. An agent can start revising against the first critique
+while the other models are still running. Human-oriented progress stays on
+stderr.
+
+Every event has ``event`` (its type) and ``ts`` (Unix time) plus:
+
+    call_started        model, round
+    retry               model, round, attempt, max_attempts, error, delay
+    call_completed      model, round, agreed, error, response, spec,
+                        input_tokens, output_tokens, cost, latency, cached
+    checkpoint_saved    kind ("checkpoint" or "session"), round, session, path
+    feedback_received   text, late
+    round_completed     the document critique --json would print
+
+Events are emitted from the model threads, so lines from different models
+interleave; each line is written whole.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from typing import Any, Optional
+
+EVENT_FORMATS = ("jsonl",)
+
+_lock = threading.Lock()
+_format: Optional[str] = None
+
+
+def configure_events(event_format: Optional[str]) -> None:
+    """Turn event output on ("jsonl") or off (None) for this process."""
+    global _format
+    if event_format is not None and event_format not in EVENT_FORMATS:
+        raise ValueError(f"Unknown event format: {event_format}")
+    _format = event_format
+
+
+def events_enabled() -> bool:
+    """Whether events are written to stdout."""
+    return _format is not None
+
+
+def emit(event: str, **data: Any) -> None:
+    """Write one event line to stdout if events are enabled."""
+    if _format is None:
+        return
+    line = json.dumps({"event": event, "ts": round(time.time(), 3), **data})
+    with _lock:
+        # Resolved per call so redirected stdout (e.g. in the daemon) is used
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
@@ -0,0 +1,328 @@
+"""Three-way, section-level merge of revised specs from several models."""
+
+from __future__ import annotations
+
+import difflib
+from dataclasses import dataclass, field
+from typing import Optional
+
+from spec_doc import (
+    KEY_SEPARATOR,
+    PREAMBLE_KEY,
+    SpecDocument,
+    SpecSection,
+    content_hash,
+)
+
+# Models that must drop a section before the merge removes it; a single
+# model omitting a section is more often truncated output than a decision
+REMOVAL_QUORUM = 2
+INPUT_VERSION = "input"
+# Body similarity at which a new heading is taken as a rename of a missing one
+RENAME_SIMILARITY = 0.6
+
+
+@dataclass
+class MergeConflict:
+    """A section that two or more models revised in different ways."""
+
+    key: str
+    chosen: str  # model whose version was kept, or INPUT_VERSION
+    models: list[str]
+    removed_by: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON output and session history."""
+        data = {"key": self.key, "chosen": self.chosen, "models": self.models}
+        if self.removed_by:
+            data["removed_by"] = self.removed_by
+        return data
+
+
+@dataclass
+class MergeResult:
+    """Outcome of merging every returned spec against the round's input."""
+
+    spec: str
+    sources: list[str]
+    applied: list[dict] = field(default_factory=list)
+    conflicts: list[MergeConflict] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        """Compact summary for session history."""
+        return {
+            "sources": self.sources,
+            "applied": len(self.applied),
+            "conflicts": len(self.conflicts),
+            "skipped": self.skipped,
+        }
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON output."""
+        return {
+            "sources": self.sources,
+            "applied": self.applied,
+            "conflicts": [c.to_dict() for c in self.conflicts],
+            "skipped": self.skipped,
+        }
+
+
+def _own_text(text: str) -> str:
+    """Section text guaranteed to end with a newline, so sections concatenate."""
+    return text if text.endswith("\n") else text + "\n"
+
+
+def _match_renames(base: SpecDocument, doc: SpecDocument) -> dict[str, str]:
+    """
+    Pair sections a revision renamed with the base sections they replace.
+
+    A new heading is a rename of a base section missing from the revision
+    when its parent was renamed and its title kept, when its body is
+    unchanged (as in spec_doc's moved detection), when its body is at least
+    RENAME_SIMILARITY alike under the same parent, or, for heading-only
+    sections, when it sits where the missing section was.
+
+    Returns:
+        Base key for each renamed section, keyed by its key in the revision.
+    """
+    base_map = base.by_key()
+    doc_keys = {s.key for s in doc.sections}
+    missing = {k: s for k, s in base_map.items() if k not in doc_keys}
+    if not missing:
+        return {}
+    by_body: dict[str, str] = {}
+    for key, section in missing.items():
+        if section.body.strip():
+            by_body.setdefault(content_hash(section.body), key)
+    base_previous = {
+        s.key: base.sections[i - 1].key if i else None
+        for i, s in enumerate(base.sections)
+    }
+
+    renames: dict[str, str] = {}
+    claimed: set[str] = set()
+    previous: Optional[str] = None
+    for section in doc.sections:
+        if section.key in base_map:
+            previous = section.key
+            continue
+        parent = renames.get(section.parent, section.parent) if section.parent else None
+        candidates = [
+            s
+            for s in missing.values()
+            if s.key not in claimed and s.level == section.level and s.parent == parent
+        ]
+        old_key: Optional[str] = None
+        if parent is not None and parent != section.parent:
+            kept_title = f"{parent}{KEY_SEPARATOR}{section.title}"
+            if kept_title in missing and kept_title not in claimed:
+                old_key = kept_title
+        if old_key is None and section.body.strip():
+            old_key = by_body.get(content_hash(section.body))
+            if old_key in claimed:
+                old_key = None
+            if old_key is None:
+                scored = [
+                    (difflib.SequenceMatcher(None, s.body, section.body).ratio(), s.key)
+                    for s in candidates
+                    if s.body.strip()
+                ]
+                if scored and max(scored)[0] >= RENAME_SIMILARITY:
+                    old_key = max(scored)[1]
+        elif old_key is None:
+            old_key = next(
+                (
+                    s.key
+                    for s in candidates
+                    if not s.body.strip() and base_previous[s.key] == previous
+                ),
+                None,
+            )
+        if old_key is not None:
+            renames[section.key] = old_key
+            claimed.add(old_key)
+        previous = old_key or section.key
+    return renames
+
+
+def _merged_order(base: SpecDocument, revisions: list[list[str]]) -> list[str]:
+    """
+    Order section keys: base order first, then each revision's new sections.
+
+    Revisions are given as their section keys, renamed sections already
+    mapped to their base keys. A section added by a revision is placed right
+    after the closest preceding section (in that revision) that is already
+    in the merged order.
+    """
+    order = [s.key for s in base.sections]
+    known = set(order)
+    for keys in revisions:
+        anchor: Optional[str] = None
+        for key in keys:
+            if key in known:
+                anchor = key
+                continue
+            position = order.index(anchor) + 1 if anchor is not None else 0
+            if anchor is None and order and order[0] == PREAMBLE_KEY:
+                position = 1
+            order.insert(position, key)
+            known.add(key)
+            anchor = key
+    return order
+
+
+def merge_specs(base: str, revisions: list[tuple[str, str]]) -> MergeResult:
+    """
+    Merge revised specs from several models against the round's input spec.
+
+    Each Markdown section is merged independently. A section edited or
+    added by one model, or changed identically by several, is applied
+    automatically. A section that models changed in different ways is a
+    conflict: the first model's version (in the given order) is kept and the
+    conflict is listed with attribution so the reviewer can resolve it.
+    Removing a section takes REMOVAL_QUORUM models; a removal by fewer is a
+    conflict and the input's version is kept. A renamed heading is an edit
+    of the section it replaces, not a removal plus an addition, so renaming
+    a parent keeps its subtree in place.
+
+    Revisions that share no section with a multi-section base are complete
+    rewrites that cannot be merged section by section; they are skipped.
+
+    Args:
+        base: The spec that was sent to the models this round.
+        revisions: (model, revised_spec) pairs in priority order.
+
+    Returns:
+        The merged spec with applied edits, conflicts, and skipped models.
+    """
+    base_doc = SpecDocument.parse(base)
+    base_map = base_doc.by_key()
+
+    # (model, sections keyed by base key where renamed)
+    docs: list[tuple[str, dict[str, SpecSection]]] = []
+    skipped: list[str] = []
+    for model, text in revisions:
+        doc = SpecDocument.parse(text)
+        renames = _match_renames(base_doc, doc)
+        sections = {renames.get(s.key, s.key): s for s in doc.sections}
+        # A heading-only section matched by position alone says nothing
+        # about whether the rest of the document was kept
+        shared = [
+            s
+            for s in doc.sections
+            if s.key in base_map
+            or (s.key in renames and (s.body.strip() or s.parent in renames))
+        ]
+        if len(base_doc.sections) > 1 and not shared:
+            skipped.append(model)
+            continue
+        docs.append((model, sections))
+
+    result = MergeResult(spec=base, sources=[m for m, _ in docs], skipped=skipped)
+    if not docs:
+        return result
+
+    pieces: list[str] = []
+    for key in _merged_order(base_doc, [list(sections) for _, sections in docs]):
+        base_section = base_map.get(key)
+        base_digest = base_section.digest if base_section else None
+
+        # Distinct proposals for this section, keyed by content hash
+        proposals: dict[Optional[str], tuple[Optional[str], list[str]]] = {}
+        new_keys: dict[Optional[str], str] = {}
+        for model, sections in docs:
+            section = sections.get(key)
+            if section is None and base_section is None:
+                continue  # section added by someone else; this model is silent
+            digest = section.digest if section else None
+            if digest == base_digest:
+                continue
+            section_text = section.text if section else None
+            proposals.setdefault(digest, (section_text, []))[1].append(model)
+            if section is not None and section.key != key:
+                new_keys[digest] = section.key
+
+        if not proposals:
+            if base_section is not None:
+                pieces.append(_own_text(base_section.text))
+            continue
+
+        removers = proposals[None][1] if None in proposals else []
+        if (
+            base_section is not None
+            and len(proposals) == 1
+            and 0 < len(removers) < REMOVAL_QUORUM
+        ):
+            result.conflicts.append(
+                MergeConflict(
+                    key=key,
+                    chosen=INPUT_VERSION,
+                    models=removers,
+                    removed_by=removers,
+                )
+            )
+            pieces.append(_own_text(base_section.text))
+            continue
+
+        # On conflict prefer keeping content over deleting it
+        chosen_digest, (chosen_text, chosen_models) = next(
+            (item for item in proposals.items() if item[1][0] is not None),
+            next(iter(proposals.items())),
+        )
+        kind = "added" if base_section is None else "edited"
+        if chosen_text is None:
+            kind = "removed"
+        elif chosen_digest in new_keys:
+            kind = "renamed"
+
+        if len(proposals) > 1:
+            models = [m for _, ms in proposals.values() for m in ms]
+            result.conflicts.append(
+                MergeConflict(
+                    key=key,
+                    chosen=chosen_models[0],
+                    models=models,
+                    removed_by=removers,
+                )
+            )
+        else:
+            change = {"key": key, "kind": kind, "models": chosen_models}
+            if kind == "renamed":
+                change["new_key"] = new_keys[chosen_digest]
+            result.applied.append(change)
+
+        if chosen_text is not None:
+            pieces.append(_own_text(chosen_text))
+
+    if result.applied or result.conflicts:
+        result.spec = "".join(pieces)
+    return result
+
+
+def format_merge_report(result: MergeResult) -> str:
+    """Render a merge result as a short human-readable report."""
+    lines = [
+        "=== Merged Spec ===",
+        f"Sources: {', '.join(result.sources) if result.sources else '(none)'}",
+        f"Applied {len(result.applied)} section change(s), "
+        f"{len(result.conflicts)} conflict(s)",
+    ]
+    for change in result.applied:
+        key = change["key"]
+        if "new_key" in change:
+            key += f" -> {change['new_key']}"
+        lines.append(f"  {change['kind']:7} {key} ({', '.join(change['models'])})")
+    for conflict in result.conflicts:
+        note = (
+            f", removed by {', '.join(conflict.removed_by)}"
+            if conflict.removed_by
+            else ""
+        )
+        lines.append(
+            f"  CONFLICT {conflict.key}: {', '.join(conflict.models)} "
+            f"(kept {conflict.chosen}{note})"
+        )
+    if result.skipped:
+        lines.append(f"Skipped full rewrites from: {', '.join(result.skipped)}")
+    return "\n".join(lines)
@@ -3,15 +3,15 @@
 from __future__ import annotations
 
 import concurrent.futures
-import difflib
+import functools
 import json
 import os
 import subprocess
 import sys
+import threading
 import time
-from dataclasses import dataclass, field
-from pathlib import Path
-from typing import Optional
+from dataclasses import asdict, dataclass, field, fields
+from typing import Callable, Optional
 
 os.environ["LITELLM_LOG"] = "ERROR"
 
@@ -27,22 +27,22 @@ except ImportError:
     )
     sys.exit(1)
 
-from prompts import (
-    FOCUS_AREAS,
-    PRESERVE_INTENT_PROMPT,
-    PRESS_PROMPT_TEMPLATE,
-    REVIEW_PROMPT_TEMPLATE,
-    get_doc_type_name,
-    get_system_prompt,
-)
+import diff_engine
+from context_pack import format_context, read_context_files
+from diff_engine import DEFAULT_DIFF_ENGINE
+from events import emit
+from pricing import get_max_output_tokens, get_model_info
+from prompt_library import PromptLibrary, get_library
+from prompts import get_doc_type_name
 from providers import (
     CLAUDE_CLI_AVAILABLE,
     CODEX_AVAILABLE,
     DEFAULT_CODEX_REASONING,
-    DEFAULT_COST,
     GEMINI_CLI_AVAILABLE,
-    MODEL_COSTS,
+    get_provider,
+    register_provider_call,
 )
+from response_cache import cache_key, get_shared_cache
 
 MAX_RETRIES = 3
 RETRY_BASE_DELAY = 1.0  # seconds
@@ -77,6 +77,8 @@ class ModelResponse:
     input_tokens: int = 0
     output_tokens: int = 0
     cost: float = 0.0
+    cached: bool = False  # served from the shared response cache
+    latency: float = 0.0  # seconds, including retries and cache waits
 
 
 @dataclass
@@ -88,13 +90,22 @@ class CostTracker:
     total_cost: float = 0.0
     by_model: dict = field(default_factory=dict)
 
-    def add(self, model: str, input_tokens: int, output_tokens: int) -> float:
-        """Add usage for a model call and return the cost."""
-        costs = MODEL_COSTS.get(model, DEFAULT_COST)
-        cost = (input_tokens / 1_000_000 * costs["input"]) + (
-            output_tokens / 1_000_000 * costs["output"]
-        )
+    def add(
+        self, model: str, input_tokens: int, output_tokens: int, cached_tokens: int = 0
+    ) -> float:
+        """Add usage for a model call and return the cost.
+
+        cached_tokens is the part of input_tokens served from the provider's
+        prompt cache, billed at the model's cached-input rate.
+        """
+        cost = get_model_info(model).cost(input_tokens, output_tokens, cached_tokens)
+        self.credit(model, input_tokens, output_tokens, cost)
+        return cost
 
+    def credit(
+        self, model: str, input_tokens: int, output_tokens: int, cost: float
+    ) -> None:
+        """Add usage whose cost is already known, e.g. paid by another process."""
         self.total_input_tokens += input_tokens
         self.total_output_tokens += output_tokens
         self.total_cost += cost
@@ -105,7 +116,24 @@ class CostTracker:
         self.by_model[model]["output_tokens"] += output_tokens
         self.by_model[model]["cost"] += cost
 
-        return cost
+    def merge(self, other: CostTracker) -> None:
+        """Add another tracker's totals to this one."""
+        self.total_input_tokens += other.total_input_tokens
+        self.total_output_tokens += other.total_output_tokens
+        self.total_cost += other.total_cost
+        for model, data in other.by_model.items():
+            totals = self.by_model.setdefault(
+                model, {"input_tokens": 0, "output_tokens": 0, "cost": 0.0}
+            )
+            for key in totals:
+                totals[key] += data[key]
+
+    def reset(self) -> None:
+        """Clear all totals."""
+        self.total_input_tokens = 0
+        self.total_output_tokens = 0
+        self.total_cost = 0.0
+        self.by_model = {}
 
     def summary(self) -> str:
         """Generate cost summary string."""
@@ -132,19 +160,7 @@ def load_context_files(context_paths: list[str]) -> str:
     """Load and format context files for inclusion in prompts."""
     if not context_paths:
         return ""
-
-    sections = []
-    for path in context_paths:
-        try:
-            content = Path(path).read_text()
-            sections.append(f"### Context: {path}\n```\n{content}\n```")
-        except Exception as e:
-            sections.append(f"### Context: {path}\n[Error loading file: {e}]")
-
-    return (
-        "## Additional Context\nThe following documents are provided as context:\n\n"
-        + "\n\n".join(sections)
-    )
+    return format_context([f.section() for f in read_context_files(context_paths)])
 
 
 def build_constitution_section(context: str) -> str:
@@ -164,6 +180,132 @@ def build_constitution_section(context: str) -> str:
     )
 
 
+def build_focus_section(
+    focus: Optional[str],
+    preserve_intent: bool,
+    library: Optional[PromptLibrary] = None,
+) -> str:
+    """Focus instructions for the user message, including preserve-intent rules."""
+    library = library or get_library()
+    focus_section = ""
+    if focus and focus.lower() in library.focus_areas:
+        focus_section = library.focus_areas[focus.lower()]
+    elif focus:
+        focus_section = f"**CRITICAL FOCUS: {focus.upper()}**\nPrioritize analysis of {focus} concerns above all else."
+
+    if preserve_intent:
+        focus_section = library.templates["preserve-intent"] + "\n\n" + focus_section
+    return focus_section
+
+
+_ROUND_FIELDS = ("round", "spec", "context_section", "constitution_section")
+
+
+def _escape_braces(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    """System prompt and user template with the per-debate parts filled in.
+
+    template still contains {round}, {spec}, {context_section} and
+    {constitution_section}.
+    """
+
+    system_prompt: str
+    template: str
+
+    def render(self, round_num: int, spec: str, context: str) -> str:
+        """Fill in the per-round parts of the user message."""
+        return self.template.format(
+            round=round_num,
+            spec=spec,
+            context_section=context,
+            constitution_section=build_constitution_section(context),
+        )
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_prompt(
+    library: PromptLibrary,
+    doc_type: str,
+    persona: Optional[str],
+    focus: Optional[str],
+    preserve_intent: bool,
+    press: bool,
+) -> CompiledPrompt:
+    template = library.templates["press" if press else "review"]
+    focus_section = build_focus_section(focus, preserve_intent, library)
+    # Per-round fields are filled later; mark them with sentinels so every
+    # other brace, including a template's own {{ }} escapes, can be escaped
+    # again for the second format pass.
+    markers = {name: f"\x00{name}\x00" for name in _ROUND_FIELDS}
+    template = _escape_braces(
+        template.format(
+            doc_type_name=get_doc_type_name(doc_type),
+            focus_section=focus_section,
+            **markers,
+        )
+    )
+    for name, marker in markers.items():
+        template = template.replace(marker, "{" + name + "}")
+    return CompiledPrompt(library.system_prompt(doc_type, persona), template)
+
+
+def compile_prompt(
+    doc_type: str,
+    persona: Optional[str],
+    focus: Optional[str],
+    preserve_intent: bool,
+    press: bool,
+) -> CompiledPrompt:
+    """
+    Resolve the system prompt and pre-fill the review template.
+
+    Cached per prompt library and (doc_type, persona, focus, preserve_intent,
+    press), so every model and round of a debate shares one system prompt
+    string. A reloaded prompt library compiles fresh prompts.
+    """
+    return _compile_prompt(
+        get_library(), doc_type, persona, focus, preserve_intent, press
+    )
+
+
+class RoundPrompts:
+    """Messages for one round, built once per distinct context.
+
+    Models that receive the same context share the same user message string
+    instead of each formatting its own copy of the spec.
+    """
+
+    def __init__(
+        self,
+        spec: str,
+        round_num: int,
+        doc_type: str,
+        press: bool = False,
+        focus: Optional[str] = None,
+        persona: Optional[str] = None,
+        preserve_intent: bool = False,
+    ):
+        self.spec = spec
+        self.round_num = round_num
+        self.compiled = compile_prompt(doc_type, persona, focus, preserve_intent, press)
+        self._messages: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def messages(self, context: Optional[str] = None) -> tuple[str, str]:
+        """Return (system_prompt, user_message) for a model's context."""
+        context = context or ""
+        with self._lock:
+            user_message = self._messages.get(context)
+            if user_message is None:
+                user_message = self.compiled.render(self.round_num, self.spec, context)
+                self._messages[context] = user_message
+        return self.compiled.system_prompt, user_message
+
+
 def detect_agreement(response: str) -> bool:
     """Check if response indicates agreement."""
     return "[AGREE]" in response
@@ -278,15 +420,16 @@ def get_critique_summary(response: str, max_length: int = 300) -> str:
     return critique
 
 
-def generate_diff(previous: str, current: str) -> str:
-    """Generate unified diff between two specs."""
-    prev_lines = previous.splitlines(keepends=True)
-    curr_lines = current.splitlines(keepends=True)
-
-    diff = difflib.unified_diff(
-        prev_lines, curr_lines, fromfile="previous", tofile="current", lineterm=""
+def generate_diff(
+    previous: str,
+    current: str,
+    engine: str = DEFAULT_DIFF_ENGINE,
+    word_level: bool = False,
+) -> str:
+    """Generate unified diff between two specs using the selected diff engine."""
+    return diff_engine.generate_diff(
+        previous, current, engine=engine, word_level=word_level
     )
-    return "".join(diff)
 
 
 def call_codex_model(
@@ -433,7 +576,8 @@ def call_claude_cli_model(
 
         if result.returncode != 0:
             error_msg = (
-                result.stderr.strip() or f"Claude CLI exited with code {result.returncode}"
+                result.stderr.strip()
+                or f"Claude CLI exited with code {result.returncode}"
             )
             raise RuntimeError(f"Claude CLI failed: {error_msg}")
 
@@ -536,247 +680,111 @@ USER REQUEST:
         raise RuntimeError("Gemini CLI not found in PATH")
 
 
-def call_single_model(
+def _codex_call(
+    system_prompt: str,
+    user_message: str,
     model: str,
-    spec: str,
-    round_num: int,
-    doc_type: str,
-    press: bool = False,
-    focus: Optional[str] = None,
-    persona: Optional[str] = None,
-    context: Optional[str] = None,
-    preserve_intent: bool = False,
-    codex_reasoning: str = DEFAULT_CODEX_REASONING,
-    codex_search: bool = False,
-    timeout: int = 600,
-    bedrock_mode: bool = False,
-    bedrock_region: Optional[str] = None,
-) -> ModelResponse:
-    """Send spec to a single model and return response with retry on failure."""
-    # Handle Bedrock routing
-    actual_model = model
-    if bedrock_mode:
-        if bedrock_region:
-            os.environ["AWS_REGION"] = bedrock_region
-        if not model.startswith("bedrock/"):
-            actual_model = f"bedrock/{model}"
-
-    system_prompt = get_system_prompt(doc_type, persona)
-    doc_type_name = get_doc_type_name(doc_type)
-
-    focus_section = ""
-    if focus and focus.lower() in FOCUS_AREAS:
-        focus_section = FOCUS_AREAS[focus.lower()]
-    elif focus:
-        focus_section = f"**CRITICAL FOCUS: {focus.upper()}**\nPrioritize analysis of {focus} concerns above all else."
-
-    if preserve_intent:
-        focus_section = PRESERVE_INTENT_PROMPT + "\n\n" + focus_section
-
-    context_section = context if context else ""
-    constitution_section = build_constitution_section(context_section)
-
-    template = PRESS_PROMPT_TEMPLATE if press else REVIEW_PROMPT_TEMPLATE
-    user_message = template.format(
-        round=round_num,
-        doc_type_name=doc_type_name,
-        spec=spec,
-        focus_section=focus_section,
-        context_section=context_section,
-        constitution_section=constitution_section,
+    timeout: int,
+    codex_reasoning: str,
+    codex_search: bool,
+) -> tuple[str, int, int]:
+    return call_codex_model(
+        system_prompt=system_prompt,
+        user_message=user_message,
+        model=model,
+        reasoning_effort=codex_reasoning,
+        timeout=timeout,
+        search=codex_search,
     )
 
-    # Route Codex CLI models to dedicated handler
-    if model.startswith("codex/"):
-        last_error = None
-        for attempt in range(MAX_RETRIES):
-            try:
-                content, input_tokens, output_tokens = call_codex_model(
-                    system_prompt=system_prompt,
-                    user_message=user_message,
-                    model=model,
-                    reasoning_effort=codex_reasoning,
-                    timeout=timeout,
-                    search=codex_search,
-                )
-                agreed = "[AGREE]" in content
-                extracted = extract_spec(content)
-
-                if not agreed and not extracted:
-                    print(
-                        f"Warning: {model} provided critique but no [SPEC] tags found. Response may be malformed.",
-                        file=sys.stderr,
-                    )
-
-                cost = cost_tracker.add(model, input_tokens, output_tokens)
-
-                return ModelResponse(
-                    model=model,
-                    response=content,
-                    agreed=agreed,
-                    spec=extracted,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    cost=cost,
-                )
-            except Exception as e:
-                last_error = str(e)
-                if attempt < MAX_RETRIES - 1:
-                    delay = RETRY_BASE_DELAY * (2**attempt)
-                    print(
-                        f"Warning: {model} failed (attempt {attempt + 1}/{MAX_RETRIES}): {last_error}. Retrying in {delay:.1f}s...",
-                        file=sys.stderr,
-                    )
-                    time.sleep(delay)
-                else:
-                    print(
-                        f"Error: {model} failed after {MAX_RETRIES} attempts: {last_error}",
-                        file=sys.stderr,
-                    )
-
-        return ModelResponse(
-            model=model, response="", agreed=False, spec=None, error=last_error
-        )
-
-    # Route Gemini CLI models to dedicated handler
-    if model.startswith("gemini-cli/"):
-        last_error = None
-        for attempt in range(MAX_RETRIES):
-            try:
-                content, input_tokens, output_tokens = call_gemini_cli_model(
-                    system_prompt=system_prompt,
-                    user_message=user_message,
-                    model=model,
-                    timeout=timeout,
-                )
-                agreed = "[AGREE]" in content
-                extracted = extract_spec(content)
-
-                if not agreed and not extracted:
-                    print(
-                        f"Warning: {model} provided critique but no [SPEC] tags found. Response may be malformed.",
-                        file=sys.stderr,
-                    )
-
-                cost = cost_tracker.add(model, input_tokens, output_tokens)
 
-                return ModelResponse(
-                    model=model,
-                    response=content,
-                    agreed=agreed,
-                    spec=extracted,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    cost=cost,
-                )
-            except Exception as e:
-                last_error = str(e)
-                if attempt < MAX_RETRIES - 1:
-                    delay = RETRY_BASE_DELAY * (2**attempt)
-                    print(
-                        f"Warning: {model} failed (attempt {attempt + 1}/{MAX_RETRIES}): {last_error}. Retrying in {delay:.1f}s...",
-                        file=sys.stderr,
-                    )
-                    time.sleep(delay)
-                else:
-                    print(
-                        f"Error: {model} failed after {MAX_RETRIES} attempts: {last_error}",
-                        file=sys.stderr,
-                    )
+def _gemini_cli_call(
+    system_prompt: str, user_message: str, model: str, timeout: int, **_: object
+) -> tuple[str, int, int]:
+    return call_gemini_cli_model(
+        system_prompt=system_prompt,
+        user_message=user_message,
+        model=model,
+        timeout=timeout,
+    )
 
-        return ModelResponse(
-            model=model, response="", agreed=False, spec=None, error=last_error
-        )
 
-    # Route Claude CLI models to dedicated handler
-    if model.startswith("claude-cli/"):
-        last_error = None
-        for attempt in range(MAX_RETRIES):
-            try:
-                content, input_tokens, output_tokens = call_claude_cli_model(
-                    system_prompt=system_prompt,
-                    user_message=user_message,
-                    model=model,
-                    timeout=timeout,
-                )
-                agreed = "[AGREE]" in content
-                extracted = extract_spec(content)
+def _claude_cli_call(
+    system_prompt: str, user_message: str, model: str, timeout: int, **_: object
+) -> tuple[str, int, int]:
+    return call_claude_cli_model(
+        system_prompt=system_prompt,
+        user_message=user_message,
+        model=model,
+        timeout=timeout,
+    )
 
-                if not agreed and not extracted:
-                    print(
-                        f"Warning: {model} provided critique but no [SPEC] tags found. Response may be malformed.",
-                        file=sys.stderr,
-                    )
 
-                cost = cost_tracker.add(model, input_tokens, output_tokens)
+register_provider_call("Codex CLI", _codex_call)
+register_provider_call("Gemini CLI", _gemini_cli_call)
+register_provider_call("Claude CLI", _claude_cli_call)
 
-                return ModelResponse(
-                    model=model,
-                    response=content,
-                    agreed=agreed,
-                    spec=extracted,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    cost=cost,
-                )
-            except Exception as e:
-                last_error = str(e)
-                if attempt < MAX_RETRIES - 1:
-                    delay = RETRY_BASE_DELAY * (2**attempt)
-                    print(
-                        f"Warning: {model} failed (attempt {attempt + 1}/{MAX_RETRIES}): {last_error}. Retrying in {delay:.1f}s...",
-                        file=sys.stderr,
-                    )
-                    time.sleep(delay)
-                else:
-                    print(
-                        f"Error: {model} failed after {MAX_RETRIES} attempts: {last_error}",
-                        file=sys.stderr,
-                    )
 
-        return ModelResponse(
-            model=model, response="", agreed=False, spec=None, error=last_error
-        )
+def _litellm_call(
+    model: str, system_prompt: str, user_message: str, timeout: int
+) -> tuple[str, int, int, int]:
+    """Call a model through litellm.
 
-    # Standard litellm path for all other providers
+    Returns:
+        (content, input_tokens, output_tokens, cached_input_tokens).
+    """
+    completion_kwargs = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message},
+        ],
+        "max_tokens": get_max_output_tokens(model),
+        "timeout": timeout,
+    }
+
+    # O-series models don't support custom temperature
+    if not is_o_series_model(model):
+        completion_kwargs["temperature"] = 0.7
+
+    response = completion(**completion_kwargs)
+    content = response.choices[0].message.content
+    usage = response.usage
+    input_tokens = usage.prompt_tokens if usage else 0
+    output_tokens = usage.completion_tokens if usage else 0
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", 0)
+    if not isinstance(cached_tokens, int):
+        cached_tokens = 0
+    return content, input_tokens, output_tokens, cached_tokens
+
+
+def _call_with_retries(
+    model: str,
+    invoke: Callable[[], tuple],
+    bedrock_mode: bool = False,
+    round_num: Optional[int] = None,
+) -> ModelResponse:
+    """Run a provider call with exponential backoff and build the response."""
     last_error = None
-    display_model = model
-
     for attempt in range(MAX_RETRIES):
         try:
-            # Build completion kwargs
-            completion_kwargs = {
-                "model": actual_model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message},
-                ],
-                "max_tokens": 100000,
-                "timeout": timeout,
-            }
-
-            # O-series models don't support custom temperature
-            if not is_o_series_model(actual_model):
-                completion_kwargs["temperature"] = 0.7
-
-            response = completion(**completion_kwargs)
-            content = response.choices[0].message.content
+            content, input_tokens, output_tokens, *cached = invoke()
             agreed = "[AGREE]" in content
             extracted = extract_spec(content)
 
             if not agreed and not extracted:
                 print(
-                    f"Warning: {display_model} provided critique but no [SPEC] tags found. Response may be malformed.",
+                    f"Warning: {model} provided critique but no [SPEC] tags found. Response may be malformed.",
                     file=sys.stderr,
                 )
 
-            input_tokens = response.usage.prompt_tokens if response.usage else 0
-            output_tokens = response.usage.completion_tokens if response.usage else 0
-
-            cost = cost_tracker.add(display_model, input_tokens, output_tokens)
+            cost = cost_tracker.add(
+                model, input_tokens, output_tokens, cached[0] if cached else 0
+            )
 
             return ModelResponse(
-                model=display_model,
+                model=model,
                 response=content,
                 agreed=agreed,
                 spec=extracted,
@@ -788,30 +796,122 @@ def call_single_model(
             last_error = str(e)
             if bedrock_mode:
                 if "AccessDeniedException" in last_error:
-                    last_error = (
-                        f"Model not enabled in your Bedrock account: {display_model}"
-                    )
+                    last_error = f"Model not enabled in your Bedrock account: {model}"
                 elif "ValidationException" in last_error:
-                    last_error = f"Invalid Bedrock model ID: {display_model}"
+                    last_error = f"Invalid Bedrock model ID: {model}"
 
             if attempt < MAX_RETRIES - 1:
                 delay = RETRY_BASE_DELAY * (2**attempt)
                 print(
-                    f"Warning: {display_model} failed (attempt {attempt + 1}/{MAX_RETRIES}): {last_error}. Retrying in {delay:.1f}s...",
+                    f"Warning: {model} failed (attempt {attempt + 1}/{MAX_RETRIES}): {last_error}. Retrying in {delay:.1f}s...",
                     file=sys.stderr,
                 )
+                emit(
+                    "retry",
+                    model=model,
+                    round=round_num,
+                    attempt=attempt + 1,
+                    max_attempts=MAX_RETRIES,
+                    error=last_error,
+                    delay=delay,
+                )
                 time.sleep(delay)
             else:
                 print(
-                    f"Error: {display_model} failed after {MAX_RETRIES} attempts: {last_error}",
+                    f"Error: {model} failed after {MAX_RETRIES} attempts: {last_error}",
                     file=sys.stderr,
                 )
 
     return ModelResponse(
-        model=display_model, response="", agreed=False, spec=None, error=last_error
+        model=model, response="", agreed=False, spec=None, error=last_error
     )
 
 
+def call_single_model(
+    model: str,
+    spec: str,
+    round_num: int,
+    doc_type: str,
+    press: bool = False,
+    focus: Optional[str] = None,
+    persona: Optional[str] = None,
+    context: Optional[str] = None,
+    preserve_intent: bool = False,
+    codex_reasoning: str = DEFAULT_CODEX_REASONING,
+    codex_search: bool = False,
+    timeout: int = 600,
+    bedrock_mode: bool = False,
+    bedrock_region: Optional[str] = None,
+    prompts: Optional[RoundPrompts] = None,
+) -> ModelResponse:
+    """Send spec to a single model and return response with retry on failure.
+
+    prompts shares message assembly across the models of a round; without it
+    the messages are built for this call alone.
+    """
+    # Handle Bedrock routing
+    actual_model = model
+    if bedrock_mode:
+        if bedrock_region:
+            os.environ["AWS_REGION"] = bedrock_region
+        if not model.startswith("bedrock/"):
+            actual_model = f"bedrock/{model}"
+
+    if prompts is None:
+        prompts = RoundPrompts(
+            spec, round_num, doc_type, press, focus, persona, preserve_intent
+        )
+    system_prompt, user_message = prompts.messages(context)
+
+    def invoke() -> ModelResponse:
+        # Providers with their own call implementation (CLI tools) bypass litellm
+        provider = get_provider(model)
+        if provider is not None and provider.call is not None:
+            call = provider.call
+            return _call_with_retries(
+                model,
+                lambda: call(
+                    system_prompt=system_prompt,
+                    user_message=user_message,
+                    model=model,
+                    timeout=timeout,
+                    codex_reasoning=codex_reasoning,
+                    codex_search=codex_search,
+                ),
+                round_num=round_num,
+            )
+
+        # Standard litellm path for all other providers
+        return _call_with_retries(
+            model,
+            lambda: _litellm_call(actual_model, system_prompt, user_message, timeout),
+            bedrock_mode=bedrock_mode,
+            round_num=round_num,
+        )
+
+    emit("call_started", model=model, round=round_num)
+    started = time.monotonic()
+    cache = get_shared_cache()
+    if cache is None:
+        response = invoke()
+    else:
+        key = cache_key(
+            actual_model, system_prompt, user_message, codex_reasoning, codex_search
+        )
+        entry, hit = cache.fetch(key, lambda: asdict(invoke()))
+        names = {f.name for f in fields(ModelResponse)}
+        response = ModelResponse(**{k: v for k, v in entry.items() if k in names})
+        if hit:
+            # Paid for by the process that made the call
+            response.model = model
+            response.input_tokens = response.output_tokens = 0
+            response.cost = 0.0
+            response.cached = True
+    response.latency = round(time.monotonic() - started, 3)
+    emit("call_completed", round=round_num, **asdict(response))
+    return response
+
+
 def call_models_parallel(
     models: list[str],
     spec: str,
@@ -827,13 +927,43 @@ def call_models_parallel(
     timeout: int = 600,
     bedrock_mode: bool = False,
     bedrock_region: Optional[str] = None,
+    contexts: Optional[dict[str, str]] = None,
+    on_result: Optional[Callable[[ModelResponse], None]] = None,
 ) -> list[ModelResponse]:
-    """Call multiple models in parallel and collect responses."""
+    """Call multiple models in parallel and collect responses.
+
+    Providers that declare max_concurrency (e.g. CLI tools that each spawn a
+    process) run at most that many calls at once. contexts maps a model to
+    the context packed for its window and takes precedence over context.
+    on_result is called with each response as soon as its model finishes.
+    """
+    limits: dict[str, threading.BoundedSemaphore] = {}
+    for model in models:
+        provider = get_provider(model)
+        if provider is not None and provider.max_concurrency:
+            limits.setdefault(
+                provider.name, threading.BoundedSemaphore(provider.max_concurrency)
+            )
+
+    prompts = RoundPrompts(
+        spec, round_num, doc_type, press, focus, persona, preserve_intent
+    )
+
+    call = functools.partial(call_single_model, prompts=prompts)
+
+    def limited(model: str, *args) -> ModelResponse:
+        provider = get_provider(model)
+        limit = limits.get(provider.name) if provider is not None else None
+        if limit is None:
+            return call(model, *args)
+        with limit:
+            return call(model, *args)
+
     results = []
     with concurrent.futures.ThreadPoolExecutor(max_workers=len(models)) as executor:
         future_to_model = {
             executor.submit(
-                call_single_model,
+                limited,
                 model,
                 spec,
                 round_num,
@@ -841,7 +971,7 @@ def call_models_parallel(
                 press,
                 focus,
                 persona,
-                context,
+                contexts.get(model, context) if contexts else context,
                 preserve_intent,
                 codex_reasoning,
                 codex_search,
@@ -852,5 +982,8 @@ def call_models_parallel(
             for model in models
         }
         for future in concurrent.futures.as_completed(future_to_model):
-            results.append(future.result())
+            result = future.result()
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
     return results
@@ -0,0 +1,232 @@
+"""Model pricing and capability lookup.
+
+Prices and limits are resolved in this order, first match winning:
+
+1. Per-model overrides in the ``pricing`` section of config.json, e.g.
+   ``{"pricing": {"my-model": {"input": 1.0, "context_window": 32000}}}``
+2. litellm's bundled ``model_cost`` map, normalized and cached on disk
+3. The hand-maintained ``MODEL_COSTS`` table in providers.py
+4. The provider's default cost, then ``DEFAULT_COST``
+
+Subscription CLI models are never priced from litellm, only their limits
+are taken from it. All prices are USD per 1M tokens.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from dataclasses import dataclass, fields, replace
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Optional
+
+from providers import DEFAULT_COST, MODEL_COSTS, get_pricing_overrides, get_provider
+
+PRICING_CACHE_PATH = (
+    Path.home() / ".config" / "adversarial-spec" / "cache" / "pricing.json"
+)
+CACHE_FORMAT = 1
+PER_MILLION = 1_000_000
+
+# max_tokens sent when a model's output limit is unknown
+DEFAULT_MAX_OUTPUT_TOKENS = 100000
+
+
+@dataclass(frozen=True)
+class ModelInfo:
+    """Prices (USD per 1M tokens) and limits for one model."""
+
+    input: float
+    output: float
+    cached_input: Optional[float] = None
+    context_window: Optional[int] = None
+    max_output_tokens: Optional[int] = None
+    source: str = "default"
+
+    def cost(
+        self, input_tokens: int, output_tokens: int, cached_tokens: int = 0
+    ) -> float:
+        """Dollar cost of a call; cached_tokens is the cached part of input_tokens."""
+        cached_tokens = min(cached_tokens, input_tokens)
+        cached_rate = self.input if self.cached_input is None else self.cached_input
+        return (
+            (input_tokens - cached_tokens) / PER_MILLION * self.input
+            + cached_tokens / PER_MILLION * cached_rate
+            + output_tokens / PER_MILLION * self.output
+        )
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON output."""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+_OVERRIDE_FIELDS = {
+    "input": float,
+    "output": float,
+    "cached_input": float,
+    "context_window": int,
+    "max_output_tokens": int,
+}
+
+_litellm_table: Optional[dict[str, dict[str, Any]]] = None
+
+
+def _litellm_version() -> str:
+    try:
+        return metadata.version("litellm")
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+def _per_million(value: Any) -> Optional[float]:
+    if not isinstance(value, (int, float)):
+        return None
+    return round(value * PER_MILLION, 6)
+
+
+def _normalize_litellm_entry(entry: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """Convert one litellm model_cost entry to ModelInfo fields."""
+    input_cost = _per_million(entry.get("input_cost_per_token"))
+    output_cost = _per_million(entry.get("output_cost_per_token"))
+    if input_cost is None or output_cost is None:
+        return None
+    context_window = entry.get("max_input_tokens") or entry.get("max_tokens")
+    return {
+        "input": input_cost,
+        "output": output_cost,
+        "cached_input": _per_million(entry.get("cache_read_input_token_cost")),
+        "context_window": context_window if isinstance(context_window, int) else None,
+        "max_output_tokens": entry.get("max_output_tokens")
+        if isinstance(entry.get("max_output_tokens"), int)
+        else None,
+    }
+
+
+def _build_litellm_table() -> dict[str, dict[str, Any]]:
+    try:
+        import litellm
+    except ImportError:
+        return {}
+    table = {}
+    for model, entry in litellm.model_cost.items():
+        if isinstance(entry, dict) and (info := _normalize_litellm_entry(entry)):
+            table[model] = info
+    return table
+
+
+def load_litellm_table() -> dict[str, dict[str, Any]]:
+    """
+    Return litellm's pricing table normalized to per-1M prices.
+
+    The normalized table is cached in PRICING_CACHE_PATH and rebuilt when the
+    installed litellm version changes, so later processes skip walking the
+    full litellm map.
+    """
+    global _litellm_table
+    if _litellm_table is not None:
+        return _litellm_table
+
+    version = _litellm_version()
+    try:
+        cached = json.loads(PRICING_CACHE_PATH.read_text())
+        if (
+            cached.get("format") == CACHE_FORMAT
+            and cached.get("litellm_version") == version
+        ):
+            _litellm_table = cached["models"]
+            return _litellm_table
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    _litellm_table = _build_litellm_table()
+    payload = {
+        "format": CACHE_FORMAT,
+        "litellm_version": version,
+        "models": _litellm_table,
+    }
+    try:
+        PRICING_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = PRICING_CACHE_PATH.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload))
+        os.replace(tmp_path, PRICING_CACHE_PATH)
+    except OSError:
+        pass  # caching is best-effort
+    return _litellm_table
+
+
+def clear_pricing_cache() -> None:
+    """Forget the in-process table so the next lookup reloads it."""
+    global _litellm_table
+    _litellm_table = None
+
+
+def _lookup_litellm(model: str) -> Optional[dict[str, Any]]:
+    table = load_litellm_table()
+    if model in table:
+        return table[model]
+    # litellm keys some models without their provider prefix
+    if "/" in model:
+        return table.get(model.split("/", 1)[1])
+    return None
+
+
+def _apply_overrides(info: ModelInfo, overrides: dict[str, Any]) -> ModelInfo:
+    changes: dict[str, Any] = {}
+    for key, convert in _OVERRIDE_FIELDS.items():
+        if key in overrides:
+            try:
+                changes[key] = convert(overrides[key])
+            except (TypeError, ValueError):
+                print(
+                    f"Warning: Ignoring invalid pricing override {key}={overrides[key]!r}",
+                    file=sys.stderr,
+                )
+    if not changes:
+        return info
+    return replace(info, source="override", **changes)
+
+
+def get_model_info(model: str) -> ModelInfo:
+    """
+    Resolve prices and limits for a model.
+
+    Args:
+        model: Model identifier as passed to --models.
+
+    Returns:
+        ModelInfo with the source layer the prices came from.
+    """
+    provider = get_provider(model)
+    entry = _lookup_litellm(model)
+    info = ModelInfo(**entry, source="litellm") if entry is not None else None
+
+    if provider is not None and provider.is_cli:
+        # Subscription CLIs are not billed per token; keep only litellm's limits
+        costs = MODEL_COSTS.get(model) or provider.default_cost or DEFAULT_COST
+        info = ModelInfo(
+            costs["input"],
+            costs["output"],
+            context_window=info.context_window if info else None,
+            max_output_tokens=info.max_output_tokens if info else None,
+            source="builtin",
+        )
+    elif info is None:
+        if model in MODEL_COSTS:
+            costs, source = MODEL_COSTS[model], "builtin"
+        elif provider is not None and provider.default_cost is not None:
+            costs, source = provider.default_cost, "provider"
+        else:
+            costs, source = DEFAULT_COST, "default"
+        info = ModelInfo(costs["input"], costs["output"], source=source)
+
+    overrides = get_pricing_overrides().get(model)
+    if isinstance(overrides, dict):
+        info = _apply_overrides(info, overrides)
+    return info
+
+
+def get_max_output_tokens(model: str) -> int:
+    """max_tokens to request: the model's output limit, or the legacy default."""
+    return get_model_info(model).max_output_tokens or DEFAULT_MAX_OUTPUT_TOKENS
@@ -0,0 +1,237 @@
+"""Prompt library: built-in prompts merged with user prompt files.
+
+Focus areas, personas, system prompts and templates can be added or
+overridden without editing the package by dropping Markdown files into
+``~/.config/adversarial-spec/prompts``:
+
+    prompts/
+      focus/<name>.md       focus area for --focus <name>
+      personas/<name>.md    system prompt for --persona <name>
+      system/<type>.md      system prompt for prd, tech or generic
+      templates/<name>.md   review, press, export-tasks or preserve-intent
+
+Files are validated when the library is loaded; an invalid file is reported
+on stderr and the built-in prompt is kept. The loaded library is cached and
+reloaded when a file in the directory is added, removed or modified, checked
+at most every RELOAD_CHECK_INTERVAL seconds, so long-running processes pick
+up edits without a restart.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import string
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from prompts import (
+    EXPORT_TASKS_PROMPT,
+    FOCUS_AREAS,
+    PERSONAS,
+    PRESERVE_INTENT_PROMPT,
+    PRESS_PROMPT_TEMPLATE,
+    REVIEW_PROMPT_TEMPLATE,
+    SYSTEM_PROMPTS,
+    get_system_prompt,
+)
+
+PROMPTS_DIR = Path.home() / ".config" / "adversarial-spec" / "prompts"
+RELOAD_CHECK_INTERVAL = 2.0  # seconds between directory checks
+
+REVIEW_FIELDS = frozenset(
+    {
+        "round",
+        "doc_type_name",
+        "spec",
+        "focus_section",
+        "context_section",
+        "constitution_section",
+    }
+)
+
+# template name -> (allowed fields, required fields)
+TEMPLATE_FIELDS: dict[str, tuple[frozenset[str], frozenset[str]]] = {
+    "review": (REVIEW_FIELDS, frozenset({"spec"})),
+    "press": (REVIEW_FIELDS, frozenset({"spec"})),
+    "export-tasks": (frozenset({"doc_type_name", "spec"}), frozenset({"spec"})),
+    "preserve-intent": (frozenset(), frozenset()),
+}
+
+_NAME_RE = re.compile(r"^[a-z0-9][a-z0-9-]*$")
+
+
+@dataclass(frozen=True, eq=False)
+class PromptLibrary:
+    """Merged prompt tables. Instances are immutable and hashed by identity."""
+
+    focus_areas: dict[str, str]
+    personas: dict[str, str]
+    system_prompts: dict[str, str]
+    templates: dict[str, str]
+    custom: frozenset[str] = field(default_factory=frozenset)  # "kind/name"
+
+    def system_prompt(self, doc_type: str, persona: Optional[str] = None) -> str:
+        """System prompt for a document type and optional persona."""
+        return get_system_prompt(doc_type, persona, self.personas, self.system_prompts)
+
+    def is_custom(self, kind: str, name: str) -> bool:
+        """Whether a prompt comes from the user's prompt directory."""
+        return f"{kind}/{name}" in self.custom
+
+
+def builtin_library() -> PromptLibrary:
+    """The prompts shipped in prompts.py."""
+    return PromptLibrary(
+        focus_areas=dict(FOCUS_AREAS),
+        personas=dict(PERSONAS),
+        system_prompts=dict(SYSTEM_PROMPTS),
+        templates={
+            "review": REVIEW_PROMPT_TEMPLATE,
+            "press": PRESS_PROMPT_TEMPLATE,
+            "export-tasks": EXPORT_TASKS_PROMPT,
+            "preserve-intent": PRESERVE_INTENT_PROMPT,
+        },
+    )
+
+
+def validate_template(name: str, text: str) -> Optional[str]:
+    """
+    Check a template's placeholders.
+
+    Returns:
+        An error message, or None if the template is valid.
+    """
+    allowed, required = TEMPLATE_FIELDS[name]
+    try:
+        fields = {
+            field_name
+            for _, field_name, _, _ in string.Formatter().parse(text)
+            if field_name is not None
+        }
+    except ValueError as e:
+        return f"invalid placeholder syntax ({e})"
+    unknown = fields - allowed
+    if unknown:
+        return f"unknown placeholders {sorted(unknown)}; allowed: {sorted(allowed)}"
+    missing = required - fields
+    if missing:
+        return f"missing required placeholders {sorted(missing)}"
+    return None
+
+
+def _validate(kind: str, name: str, text: str) -> Optional[str]:
+    if not text.strip():
+        return "file is empty"
+    if not _NAME_RE.match(name):
+        return "name must be lowercase letters, digits and hyphens"
+    if kind == "system" and name not in SYSTEM_PROMPTS:
+        return f"unknown document type; expected one of {sorted(SYSTEM_PROMPTS)}"
+    if kind == "templates":
+        if name not in TEMPLATE_FIELDS:
+            return f"unknown template; expected one of {sorted(TEMPLATE_FIELDS)}"
+        return validate_template(name, text)
+    return None
+
+
+_KINDS = ("focus", "personas", "system", "templates")
+
+
+def _prompt_files(directory: Path) -> list[tuple[str, Path]]:
+    files = []
+    for kind in _KINDS:
+        try:
+            entries = sorted(os.scandir(directory / kind), key=lambda e: e.name)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        for entry in entries:
+            if entry.name.endswith(".md") and entry.is_file():
+                files.append((kind, Path(entry.path)))
+    return files
+
+
+def load_library(directory: Path) -> PromptLibrary:
+    """
+    Load the built-in prompts overlaid with the files in directory.
+
+    Invalid files are reported on stderr and skipped.
+    """
+    library = builtin_library()
+    tables = {
+        "focus": library.focus_areas,
+        "personas": library.personas,
+        "system": library.system_prompts,
+        "templates": library.templates,
+    }
+    custom = set()
+    for kind, path in _prompt_files(directory):
+        name = path.stem.lower()
+        try:
+            text = path.read_text().strip()
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Warning: Ignoring prompt file {path}: {e}", file=sys.stderr)
+            continue
+        error = _validate(kind, name, text)
+        if error:
+            print(f"Warning: Ignoring prompt file {path}: {error}", file=sys.stderr)
+            continue
+        tables[kind][name] = text
+        custom.add(f"{kind}/{name}")
+    return PromptLibrary(
+        focus_areas=library.focus_areas,
+        personas=library.personas,
+        system_prompts=library.system_prompts,
+        templates=library.templates,
+        custom=frozenset(custom),
+    )
+
+
+def _directory_signature(directory: Path) -> tuple:
+    """(path, mtime_ns, size) of every prompt file; changes on any edit."""
+    signature = []
+    for _, path in _prompt_files(directory):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+_lock = threading.Lock()
+_library: Optional[PromptLibrary] = None
+_signature: Optional[tuple] = None
+_checked_at = 0.0
+
+
+def get_library() -> PromptLibrary:
+    """
+    Return the current prompt library, reloading it if PROMPTS_DIR changed.
+
+    The directory is checked at most every RELOAD_CHECK_INTERVAL seconds; the
+    same PromptLibrary object is returned until a prompt file changes.
+    """
+    global _library, _signature, _checked_at
+    with _lock:
+        now = time.monotonic()
+        if _library is not None and now - _checked_at < RELOAD_CHECK_INTERVAL:
+            return _library
+        _checked_at = now
+        signature = _directory_signature(PROMPTS_DIR)
+        if _library is None or signature != _signature:
+            _library = load_library(PROMPTS_DIR)
+            _signature = signature
+        return _library
+
+
+def clear_library_cache() -> None:
+    """Forget the loaded library so the next call reloads it."""
+    global _library, _signature, _checked_at
+    with _lock:
+        _library = None
+        _signature = None
+        _checked_at = 0.0
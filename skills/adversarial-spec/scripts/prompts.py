@@ -289,21 +289,36 @@ Extract:
 Be thorough. Every actionable item in the spec should become a task."""
 
 
-def get_system_prompt(doc_type: str, persona: Optional[str] = None) -> str:
-    """Get the system prompt for a given document type and optional persona."""
+SYSTEM_PROMPTS = {
+    "prd": SYSTEM_PROMPT_PRD,
+    "tech": SYSTEM_PROMPT_TECH,
+    "generic": SYSTEM_PROMPT_GENERIC,
+}
+
+
+def get_system_prompt(
+    doc_type: str,
+    persona: Optional[str] = None,
+    personas: Optional[dict[str, str]] = None,
+    system_prompts: Optional[dict[str, str]] = None,
+) -> str:
+    """Get the system prompt for a given document type and optional persona.
+
+    personas and system_prompts default to the built-in prompts; the prompt
+    library passes its merged tables.
+    """
+    personas = PERSONAS if personas is None else personas
+    system_prompts = SYSTEM_PROMPTS if system_prompts is None else system_prompts
     if persona:
         persona_key = persona.lower().replace(" ", "-").replace("_", "-")
-        if persona_key in PERSONAS:
-            return PERSONAS[persona_key]
+        if persona_key in personas:
+            return personas[persona_key]
         else:
             return f"You are a {persona} participating in adversarial spec development. Review the document from your professional perspective and critique any issues you find."
 
-    if doc_type == "prd":
-        return SYSTEM_PROMPT_PRD
-    elif doc_type == "tech":
-        return SYSTEM_PROMPT_TECH
-    else:
-        return SYSTEM_PROMPT_GENERIC
+    if doc_type in ("prd", "tech"):
+        return system_prompts[doc_type]
+    return system_prompts["generic"]
 
 
 def get_doc_type_name(doc_type: str) -> str:
@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
+import copy
 import json
 import os
 import shutil
 import sys
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Optional
 
-from prompts import FOCUS_AREAS, PERSONAS
+from prompt_library import get_library
 
 PROFILES_DIR = Path.home() / ".config" / "adversarial-spec" / "profiles"
 GLOBAL_CONFIG_PATH = Path.home() / ".config" / "adversarial-spec" / "config.json"
@@ -91,33 +93,392 @@ BEDROCK_MODEL_MAP = {
 }
 
 
-def load_global_config() -> dict:
-    """Load global config from ~/.config/adversarial-spec/config.json."""
-    if not GLOBAL_CONFIG_PATH.exists():
-        return {}
+class PrefixTrie:
+    """Map string prefixes to values; lookups return the longest matching prefix."""
+
+    _END = ""  # child keys are single characters, so "" marks a stored prefix
+
+    def __init__(self) -> None:
+        self._root: dict[str, Any] = {}
+
+    def insert(self, prefix: str, value: Any) -> None:
+        """Store value under prefix, replacing any previous value."""
+        node = self._root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[self._END] = value
+
+    def remove(self, prefix: str, value: Any) -> None:
+        """Drop prefix if it still maps to value, pruning emptied nodes."""
+        path = [self._root]
+        for char in prefix:
+            child = path[-1].get(char)
+            if child is None:
+                return
+            path.append(child)
+        if path[-1].get(self._END) is not value:
+            return
+        del path[-1][self._END]
+        for i in range(len(prefix), 0, -1):
+            if path[i]:
+                break
+            del path[i - 1][prefix[i - 1]]
+
+    def longest_match(self, key: str) -> Any:
+        """Return the value of the longest stored prefix of key, or None."""
+        node = self._root
+        best = node.get(self._END)
+        for char in key:
+            child = node.get(char)
+            if child is None:
+                break
+            node = child
+            best = node.get(self._END, best)
+        return best
+
+
+@dataclass
+class Provider:
+    """
+    A model backend: how to route, authenticate, bill and call it.
+
+    API providers declare the environment variable holding their key. CLI
+    providers declare an availability check and the account they use instead.
+    Providers without a ``call`` implementation go through litellm.
+    """
+
+    name: str
+    prefixes: tuple[str, ...]
+    example_models: str
+    default_model: Optional[str] = None  # offered by get_available_providers
+    env_var: Optional[str] = None
+    cli_available: Optional[Callable[[], bool]] = None
+    account: Optional[str] = None  # auth label shown for CLI providers
+    install: Optional[str] = None
+    notes: tuple[str, ...] = ()
+    default_cost: Optional[dict[str, float]] = None  # for models not in MODEL_COSTS
+    max_concurrency: Optional[int] = None  # parallel calls per round
+    call: Optional[Callable[..., tuple[str, int, int]]] = None
+
+    @property
+    def is_cli(self) -> bool:
+        return self.cli_available is not None
+
+    def has_credentials(self) -> bool:
+        """Whether the key is set or the CLI is installed."""
+        if self.cli_available is not None:
+            return self.cli_available()
+        if self.env_var:
+            return bool(os.environ.get(self.env_var))
+        return True
+
+    def requirement(self) -> str:
+        """Describe what the provider needs, for error messages."""
+        if self.is_cli:
+            return f"requires {self.name}: {self.install}"
+        return f"requires {self.env_var}"
+
+
+FREE_COST = {"input": 0.0, "output": 0.0}
+
+# Availability flags are read at call time so they can be patched in tests
+PROVIDERS: list[Provider] = [
+    Provider(
+        "OpenAI",
+        ("gpt-", "o1"),
+        "gpt-4o, gpt-4-turbo, o1",
+        default_model="gpt-4o",
+        env_var="OPENAI_API_KEY",
+    ),
+    Provider(
+        "Anthropic",
+        ("claude-",),
+        "claude-sonnet-4-20250514, claude-opus-4-20250514",
+        default_model="claude-sonnet-4-20250514",
+        env_var="ANTHROPIC_API_KEY",
+    ),
+    Provider(
+        "Google",
+        ("gemini/",),
+        "gemini/gemini-2.0-flash, gemini/gemini-pro",
+        default_model="gemini/gemini-2.0-flash",
+        env_var="GEMINI_API_KEY",
+    ),
+    Provider(
+        "xAI",
+        ("xai/",),
+        "xai/grok-3, xai/grok-beta",
+        default_model="xai/grok-3",
+        env_var="XAI_API_KEY",
+    ),
+    Provider(
+        "Mistral",
+        ("mistral/",),
+        "mistral/mistral-large, mistral/codestral",
+        default_model="mistral/mistral-large",
+        env_var="MISTRAL_API_KEY",
+    ),
+    Provider(
+        "Groq",
+        ("groq/",),
+        "groq/llama-3.3-70b-versatile",
+        default_model="groq/llama-3.3-70b-versatile",
+        env_var="GROQ_API_KEY",
+    ),
+    Provider(
+        "Together",
+        ("together_ai/",),
+        "together_ai/meta-llama/Llama-3-70b",
+        env_var="TOGETHER_API_KEY",
+    ),
+    Provider(
+        "OpenRouter",
+        ("openrouter/",),
+        "openrouter/openai/gpt-4o, openrouter/anthropic/claude-3.5-sonnet",
+        default_model="openrouter/openai/gpt-4o",
+        env_var="OPENROUTER_API_KEY",
+    ),
+    Provider(
+        "Deepseek",
+        ("deepseek/",),
+        "deepseek/deepseek-chat",
+        default_model="deepseek/deepseek-chat",
+        env_var="DEEPSEEK_API_KEY",
+    ),
+    Provider(
+        "Zhipu",
+        ("zhipu/",),
+        "zhipu/glm-4, zhipu/glm-4-plus",
+        default_model="zhipu/glm-4",
+        env_var="ZHIPUAI_API_KEY",
+    ),
+    Provider(
+        "Codex CLI",
+        ("codex/",),
+        "codex/gpt-5.3-codex, codex/gpt-5.2-codex",
+        default_model="codex/gpt-5.3-codex",
+        cli_available=lambda: CODEX_AVAILABLE,
+        account="(ChatGPT subscription)",
+        install="npm install -g @openai/codex && codex login",
+        notes=("Reasoning: --codex-reasoning (minimal, low, medium, high, xhigh)",),
+        default_cost=FREE_COST,
+        max_concurrency=4,
+    ),
+    Provider(
+        "Claude CLI",
+        ("claude-cli/",),
+        "claude-cli/sonnet, claude-cli/opus",
+        default_model="claude-cli/sonnet",
+        cli_available=lambda: CLAUDE_CLI_AVAILABLE,
+        account="(Claude account)",
+        install="npm install -g @anthropic-ai/claude-code && claude",
+        default_cost=FREE_COST,
+        max_concurrency=4,
+    ),
+    Provider(
+        "Gemini CLI",
+        ("gemini-cli/",),
+        "gemini-cli/gemini-3-pro-preview, gemini-cli/gemini-3-flash-preview",
+        default_model="gemini-cli/gemini-3-pro-preview",
+        cli_available=lambda: GEMINI_CLI_AVAILABLE,
+        account="(Google account)",
+        install="npm install -g @google/gemini-cli && gemini auth",
+        default_cost=FREE_COST,
+        max_concurrency=4,
+    ),
+]
+
+_provider_trie = PrefixTrie()
+for _provider in PROVIDERS:
+    for _prefix in _provider.prefixes:
+        _provider_trie.insert(_prefix, _provider)
+
+
+def get_provider(model: str) -> Optional[Provider]:
+    """Return the provider whose longest prefix matches model, or None."""
+    return _provider_trie.longest_match(model)
+
+
+def register_provider(provider: Provider) -> None:
+    """Add a provider, or replace the one registered under the same name."""
+    replaced = [p for p in PROVIDERS if p.name == provider.name]
+    PROVIDERS[:] = [p for p in PROVIDERS if p.name != provider.name]
+    for old in replaced:
+        for prefix in old.prefixes:
+            _provider_trie.remove(prefix, old)
+            # Another provider may declare the same prefix
+            for other in PROVIDERS:
+                if prefix in other.prefixes:
+                    _provider_trie.insert(prefix, other)
+    PROVIDERS.append(provider)
+    for prefix in provider.prefixes:
+        _provider_trie.insert(prefix, provider)
+
+
+def register_provider_call(
+    name: str, call: Callable[..., tuple[str, int, int]]
+) -> None:
+    """
+    Attach a call implementation to a registered provider.
+
+    The implementation is called with keyword arguments system_prompt,
+    user_message, model, timeout, codex_reasoning and codex_search, and
+    returns (content, input_tokens, output_tokens).
+    """
+    for provider in PROVIDERS:
+        if provider.name == name:
+            provider.call = call
+            return
+    raise KeyError(f"Unknown provider: {name}")
+
+
+# Parsed JSON files keyed by path, valid while (mtime_ns, size) is unchanged
+_file_cache: dict[Path, tuple[tuple[int, int], Any]] = {}
+
+
+def _file_signature(path: Path) -> Optional[tuple[int, int]]:
+    """Return (mtime_ns, size) for a file, or None if it does not exist."""
     try:
-        return json.loads(GLOBAL_CONFIG_PATH.read_text())
+        stat = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load_cached(path: Path, parse: Callable[[str], Any]) -> Any:
+    """
+    Parse a file once and reuse the result until the file changes on disk.
+
+    Each call costs one stat(); the file is only re-read and re-parsed when
+    its modification time or size differs from the cached copy. Exceptions
+    raised by parse are not cached.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    signature = _file_signature(path)
+    if signature is None:
+        _file_cache.pop(path, None)
+        raise FileNotFoundError(path)
+    cached = _file_cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    value = parse(path.read_text())
+    _file_cache[path] = (signature, value)
+    return value
+
+
+def clear_config_cache() -> None:
+    """Forget all cached config and profile files."""
+    global _bedrock_index
+    _file_cache.clear()
+    _bedrock_index = None
+
+
+def _parse_global_config(text: str) -> dict:
+    try:
+        return json.loads(text)
     except json.JSONDecodeError as e:
+        # Cached like a valid parse, so the warning is printed once per edit
         print(f"Warning: Invalid JSON in global config: {e}", file=sys.stderr)
         return {}
 
 
+def _global_config() -> dict:
+    """Cached global config. Shared between callers; do not mutate."""
+    try:
+        return _load_cached(GLOBAL_CONFIG_PATH, _parse_global_config)
+    except FileNotFoundError:
+        return {}
+
+
+def load_global_config() -> dict:
+    """Load global config from ~/.config/adversarial-spec/config.json."""
+    return copy.deepcopy(_global_config())
+
+
 def save_global_config(config: dict):
     """Save global config to ~/.config/adversarial-spec/config.json."""
     GLOBAL_CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
     GLOBAL_CONFIG_PATH.write_text(json.dumps(config, indent=2))
+    _file_cache.pop(GLOBAL_CONFIG_PATH, None)
 
 
 def is_bedrock_enabled() -> bool:
     """Check if Bedrock mode is enabled in global config."""
-    config = load_global_config()
-    return config.get("bedrock", {}).get("enabled", False)
+    return get_bedrock_config().get("enabled", False)
 
 
 def get_bedrock_config() -> dict:
-    """Get Bedrock configuration from global config."""
-    config = load_global_config()
-    return config.get("bedrock", {})
+    """Get Bedrock configuration from global config.
+
+    The returned dict is shared with the config cache and must not be mutated.
+    """
+    return _global_config().get("bedrock", {})
+
+
+def get_pricing_overrides() -> dict:
+    """Get per-model pricing overrides from global config (read-only)."""
+    return _global_config().get("pricing", {})
+
+
+def _resolve_alias(
+    friendly_name: str, aliases: dict[str, str], custom_aliases: dict[str, str]
+) -> Optional[str]:
+    # If it looks like a full Bedrock ID, return as-is
+    if "." in friendly_name and not friendly_name.startswith("bedrock/"):
+        return friendly_name
+    return aliases.get(friendly_name) or custom_aliases.get(friendly_name)
+
+
+@dataclass(frozen=True)
+class BedrockIndex:
+    """Bedrock aliases and available models of one config, resolved up front."""
+
+    config: dict
+    custom_aliases: dict[str, str]
+    available: frozenset[str]
+    available_ids: frozenset[str]
+
+    def resolve(self, friendly_name: str) -> Optional[str]:
+        """Resolve a model name like resolve_bedrock_model."""
+        return _resolve_alias(friendly_name, BEDROCK_MODEL_MAP, self.custom_aliases)
+
+
+def build_bedrock_index(config: dict) -> BedrockIndex:
+    """Resolve every available model of a Bedrock config once."""
+    custom_aliases = config.get("custom_aliases", {})
+    available = config.get("available_models", [])
+    resolved = (
+        _resolve_alias(name, BEDROCK_MODEL_MAP, custom_aliases) for name in available
+    )
+    return BedrockIndex(
+        config=config,
+        custom_aliases=custom_aliases,
+        available=frozenset(available),
+        available_ids=frozenset(r for r in resolved if r),
+    )
+
+
+_bedrock_index: Optional[BedrockIndex] = None
+
+
+def get_bedrock_index(config: Optional[dict] = None) -> BedrockIndex:
+    """
+    Return the resolved Bedrock index for a config (default: global config).
+
+    The index of the cached global config is kept until config.json changes,
+    so repeated lookups against it do not re-resolve aliases.
+    """
+    global _bedrock_index
+    if config is None:
+        config = get_bedrock_config()
+    if _bedrock_index is not None and _bedrock_index.config is config:
+        return _bedrock_index
+    index = build_bedrock_index(config)
+    if config is get_bedrock_config():
+        _bedrock_index = index
+    return index
 
 
 def resolve_bedrock_model(
@@ -133,22 +494,11 @@ def resolve_bedrock_model(
 
     Returns None if not found.
     """
-    # If it looks like a full Bedrock ID, return as-is
-    if "." in friendly_name and not friendly_name.startswith("bedrock/"):
-        return friendly_name
-
-    # Check built-in map
-    if friendly_name in BEDROCK_MODEL_MAP:
-        return BEDROCK_MODEL_MAP[friendly_name]
-
-    # Check custom aliases in config
     if config is None:
         config = get_bedrock_config()
-    custom_aliases = config.get("custom_aliases", {})
-    if friendly_name in custom_aliases:
-        return custom_aliases[friendly_name]
-
-    return None
+    return _resolve_alias(
+        friendly_name, BEDROCK_MODEL_MAP, config.get("custom_aliases", {})
+    )
 
 
 def validate_bedrock_models(
@@ -157,52 +507,37 @@ def validate_bedrock_models(
     """
     Validate that requested models are available in Bedrock config.
 
+    A model is valid if it is listed in available_models, or if it resolves to
+    the same Bedrock ID as a listed model. Each check is a set lookup in the
+    precomputed BedrockIndex.
+
     Returns (valid_models, invalid_models) where valid_models are resolved to Bedrock IDs.
     """
-    if config is None:
-        config = get_bedrock_config()
-
-    available = config.get("available_models", [])
+    index = get_bedrock_index(config)
     valid = []
     invalid = []
 
     for model in models:
-        # Check if model is in available list (by friendly name or full ID)
-        if model in available:
-            resolved = resolve_bedrock_model(model, config)
-            if resolved:
-                valid.append(resolved)
-            else:
-                invalid.append(model)
+        resolved = index.resolve(model)
+        if resolved and (model in index.available or resolved in index.available_ids):
+            valid.append(resolved)
         else:
-            # Also check if it's a full Bedrock ID that matches an available friendly name
-            resolved = resolve_bedrock_model(model, config)
-            if resolved:
-                # Check if the friendly name version is available
-                for avail in available:
-                    if resolve_bedrock_model(avail, config) == resolved:
-                        valid.append(resolved)
-                        break
-                else:
-                    invalid.append(model)
-            else:
-                invalid.append(model)
+            invalid.append(model)
 
     return valid, invalid
 
 
 def load_profile(profile_name: str) -> dict:
-    """Load a saved profile by name."""
+    """Load a saved profile by name (cached until the file changes)."""
     profile_path = PROFILES_DIR / f"{profile_name}.json"
-    if not profile_path.exists():
+    try:
+        return copy.deepcopy(_load_cached(profile_path, json.loads))
+    except FileNotFoundError:
         print(
             f"Error: Profile '{profile_name}' not found at {profile_path}",
             file=sys.stderr,
         )
         sys.exit(2)
-
-    try:
-        return json.loads(profile_path.read_text())
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON in profile '{profile_name}': {e}", file=sys.stderr)
         sys.exit(2)
@@ -213,6 +548,7 @@ def save_profile(profile_name: str, config: dict):
     PROFILES_DIR.mkdir(parents=True, exist_ok=True)
     profile_path = PROFILES_DIR / f"{profile_name}.json"
     profile_path.write_text(json.dumps(config, indent=2))
+    _file_cache.pop(profile_path, None)
     print(f"Profile saved to {profile_path}")
 
 
@@ -234,7 +570,7 @@ def list_profiles():
 
     for p in sorted(profiles):
         try:
-            config = json.loads(p.read_text())
+            config = _load_cached(p, json.loads)
             name = p.stem
             models = config.get("models", "not set")
             focus = config.get("focus", "none")
@@ -279,64 +615,25 @@ def list_providers():
         )
         print("-" * 60 + "\n")
 
-    providers = [
-        ("OpenAI", "OPENAI_API_KEY", "gpt-4o, gpt-4-turbo, o1"),
-        (
-            "Anthropic",
-            "ANTHROPIC_API_KEY",
-            "claude-sonnet-4-20250514, claude-opus-4-20250514",
-        ),
-        ("Google", "GEMINI_API_KEY", "gemini/gemini-2.0-flash, gemini/gemini-pro"),
-        ("xAI", "XAI_API_KEY", "xai/grok-3, xai/grok-beta"),
-        ("Mistral", "MISTRAL_API_KEY", "mistral/mistral-large, mistral/codestral"),
-        ("Groq", "GROQ_API_KEY", "groq/llama-3.3-70b-versatile"),
-        ("Together", "TOGETHER_API_KEY", "together_ai/meta-llama/Llama-3-70b"),
-        (
-            "OpenRouter",
-            "OPENROUTER_API_KEY",
-            "openrouter/openai/gpt-4o, openrouter/anthropic/claude-3.5-sonnet",
-        ),
-        ("Deepseek", "DEEPSEEK_API_KEY", "deepseek/deepseek-chat"),
-        ("Zhipu", "ZHIPUAI_API_KEY", "zhipu/glm-4, zhipu/glm-4-plus"),
-    ]
-
     if bedrock_config.get("enabled"):
         print("Direct API Providers (inactive while Bedrock is enabled):\n")
     else:
         print("Supported providers:\n")
 
-    for name, key, models in providers:
-        status = "[set]" if os.environ.get(key) else "[not set]"
-        print(f"  {name:12} {key:24} {status}")
-        print(f"             Example models: {models}")
+    for provider in PROVIDERS:
+        if provider.is_cli:
+            status = "[installed]" if provider.has_credentials() else "[not installed]"
+            print(f"  {provider.name:12} {provider.account:24} {status}")
+        else:
+            status = "[set]" if provider.has_credentials() else "[not set]"
+            print(f"  {provider.name:12} {provider.env_var:24} {status}")
+        print(f"             Example models: {provider.example_models}")
+        for note in provider.notes:
+            print(f"             {note}")
+        if provider.install:
+            print(f"             Install: {provider.install}")
         print()
 
-    # Codex CLI (uses ChatGPT subscription, not API key)
-    codex_status = "[installed]" if CODEX_AVAILABLE else "[not installed]"
-    print(f"  {'Codex CLI':12} {'(ChatGPT subscription)':24} {codex_status}")
-    print("             Example models: codex/gpt-5.3-codex, codex/gpt-5.2-codex")
-    print(
-        "             Reasoning: --codex-reasoning (minimal, low, medium, high, xhigh)"
-    )
-    print("             Install: npm install -g @openai/codex && codex login")
-    print()
-
-    # Claude CLI (uses Claude account, not API key)
-    claude_cli_status = "[installed]" if CLAUDE_CLI_AVAILABLE else "[not installed]"
-    print(f"  {'Claude CLI':12} {'(Claude account)':24} {claude_cli_status}")
-    print("             Example models: claude-cli/sonnet, claude-cli/opus")
-    print("             Install: npm install -g @anthropic-ai/claude-code && claude")
-    print()
-
-    # Gemini CLI (uses Google account, not API key)
-    gemini_cli_status = "[installed]" if GEMINI_CLI_AVAILABLE else "[not installed]"
-    print(f"  {'Gemini CLI':12} {'(Google account)':24} {gemini_cli_status}")
-    print(
-        "             Example models: gemini-cli/gemini-3-pro-preview, gemini-cli/gemini-3-flash-preview"
-    )
-    print("             Install: npm install -g @google/gemini-cli && gemini auth")
-    print()
-
     # Show Bedrock option if not enabled
     if not bedrock_config.get("enabled"):
         print("AWS Bedrock:\n")
@@ -348,22 +645,26 @@ def list_providers():
 
 def list_focus_areas():
     """List available focus areas."""
+    library = get_library()
     print("Available focus areas (--focus):\n")
-    for name, description in FOCUS_AREAS.items():
+    for name, description in library.focus_areas.items():
         first_line = (
             description.strip().split("\n")[1]
             if "\n" in description
             else description[:60]
         )
-        print(f"  {name:15} {first_line.strip()[:60]}")
+        custom = " (custom)" if library.is_custom("focus", name) else ""
+        print(f"  {name:15} {first_line.strip()[:60]}{custom}")
     print()
 
 
 def list_personas():
     """List available personas."""
+    library = get_library()
     print("Available personas (--persona):\n")
-    for name, description in PERSONAS.items():
-        print(f"  {name}")
+    for name, description in library.personas.items():
+        custom = " (custom)" if library.is_custom("personas", name) else ""
+        print(f"  {name}{custom}")
         print(f"    {description[:80]}...")
         print()
 
@@ -376,34 +677,10 @@ def get_available_providers() -> list[tuple[str, Optional[str], str]]:
         List of (provider_name, env_var, default_model) tuples for providers with API keys set.
         Note: env_var can be None for providers like Codex CLI that use alternative auth.
     """
-    providers = [
-        ("OpenAI", "OPENAI_API_KEY", "gpt-4o"),
-        ("Anthropic", "ANTHROPIC_API_KEY", "claude-sonnet-4-20250514"),
-        ("Google", "GEMINI_API_KEY", "gemini/gemini-2.0-flash"),
-        ("xAI", "XAI_API_KEY", "xai/grok-3"),
-        ("Mistral", "MISTRAL_API_KEY", "mistral/mistral-large"),
-        ("Groq", "GROQ_API_KEY", "groq/llama-3.3-70b-versatile"),
-        ("OpenRouter", "OPENROUTER_API_KEY", "openrouter/openai/gpt-4o"),
-        ("Deepseek", "DEEPSEEK_API_KEY", "deepseek/deepseek-chat"),
-        ("Zhipu", "ZHIPUAI_API_KEY", "zhipu/glm-4"),
-    ]
-
     available: list[tuple[str, Optional[str], str]] = []
-    for name, key, model in providers:
-        if os.environ.get(key):
-            available.append((name, key, model))
-
-    # Add Codex CLI if available
-    if CODEX_AVAILABLE:
-        available.append(("Codex CLI", None, "codex/gpt-5.3-codex"))
-
-    # Add Claude CLI if available
-    if CLAUDE_CLI_AVAILABLE:
-        available.append(("Claude CLI", None, "claude-cli/sonnet"))
-
-    # Add Gemini CLI if available
-    if GEMINI_CLI_AVAILABLE:
-        available.append(("Gemini CLI", None, "gemini-cli/gemini-3-pro-preview"))
+    for provider in PROVIDERS:
+        if provider.default_model and provider.has_credentials():
+            available.append((provider.name, provider.env_var, provider.default_model))
 
     return available
 
@@ -459,60 +736,10 @@ def validate_model_credentials(models: list[str]) -> tuple[list[str], list[str]]
     valid = []
     invalid = []
 
-    provider_map = {
-        "gpt-": "OPENAI_API_KEY",
-        "o1": "OPENAI_API_KEY",
-        "claude-": "ANTHROPIC_API_KEY",
-        "gemini/": "GEMINI_API_KEY",
-        "xai/": "XAI_API_KEY",
-        "mistral/": "MISTRAL_API_KEY",
-        "groq/": "GROQ_API_KEY",
-        "deepseek/": "DEEPSEEK_API_KEY",
-        "zhipu/": "ZHIPUAI_API_KEY",
-        "codex/": None,  # Uses ChatGPT subscription, not API key
-        "claude-cli/": None,  # Uses Claude account, not API key
-        "gemini-cli/": None,  # Uses Google account, not API key
-    }
-
     for model in models:
-        # Check if it's a Codex model
-        if model.startswith("codex/"):
-            if CODEX_AVAILABLE:
-                valid.append(model)
-            else:
-                invalid.append(model)
-            continue
-
-        # Check if it's a Claude CLI model
-        if model.startswith("claude-cli/"):
-            if CLAUDE_CLI_AVAILABLE:
-                valid.append(model)
-            else:
-                invalid.append(model)
-            continue
-
-        # Check if it's a Gemini CLI model
-        if model.startswith("gemini-cli/"):
-            if GEMINI_CLI_AVAILABLE:
-                valid.append(model)
-            else:
-                invalid.append(model)
-            continue
-
-        # Find matching provider
-        required_key = None
-        for prefix, key in provider_map.items():
-            if model.startswith(prefix):
-                required_key = key
-                break
-
-        # If no provider match found, assume it needs validation later
-        if required_key is None:
-            valid.append(model)
-            continue
-
-        # Check if API key is set
-        if os.environ.get(required_key):
+        provider = get_provider(model)
+        # Unknown providers are left for litellm to validate
+        if provider is None or provider.has_credentials():
             valid.append(model)
         else:
             invalid.append(model)
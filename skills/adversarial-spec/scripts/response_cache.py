@@ -0,0 +1,174 @@
+"""Shared on-disk cache of model responses with cross-process deduplication.
+
+With ``critique --shared-cache``, every model call is keyed by a hash of the
+model, the exact system prompt and user message, and the call options. The
+first process to make a call takes an exclusive ``flock`` on the key's lock
+file; concurrent callers with the same key block on that lock and then read
+the response it wrote instead of calling the model again. Later callers
+within DEFAULT_TTL read the stored response directly.
+
+Parallel CI jobs or engineers reviewing the same spec with the same models
+therefore pay for one call per model instead of one per process. Failed
+calls are not cached, so the next caller retries upstream.
+
+Environment:
+    ADVERSARIAL_SPEC_CACHE_DIR - Cache directory (default: ~/.config/adversarial-spec/cache/responses)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: responses are shared, in-flight calls are not
+    fcntl = None  # type: ignore[assignment]
+
+DEFAULT_CACHE_DIR = Path.home() / ".config" / "adversarial-spec" / "cache" / "responses"
+DEFAULT_TTL = 24 * 3600  # seconds a stored response is served
+CACHE_FORMAT = 1
+
+
+def cache_key(*parts: Any) -> str:
+    """SHA-256 over the parts; any change in prompt or options changes it."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SharedCache:
+    """Response store shared by every process using the same directory."""
+
+    def __init__(self, directory: Path, ttl: float = DEFAULT_TTL):
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """The stored entry for key, or None if missing, expired or unreadable."""
+        try:
+            data = json.loads(self._path(key).read_text())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT:
+            return None
+        if time.time() - data.get("created", 0) > self.ttl:
+            return None
+        return data.get("entry")
+
+    def put(self, key: str, entry: dict) -> None:
+        """Store entry atomically; readers never see a partial file."""
+        path = self._path(key)
+        payload = {"format": CACHE_FORMAT, "created": time.time(), "entry": entry}
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(payload))
+            os.replace(tmp_path, path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                tmp_path.unlink()
+
+    def fetch(self, key: str, call: Callable[[], dict]) -> tuple[dict, bool]:
+        """
+        Return the cached entry for key, or make the call once across processes.
+
+        Args:
+            key: Cache key from cache_key().
+            call: Makes the upstream call; entries with an "error" are not stored.
+
+        Returns:
+            (entry, whether it came from the cache).
+        """
+        entry = self.get(key)
+        if entry is not None:
+            return entry, True
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            lock_file = open(path.with_suffix(".lock"), "a")
+        except OSError:
+            return call(), False
+
+        with lock_file:
+            if fcntl is not None:
+                # Blocks while another process makes this call; the kernel
+                # releases the lock if that process dies.
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                entry = self.get(key)
+                if entry is not None:
+                    return entry, True
+                entry = call()
+                if not entry.get("error"):
+                    self.put(key, entry)
+                return entry, False
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def prune(self) -> int:
+        """Delete expired entries and idle lock files. Returns files removed."""
+        removed = 0
+        cutoff = time.time() - self.ttl
+        for path in self.directory.glob("*/*"):
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                if path.suffix == ".lock" and fcntl is not None:
+                    with open(path, "a") as lock_file:
+                        try:
+                            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        except OSError:
+                            continue  # a call is in flight
+                        path.unlink()
+                else:
+                    path.unlink()
+                removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+_shared_cache: Optional[SharedCache] = None
+
+
+def configure_shared_cache(enabled: bool) -> Optional[SharedCache]:
+    """Turn the shared cache on or off for model calls in this process."""
+    global _shared_cache
+    if not enabled:
+        _shared_cache = None
+        return None
+    configured = os.environ.get("ADVERSARIAL_SPEC_CACHE_DIR")
+    directory = Path(configured).expanduser() if configured else DEFAULT_CACHE_DIR
+    if _shared_cache is None or _shared_cache.directory != directory:
+        _shared_cache = SharedCache(directory)
+        _shared_cache.prune()
+    return _shared_cache
+
+
+def get_shared_cache() -> Optional[SharedCache]:
+    """The active shared cache, or None when --shared-cache is off."""
+    return _shared_cache
+
+
+@contextlib.contextmanager
+def using_cache(cache: SharedCache) -> Iterator[SharedCache]:
+    """Route model calls through cache for the duration of the block."""
+    global _shared_cache
+    previous = _shared_cache
+    _shared_cache = cache
+    try:
+        yield cache
+    finally:
+        _shared_cache = previous
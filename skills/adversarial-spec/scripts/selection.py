@@ -0,0 +1,240 @@
+"""Adaptive per-round model selection from session history.
+
+Without a policy every round goes to every model, including models that
+already agreed with the spec and models whose critiques only repeat what
+the others said. ``critique --adaptive`` uses the per-model record kept in
+the session history (agreement, critique novelty, latency, cost) to choose
+the models for the next round:
+
+- Models that dissented or failed in their last round, and models with no
+  record yet, are always asked.
+- Models that agreed in their last round are skipped, except one verifier
+  that confirms the revised spec for them. The verifier is the agreeing
+  model with the most novel critiques, then the cheapest, then the fastest.
+- A dissenter whose critiques added almost nothing new in each of its last
+  LOW_VALUE_ROUNDS rounds is skipped as redundant, as long as another
+  dissenter is still asked.
+- A model skipped for REVALIDATE_AFTER rounds in a row is asked again.
+
+Rounds with --press, rounds after every asked model agreed, and rounds
+without a history send to every model. A round that skipped models never
+reports all_agreed; it reports confirmation_pending, because the skipped
+models have not seen the revised spec.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from convergence import shingles
+
+LOW_NOVELTY = 0.1  # share of critique shingles no other model raised
+LOW_VALUE_ROUNDS = 2
+REVALIDATE_AFTER = 2
+
+
+@dataclass
+class ModelStats:
+    """A model's record across the rounds of a session."""
+
+    model: str
+    rounds: int = 0
+    agreement_rate: float = 0.0
+    novelty: Optional[float] = None  # mean over rounds it critiqued
+    latency: float = 0.0  # mean seconds per call
+    cost: float = 0.0  # mean dollars per call
+    last_agreed: Optional[bool] = None  # None if it failed or never ran
+    skipped_streak: int = 0
+    recent_novelty: list[float] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON output."""
+        data = asdict(self)
+        del data["recent_novelty"]
+        for key in ("agreement_rate", "novelty", "latency", "cost"):
+            if data[key] is not None:
+                data[key] = round(data[key], 4)
+        return data
+
+
+@dataclass
+class SelectionDecision:
+    """Models chosen for a round and why the others were left out."""
+
+    selected: list[str]
+    skipped: dict[str, str]  # model -> reason
+    verifier: Optional[str] = None
+    reason: str = ""
+    stats: dict[str, ModelStats] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON output and session history."""
+        return {
+            "selected": self.selected,
+            "skipped": self.skipped,
+            "verifier": self.verifier,
+            "reason": self.reason,
+            "stats": {model: s.to_dict() for model, s in self.stats.items()},
+        }
+
+
+def critique_novelty(critiques: dict[str, str]) -> dict[str, float]:
+    """
+    Share of each critique's word shingles that no other critique contains.
+
+    Args:
+        critiques: Critique text keyed by model.
+
+    Returns:
+        Novelty from 0.0 (fully repeated by others) to 1.0, keyed by model.
+    """
+    sets = {model: shingles(text) for model, text in critiques.items()}
+    novelty = {}
+    for model, own in sets.items():
+        if not own:
+            novelty[model] = 0.0
+            continue
+        others: set[str] = set()
+        for other, other_set in sets.items():
+            if other != model:
+                others |= other_set
+        novelty[model] = round(len(own - others) / len(own), 4)
+    return novelty
+
+
+def model_stats(models: list[str], history: list[dict]) -> dict[str, ModelStats]:
+    """
+    Aggregate each model's record from session history entries.
+
+    Args:
+        models: Models configured for the debate.
+        history: Session history entries, oldest first.
+
+    Returns:
+        ModelStats keyed by model, in the order of models.
+    """
+    stats = {model: ModelStats(model) for model in models}
+    totals = {model: {"agreed": 0, "latency": 0.0, "cost": 0.0} for model in models}
+    novelty_sums: dict[str, list[float]] = {model: [] for model in models}
+    for entry in history:
+        ran = {m["model"]: m for m in entry.get("models", [])}
+        for model, s in stats.items():
+            record = ran.get(model)
+            if record is None:
+                # Only rounds that recorded a selection count as skips
+                if model in entry.get("selection", {}).get("skipped", {}):
+                    s.skipped_streak += 1
+                continue
+            s.skipped_streak = 0
+            s.rounds += 1
+            totals[model]["latency"] += record.get("latency", 0.0)
+            totals[model]["cost"] += record.get("cost", 0.0)
+            if record.get("error"):
+                s.last_agreed = None
+                continue
+            s.last_agreed = bool(record.get("agreed"))
+            if s.last_agreed:
+                totals[model]["agreed"] += 1
+            elif record.get("novelty") is not None:
+                novelty_sums[model].append(record["novelty"])
+    for model, s in stats.items():
+        if s.rounds:
+            s.agreement_rate = totals[model]["agreed"] / s.rounds
+            s.latency = totals[model]["latency"] / s.rounds
+            s.cost = totals[model]["cost"] / s.rounds
+        values = novelty_sums[model]
+        if values:
+            s.novelty = sum(values) / len(values)
+        s.recent_novelty = values[-LOW_VALUE_ROUNDS:]
+    return stats
+
+
+def select_models(
+    models: list[str], history: list[dict], press: bool = False
+) -> SelectionDecision:
+    """
+    Choose the models for the next round.
+
+    Args:
+        models: Models configured for the debate.
+        history: Session history entries, oldest first.
+        press: Whether this is an anti-laziness round, which needs every model.
+
+    Returns:
+        The decision, with per-model stats.
+    """
+    stats = model_stats(models, history)
+    if not history:
+        return SelectionDecision(
+            list(models), {}, reason="No history yet.", stats=stats
+        )
+    if press:
+        return SelectionDecision(
+            list(models), {}, reason="--press asks every model.", stats=stats
+        )
+    last = history[-1]
+    if last.get("all_agreed") or last.get("confirmation_pending"):
+        return SelectionDecision(
+            list(models),
+            {},
+            reason="All asked models agreed last round; confirming with every model.",
+            stats=stats,
+        )
+
+    skipped: dict[str, str] = {}
+    due = [m for m in models if stats[m].skipped_streak >= REVALIDATE_AFTER]
+    agreed = [m for m in models if stats[m].last_agreed and m not in due]
+    dissenters = [m for m in models if m not in agreed]
+
+    verifier = None
+    if agreed:
+        verifier = min(
+            agreed,
+            key=lambda m: (
+                -(stats[m].novelty or 0.0),
+                stats[m].cost,
+                stats[m].latency,
+            ),
+        )
+        for model in agreed:
+            if model != verifier:
+                skipped[model] = f"agreed in its last round; {verifier} verifies"
+
+    redundant = [
+        m
+        for m in dissenters
+        if m not in due
+        and stats[m].last_agreed is False
+        and len(stats[m].recent_novelty) >= LOW_VALUE_ROUNDS
+        and max(stats[m].recent_novelty) < LOW_NOVELTY
+    ]
+    if len(redundant) == len(dissenters) and redundant:
+        # Keep the most useful of them so the round still gets a critique
+        redundant.remove(max(redundant, key=lambda m: stats[m].novelty or 0.0))
+    for model in redundant:
+        skipped[model] = (
+            f"critiques repeated other models for {LOW_VALUE_ROUNDS} rounds"
+        )
+
+    selected = [m for m in models if m not in skipped]
+    if skipped:
+        reason = f"Asking {len(selected)} of {len(models)} models"
+        reason += f"; {verifier} verifies for those that agreed." if verifier else "."
+    else:
+        reason = "Every model is still contributing."
+    return SelectionDecision(
+        selected,
+        skipped,
+        verifier=verifier if skipped else None,
+        reason=reason,
+        stats=stats,
+    )
+
+
+def format_selection(decision: SelectionDecision) -> str:
+    """Human-readable summary of a selection decision for stderr."""
+    lines = [f"Adaptive selection: {decision.reason}"]
+    for model, reason in decision.skipped.items():
+        lines.append(f"  skipped {model}: {reason}")
+    return "\n".join(lines)
@@ -0,0 +1,812 @@
+"""
+HTTP job service for running debates on behalf of a team.
+
+`debate.py serve --http` runs one shared service that holds the provider
+keys. Team members submit critique and export-tasks jobs over HTTP. Jobs are
+queued and run by a pool of workers, each user has a concurrency limit and
+an optional budget, and progress is streamed as Server-Sent Events. Critique
+results are saved as sessions in the session store, so a later job (or the
+CLI's --resume) can continue the debate.
+
+Endpoints:
+    POST /jobs              Submit a job; returns 202 {"id", "status"}
+    GET  /jobs              The caller's jobs
+    GET  /jobs/<id>         Job status and result
+    GET  /jobs/<id>/events  Progress as text/event-stream
+    GET  /usage             The caller's spend, budget and running jobs
+    GET  /health            Liveness check (no auth)
+
+Job body:
+    {"type": "critique" | "export-tasks", "spec": "...", "models": [...],
+     "doc_type": "tech", "round": 1, "focus": null, "persona": null,
+     "context": null, "preserve_intent": false, "press": false,
+     "session": null, "timeout": 600}
+
+    spec may be omitted when session names an existing session; the job then
+    continues that session's spec and round, read when the job starts so
+    jobs queued on one session run consecutive rounds. Sessions are private to the
+    user: "team" submitted by alice is stored as "alice-team", and a stored
+    session created by anyone else (including the CLI) is rejected.
+
+Events:
+    queued, started, model_completed, completed, failed
+
+Users file (JSON):
+    {"users": {"alice": {"token": "...", "max_concurrent": 2, "budget": 20.0}}}
+
+    Requests authenticate with "Authorization: Bearer <token>". Without a
+    users file the service only binds to loopback and everyone is the single
+    user "local". Spend is tracked per service run.
+
+POST requests must have "Content-Type: application/json", which a web page
+cannot send to another origin without a CORS preflight the service never
+grants, so a browser cannot start paid jobs on a loopback service.
+"""
+
+from __future__ import annotations
+
+import hmac
+import json
+import re
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+from models import (
+    DEFAULT_CODEX_REASONING,
+    ModelResponse,
+    _litellm_call,
+    call_models_parallel,
+    cost_tracker,
+    extract_tasks,
+)
+from prompt_library import get_library
+from prompts import get_doc_type_name
+from providers import get_provider, validate_model_credentials
+from session import SessionState, round_history_entry
+
+DEFAULT_SERVICE_PORT = 8790
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_CONCURRENT = 2
+LOCAL_USER = "local"
+MAX_BODY_BYTES = 16 << 20
+SSE_KEEPALIVE = 15.0  # seconds between keep-alive comments on an idle stream
+
+JOB_TYPES = ("critique", "export-tasks")
+DOC_TYPES = ("prd", "tech")
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
+_SESSION_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+_LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+class JobError(ValueError):
+    """Job parameters are invalid."""
+
+
+class BudgetExceededError(RuntimeError):
+    """The user has spent their budget."""
+
+
+@dataclass
+class ServiceUser:
+    """A team member with their limits and spend in this service run."""
+
+    name: str
+    token: Optional[str] = None
+    max_concurrent: int = DEFAULT_MAX_CONCURRENT
+    budget: Optional[float] = None
+    spent: float = 0.0
+    running: int = 0
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.spent >= self.budget
+
+    def to_dict(self) -> dict:
+        return {
+            "user": self.name,
+            "max_concurrent": self.max_concurrent,
+            "budget": self.budget,
+            "spent": round(self.spent, 6),
+            "running": self.running,
+        }
+
+
+def load_users(path: Path) -> dict[str, ServiceUser]:
+    """
+    Load the users file.
+
+    Returns:
+        Users by token.
+
+    Raises:
+        ValueError: If the file is not valid JSON or an entry is malformed.
+    """
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read users file {path}: {e}")
+    entries = data.get("users") if isinstance(data, dict) else None
+    if not isinstance(entries, dict) or not entries:
+        raise ValueError(f"Users file {path} must contain a non-empty 'users' object")
+
+    users: dict[str, ServiceUser] = {}
+    for name, entry in entries.items():
+        token = entry.get("token") if isinstance(entry, dict) else None
+        if not isinstance(token, str) or not token:
+            raise ValueError(f"User '{name}' needs a token")
+        if token in users:
+            raise ValueError(f"User '{name}' reuses another user's token")
+        max_concurrent = entry.get("max_concurrent", DEFAULT_MAX_CONCURRENT)
+        budget = entry.get("budget")
+        if not isinstance(max_concurrent, int) or max_concurrent < 1:
+            raise ValueError(
+                f"User '{name}': max_concurrent must be a positive integer"
+            )
+        if budget is not None and (not isinstance(budget, (int, float)) or budget < 0):
+            raise ValueError(f"User '{name}': budget must be a non-negative number")
+        users[token] = ServiceUser(name, token, max_concurrent, budget)
+    return users
+
+
+@dataclass
+class Job:
+    """One submitted job and its progress events."""
+
+    id: str
+    user: str
+    type: str
+    params: dict
+    status: str = "queued"
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    cost: float = 0.0
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    events: list[dict] = field(default_factory=list)
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def to_dict(self, include_result: bool = True) -> dict:
+        data: dict[str, Any] = {
+            "id": self.id,
+            "user": self.user,
+            "type": self.type,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "cost": round(self.cost, 6),
+            "error": self.error,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+def _optional_str(params: dict, name: str) -> Optional[str]:
+    value = params.get(name)
+    if value is not None and not isinstance(value, str):
+        raise JobError(f"{name} must be a string")
+    return value or None
+
+
+def scoped_session_id(user: str, name: str) -> str:
+    """Session store ID for a user's session name."""
+    return f"{user}-{name}"
+
+
+def load_user_session(user: str, name: str) -> Optional[SessionState]:
+    """
+    Load a user's session, or None if it does not exist yet.
+
+    Raises:
+        JobError: If the stored session belongs to someone else or is corrupt.
+    """
+    try:
+        session = SessionState.load(scoped_session_id(user, name))
+    except FileNotFoundError:
+        return None
+    except (ValueError, TypeError, json.JSONDecodeError) as e:
+        raise JobError(f"Cannot load session '{name}': {e}")
+    if session.owner != user:
+        raise JobError(f"Session '{name}' belongs to another user")
+    return session
+
+
+def parse_job(job_type: Any, params: dict, user: str = LOCAL_USER) -> dict:
+    """
+    Validate a job body and fill in defaults.
+
+    Args:
+        job_type: Requested job type.
+        params: Job body.
+        user: Name of the submitting user; sessions are scoped to it.
+
+    Returns:
+        Normalized parameters.
+
+    Raises:
+        JobError: If the job type or a parameter is invalid.
+    """
+    if job_type not in JOB_TYPES:
+        raise JobError(f"type must be one of {list(JOB_TYPES)}")
+
+    session_id = _optional_str(params, "session")
+    if session_id and not _SESSION_RE.match(session_id):
+        raise JobError("session may only contain letters, digits, '.', '_' and '-'")
+    session = load_user_session(user, session_id) if session_id else None
+
+    spec = _optional_str(params, "spec")
+    if not (spec or (session.spec if session else "")).strip():
+        raise JobError("spec is required unless session names an existing session")
+
+    models = params.get("models", session.models if session else None)
+    if isinstance(models, str):
+        models = [m.strip() for m in models.split(",") if m.strip()]
+    if not isinstance(models, list) or not models:
+        raise JobError("models must be a non-empty list of model names")
+    if not all(isinstance(m, str) and m for m in models):
+        raise JobError("models must be a non-empty list of model names")
+    _, invalid = validate_model_credentials(models)
+    if invalid:
+        raise JobError(f"No credentials on the service for: {', '.join(invalid)}")
+
+    doc_type = params.get("doc_type", session.doc_type if session else "tech")
+    if doc_type not in DOC_TYPES:
+        raise JobError(f"doc_type must be one of {list(DOC_TYPES)}")
+
+    round_num = params.get("round")
+    if round_num is not None and (
+        not isinstance(round_num, int) or isinstance(round_num, bool) or round_num < 1
+    ):
+        raise JobError("round must be a positive integer")
+
+    focus = _optional_str(params, "focus") or (session.focus if session else None)
+    if focus and focus.lower() not in get_library().focus_areas:
+        raise JobError(f"Unknown focus area: {focus}")
+
+    timeout = params.get("timeout", 600)
+    if not isinstance(timeout, int) or isinstance(timeout, bool) or timeout < 1:
+        raise JobError("timeout must be a positive integer")
+
+    flags = {}
+    for name in ("preserve_intent", "press"):
+        value = params.get(name, False)
+        if not isinstance(value, bool):
+            raise JobError(f"{name} must be true or false")
+        flags[name] = value
+    if session is not None and session.preserve_intent:
+        flags["preserve_intent"] = True
+
+    return {
+        "spec": spec,
+        "models": models,
+        "doc_type": doc_type,
+        "round": round_num,
+        "focus": focus,
+        "persona": _optional_str(params, "persona")
+        or (session.persona if session else None),
+        "context": _optional_str(params, "context"),
+        "session": session_id,
+        "timeout": timeout,
+        **flags,
+    }
+
+
+Emit = Callable[[str, dict], None]
+
+_session_locks: dict[str, threading.Lock] = {}
+_session_locks_guard = threading.Lock()
+
+
+def _session_lock(session_id: str) -> threading.Lock:
+    with _session_locks_guard:
+        return _session_locks.setdefault(session_id, threading.Lock())
+
+
+def _result_dict(r: ModelResponse) -> dict:
+    return {
+        "model": r.model,
+        "agreed": r.agreed,
+        "response": r.response,
+        "spec": r.spec,
+        "error": r.error,
+        "input_tokens": r.input_tokens,
+        "output_tokens": r.output_tokens,
+        "cost": r.cost,
+    }
+
+
+def run_critique_job(job: Job, emit: Emit) -> dict:
+    """Run one critique round and save it to the job's session."""
+    p = job.params
+    name = p["session"] or f"job-{job.id}"
+    session_id = scoped_session_id(job.user, name)
+
+    def on_result(r: ModelResponse) -> None:
+        job.cost += r.cost
+        emit(
+            "model_completed",
+            {"model": r.model, "agreed": r.agreed, "error": r.error, "cost": r.cost},
+        )
+
+    with _session_lock(session_id):
+        # Resolved here, not at submit, so queued jobs see earlier rounds
+        session = load_user_session(job.user, name)
+        spec = p["spec"] or (session.spec if session else "")
+        round_num = p["round"] or (session.round if session else 1)
+        results = call_models_parallel(
+            p["models"],
+            spec,
+            round_num,
+            p["doc_type"],
+            p["press"],
+            p["focus"],
+            p["persona"],
+            p["context"],
+            p["preserve_intent"],
+            DEFAULT_CODEX_REASONING,
+            False,
+            p["timeout"],
+            on_result=on_result,
+        )
+        successful = [r for r in results if not r.error]
+        all_agreed = all(r.agreed for r in successful) if successful else False
+        latest_spec = next((r.spec for r in successful if r.spec), spec)
+
+        if session is None:
+            session = SessionState(
+                session_id=session_id,
+                spec=spec,
+                round=round_num,
+                doc_type=p["doc_type"],
+                models=p["models"],
+                focus=p["focus"],
+                persona=p["persona"],
+                preserve_intent=p["preserve_intent"],
+                created_at=datetime.now().isoformat(),
+                owner=job.user,
+            )
+        entry = round_history_entry(
+            round_num, spec, latest_spec, results, all_agreed, session.history
+        )
+        session.spec = latest_spec
+        session.round = round_num + 1
+        session.history.append({**entry, "job": job.id, "user": job.user})
+        session.save()
+
+    if not successful:
+        raise RuntimeError(
+            "All models failed: " + "; ".join(f"{r.model}: {r.error}" for r in results)
+        )
+    return {
+        "session": name,
+        "round": round_num,
+        "all_agreed": all_agreed,
+        "spec": latest_spec,
+        "results": [_result_dict(r) for r in results],
+        "cost": job.cost,
+    }
+
+
+def run_export_job(job: Job, emit: Emit) -> dict:
+    """Extract tasks from the spec with the job's first model."""
+    p = job.params
+    model = p["models"][0]
+    spec = p["spec"]
+    if spec is None:
+        with _session_lock(scoped_session_id(job.user, p["session"])):
+            session = load_user_session(job.user, p["session"])
+        spec = session.spec if session else ""
+    prompt = (
+        get_library()
+        .templates["export-tasks"]
+        .format(doc_type_name=get_doc_type_name(p["doc_type"]), spec=spec)
+    )
+    system_prompt = get_library().system_prompt(p["doc_type"], p["persona"])
+    provider = get_provider(model)
+    if provider is not None and provider.call is not None:
+        content, input_tokens, output_tokens, *cached = provider.call(
+            system_prompt=system_prompt,
+            user_message=prompt,
+            model=model,
+            timeout=p["timeout"],
+            codex_reasoning=DEFAULT_CODEX_REASONING,
+            codex_search=False,
+        )
+    else:
+        content, input_tokens, output_tokens, *cached = _litellm_call(
+            model, system_prompt, prompt, p["timeout"]
+        )
+    cost = cost_tracker.add(
+        model, input_tokens, output_tokens, cached[0] if cached else 0
+    )
+    job.cost += cost
+    emit("model_completed", {"model": model, "error": None, "cost": cost})
+    tasks = extract_tasks(content)
+    return {"model": model, "tasks": tasks, "cost": job.cost}
+
+
+JOB_RUNNERS: dict[str, Callable[[Job, Emit], dict]] = {
+    "critique": run_critique_job,
+    "export-tasks": run_export_job,
+}
+
+
+def run_job(job: Job, emit: Emit) -> dict:
+    """Run a job with the runner for its type."""
+    return JOB_RUNNERS[job.type](job, emit)
+
+
+class JobQueue:
+    """FIFO job queue with per-user concurrency and budget limits.
+
+    Workers take the oldest queued job whose user is below their concurrency
+    limit, so one user's backlog does not block everyone else's jobs. Budgets
+    are checked when a job is submitted and again when it starts; a running
+    job is never interrupted, so a user can overshoot by one round.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[Job, Emit], dict] = run_job,
+        workers: int = DEFAULT_WORKERS,
+    ):
+        self.runner = runner
+        self.workers = workers
+        self._cond = threading.Condition()
+        self._jobs: dict[str, Job] = {}
+        self._queue: list[Job] = []
+        self._users: dict[str, ServiceUser] = {}
+        self._threads: list[threading.Thread] = []
+        self._stopping = False
+
+    def start(self) -> None:
+        """Start the worker threads."""
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f"job-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop taking jobs and wait for idle workers to exit."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def submit(self, user: ServiceUser, job_type: str, params: dict) -> Job:
+        """
+        Queue a job.
+
+        Raises:
+            BudgetExceededError: If the user has spent their budget.
+        """
+        with self._cond:
+            self._users.setdefault(user.name, user)
+            if user.over_budget:
+                raise BudgetExceededError(
+                    f"Budget of ${user.budget:.2f} spent (${user.spent:.2f})"
+                )
+            job = Job(uuid.uuid4().hex[:12], user.name, job_type, params)
+            self._jobs[job.id] = job
+            self._queue.append(job)
+            self._emit(job, "queued", {"position": len(self._queue)})
+            self._cond.notify_all()
+            return job
+
+    def get(self, job_id: str, user: ServiceUser) -> Optional[Job]:
+        """A job by ID, if it belongs to user."""
+        job = self._jobs.get(job_id)
+        return job if job is not None and job.user == user.name else None
+
+    def jobs_for(self, user: ServiceUser) -> list[Job]:
+        """The user's jobs, newest first."""
+        with self._cond:
+            jobs = [j for j in self._jobs.values() if j.user == user.name]
+        return sorted(jobs, key=lambda j: j.created_at, reverse=True)
+
+    def emit(self, job: Job, event: str, data: dict) -> None:
+        """Append a progress event and wake event streams."""
+        with self._cond:
+            self._emit(job, event, data)
+
+    def _emit(self, job: Job, event: str, data: dict) -> None:
+        job.events.append({"id": len(job.events), "event": event, "data": data})
+        self._cond.notify_all()
+
+    def wait_events(
+        self, job: Job, after: int, timeout: float
+    ) -> tuple[list[dict], bool]:
+        """
+        Wait for events with an id of at least after.
+
+        Returns:
+            (new events, whether the job has finished).
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while len(job.events) <= after and not job.done:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return job.events[after:], job.done
+
+    def _next_job(self) -> Optional[Job]:
+        for job in self._queue:
+            user = self._users[job.user]
+            if user.running < user.max_concurrent:
+                return job
+        return None
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                job = None
+                while not self._stopping:
+                    job = self._next_job()
+                    if job is not None:
+                        break
+                    self._cond.wait()
+                if job is None:
+                    return
+                self._queue.remove(job)
+                user = self._users[job.user]
+                if user.over_budget:
+                    self._finish(job, error="Budget spent before the job started")
+                    continue
+                user.running += 1
+                job.status = "running"
+                job.started_at = datetime.now().isoformat()
+                self._emit(job, "started", {})
+
+            result, error = None, None
+            try:
+                result = self.runner(job, lambda e, d: self.emit(job, e, d))
+            except Exception as e:
+                error = str(e) or type(e).__name__
+
+            with self._cond:
+                user.running -= 1
+                user.spent += job.cost
+                self._finish(job, result, error)
+
+    def _finish(
+        self, job: Job, result: Optional[dict] = None, error: Optional[str] = None
+    ) -> None:
+        job.finished_at = datetime.now().isoformat()
+        if error is None:
+            job.status, job.result = "completed", result
+            self._emit(job, "completed", {"cost": job.cost, "result": result})
+        else:
+            job.status, job.error = "failed", error
+            self._emit(job, "failed", {"cost": job.cost, "error": error})
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    service: JobService
+
+    def _respond(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _user(self) -> Optional[ServiceUser]:
+        """The authenticated user, or None after sending 401."""
+        user = self.service.authenticate(self.headers.get("Authorization", ""))
+        if user is None:
+            self._respond(401, {"error": "Missing or invalid bearer token"})
+        return user
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length", 0))
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._respond(413, {"error": "Request body too large"})
+            return
+        body = self.rfile.read(length)
+        if urlsplit(self.path).path != "/jobs":
+            self._respond(404, {"error": "Not found"})
+            return
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.split(";")[0].strip().lower() != "application/json":
+            self._respond(415, {"error": "Content-Type must be application/json"})
+            return
+        user = self._user()
+        if user is None:
+            return
+        try:
+            request = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            self._respond(400, {"error": "Body must be a JSON object"})
+            return
+        if not isinstance(request, dict):
+            self._respond(400, {"error": "Body must be a JSON object"})
+            return
+        job_type = request.get("type", "critique")
+        try:
+            job = self.service.queue.submit(
+                user, job_type, parse_job(job_type, request, user.name)
+            )
+        except JobError as e:
+            self._respond(400, {"error": str(e)})
+            return
+        except BudgetExceededError as e:
+            self._respond(402, {"error": str(e)})
+            return
+        self._respond(202, {"id": job.id, "status": job.status})
+
+    def do_GET(self) -> None:  # noqa: N802
+        path = urlsplit(self.path).path.rstrip("/")
+        if path == "/health":
+            self._respond(200, {"ok": True})
+            return
+        user = self._user()
+        if user is None:
+            return
+        queue = self.service.queue
+        if path == "/usage":
+            self._respond(200, user.to_dict())
+            return
+        if path == "/jobs":
+            jobs = [j.to_dict(include_result=False) for j in queue.jobs_for(user)]
+            self._respond(200, {"jobs": jobs})
+            return
+        parts = path.split("/")
+        job = None
+        if len(parts) in (3, 4) and parts[1] == "jobs":
+            job = queue.get(parts[2], user)
+        if job is None or (len(parts) == 4 and parts[3] != "events"):
+            self._respond(404, {"error": "Not found"})
+            return
+        if len(parts) == 3:
+            self._respond(200, job.to_dict())
+            return
+        self._stream_events(job)
+
+    def _stream_events(self, job: Job) -> None:
+        try:
+            after = int(self.headers.get("Last-Event-ID", -1)) + 1
+        except ValueError:
+            after = 0
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            while True:
+                events, done = self.service.queue.wait_events(job, after, SSE_KEEPALIVE)
+                if not events and not done:
+                    self.wfile.write(b": keep-alive\n\n")
+                for event in events:
+                    self.wfile.write(
+                        f"id: {event['id']}\nevent: {event['event']}\n"
+                        f"data: {json.dumps(event['data'])}\n\n".encode("utf-8")
+                    )
+                    after = event["id"] + 1
+                self.wfile.flush()
+                if done and after >= len(job.events):
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.service.verbose:
+            super().log_message(format, *args)
+
+
+class JobService:
+    """Threaded HTTP server in front of a JobQueue."""
+
+    def __init__(
+        self,
+        users: Optional[dict[str, ServiceUser]] = None,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_SERVICE_PORT,
+        workers: int = DEFAULT_WORKERS,
+        runner: Callable[[Job, Emit], dict] = run_job,
+        verbose: bool = False,
+    ):
+        if not users and host not in _LOOPBACK_HOSTS:
+            raise ValueError("A users file is required to bind a non-loopback host")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.users = users or {}
+        self.local_user = (
+            None if users else ServiceUser(LOCAL_USER, max_concurrent=workers)
+        )
+        self.verbose = verbose
+        self.queue = JobQueue(runner, workers)
+        handler = type("ServiceHandler", (_ServiceHandler,), {"service": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL clients use to reach the service."""
+        host, port = self.server.server_address[:2]
+        return f"http://{str(host)}:{int(port)}"
+
+    def authenticate(self, authorization: str) -> Optional[ServiceUser]:
+        """The user for an Authorization header, or None if it is not valid."""
+        if self.local_user is not None:
+            return self.local_user
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        for known, user in self.users.items():
+            if hmac.compare_digest(known.encode(), token.strip().encode()):
+                return user
+        return None
+
+    def start(self) -> "JobService":
+        """Start the workers and serve in a background thread."""
+        self.queue.start()
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, name="job-service", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Start the workers and serve in the current thread until interrupted."""
+        self.queue.start()
+        self.server.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving, close the socket and stop idle workers."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.queue.stop()
+
+
+def run_service(host: str, port: int, users_path: Optional[Path], workers: int) -> None:
+    """Serve jobs until interrupted.
+
+    Args:
+        host: Interface to bind.
+        port: Port to bind.
+        users_path: Users file; None for a single local user.
+        workers: Jobs run at once across all users.
+
+    Raises:
+        ValueError: If the users file is invalid or auth is required.
+        OSError: If the address cannot be bound.
+    """
+    users = load_users(users_path) if users_path else None
+    service = JobService(users, host, port, workers, verbose=True)
+    auth = f"{len(users)} user(s)" if users else "single local user, no auth"
+    print(
+        f"Job service listening on {service.url} ({workers} workers, {auth})",
+        file=sys.stderr,
+    )
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping job service.", file=sys.stderr)
+    finally:
+        service.server.server_close()
+        service.queue.stop(timeout=0)
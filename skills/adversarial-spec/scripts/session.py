@@ -7,10 +7,20 @@ import sys
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
+
+from convergence import (
+    DEFAULT_CONVERGENCE_THRESHOLD,
+    compute_round_metrics,
+    critique_text,
+    predict_convergence,
+)
+from selection import critique_novelty
+from spec_doc import diff_sections, summarize_changes
 
 SESSIONS_DIR = Path.home() / ".config" / "adversarial-spec" / "sessions"
 CHECKPOINTS_DIR = Path.cwd() / ".adversarial-spec-checkpoints"
+TELEGRAM_MESSAGE_IDS_KEPT = 50
 
 
 @dataclass
@@ -28,15 +38,20 @@ class SessionState:
     created_at: str = ""
     updated_at: str = ""
     history: list = field(default_factory=list)
+    telegram_offset: Optional[int] = None
+    # Async notification messages whose replies are this session's feedback
+    telegram_message_ids: list = field(default_factory=list)
+    owner: Optional[str] = None  # service user that created it; None for the CLI
 
-    def save(self):
-        """Save session state to disk."""
+    def save(self) -> Path:
+        """Save session state to disk and return its path."""
         SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
         self.updated_at = datetime.now().isoformat()
         path = SESSIONS_DIR / f"{self.session_id}.json"
         if not path.resolve().is_relative_to(SESSIONS_DIR.resolve()):
             raise ValueError(f"Invalid session ID: {self.session_id}")
         path.write_text(json.dumps(asdict(self), indent=2))
+        return path
 
     @classmethod
     def load(cls, session_id: str) -> "SessionState":
@@ -71,8 +86,76 @@ class SessionState:
         return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
 
 
-def save_checkpoint(spec: str, round_num: int, session_id: Optional[str] = None):
-    """Save spec checkpoint for this round."""
+def round_history_entry(
+    round_num: int,
+    spec: str,
+    latest_spec: str,
+    results: list,
+    all_agreed: bool,
+    history: list,
+    threshold: float = DEFAULT_CONVERGENCE_THRESHOLD,
+) -> dict[str, Any]:
+    """
+    Session history entry for a critique round.
+
+    Both the CLI and the service record rounds with this, so convergence
+    prediction and adaptive selection see the same fields for every round.
+
+    Args:
+        round_num: Round number.
+        spec: Spec sent to the models.
+        latest_spec: Spec carried into the next round.
+        results: ModelResponse objects for the round.
+        all_agreed: Whether the round counts as full agreement.
+        history: The session's earlier entries, for the convergence trend.
+        threshold: Change ratio below which a round counts as cosmetic.
+
+    Returns:
+        The entry, with per-model records, section changes, metrics and the
+        convergence prediction.
+    """
+    section_changes = diff_sections(spec, latest_spec, include_diff=False)
+    metrics = compute_round_metrics(
+        round_num, spec, latest_spec, results, sections_changed=len(section_changes)
+    )
+    prediction = predict_convergence(
+        [h["metrics"] for h in history if h.get("metrics")] + [metrics.to_dict()],
+        threshold,
+    )
+    novelty = critique_novelty(
+        {
+            r.model: critique_text(r.response)
+            for r in results
+            if not r.error and not r.agreed
+        }
+    )
+    return {
+        "round": round_num,
+        "all_agreed": all_agreed,
+        "models": [
+            {
+                "model": r.model,
+                "agreed": r.agreed,
+                "error": r.error,
+                "cost": r.cost,
+                "latency": r.latency,
+                "novelty": novelty.get(r.model),
+            }
+            for r in results
+        ],
+        "section_changes": {
+            "summary": summarize_changes(section_changes),
+            "sections": [c.to_dict() for c in section_changes],
+        },
+        "metrics": metrics.to_dict(),
+        "convergence": prediction.to_dict(),
+    }
+
+
+def save_checkpoint(
+    spec: str, round_num: int, session_id: Optional[str] = None
+) -> Path:
+    """Save spec checkpoint for this round and return its path."""
     CHECKPOINTS_DIR.mkdir(parents=True, exist_ok=True)
     prefix = f"{session_id}-" if session_id else ""
     path = CHECKPOINTS_DIR / f"{prefix}round-{round_num}.md"
@@ -80,3 +163,4 @@ def save_checkpoint(spec: str, round_num: int, session_id: Optional[str] = None)
         raise ValueError(f"Invalid session ID: {session_id}")
     path.write_text(spec)
     print(f"Checkpoint saved: {path}", file=sys.stderr)
+    return path
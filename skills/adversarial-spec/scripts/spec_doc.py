@@ -0,0 +1,360 @@
+"""Section-aware spec document model and incremental, hash-based diffing."""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+HEADING_RE = re.compile(r"^(#{1,6})[ \t]+(.*?)[ \t]*#*[ \t]*$")
+FENCE_RE = re.compile(r"^[ ]{0,3}(`{3,}|~{3,})")
+HUNK_RE = re.compile(r"^@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@")
+
+PREAMBLE_KEY = "(preamble)"
+KEY_SEPARATOR = " > "
+
+
+def content_hash(text: str) -> str:
+    """Return a short, stable content hash, ignoring surrounding whitespace."""
+    return hashlib.blake2b(text.strip().encode("utf-8"), digest_size=12).hexdigest()
+
+
+@dataclass
+class SpecSection:
+    """A heading and the text it owns, up to the next heading of any level."""
+
+    key: str
+    title: str
+    level: int
+    text: str
+    start_line: int
+    digest: str
+    parent: Optional[str] = None
+    children: list[str] = field(default_factory=list)
+
+    @property
+    def body(self) -> str:
+        """Section text without its heading line."""
+        if self.level == 0:
+            return self.text
+        newline = self.text.find("\n")
+        return "" if newline == -1 else self.text[newline + 1 :]
+
+
+@dataclass
+class SpecDocument:
+    """Markdown spec parsed into a heading tree with per-section hashes."""
+
+    sections: list[SpecSection]
+    digest: str
+
+    @classmethod
+    def parse(cls, text: str) -> "SpecDocument":
+        """
+        Parse Markdown into sections keyed by their heading path.
+
+        Headings inside fenced code blocks are ignored. Duplicate heading paths
+        are disambiguated with a ``#n`` suffix so every key is unique.
+
+        Args:
+            text: Markdown document.
+
+        Returns:
+            Parsed document. Text before the first heading becomes a level 0
+            preamble section.
+        """
+        lines = text.splitlines(keepends=True)
+        # (line index, offset, level, title) for every real heading
+        headings: list[tuple[int, int, int, str]] = []
+        fence: Optional[str] = None
+        offset = 0
+        for index, line in enumerate(lines):
+            fence_match = FENCE_RE.match(line)
+            if fence_match:
+                marker = fence_match.group(1)
+                if fence is None:
+                    fence = marker
+                elif marker[0] == fence[0] and len(marker) >= len(fence):
+                    fence = None
+            elif fence is None and line.startswith("#"):
+                match = HEADING_RE.match(line.rstrip("\r\n"))
+                if match:
+                    headings.append(
+                        (index, offset, len(match.group(1)), match.group(2))
+                    )
+            offset += len(line)
+
+        sections: list[SpecSection] = []
+        first_offset = headings[0][1] if headings else len(text)
+        if first_offset > 0 and text[:first_offset].strip():
+            preamble = text[:first_offset]
+            sections.append(
+                SpecSection(
+                    key=PREAMBLE_KEY,
+                    title="",
+                    level=0,
+                    text=preamble,
+                    start_line=1,
+                    digest=content_hash(preamble),
+                )
+            )
+
+        stack: list[SpecSection] = []
+        seen: dict[str, int] = {}
+        for position, (line_index, start, level, title) in enumerate(headings):
+            end = (
+                headings[position + 1][1] if position + 1 < len(headings) else len(text)
+            )
+            while stack and stack[-1].level >= level:
+                stack.pop()
+            parent = stack[-1] if stack else None
+            key = f"{parent.key}{KEY_SEPARATOR}{title}" if parent else title
+            seen[key] = seen.get(key, 0) + 1
+            if seen[key] > 1:
+                key = f"{key}#{seen[key]}"
+            section_text = text[start:end]
+            section = SpecSection(
+                key=key,
+                title=title,
+                level=level,
+                text=section_text,
+                start_line=line_index + 1,
+                digest=content_hash(section_text),
+                parent=parent.key if parent else None,
+            )
+            if parent:
+                parent.children.append(key)
+            sections.append(section)
+            stack.append(section)
+
+        return cls(
+            sections=sections,
+            digest=hashlib.blake2b(text.encode("utf-8"), digest_size=12).hexdigest(),
+        )
+
+    def by_key(self) -> dict[str, SpecSection]:
+        """Map section keys to sections."""
+        return {s.key: s for s in self.sections}
+
+    def outline(self) -> list[str]:
+        """Indented heading outline, one entry per section."""
+        return [
+            f"{'  ' * max(s.level - 1, 0)}{s.title or s.key}" for s in self.sections
+        ]
+
+
+@dataclass
+class SectionChange:
+    """A single section-level difference between two documents."""
+
+    kind: str  # added, removed, moved, edited
+    key: str
+    old_key: Optional[str] = None
+    old_line: Optional[int] = None
+    new_line: Optional[int] = None
+    diff: str = ""
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON output and session history."""
+        data: dict = {"kind": self.kind, "key": self.key}
+        if self.old_key and self.old_key != self.key:
+            data["old_key"] = self.old_key
+        if self.old_line is not None:
+            data["old_line"] = self.old_line
+        if self.new_line is not None:
+            data["new_line"] = self.new_line
+        return data
+
+
+def _offset_hunks(diff: str, old_offset: int, new_offset: int) -> str:
+    """Shift unified diff hunk headers so line numbers match the full document."""
+    if not old_offset and not new_offset:
+        return diff
+
+    def shift(match: re.Match) -> str:
+        old_start = int(match.group(1)) + old_offset
+        new_start = int(match.group(3)) + new_offset
+        return (
+            f"@@ -{old_start}{match.group(2) or ''} "
+            f"+{new_start}{match.group(4) or ''} @@"
+        )
+
+    return "\n".join(HUNK_RE.sub(shift, line) for line in diff.split("\n"))
+
+
+def _diff_lines(text: str) -> list[str]:
+    """Split text into newline-terminated lines for difflib."""
+    lines = text.splitlines(keepends=True)
+    if lines and not lines[-1].endswith("\n"):
+        lines[-1] += "\n"
+    return lines
+
+
+def _section_diff(old: Optional[SpecSection], new: Optional[SpecSection]) -> str:
+    """Unified diff of one section, with line numbers relative to the document."""
+    old_lines = _diff_lines(old.text) if old else []
+    new_lines = _diff_lines(new.text) if new else []
+    key = new.key if new else old.key if old else ""
+    diff = "".join(
+        difflib.unified_diff(
+            old_lines, new_lines, fromfile=f"previous: {key}", tofile=f"current: {key}"
+        )
+    ).rstrip("\n")
+    return _offset_hunks(
+        diff,
+        old.start_line - 1 if old else 0,
+        new.start_line - 1 if new else 0,
+    )
+
+
+def diff_documents(
+    previous: SpecDocument, current: SpecDocument, include_diff: bool = True
+) -> list[SectionChange]:
+    """
+    Compare two parsed documents section by section.
+
+    Sections with identical hashes are skipped without a line diff. A section
+    whose key disappears but whose content reappears under a new key (or whose
+    position relative to the other shared sections changed) is reported as
+    ``moved`` rather than as a delete plus an add.
+
+    Args:
+        previous: Earlier version of the document.
+        current: Later version of the document.
+        include_diff: Attach a unified diff to each edited section.
+
+    Returns:
+        Section changes in current-document order, removals last.
+    """
+    if previous.digest == current.digest:
+        return []
+
+    old_map = previous.by_key()
+    new_map = current.by_key()
+
+    removed = {k: s for k, s in old_map.items() if k not in new_map}
+    removed_by_body: dict[str, str] = {}
+    for key, section in removed.items():
+        if section.body.strip():
+            removed_by_body.setdefault(content_hash(section.body), key)
+
+    # Shared keys whose relative order changed are moves; keep the longest
+    # common ordering and flag everything else.
+    shared_old = [s.key for s in previous.sections if s.key in new_map]
+    shared_new = [s.key for s in current.sections if s.key in old_map]
+    stable: set[str] = set()
+    if shared_old != shared_new:
+        matcher = difflib.SequenceMatcher(None, shared_old, shared_new, autojunk=False)
+        for block in matcher.get_matching_blocks():
+            stable.update(shared_old[block.a : block.a + block.size])
+    else:
+        stable.update(shared_old)
+
+    changes: list[SectionChange] = []
+    for section in current.sections:
+        old = old_map.get(section.key)
+        if old is None:
+            old_key = (
+                removed_by_body.pop(content_hash(section.body), None)
+                if section.body.strip()
+                else None
+            )
+            if old_key is not None:
+                removed.pop(old_key, None)
+                changes.append(
+                    SectionChange(
+                        kind="moved",
+                        key=section.key,
+                        old_key=old_key,
+                        old_line=old_map[old_key].start_line,
+                        new_line=section.start_line,
+                    )
+                )
+            else:
+                changes.append(
+                    SectionChange(
+                        kind="added",
+                        key=section.key,
+                        new_line=section.start_line,
+                        diff=_section_diff(None, section) if include_diff else "",
+                    )
+                )
+            continue
+
+        if old.digest != section.digest:
+            changes.append(
+                SectionChange(
+                    kind="edited",
+                    key=section.key,
+                    old_line=old.start_line,
+                    new_line=section.start_line,
+                    diff=_section_diff(old, section) if include_diff else "",
+                )
+            )
+        elif section.key not in stable:
+            changes.append(
+                SectionChange(
+                    kind="moved",
+                    key=section.key,
+                    old_key=section.key,
+                    old_line=old.start_line,
+                    new_line=section.start_line,
+                )
+            )
+
+    for key, section in removed.items():
+        changes.append(
+            SectionChange(
+                kind="removed",
+                key=key,
+                old_line=section.start_line,
+                diff=_section_diff(section, None) if include_diff else "",
+            )
+        )
+    return changes
+
+
+def diff_sections(
+    previous: str, current: str, include_diff: bool = True
+) -> list[SectionChange]:
+    """Parse two Markdown specs and return their section-level changes."""
+    if previous == current:
+        return []
+    return diff_documents(
+        SpecDocument.parse(previous), SpecDocument.parse(current), include_diff
+    )
+
+
+def summarize_changes(changes: list[SectionChange]) -> dict:
+    """Count section changes by kind, for session history and JSON output."""
+    summary = {"added": 0, "removed": 0, "moved": 0, "edited": 0}
+    for change in changes:
+        summary[change.kind] = summary.get(change.kind, 0) + 1
+    summary["changed"] = len(changes)
+    return summary
+
+
+def format_section_changes(changes: list[SectionChange], show_diff: bool = True) -> str:
+    """Render section changes as a human-readable report."""
+    if not changes:
+        return ""
+    summary = summarize_changes(changes)
+    lines = [
+        "=== Section Changes ===",
+        f"{summary['edited']} edited, {summary['added']} added, "
+        f"{summary['removed']} removed, {summary['moved']} moved",
+        "",
+    ]
+    for change in changes:
+        if change.kind == "moved" and change.old_key and change.old_key != change.key:
+            lines.append(f"  moved   {change.old_key} -> {change.key}")
+        else:
+            lines.append(f"  {change.kind:7} {change.key}")
+    if show_diff:
+        for change in changes:
+            if change.diff:
+                lines.append("")
+                lines.append(change.diff)
+    return "\n".join(lines)
@@ -0,0 +1,281 @@
+"""
+Speculative prefetch of the next critique round.
+
+While the agent revises the spec, the opponent models sit idle. With
+``critique --speculate``, a round that produced a revised spec starts a
+detached worker that runs round N+1 against that spec in the background.
+The worker sends its calls through a private SharedCache, so when the next
+``critique`` submits the same spec with the same options its model calls are
+answered from that cache, or wait on the worker's in-flight calls instead
+of being sent again.
+
+If the next round's spec or options differ, the worker is stopped, its
+files are removed, and the spend of its completed calls is reported as
+wasted. On a match, the worker's per-model tokens, cost and latency are
+credited to the round that used its responses. State lives in
+SPECULATION_DIR:
+
+    <key>.json           written by the parent: spec hash, round, call options
+    <key>.progress.json  written by the worker: completed models and spend,
+                         total and per model
+    <key>/               the worker's response cache
+
+Usage (started by debate.py):
+    python3 speculation.py STATE_PATH
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+SPECULATION_DIR = Path.home() / ".config" / "adversarial-spec" / "speculation"
+MAX_AGE = 6 * 3600  # seconds before an unclaimed speculation is discarded
+USAGE_WAIT = 5.0  # seconds to wait for the worker to record a finished call
+
+
+def spec_hash(spec: str) -> str:
+    """SHA-256 of the spec text."""
+    return hashlib.sha256(spec.encode("utf-8")).hexdigest()
+
+
+def speculation_key(session_id: Optional[str]) -> str:
+    """One speculation slot per session, or per working directory without one."""
+    if session_id:
+        return f"session-{session_id}"
+    return "cwd-" + hashlib.sha256(os.getcwd().encode("utf-8")).hexdigest()[:16]
+
+
+def _paths(key: str) -> tuple[Path, Path, Path]:
+    return (
+        SPECULATION_DIR / f"{key}.json",
+        SPECULATION_DIR / f"{key}.progress.json",
+        SPECULATION_DIR / key,
+    )
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data))
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: Path) -> Optional[dict]:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _stop_worker(pid: Optional[int]) -> None:
+    if not pid:
+        return
+    with contextlib.suppress(OSError):
+        os.killpg(pid, signal.SIGTERM)
+
+
+def discard(key: str) -> None:
+    """Remove a speculation's state, progress and cache."""
+    state_path, progress_path, cache_dir = _paths(key)
+    for path in (state_path, progress_path):
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def start_speculation(
+    key: str, spec: str, round_num: int, options: dict[str, Any]
+) -> Optional[int]:
+    """
+    Start a detached worker that runs round_num against spec.
+
+    Any earlier speculation for key is stopped and discarded first.
+
+    Args:
+        key: Slot from speculation_key().
+        spec: The revised spec the next round is expected to critique.
+        round_num: The next round number.
+        options: Keyword arguments for call_models_parallel besides spec
+            and round_num; they must match for the next round to use it.
+
+    Returns:
+        The worker's process ID, or None if it could not be started.
+    """
+    state_path, progress_path, cache_dir = _paths(key)
+    previous = _read_json(state_path)
+    if previous:
+        _stop_worker(previous.get("pid"))
+    discard(key)
+    SPECULATION_DIR.mkdir(parents=True, exist_ok=True)
+    state = {
+        "spec": spec,
+        "spec_hash": spec_hash(spec),
+        "round": round_num,
+        "options": options,
+        "created": time.time(),
+        "pid": None,
+    }
+    _write_json(state_path, state)
+    try:
+        process = subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), str(state_path)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        print(f"Warning: Could not start speculative round: {e}", file=sys.stderr)
+        discard(key)
+        return None
+    state["pid"] = process.pid
+    _write_json(state_path, state)
+    return process.pid
+
+
+def claim_speculation(
+    key: str, spec: str, round_num: int, options: dict[str, Any]
+) -> tuple[Optional[dict], Optional[Path]]:
+    """
+    Match this round against a pending speculation.
+
+    Args:
+        key: Slot from speculation_key().
+        spec: The spec submitted for this round.
+        round_num: This round's number.
+        options: This round's call options, compared with the speculation's.
+
+    Returns:
+        (report, cache_dir). report is None if no speculation was pending.
+        cache_dir is the worker's response cache on a hit; the caller routes
+        this round's calls through it and then calls discard(key). On a miss
+        the worker has already been stopped and its files removed.
+    """
+    state_path, progress_path, cache_dir = _paths(key)
+    state = _read_json(state_path)
+    if state is None:
+        return None, None
+    progress = _read_json(progress_path) or {}
+    report = {
+        "round": state.get("round"),
+        "models_completed": progress.get("completed", []),
+        "cost": progress.get("spent", 0.0),
+    }
+    fresh = time.time() - state.get("created", 0) < MAX_AGE
+    if (
+        fresh
+        and state.get("spec_hash") == spec_hash(spec)
+        and state.get("round") == round_num
+        and state.get("options") == json.loads(json.dumps(options))
+    ):
+        report["status"] = "hit"
+        return report, cache_dir
+
+    report["status"] = "wasted" if fresh else "expired"
+    report["calls_cancelled"] = 0
+    if not progress.get("finished"):
+        _stop_worker(state.get("pid"))
+        report["calls_cancelled"] = len(
+            state.get("options", {}).get("models", [])
+        ) - len(report["models_completed"])
+    discard(key)
+    return report, None
+
+
+def prefetched_usage(
+    key: str, models: list[str], timeout: float = USAGE_WAIT
+) -> dict[str, dict]:
+    """
+    The worker's usage for models whose responses a round took from its cache.
+
+    The worker records a call just after storing its response, so this waits
+    up to timeout for models not recorded yet. Call it before discard(key).
+
+    Returns:
+        input_tokens, output_tokens, cost and latency keyed by model, for the
+        models the worker recorded.
+    """
+    _, progress_path, _ = _paths(key)
+    deadline = time.monotonic() + timeout
+    while True:
+        progress = _read_json(progress_path) or {}
+        usage = progress.get("models", {})
+        if (
+            all(model in usage for model in models)
+            or progress.get("finished")
+            or time.monotonic() >= deadline
+        ):
+            return {model: usage[model] for model in models if model in usage}
+        time.sleep(0.05)
+
+
+def format_speculation(report: dict) -> str:
+    """One-line summary of a speculation outcome for stderr."""
+    if report["status"] == "hit":
+        ready = len(report["models_completed"])
+        return (
+            f"Speculative round {report['round']} matched: {ready} response(s) "
+            f"prefetched (${report['cost']:.4f} spent in the background)"
+        )
+    cancelled = report.get("calls_cancelled", 0)
+    cancelled_info = f", {cancelled} call(s) cancelled" if cancelled else ""
+    return (
+        f"Speculative round {report['round']} discarded ({report['status']}): "
+        f"${report['cost']:.4f} wasted{cancelled_info}"
+    )
+
+
+def run_worker(state_path: Path) -> None:
+    """Run the speculative round described by state_path, recording progress."""
+    from models import call_models_parallel
+    from response_cache import SharedCache, using_cache
+
+    state = _read_json(state_path)
+    if state is None:
+        return
+    key = state_path.stem
+    _, progress_path, cache_dir = _paths(key)
+    progress: dict[str, Any] = {
+        "completed": [],
+        "spent": 0.0,
+        "models": {},
+        "finished": False,
+    }
+    _write_json(progress_path, progress)
+
+    def record(response) -> None:
+        progress["completed"].append(response.model)
+        progress["spent"] += response.cost
+        progress["models"][response.model] = {
+            "input_tokens": response.input_tokens,
+            "output_tokens": response.output_tokens,
+            "cost": response.cost,
+            "latency": response.latency,
+        }
+        _write_json(progress_path, progress)
+
+    with using_cache(SharedCache(cache_dir)):
+        try:
+            call_models_parallel(
+                spec=state["spec"],
+                round_num=state["round"],
+                on_result=record,
+                **state["options"],
+            )
+        finally:
+            progress["finished"] = True
+            _write_json(progress_path, progress)
+
+
+if __name__ == "__main__":
+    run_worker(Path(sys.argv[1]))
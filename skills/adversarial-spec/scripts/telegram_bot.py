@@ -5,11 +5,15 @@ Telegram bot utilities for adversarial spec development.
 Usage:
     python3 telegram_bot.py setup              # Setup instructions and chat_id discovery
     python3 telegram_bot.py send <<< "message" # Send message from stdin
+    python3 telegram_bot.py send --document spec.md < spec.md  # Upload as a file
     python3 telegram_bot.py poll --timeout 60  # Poll for reply
+    python3 telegram_bot.py webhook --public-url URL  # Relay for concurrent debates
 
 Environment:
     TELEGRAM_BOT_TOKEN - Bot token from @BotFather
     TELEGRAM_CHAT_ID   - Your chat ID (get via setup command)
+    TELEGRAM_WEBHOOK_RELAY  - Webhook relay URL; debates wait on it instead of polling
+    TELEGRAM_WEBHOOK_SECRET - Shared secret for the relay and Telegram
 
 Exit codes:
     0 - Success
@@ -20,17 +24,161 @@ Exit codes:
 from __future__ import annotations
 
 import argparse
+import bisect
+import gzip
+import http.client
 import json
 import os
+import queue
+import re
 import sys
+import threading
 import time
-from typing import Any, Optional
-from urllib.error import HTTPError, URLError
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+import uuid
+from typing import Any, Callable, Optional
 
-TELEGRAM_API: str = "https://api.telegram.org/bot{token}/{method}"
+TELEGRAM_HOST: str = "api.telegram.org"
 MAX_MESSAGE_LENGTH: int = 4096
+REQUEST_TIMEOUT: int = 30
+MAX_RATE_LIMIT_RETRIES: int = 3
+MAX_CAPTION_LENGTH: int = 1024
+MAX_UPLOAD_BYTES: int = 50 * 1024 * 1024  # Bot API sendDocument limit
+UPLOAD_TIMEOUT: int = 120
+LONG_POLL_TIMEOUT: int = 25
+CHUNK_HEADER_RESERVE: int = 16  # room for the "[i/N]\n" chunk header
+FENCE_LINE_RE = re.compile(r"^ {0,3}(```|~~~)", re.MULTILINE)
+MAX_FENCE_TAG_LENGTH = 32  # language tag kept when reopening a split code block
+SEPS: tuple[str, ...] = ("\n\n", "\n", " ")  # preferred split points, best first
+REQUEST_HEADERS: dict[str, str] = {
+    "User-Agent": "adversarial-spec/1.0",
+    "Content-Type": "application/json",
+    "Connection": "keep-alive",
+}
+
+# Errors that mean a reused keep-alive connection was closed by the server
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class TelegramClient:
+    """Pool of keep-alive HTTPS connections to the Bot API.
+
+    Connections are reused across calls so each request skips the TCP and TLS
+    handshake. Every request checks out its own connection, so a long-poll
+    ``getUpdates`` in one thread does not block ``sendMessage`` in another.
+    """
+
+    def __init__(
+        self,
+        host: str = TELEGRAM_HOST,
+        connection_factory: Optional[Callable[[], http.client.HTTPConnection]] = None,
+    ):
+        self.host = host
+        self._factory = connection_factory or (
+            lambda: http.client.HTTPSConnection(host, timeout=REQUEST_TIMEOUT)
+        )
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._factory()
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.append(conn)
+
+    def post(
+        self,
+        path: str,
+        payload: dict[str, Any],
+        timeout: float = REQUEST_TIMEOUT,
+        files: Optional[dict[str, tuple[str, bytes, str]]] = None,
+    ) -> tuple[int, bytes]:
+        """POST a JSON body and return (status, response body).
+
+        With ``files`` the payload and files are sent as a single
+        multipart/form-data body instead. A request that fails because the
+        server closed an idle keep-alive connection is retried once on a fresh
+        connection.
+
+        Raises:
+            OSError, http.client.HTTPException: On network errors.
+        """
+        if files:
+            body, content_type = encode_multipart(payload, files)
+            headers = {**REQUEST_HEADERS, "Content-Type": content_type}
+        else:
+            body = json.dumps(payload).encode("utf-8")
+            headers = REQUEST_HEADERS
+        retried = False
+        while True:
+            conn = self._acquire()
+            reused = conn.sock is not None
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                if reused and not retried:
+                    retried = True
+                    continue
+                raise
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                raise
+            self._release(conn)
+            return response.status, data
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+
+
+_client = TelegramClient()
+
+
+def encode_multipart(
+    fields: dict[str, Any], files: dict[str, tuple[str, bytes, str]]
+) -> tuple[bytes, str]:
+    """Encode form fields and files as a multipart/form-data body.
+
+    Args:
+        fields: Plain form fields.
+        files: Field name to (filename, content, content type).
+
+    Returns:
+        Tuple of (body, Content-Type header value).
+    """
+    boundary = uuid.uuid4().hex
+    parts: list[bytes] = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+            f"{value}\r\n".encode()
+        )
+    for name, (filename, content, content_type) in files.items():
+        parts.append(
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n".encode()
+        )
+        parts.append(content)
+        parts.append(b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
 
 
 def get_config() -> tuple[str, str]:
@@ -45,14 +193,23 @@ def get_config() -> tuple[str, str]:
 
 
 def api_call(
-    token: str, method: str, params: Optional[dict[str, Any]] = None
+    token: str,
+    method: str,
+    params: Optional[dict[str, Any]] = None,
+    files: Optional[dict[str, tuple[str, bytes, str]]] = None,
 ) -> dict[str, Any]:
     """Make Telegram Bot API call.
 
+    Parameters are sent as a JSON POST body over the shared keep-alive client,
+    or as multipart/form-data when files are attached. When Telegram answers
+    429 Too Many Requests, the call waits for the ``retry_after`` seconds it
+    reports and tries again.
+
     Args:
         token: Bot API token.
         method: API method name (e.g., sendMessage, getUpdates).
-        params: Optional query parameters.
+        params: Optional method parameters.
+        files: Optional field name to (filename, content, content type).
 
     Returns:
         Parsed JSON response from Telegram API.
@@ -60,19 +217,33 @@ def api_call(
     Raises:
         RuntimeError: On HTTP or network errors.
     """
-    url = TELEGRAM_API.format(token=token, method=method)
-    if params:
-        url += "?" + urlencode(params)
+    params = params or {}
+    path = f"/bot{token}/{method}"
+    # Long polls hold the request open for up to params["timeout"] seconds
+    timeout = REQUEST_TIMEOUT + int(params.get("timeout", 0))
+    if files:
+        timeout = UPLOAD_TIMEOUT
+
+    retries = 0
+    while True:
+        try:
+            status, data = _client.post(path, params, timeout=timeout, files=files)
+        except (OSError, http.client.HTTPException) as e:
+            raise RuntimeError(f"Network error: {e}")
 
-    try:
-        req = Request(url, headers={"User-Agent": "adversarial-spec/1.0"})
-        with urlopen(req, timeout=30) as response:  # noqa: S310
-            return json.loads(response.read().decode("utf-8"))
-    except HTTPError as e:
-        body = e.read().decode("utf-8")
-        raise RuntimeError(f"Telegram API error {e.code}: {body}")
-    except URLError as e:
-        raise RuntimeError(f"Network error: {e.reason}")
+        body = data.decode("utf-8", errors="replace")
+        try:
+            result = json.loads(body)
+        except json.JSONDecodeError:
+            result = {}
+
+        if status == 429 and retries < MAX_RATE_LIMIT_RETRIES:
+            retries += 1
+            time.sleep(result.get("parameters", {}).get("retry_after", 1))
+            continue
+        if status >= 400:
+            raise RuntimeError(f"Telegram API error {status}: {body}")
+        return result
 
 
 def send_message(token: str, chat_id: str, text: str) -> bool:
@@ -94,9 +265,141 @@ def send_message(token: str, chat_id: str, text: str) -> bool:
     return result.get("ok", False)
 
 
+def _fence_spans(text: str) -> list[tuple[int, int, str]]:
+    """Find fenced code blocks as (start, end, opening line) offsets.
+
+    ``end`` is the offset of the newline ending the closing fence line (or the
+    end of the text for an unterminated fence).
+    """
+    spans: list[tuple[int, int, str]] = []
+    open_start = -1
+    marker = opener = ""
+    for match in FENCE_LINE_RE.finditer(text):
+        line_end = text.find("\n", match.start())
+        if line_end == -1:
+            line_end = len(text)
+        if open_start == -1:
+            open_start, marker = match.start(), match.group(1)
+            opener = text[match.start() : line_end].strip()
+        elif match.group(1) == marker:
+            spans.append((open_start, line_end, opener))
+            open_start = -1
+    if open_start != -1:
+        spans.append((open_start, len(text), opener))
+    return spans
+
+
+def _fence_at(
+    fences: list[tuple[int, int, str]], ends: list[int], offset: int
+) -> Optional[tuple[int, int, str]]:
+    """Return the fence containing offset, if any."""
+    index = bisect.bisect_right(ends, offset)
+    if index < len(fences) and fences[index][0] <= offset:
+        return fences[index]
+    return None
+
+
+def _reopen_fence(opener: str) -> str:
+    """Opening line for the continuation of a split code block.
+
+    Only the fence marker and a length-capped language tag are repeated, so
+    the prefix stays small however long the original opener line is.
+    """
+    words = opener[3:].split(maxsplit=1)
+    tag = words[0][:MAX_FENCE_TAG_LENGTH] if words else ""
+    return opener[:3] + tag + "\n"
+
+
+def _entities_balanced(text: str, start: int, end: int) -> bool:
+    """Whether text[start:end] leaves no inline Markdown entity open."""
+    segment = text[start:end]
+    return (
+        segment.count("`") % 2 == 0
+        and segment.count("*") % 2 == 0
+        and segment.count("_") % 2 == 0
+        and segment.count("[") == segment.count("]")
+        and segment.count("(") == segment.count(")")
+    )
+
+
+def _last_break(
+    text: str,
+    sep: str,
+    start: int,
+    limit: int,
+    fences: list[tuple[int, int, str]],
+    ends: list[int],
+) -> int:
+    """Latest offset of sep in (start, limit) that is safe to split at, or -1."""
+    index = text.rfind(sep, start, limit)
+    while index > start:
+        fence = _fence_at(fences, ends, index)
+        if fence is not None:
+            index = text.rfind(sep, start, fence[0])
+            continue
+        if sep == " ":
+            line_start = text.rfind("\n", start, index) + 1
+            if not _entities_balanced(text, max(line_start, start), index):
+                index = text.rfind(sep, start, index)
+                continue
+        return index
+    return -1
+
+
+def send_document(
+    token: str,
+    chat_id: str,
+    filename: str,
+    content: str | bytes,
+    caption: Optional[str] = None,
+    compress: bool = False,
+) -> bool:
+    """Upload content as a single document.
+
+    One multipart request replaces the dozens of chunked messages a large
+    spec or diff would otherwise need, so delivery time barely depends on
+    size. Content larger than the Bot API upload limit is always compressed.
+
+    Args:
+        token: Bot API token.
+        chat_id: Target chat identifier.
+        filename: File name shown in the chat.
+        content: Document content.
+        caption: Optional short caption (supports Markdown).
+        compress: Gzip the content and append ``.gz`` to the filename.
+
+    Returns:
+        True on success, False on failure.
+    """
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    content_type = "text/markdown" if filename.endswith(".md") else "text/plain"
+    if compress or len(data) > MAX_UPLOAD_BYTES:
+        data = gzip.compress(data, mtime=0)
+        filename += ".gz"
+        content_type = "application/gzip"
+
+    params: dict[str, Any] = {"chat_id": chat_id}
+    if caption:
+        params["caption"] = caption[:MAX_CAPTION_LENGTH]
+        params["parse_mode"] = "Markdown"
+    result = api_call(
+        token,
+        "sendDocument",
+        params,
+        files={"document": (filename, data, content_type)},
+    )
+    return result.get("ok", False)
+
+
 def split_message(text: str, max_length: int = MAX_MESSAGE_LENGTH) -> list[str]:
     """Split long message into chunks, preferring paragraph boundaries.
 
+    Walks the text once by offset. Each chunk is packed as close to
+    ``max_length`` as a paragraph, line, or word boundary allows, and never
+    ends inside a fenced code block or an inline Markdown entity. A code block
+    longer than a whole chunk is split at a line break, closed at the end of
+    the chunk, and reopened at the start of the next one.
+
     Args:
         text: The message text to split.
         max_length: Maximum length per chunk.
@@ -107,32 +410,71 @@ def split_message(text: str, max_length: int = MAX_MESSAGE_LENGTH) -> list[str]:
     if len(text) <= max_length:
         return [text]
 
-    chunks = []
-    remaining = text
+    fences = _fence_spans(text)
+    ends = [end for _, end, _ in fences]
+    chunks: list[str] = []
+    pos, length = 0, len(text)
+    reopen = ""  # opening fence line carried into the next chunk
 
-    while remaining:
-        if len(remaining) <= max_length:
-            chunks.append(remaining)
+    while pos < length:
+        budget = max_length - len(reopen)
+        if length - pos <= budget:
+            chunks.append(reopen + text[pos:])
             break
 
-        # Try to split at paragraph boundary
-        split_at = remaining.rfind("\n\n", 0, max_length)
-        if split_at == -1 or split_at < max_length // 2:
-            # Try single newline
-            split_at = remaining.rfind("\n", 0, max_length)
-        if split_at == -1 or split_at < max_length // 2:
-            # Fall back to space
-            split_at = remaining.rfind(" ", 0, max_length)
-        if split_at == -1:
-            # Hard split
-            split_at = max_length
-
-        chunks.append(remaining[:split_at])
-        remaining = remaining[split_at:].lstrip()
+        limit = pos + budget
+        fence = _fence_at(fences, ends, limit)
+        if fence is not None and fence[0] <= pos:
+            # Inside a code block longer than a chunk: close and reopen it
+            closing = "\n" + fence[2][:3]
+            cut = text.rfind("\n", pos, limit - len(closing))
+            if cut <= pos:
+                cut = max(limit - len(closing), pos + 1)
+            chunks.append(reopen + text[pos:cut] + closing)
+            reopen = _reopen_fence(fence[2])
+            pos = cut + 1 if text[cut] == "\n" else cut
+            continue
+        if fence is not None:
+            limit = fence[0]  # stop before a block that would straddle chunks
+
+        cut = -1
+        min_fill = pos + (budget * 3) // 4
+        candidates = [_last_break(text, sep, pos, limit, fences, ends) for sep in SEPS]
+        for candidate in candidates:
+            if candidate >= min_fill:
+                cut = candidate
+                break
+        else:
+            cut = max(candidates)
+        if cut <= pos:
+            cut = max(limit, pos + 1)  # hard split; always make progress
+
+        chunks.append(reopen + text[pos:cut])
+        reopen = ""
+        pos = cut
+        while pos < length and text[pos] in " \n":
+            pos += 1
 
     return chunks
 
 
+def message_chunks(text: str) -> list[str]:
+    """Split text into messages, adding an [i/N] header when there are several.
+
+    Args:
+        text: Message text (may exceed 4096 chars).
+
+    Returns:
+        Messages ready to send, each within the API limit.
+    """
+    chunks = split_message(text)
+    if len(chunks) == 1:
+        return chunks
+    # Leave room for the [i/N] header so chunks stay within the API limit
+    chunks = split_message(text, MAX_MESSAGE_LENGTH - CHUNK_HEADER_RESERVE)
+    return [f"[{i + 1}/{len(chunks)}]\n{chunk}" for i, chunk in enumerate(chunks)]
+
+
 def send_long_message(token: str, chat_id: str, text: str) -> bool:
     """Send message, splitting if necessary.
 
@@ -144,18 +486,69 @@ def send_long_message(token: str, chat_id: str, text: str) -> bool:
     Returns:
         True if all chunks sent successfully.
     """
-    chunks = split_message(text)
-    for i, chunk in enumerate(chunks):
-        if len(chunks) > 1:
-            header = f"[{i + 1}/{len(chunks)}]\n"
-            chunk = header + chunk
+    for chunk in message_chunks(text):
         if not send_message(token, chat_id, chunk):
             return False
-        if i < len(chunks) - 1:
-            time.sleep(0.5)  # Rate limit
     return True
 
 
+def send_long_message_ids(token: str, chat_id: str, text: str) -> Optional[list[int]]:
+    """Send message like send_long_message, returning the sent message IDs.
+
+    The IDs let webhook mode route replies to this notification back to the
+    debate that sent it.
+
+    Returns:
+        Message IDs of every chunk, or None if any chunk failed.
+    """
+    message_ids = []
+    for chunk in message_chunks(text):
+        result = api_call(
+            token,
+            "sendMessage",
+            {"chat_id": chat_id, "text": chunk, "parse_mode": "Markdown"},
+        )
+        if not result.get("ok", False):
+            return None
+        message_ids.append(result.get("result", {}).get("message_id", 0))
+    return message_ids
+
+
+def set_webhook(token: str, url: str, secret: str) -> bool:
+    """Point the bot's updates at a webhook URL.
+
+    Args:
+        token: Bot API token.
+        url: Public HTTPS URL that forwards to the local relay.
+        secret: Value Telegram sends in X-Telegram-Bot-Api-Secret-Token.
+
+    Returns:
+        True on success.
+    """
+    result = api_call(
+        token,
+        "setWebhook",
+        {"url": url, "secret_token": secret, "allowed_updates": ["message"]},
+    )
+    return result.get("ok", False)
+
+
+def delete_webhook(token: str) -> bool:
+    """Remove the webhook so getUpdates polling works again."""
+    return api_call(token, "deleteWebhook").get("ok", False)
+
+
+def get_relay_config() -> tuple[str, str]:
+    """Get webhook relay URL and shared secret from environment.
+
+    Returns:
+        Tuple of (relay_url, secret). Empty strings if not set.
+    """
+    relay_url = os.environ.get("TELEGRAM_WEBHOOK_RELAY", "")
+    secret = os.environ.get("TELEGRAM_WEBHOOK_SECRET", "")
+    return relay_url, secret
+
+
 def get_last_update_id(token: str) -> int:
     """Get the ID of the most recent update.
 
@@ -220,6 +613,156 @@ def poll_for_reply(
     return None
 
 
+def wait_for_reply(
+    token: str,
+    chat_id: str,
+    timeout: int = 60,
+    after_update_id: int = 0,
+    reply_to: Optional[list[int]] = None,
+) -> Optional[str]:
+    """Wait for a reply, through the webhook relay when one is configured.
+
+    Args:
+        token: Bot API token.
+        chat_id: Chat to wait for replies from.
+        timeout: Maximum seconds to wait.
+        after_update_id: Polling mode only; ignore updates up to this ID.
+        reply_to: Webhook mode only; IDs of the messages being replied to.
+
+    Returns:
+        Message text if received within timeout, None otherwise.
+    """
+    relay_url, secret = get_relay_config()
+    if relay_url:
+        import telegram_webhook
+
+        return telegram_webhook.wait_via_relay(
+            relay_url, secret, chat_id, reply_to, timeout
+        )
+    return poll_for_reply(token, chat_id, timeout, after_update_id)
+
+
+class FeedbackWorker:
+    """Background long-poll thread that queues replies from one chat.
+
+    Start it when a round begins; replies that arrive while the models are
+    running are collected without blocking the debate. ``drain`` returns the
+    queued replies together with the update offset that covers exactly those
+    replies, so the offset can be persisted and the next round resumes
+    without an extra ``getUpdates`` round-trip. Updates fetched but not yet
+    drained are left unconfirmed on Telegram's side and are delivered again.
+
+    With ``relay`` set to (relay_url, secret), the worker waits on a webhook
+    relay instead of calling ``getUpdates``; the offset is then unused. It
+    takes only replies to ``reply_to`` (the debate's earlier notification
+    messages), so plain messages and replies meant for other debates sharing
+    the bot are left to them.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        chat_id: str,
+        offset: Optional[int] = None,
+        poll_timeout: int = LONG_POLL_TIMEOUT,
+        relay: Optional[tuple[str, str]] = None,
+        reply_to: Optional[list[int]] = None,
+    ):
+        self.token = token
+        self.chat_id = str(chat_id)
+        self.offset = offset
+        self.poll_timeout = poll_timeout
+        self.relay = relay
+        self.reply_to = list(reply_to or [])
+        self._replies: queue.Queue[str] = queue.Queue()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="telegram-feedback", daemon=True
+        )
+
+    def start(self) -> "FeedbackWorker":
+        """Start polling in the background."""
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        if self.relay:
+            self._run_relay(*self.relay)
+            return
+        if self.offset is None:
+            try:
+                self.offset = get_last_update_id(self.token) + 1
+            except RuntimeError:
+                self.offset = 0
+        while not self._stopped.is_set():
+            params: dict[str, Any] = {
+                "timeout": self.poll_timeout,
+                "allowed_updates": ["message"],
+            }
+            if self.offset:
+                params["offset"] = self.offset
+            try:
+                result = api_call(self.token, "getUpdates", params)
+            except RuntimeError:
+                self._stopped.wait(1)
+                continue
+            if self._stopped.is_set():
+                break  # leave this batch unconfirmed for the next worker
+            with self._lock:
+                for update in result.get("result", []):
+                    self.offset = update["update_id"] + 1
+                    message = update.get("message", {})
+                    msg_chat_id = str(message.get("chat", {}).get("id", ""))
+                    text = message.get("text", "")
+                    if msg_chat_id == self.chat_id and text:
+                        self._replies.put(text)
+
+    def _run_relay(self, relay_url: str, secret: str) -> None:
+        import telegram_webhook
+
+        if not self.reply_to:
+            return  # no notification yet, so nothing can be a reply to it
+        while not self._stopped.is_set():
+            try:
+                text = telegram_webhook.wait_via_relay(
+                    relay_url,
+                    secret,
+                    self.chat_id,
+                    self.reply_to,
+                    timeout=self.poll_timeout,
+                    replies_only=True,
+                )
+            except RuntimeError:
+                self._stopped.wait(1)
+                continue
+            if text is None:
+                continue
+            if self._stopped.is_set():
+                # Too late for this round; give it back for the next one
+                try:
+                    telegram_webhook.requeue_via_relay(
+                        relay_url, secret, self.chat_id, text, self.reply_to[-1]
+                    )
+                except RuntimeError:
+                    pass
+                break
+            with self._lock:
+                self._replies.put(text)
+
+    def drain(self) -> tuple[list[str], Optional[int]]:
+        """Return all queued replies and the offset that confirms them."""
+        with self._lock:
+            replies = []
+            while not self._replies.empty():
+                replies.append(self._replies.get_nowait())
+            return replies, self.offset
+
+    def stop(self) -> None:
+        """Stop polling. An in-flight long poll is abandoned, not awaited."""
+        self._stopped.set()
+
+
 def discover_chat_id(token: str) -> None:
     """Poll for messages and print chat IDs.
 
@@ -330,7 +873,11 @@ def cmd_send(args: argparse.Namespace) -> None:
         print("Error: No message provided via stdin", file=sys.stderr)
         sys.exit(1)
 
-    if send_long_message(token, chat_id, text):
+    if args.document:
+        sent = send_document(token, chat_id, args.document, text, compress=args.gzip)
+    else:
+        sent = send_long_message(token, chat_id, text)
+    if sent:
         print("Message sent.")
     else:
         print("Failed to send message.", file=sys.stderr)
@@ -351,10 +898,11 @@ def cmd_poll(args: argparse.Namespace) -> None:
         )
         sys.exit(2)
 
-    last_update = get_last_update_id(token)
+    relay_url, _ = get_relay_config()
+    last_update = 0 if relay_url else get_last_update_id(token)
     print(f"Polling for reply (timeout: {args.timeout}s)...", file=sys.stderr)
 
-    reply = poll_for_reply(token, chat_id, args.timeout, last_update)
+    reply = wait_for_reply(token, chat_id, args.timeout, last_update)
     if reply:
         print(reply)
     else:
@@ -382,25 +930,55 @@ def cmd_notify(args: argparse.Namespace) -> None:
         print("Error: No notification provided via stdin", file=sys.stderr)
         sys.exit(1)
 
-    # Get last update ID before sending
-    last_update = get_last_update_id(token)
+    # Get last update ID before sending (webhook mode routes by reply instead)
+    relay_url, _ = get_relay_config()
+    last_update = 0 if relay_url else get_last_update_id(token)
 
     # Send notification
     notification += (
         f"\n\n_Reply within {args.timeout}s to add feedback, or wait to continue._"
     )
-    if not send_long_message(token, chat_id, notification):
+    message_ids = None
+    if relay_url:
+        message_ids = send_long_message_ids(token, chat_id, notification)
+        sent = message_ids is not None
+    else:
+        sent = send_long_message(token, chat_id, notification)
+    if not sent:
         print("Failed to send notification.", file=sys.stderr)
         sys.exit(1)
 
-    # Poll for reply
-    reply = poll_for_reply(token, chat_id, args.timeout, last_update)
+    # Wait for reply
+    reply = wait_for_reply(token, chat_id, args.timeout, last_update, message_ids)
 
     # Output as JSON
     result = {"notification_sent": True, "feedback": reply}
     print(json.dumps(result))
 
 
+def cmd_webhook(args: argparse.Namespace) -> None:
+    """Run the webhook relay for concurrent debates.
+
+    Args:
+        args: Parsed command-line arguments (public_url, host, port).
+    """
+    import telegram_webhook
+
+    token, _ = get_config()
+    _, secret = get_relay_config()
+    if not token or not secret:
+        print(
+            "Error: TELEGRAM_BOT_TOKEN and TELEGRAM_WEBHOOK_SECRET must be set",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+    try:
+        telegram_webhook.run_relay(token, secret, args.public_url, args.host, args.port)
+    except (OSError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
 def main() -> None:
     """Entry point for the telegram_bot CLI."""
     parser = argparse.ArgumentParser(
@@ -417,6 +995,14 @@ def main() -> None:
 
     # send
     send_parser = subparsers.add_parser("send", help="Send message from stdin")
+    send_parser.add_argument(
+        "--document",
+        metavar="FILENAME",
+        help="Upload stdin as a single document with this file name",
+    )
+    send_parser.add_argument(
+        "--gzip", action="store_true", help="Gzip the document before uploading"
+    )
     send_parser.set_defaults(func=cmd_send)
 
     # poll
@@ -435,6 +1021,23 @@ def main() -> None:
     )
     notify_parser.set_defaults(func=cmd_notify)
 
+    # webhook
+    webhook_parser = subparsers.add_parser(
+        "webhook", help="Run a webhook relay so several debates can share one bot"
+    )
+    webhook_parser.add_argument(
+        "--public-url",
+        required=True,
+        help="Public HTTPS URL that forwards to this relay's /webhook path",
+    )
+    webhook_parser.add_argument(
+        "--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)"
+    )
+    webhook_parser.add_argument(
+        "--port", type=int, default=8787, help="Port to bind (default: 8787)"
+    )
+    webhook_parser.set_defaults(func=cmd_webhook)
+
     args = parser.parse_args()
     args.func(args)
 
@@ -0,0 +1,375 @@
+"""
+Local webhook relay that routes Telegram updates to waiting debates.
+
+getUpdates long polling is serialized per bot token, so two debates polling
+the same bot steal each other's replies. In webhook mode Telegram pushes
+every update to one relay process, and each debate waits on the relay
+instead. A reply to a debate's notification goes to that debate; other
+messages go to the longest-waiting debate in the chat that accepts them.
+Background feedback workers (--telegram-async) take replies only.
+
+Usage:
+    python3 telegram_bot.py webhook --public-url https://example.com/webhook
+
+Environment:
+    TELEGRAM_WEBHOOK_RELAY  - Relay URL debates connect to (e.g. http://127.0.0.1:8787)
+    TELEGRAM_WEBHOOK_SECRET - Shared secret for Telegram and for debates
+"""
+
+from __future__ import annotations
+
+import hmac
+import http.client
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+WEBHOOK_PATH = "/webhook"
+WAIT_PATH = "/wait"
+TELEGRAM_SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+RELAY_SECRET_HEADER = "X-Relay-Secret"
+DEFAULT_RELAY_PORT = 8787
+MAX_WAIT_SECONDS = 300
+MAILBOX_TTL = 3600  # seconds an unclaimed message is kept
+MAILBOX_LIMIT = 100  # unclaimed messages kept per chat
+
+
+@dataclass
+class _Waiter:
+    chat_id: str
+    reply_to: set[int]
+    replies_only: bool = False
+    text: Optional[str] = None
+
+
+@dataclass
+class _Unclaimed:
+    reply_to: Optional[int]
+    text: str
+    received: float = field(default_factory=time.monotonic)
+
+
+class UpdateRouter:
+    """Hand Telegram messages to the debates waiting for them.
+
+    A message that replies to one of a waiter's notification messages goes to
+    that waiter only. A plain message goes to the longest-waiting debate in
+    the chat that accepts plain messages. Messages nobody is waiting for are
+    kept in a per-chat mailbox and handed out by the same rules when a debate
+    starts waiting.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._waiters: list[_Waiter] = []
+        self._mailbox: dict[str, list[_Unclaimed]] = {}
+
+    def dispatch(self, update: dict[str, Any]) -> bool:
+        """Route one update. Returns True if a waiting debate received it."""
+        message = update.get("message") or {}
+        chat_id = str(message.get("chat", {}).get("id", ""))
+        text = message.get("text", "")
+        if not chat_id or not text:
+            return False
+        reply_to = (message.get("reply_to_message") or {}).get("message_id")
+
+        with self._cond:
+            waiting = [
+                w for w in self._waiters if w.chat_id == chat_id and w.text is None
+            ]
+            if reply_to is not None:
+                target = next((w for w in waiting if reply_to in w.reply_to), None)
+            else:
+                target = next((w for w in waiting if not w.replies_only), None)
+            if target is not None:
+                target.text = text
+                self._cond.notify_all()
+                return True
+
+            box = self._mailbox.setdefault(chat_id, [])
+            box.append(_Unclaimed(reply_to, text))
+            self._prune(box)
+            return False
+
+    def _prune(self, box: list[_Unclaimed]) -> None:
+        cutoff = time.monotonic() - MAILBOX_TTL
+        box[:] = [m for m in box if m.received >= cutoff][-MAILBOX_LIMIT:]
+
+    def _claim(
+        self, chat_id: str, reply_to: set[int], replies_only: bool
+    ) -> Optional[str]:
+        box = self._mailbox.get(chat_id, [])
+        self._prune(box)
+        for index, message in enumerate(box):
+            if message.reply_to in reply_to or (
+                message.reply_to is None and not replies_only
+            ):
+                return box.pop(index).text
+        return None
+
+    def wait(
+        self,
+        chat_id: str,
+        reply_to: Optional[set[int]],
+        timeout: float,
+        replies_only: bool = False,
+    ) -> Optional[str]:
+        """Block until a message for this debate arrives or timeout expires.
+
+        Args:
+            chat_id: Chat the debate reports to.
+            reply_to: Message IDs of the debate's notification.
+            timeout: Maximum seconds to wait.
+            replies_only: Accept only replies to reply_to, not plain messages.
+
+        Returns:
+            Message text, or None on timeout.
+        """
+        chat_id = str(chat_id)
+        reply_to = reply_to or set()
+        with self._cond:
+            text = self._claim(chat_id, reply_to, replies_only)
+            if text is not None:
+                return text
+            waiter = _Waiter(chat_id, reply_to, replies_only)
+            self._waiters.append(waiter)
+            deadline = time.monotonic() + timeout
+            try:
+                while waiter.text is None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            finally:
+                self._waiters.remove(waiter)
+            return waiter.text
+
+
+class _RelayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    relay: WebhookRelay
+
+    def _respond(self, status: int, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self, header: str) -> bool:
+        supplied = self.headers.get(header, "")
+        return hmac.compare_digest(supplied.encode(), self.relay.secret.encode())
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        if urlsplit(self.path).path != WEBHOOK_PATH:
+            self._respond(404, {"ok": False})
+            return
+        if not self._authorized(TELEGRAM_SECRET_HEADER):
+            self._respond(403, {"ok": False})
+            return
+        try:
+            update = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            self._respond(400, {"ok": False})
+            return
+        self._respond(
+            200, {"ok": True, "delivered": self.relay.router.dispatch(update)}
+        )
+
+    def do_GET(self) -> None:  # noqa: N802
+        url = urlsplit(self.path)
+        if url.path != WAIT_PATH:
+            self._respond(404, {"ok": False})
+            return
+        if not self._authorized(RELAY_SECRET_HEADER):
+            self._respond(403, {"ok": False})
+            return
+        query = parse_qs(url.query)
+        try:
+            chat_id = query["chat_id"][0]
+            reply_to = {int(i) for i in query.get("reply_to", [""])[0].split(",") if i}
+            timeout = min(float(query.get("timeout", ["30"])[0]), MAX_WAIT_SECONDS)
+        except (KeyError, ValueError):
+            self._respond(400, {"ok": False})
+            return
+        replies_only = query.get("replies_only", [""])[0] == "1"
+        text = self.relay.router.wait(chat_id, reply_to, timeout, replies_only)
+        self._respond(200, {"ok": True, "text": text})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.relay.verbose:
+            super().log_message(format, *args)
+
+
+class WebhookRelay:
+    """Threaded HTTP server that receives webhooks and serves waiting debates."""
+
+    def __init__(
+        self,
+        secret: str,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_RELAY_PORT,
+        verbose: bool = False,
+    ):
+        if not secret:
+            raise ValueError("A webhook secret is required")
+        self.secret = secret
+        self.verbose = verbose
+        self.router = UpdateRouter()
+        handler = type("RelayHandler", (_RelayHandler,), {"relay": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL debates use to reach the relay."""
+        host, port = self.server.server_address[:2]
+        return f"http://{str(host)}:{int(port)}"
+
+    def start(self) -> "WebhookRelay":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, name="telegram-relay", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the current thread until interrupted."""
+        self.server.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _relay_request(
+    relay_url: str,
+    method: str,
+    path: str,
+    headers: dict[str, str],
+    body: Optional[bytes] = None,
+    timeout: float = 30,
+) -> dict[str, Any]:
+    url = urlsplit(relay_url)
+    connection_class = (
+        http.client.HTTPSConnection
+        if url.scheme == "https"
+        else http.client.HTTPConnection
+    )
+    conn = connection_class(url.hostname or "127.0.0.1", url.port, timeout=timeout)
+    try:
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        data = response.read()
+    except (OSError, http.client.HTTPException) as e:
+        raise RuntimeError(f"Webhook relay unreachable: {e}")
+    finally:
+        conn.close()
+    if response.status != 200:
+        raise RuntimeError(f"Webhook relay error {response.status}")
+    return json.loads(data.decode("utf-8"))
+
+
+def wait_via_relay(
+    relay_url: str,
+    secret: str,
+    chat_id: str,
+    reply_to: Optional[list[int]] = None,
+    timeout: float = 60,
+    replies_only: bool = False,
+) -> Optional[str]:
+    """Wait on the relay for a reply from a chat.
+
+    Args:
+        relay_url: Base URL of the relay.
+        secret: Shared relay secret.
+        chat_id: Chat to wait for.
+        reply_to: Notification message IDs that replies may target.
+        timeout: Maximum seconds to wait.
+        replies_only: Accept only replies to reply_to, not plain messages.
+
+    Returns:
+        Reply text, or None on timeout.
+
+    Raises:
+        RuntimeError: If the relay is unreachable or rejects the request.
+    """
+    params: dict[str, Any] = {
+        "chat_id": chat_id,
+        "reply_to": ",".join(str(i) for i in reply_to or []),
+        "timeout": timeout,
+    }
+    if replies_only:
+        params["replies_only"] = 1
+    query = urlencode(params)
+    result = _relay_request(
+        relay_url,
+        "GET",
+        f"{WAIT_PATH}?{query}",
+        {RELAY_SECRET_HEADER: secret},
+        timeout=timeout + 10,
+    )
+    return result.get("text")
+
+
+def requeue_via_relay(
+    relay_url: str,
+    secret: str,
+    chat_id: str,
+    text: str,
+    reply_to: Optional[int] = None,
+) -> None:
+    """Hand a reply that a stopped worker received back to the relay mailbox.
+
+    With reply_to, the reply is requeued as a reply to that message, so it
+    stays with the debate that owns it.
+    """
+    message: dict[str, Any] = {"chat": {"id": chat_id}, "text": text}
+    if reply_to is not None:
+        message["reply_to_message"] = {"message_id": reply_to}
+    update = {"message": message}
+    _relay_request(
+        relay_url,
+        "POST",
+        WEBHOOK_PATH,
+        {TELEGRAM_SECRET_HEADER: secret, "Content-Type": "application/json"},
+        body=json.dumps(update).encode("utf-8"),
+    )
+
+
+def run_relay(token: str, secret: str, public_url: str, host: str, port: int) -> None:
+    """Register the webhook, serve until interrupted, then remove the webhook.
+
+    Args:
+        token: Bot API token.
+        secret: Shared secret for Telegram and debates.
+        public_url: Public HTTPS URL Telegram posts updates to.
+        host: Local interface to bind.
+        port: Local port to bind.
+    """
+    import telegram_bot
+
+    relay = WebhookRelay(secret, host=host, port=port, verbose=True)
+    if not telegram_bot.set_webhook(token, public_url, secret):
+        relay.server.server_close()
+        raise RuntimeError("setWebhook failed")
+    print(f"Relay listening on {relay.url}; webhook set to {public_url}")
+    print(f"Debates: export TELEGRAM_WEBHOOK_RELAY={relay.url}")
+    try:
+        relay.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping relay.", file=sys.stderr)
+    finally:
+        relay.server.server_close()
+        telegram_bot.delete_webhook(token)
@@ -0,0 +1,17 @@
+"""Shared fixtures for the test suite."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pricing
+
+
+@pytest.fixture(autouse=True)
+def isolated_pricing_cache(tmp_path, monkeypatch):
+    """Keep the litellm pricing cache out of the real home directory."""
+    monkeypatch.setattr(pricing, "PRICING_CACHE_PATH", tmp_path / "pricing.json")
+    monkeypatch.setattr(pricing, "_litellm_table", None)
@@ -7,6 +7,8 @@ from io import StringIO
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -707,6 +709,32 @@ class TestSetupBedrock:
                 assert region is None
 
 
+class TestValidateModelsBeforeRun:
+    """Tests for validate_models_before_run error messages."""
+
+    def test_reports_requirement_per_provider(self):
+        import debate
+
+        with patch.dict("os.environ", {}, clear=True):
+            with patch("providers.CLAUDE_CLI_AVAILABLE", False):
+                with patch("sys.stderr", new_callable=StringIO) as mock_err:
+                    with pytest.raises(SystemExit) as exc_info:
+                        debate.validate_models_before_run(
+                            ["gpt-4o", "claude-cli/opus"], bedrock_mode=False
+                        )
+        assert exc_info.value.code == 2
+        err = mock_err.getvalue()
+        assert "gpt-4o (requires OPENAI_API_KEY)" in err
+        assert "claude-cli/opus (requires Claude CLI: npm install" in err
+
+    def test_skips_validation_in_bedrock_mode(self):
+        import debate
+
+        with patch("debate.validate_model_credentials") as mock_validate:
+            debate.validate_models_before_run(["gpt-4o"], bedrock_mode=True)
+        mock_validate.assert_not_called()
+
+
 class TestSendTelegramNotification:
     """Tests for send_telegram_notification function.
 
@@ -743,6 +771,30 @@ class TestSendTelegramNotification:
         feedback = debate.send_telegram_notification(["gpt-4o"], 1, results, 60)
         assert feedback == "User feedback"
 
+    @patch("telegram_bot.wait_for_reply")
+    @patch("telegram_bot.send_long_message_ids")
+    @patch("telegram_bot.get_last_update_id")
+    @patch("telegram_bot.get_config")
+    def test_webhook_mode_waits_for_reply_to_notification(
+        self, mock_config, mock_last_id, mock_send, mock_wait
+    ):
+        import debate
+        from models import ModelResponse
+
+        mock_config.return_value = ("token", "123")
+        mock_send.return_value = [11, 12]
+        mock_wait.return_value = "Relayed feedback"
+        results = [ModelResponse(model="m", response="c", agreed=False, spec=None)]
+
+        with patch.dict(
+            "os.environ",
+            {"TELEGRAM_WEBHOOK_RELAY": "http://127.0.0.1:8787"},
+        ):
+            feedback = debate.send_telegram_notification(["m"], 1, results, 60)
+        assert feedback == "Relayed feedback"
+        mock_last_id.assert_not_called()
+        mock_wait.assert_called_once_with("token", "123", 60, reply_to=[11, 12])
+
     @patch("telegram_bot.get_config")
     def test_returns_none_when_not_configured(self, mock_config):
         import debate
@@ -812,3 +864,452 @@ class TestSendTelegramNotification:
         debate.send_telegram_notification(["gpt-4o"], 1, results, 60)
         call_args = mock_send.call_args
         assert "ERROR" in call_args[0][2]
+
+
+class TestCLIDiffSections:
+    def test_diff_sections_text(self, tmp_path):
+        import debate
+
+        prev = tmp_path / "prev.md"
+        curr = tmp_path / "curr.md"
+        prev.write_text("# A\none\n# B\ntwo\n")
+        curr.write_text("# B\ntwo\n# A\nuno\n")
+
+        argv = ["debate.py", "diff", "--previous", str(prev), "--current", str(curr)]
+        with patch("sys.argv", argv + ["--sections"]):
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                debate.main()
+                output = mock_stdout.getvalue()
+                assert "Section Changes" in output
+                assert "edited  A" in output
+                assert "+uno" in output
+
+    def test_diff_sections_json(self, tmp_path):
+        import debate
+
+        prev = tmp_path / "prev.md"
+        curr = tmp_path / "curr.md"
+        prev.write_text("# A\none\n")
+        curr.write_text("# A\none\n# C\nthree\n")
+
+        argv = ["debate.py", "diff", "--previous", str(prev), "--current", str(curr)]
+        with patch("sys.argv", argv + ["--json"]):
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                debate.main()
+                data = json.loads(mock_stdout.getvalue())
+                assert data["summary"]["added"] == 1
+                assert data["sections"][0]["key"] == "C"
+
+    def test_diff_sections_identical(self, tmp_path):
+        import debate
+
+        prev = tmp_path / "prev.md"
+        prev.write_text("# A\n")
+        argv = ["debate.py", "diff", "--previous", str(prev), "--current", str(prev)]
+        with patch("sys.argv", argv + ["--sections"]):
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                debate.main()
+                assert "No differences found." in mock_stdout.getvalue()
+
+    @patch("debate.validate_models_before_run")
+    @patch("debate.call_models_parallel")
+    def test_session_history_records_section_changes(
+        self, mock_call, mock_validate, tmp_path
+    ):
+        import debate
+        from models import ModelResponse
+
+        mock_call.return_value = [
+            ModelResponse(
+                model="gpt-4o",
+                response="[SPEC]\n# A\nrevised\n[/SPEC]",
+                agreed=False,
+                spec="# A\nrevised\n",
+            )
+        ]
+        sessions_dir = tmp_path / "sessions"
+        with (
+            patch("session.SESSIONS_DIR", sessions_dir),
+            patch("session.CHECKPOINTS_DIR", tmp_path / "checkpoints"),
+        ):
+            with patch("sys.stdin", StringIO("# A\noriginal\n")):
+                argv = ["debate.py", "critique", "--models", "gpt-4o"]
+                with patch("sys.argv", argv + ["--session", "s1", "--json"]):
+                    with patch("sys.stdout", new_callable=StringIO):
+                        with patch("sys.stderr", new_callable=StringIO):
+                            debate.main()
+            data = json.loads((sessions_dir / "s1.json").read_text())
+            changes = data["history"][0]["section_changes"]
+            assert changes["summary"]["edited"] == 1
+            assert changes["sections"][0]["key"] == "A"
+
+
+class TestCLIDiffEngines:
+    def test_diff_with_engine_and_word_diff(self, tmp_path):
+        import debate
+
+        prev = tmp_path / "prev.md"
+        curr = tmp_path / "curr.md"
+        prev.write_text("line1\nthe old value\n")
+        curr.write_text("line1\nthe new value\n")
+
+        argv = ["debate.py", "diff", "--previous", str(prev), "--current", str(curr)]
+        with patch("sys.argv", argv + ["--diff-engine", "myers", "--word-diff"]):
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                debate.main()
+                assert "~the [-old-]{+new+} value" in mock_stdout.getvalue()
+
+    def test_diff_benchmark(self, tmp_path):
+        import debate
+
+        prev = tmp_path / "prev.md"
+        curr = tmp_path / "curr.md"
+        prev.write_text("a\nb\n")
+        curr.write_text("a\nc\n")
+
+        argv = ["debate.py", "diff", "--previous", str(prev), "--current", str(curr)]
+        with patch("sys.argv", argv + ["--benchmark", "--json"]):
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                debate.main()
+                rows = json.loads(mock_stdout.getvalue())["benchmark"]
+                assert {"difflib", "myers"} <= {r["engine"] for r in rows}
+
+        with patch("sys.argv", argv + ["--benchmark"]):
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                debate.main()
+                assert "Diff Engine Benchmark" in mock_stdout.getvalue()
+
+
+class TestCLIMerge:
+    @patch("debate.validate_models_before_run")
+    @patch("debate.call_models_parallel")
+    def test_merge_combines_revisions(self, mock_call, mock_validate):
+        import debate
+        from models import ModelResponse
+
+        base = "# A\none\n\n# B\ntwo\n"
+        mock_call.return_value = [
+            ModelResponse(
+                model="gemini/gemini-2.0-flash",
+                response="critique",
+                agreed=False,
+                spec="# A\none\n\n# B\nTWO\n",
+            ),
+            ModelResponse(
+                model="gpt-4o",
+                response="critique",
+                agreed=False,
+                spec="# A\nONE\n\n# B\ntwo\n",
+            ),
+        ]
+        argv = ["debate.py", "critique", "--models", "gpt-4o,gemini/gemini-2.0-flash"]
+        with patch("sys.stdin", StringIO(base)):
+            with patch("sys.argv", argv + ["--merge", "--json"]):
+                with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                    with patch("sys.stderr", new_callable=StringIO):
+                        debate.main()
+        data = json.loads(mock_stdout.getvalue())
+        assert data["merge"]["spec"] == "# A\nONE\n\n# B\nTWO\n"
+        assert data["merge"]["sources"] == ["gpt-4o", "gemini/gemini-2.0-flash"]
+        assert data["merge"]["conflicts"] == []
+
+    def test_text_output_includes_merge_report(self):
+        import debate
+        from merge import merge_specs
+        from models import ModelResponse
+
+        args = debate.create_parser().parse_args(["critique"])
+        merge_result = merge_specs("# A\nx\n", [("gpt-4o", "# A\ny\n")])
+        results = [
+            ModelResponse(model="gpt-4o", response="c", agreed=False, spec="# A\ny\n")
+        ]
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            debate.output_results(
+                args, results, ["gpt-4o"], False, None, None, merge_result=merge_result
+            )
+        output = mock_stdout.getvalue()
+        assert "=== Merged Spec ===" in output
+        assert "# A\ny" in output
+
+
+class TestCLIConvergence:
+    @patch("debate.validate_models_before_run")
+    @patch("debate.call_models_parallel")
+    def test_json_and_session_record_convergence(
+        self, mock_call, mock_validate, tmp_path
+    ):
+        import debate
+        from models import ModelResponse
+
+        mock_call.return_value = [
+            ModelResponse(model="gpt-4o", response="[AGREE]", agreed=True, spec=None)
+        ]
+        sessions_dir = tmp_path / "sessions"
+        with (
+            patch("session.SESSIONS_DIR", sessions_dir),
+            patch("session.CHECKPOINTS_DIR", tmp_path / "checkpoints"),
+        ):
+            with patch("sys.stdin", StringIO("# A\nbody\n")):
+                argv = ["debate.py", "critique", "--models", "gpt-4o"]
+                with patch("sys.argv", argv + ["--session", "c1", "--json"]):
+                    with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                        with patch("sys.stderr", new_callable=StringIO):
+                            debate.main()
+            data = json.loads(mock_stdout.getvalue())
+            assert data["convergence"]["recommendation"] == "stop"
+            assert data["convergence"]["metrics"]["agreement"] == 1.0
+            history = json.loads((sessions_dir / "c1.json").read_text())["history"]
+            assert history[0]["metrics"]["edit_distance"] == 0
+            assert history[0]["convergence"]["recommendation"] == "stop"
+
+            with patch("sys.argv", ["debate.py", "sessions", "--session", "c1"]):
+                with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                    debate.main()
+            output = mock_stdout.getvalue()
+            assert "Session c1" in output
+            assert "Recommendation: stop" in output
+
+    def test_sessions_unknown_session_exits(self, tmp_path):
+        import debate
+
+        with patch("session.SESSIONS_DIR", tmp_path):
+            with patch("sys.argv", ["debate.py", "sessions", "--session", "nope"]):
+                with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+                    with pytest.raises(SystemExit) as exc_info:
+                        debate.main()
+        assert exc_info.value.code == 2
+        assert "not found" in mock_stderr.getvalue()
+
+
+class TestCLIDigest:
+    @patch("debate.validate_models_before_run")
+    @patch("debate.call_models_parallel")
+    def test_json_digest_replaces_responses(self, mock_call, mock_validate):
+        import debate
+        from models import ModelResponse
+
+        critique = "- The login endpoint lacks rate limiting entirely.\n"
+        mock_call.return_value = [
+            ModelResponse(model="gpt-4o", response=critique, agreed=False, spec=None),
+            ModelResponse(model="gemini", response=critique, agreed=False, spec=None),
+        ]
+        argv = ["debate.py", "critique", "--models", "gpt-4o,gemini"]
+        with patch("sys.stdin", StringIO("# Spec\n")):
+            with patch("sys.argv", argv + ["--digest", "--json"]):
+                with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                    with patch("sys.stderr", new_callable=StringIO):
+                        debate.main()
+        data = json.loads(mock_stdout.getvalue())
+        assert data["digest"][0]["models"] == ["gpt-4o", "gemini"]
+        assert all(r["response"] is None for r in data["results"])
+
+    def test_text_output_prints_digest(self):
+        import debate
+        from digest import CritiqueCluster
+        from models import ModelResponse
+
+        args = debate.create_parser().parse_args(["critique"])
+        results = [
+            ModelResponse(model="gpt-4o", response="long", agreed=False, spec=None)
+        ]
+        digest = [CritiqueCluster(point="Add rate limiting", models=["gpt-4o"])]
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            debate.output_results(
+                args, results, ["gpt-4o"], False, None, None, digest=digest
+            )
+        output = mock_stdout.getvalue()
+        assert "[CRITIQUED - see digest]" in output
+        assert "[1/1] Add rate limiting (gpt-4o)" in output
+        assert "long" not in output
+
+
+class TestSendFinalSpecToTelegram:
+    def run_send(self, spec, compress=False):
+        import debate
+
+        with patch.dict(
+            "os.environ", {"TELEGRAM_BOT_TOKEN": "t", "TELEGRAM_CHAT_ID": "1"}
+        ):
+            with (
+                patch("telegram_bot.send_message", return_value=True) as send_message,
+                patch("telegram_bot.send_long_message", return_value=True) as send_long,
+                patch("telegram_bot.send_document", return_value=True) as send_doc,
+            ):
+                ok = debate.send_final_spec_to_telegram(
+                    spec, 3, ["gpt-4o"], "tech", compress=compress
+                )
+        return ok, send_message, send_long, send_doc
+
+    def test_short_spec_sent_inline(self):
+        ok, send_message, send_long, send_doc = self.run_send("# Spec\nbody\n")
+        assert ok
+        assert "Final document:" in send_message.call_args[0][2]
+        send_long.assert_called_once()
+        send_doc.assert_not_called()
+
+    def test_large_spec_uploaded_as_document(self):
+        spec = "".join(f"# Section {i}\n" + "x" * 1000 + "\n" for i in range(200))
+        ok, send_message, send_long, send_doc = self.run_send(spec, compress=True)
+        assert ok
+        assert "attached (198 KB, 200 sections)" in send_message.call_args[0][2]
+        send_long.assert_not_called()
+        args, kwargs = send_doc.call_args
+        assert args[2:4] == ("tech-final.md", spec)
+        assert kwargs["compress"] is True
+
+
+class TestCLITelegramAsync:
+    @patch("debate.send_async_telegram_notification", return_value=[7, 8])
+    @patch("debate.start_feedback_worker")
+    @patch("debate.validate_models_before_run")
+    @patch("debate.call_models_parallel")
+    def test_background_feedback_saved_with_offset(
+        self, mock_call, mock_validate, mock_start, mock_notify, tmp_path
+    ):
+        from unittest.mock import MagicMock
+
+        import debate
+        from models import ModelResponse
+
+        mock_call.return_value = [
+            ModelResponse(model="gpt-4o", response="[AGREE]", agreed=True, spec=None)
+        ]
+        worker = MagicMock()
+        worker.drain.return_value = (["tighten auth"], 42)
+        mock_start.return_value = worker
+        sessions_dir = tmp_path / "sessions"
+        argv = ["debate.py", "critique", "--models", "gpt-4o", "--telegram"]
+        with (
+            patch("session.SESSIONS_DIR", sessions_dir),
+            patch("session.CHECKPOINTS_DIR", tmp_path / "checkpoints"),
+        ):
+            with patch("sys.stdin", StringIO("# Spec\n")):
+                with patch(
+                    "sys.argv",
+                    argv + ["--telegram-async", "--session", "tg", "--json"],
+                ):
+                    with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                        with patch("sys.stderr", new_callable=StringIO):
+                            debate.main()
+            saved = json.loads((sessions_dir / "tg.json").read_text())
+        data = json.loads(mock_stdout.getvalue())
+        assert data["user_feedback"] == "tighten auth"
+        assert data["rerun_with_feedback"] is True
+        assert saved["telegram_offset"] == 42
+        assert saved["telegram_message_ids"] == [7, 8]
+        mock_start.assert_called_once_with(None, [])
+        mock_notify.assert_called_once()
+        worker.stop.assert_called_once()
+
+    @patch("telegram_bot.poll_for_reply")
+    @patch("telegram_bot.get_last_update_id")
+    @patch("telegram_bot.send_long_message_ids", return_value=[5, 6])
+    def test_async_notification_does_not_poll(self, mock_send, mock_last_id, mock_poll):
+        import debate
+        from models import ModelResponse
+
+        results = [ModelResponse(model="m", response="c", agreed=False, spec=None)]
+        with patch.dict(
+            "os.environ", {"TELEGRAM_BOT_TOKEN": "t", "TELEGRAM_CHAT_ID": "1"}
+        ):
+            assert debate.send_async_telegram_notification(2, results) == [5, 6]
+        assert "picked up by the next round" in mock_send.call_args[0][2]
+        mock_last_id.assert_not_called()
+        mock_poll.assert_not_called()
+
+    @patch("debate.call_models_parallel")
+    @patch("debate.validate_models_before_run")
+    def test_requires_session(self, mock_validate, mock_call):
+        import debate
+
+        argv = ["critique", "--models", "gpt-4o", "--telegram", "--telegram-async"]
+        with (
+            patch("sys.stdin", StringIO("# Spec\n")),
+            patch("sys.stderr", new_callable=StringIO) as mock_stderr,
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            debate.main(argv)
+        assert exc_info.value.code == 2
+        assert "--telegram-async requires --session" in mock_stderr.getvalue()
+        mock_call.assert_not_called()
+
+    def test_start_feedback_worker_requires_config(self):
+        import debate
+
+        with patch.dict("os.environ", {}, clear=True):
+            with patch("sys.stderr", new_callable=StringIO):
+                assert debate.start_feedback_worker(None) is None
+
+
+class TestCLIContextPacking:
+    @patch("debate.validate_models_before_run")
+    @patch("debate.call_models_parallel")
+    def test_json_records_trimmed_context(self, mock_call, mock_validate, tmp_path):
+        import debate
+        from models import ModelResponse
+
+        context = tmp_path / "notes.md"
+        context.write_text("notes " * 50)
+        mock_call.return_value = [
+            ModelResponse(model="gpt-4o", response="[AGREE]", agreed=True, spec=None)
+        ]
+        argv = ["debate.py", "critique", "--models", "gpt-4o", "--json"]
+        argv += ["--context", str(context)]
+        with patch("context_pack.context_budget", return_value=10):
+            with patch("sys.stdin", StringIO("# Spec\n")):
+                with patch("sys.argv", argv):
+                    with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                        with patch("sys.stderr", new_callable=StringIO) as mock_err:
+                            debate.main()
+        data = json.loads(mock_stdout.getvalue())
+        assert data["context_packing"]["gpt-4o"]["dropped"][0]["path"] == str(context)
+        assert "context for gpt-4o trimmed" in mock_err.getvalue()
+        contexts = mock_call.call_args[1]["contexts"]
+        assert "notes" not in contexts["gpt-4o"]
+
+
+class TestCLIContextIndex:
+    def test_index_then_auto_context(self, tmp_path):
+        import debate
+        from models import ModelResponse
+
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "auth.md").write_text("# Auth\n\nLogin attempts are rate limited.\n")
+        (docs / "billing.md").write_text("# Billing\n\nInvoices are monthly.\n")
+        index = tmp_path / "index.json"
+
+        argv = ["debate.py", "context-index", "--docs", str(docs)]
+        with patch("sys.argv", argv + ["--index", str(index), "--json"]):
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                debate.main()
+        assert json.loads(mock_stdout.getvalue())["files"] == 2
+
+        argv = ["debate.py", "critique", "--models", "gpt-4o", "--json"]
+        argv += ["--auto-context", "--auto-context-k", "1", "--index", str(index)]
+        response = ModelResponse(model="gpt-4o", response="ok", agreed=True, spec=None)
+        with patch("debate.validate_models_before_run"):
+            with patch("debate.call_models_parallel", return_value=[response]) as call:
+                with patch("sys.stdin", StringIO("# Spec\nRate limit login.\n")):
+                    with patch("sys.argv", argv):
+                        with patch("sys.stdout", new_callable=StringIO):
+                            with patch("sys.stderr", new_callable=StringIO) as err:
+                                debate.main()
+        context = call.call_args[0][7]
+        assert "Login attempts are rate limited" in context
+        assert "Invoices" not in context
+        assert "Auto-context: 1 chunks" in err.getvalue()
+
+    def test_auto_context_without_index(self, tmp_path):
+        import debate
+
+        argv = ["debate.py", "critique", "--models", "gpt-4o", "--auto-context"]
+        argv += ["--index", str(tmp_path / "missing.json")]
+        with patch("debate.validate_models_before_run"):
+            with patch("sys.stdin", StringIO("# Spec\n")):
+                with patch("sys.argv", argv):
+                    with patch("sys.stderr", new_callable=StringIO) as err:
+                        with pytest.raises(SystemExit) as exc:
+                            debate.main()
+        assert exc.value.code == 2
+        assert "context-index --docs" in err.getvalue()
@@ -0,0 +1,141 @@
+"""Tests for compact module and critique --compact."""
+
+import json
+import shutil
+import subprocess
+import sys
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from compact import SIDE_FILE_THRESHOLD, compact_output, spec_ref
+
+INPUT = "# Spec\n\n## Auth\nTokens.\n"
+REVISED = "# Spec\n\n## Auth\nTokens expire after 1h.\n"
+
+
+def make_output(*results, merge_spec=None):
+    output = {"round": 2, "results": [dict(r) for r in results]}
+    if merge_spec is not None:
+        output["merge"] = {"applied": 1, "spec": merge_spec}
+    return output
+
+
+def result(model, spec=None, critique="Tighten auth.", agreed=False):
+    response = critique + (f"\n[SPEC]\n{spec}\n[/SPEC]" if spec else "")
+    return {"model": model, "agreed": agreed, "response": response, "spec": spec}
+
+
+class TestCompactOutput:
+    def test_specs_listed_once_as_diffs(self):
+        output = compact_output(
+            make_output(
+                result("gpt-4o", REVISED),
+                result("gemini/gemini-pro", REVISED),
+                result("xai/grok-3", INPUT),
+                merge_spec=REVISED,
+            ),
+            INPUT,
+        )
+        ref = spec_ref(REVISED)
+        assert output["input_spec"] == spec_ref(INPUT)
+        assert [r["spec"] for r in output["results"]] == [ref, ref, spec_ref(INPUT)]
+        assert output["merge"]["spec"] == ref
+        assert list(output["specs"]) == [ref]
+        assert "+Tokens expire after 1h." in output["specs"][ref]["diff"]
+        first = output["results"][0]
+        assert "response" not in first
+        assert first["critique"] == "Tighten auth."
+
+    def test_keeps_response_without_spec_and_full_format(self):
+        output = compact_output(
+            make_output(result("gpt-4o"), result("o1", REVISED)),
+            INPUT,
+            spec_format="full",
+        )
+        assert output["results"][0]["response"] == "Tighten auth."
+        assert output["specs"][spec_ref(REVISED)]["text"] == REVISED
+
+    def test_side_files(self, tmp_path):
+        long_critique = "x" * (SIDE_FILE_THRESHOLD + 1)
+        output = compact_output(
+            make_output(result("gemini/gemini-pro", REVISED, long_critique)),
+            INPUT,
+            side_dir=tmp_path,
+        )
+        entry = output["specs"][spec_ref(REVISED)]
+        assert Path(entry["path"]).read_text() == REVISED
+        first = output["results"][0]
+        assert "critique" not in first
+        path = Path(first["critique_path"])
+        assert path.name == "round-2-gemini-gemini-pro-critique.md"
+        assert path.read_text() == long_critique
+
+    def test_digest_responses_stay_null(self):
+        entry = result("gpt-4o", REVISED)
+        entry["response"] = None
+        output = compact_output(make_output(entry), INPUT)
+        assert output["results"][0]["critique"] is None
+
+    @pytest.mark.skipif(shutil.which("patch") is None, reason="patch not installed")
+    @pytest.mark.parametrize("engine", ["myers", "difflib"])
+    @pytest.mark.parametrize(
+        ("base", "revised"),
+        [
+            (INPUT, REVISED),
+            (INPUT, REVISED.rstrip("\n")),
+            (INPUT.rstrip("\n"), REVISED),
+            (INPUT + "\n## Rate limits\nNone.", "# Spec\n\n## Auth\nRemoved.\n"),
+        ],
+    )
+    def test_diff_applies_with_patch(self, tmp_path, engine, base, revised):
+        output = compact_output(
+            make_output(result("gpt-4o", revised)), base, diff_engine=engine
+        )
+        spec_file = tmp_path / "spec.md"
+        spec_file.write_text(base)
+        subprocess.run(
+            ["patch", "--quiet", str(spec_file)],
+            input=output["specs"][spec_ref(revised)]["diff"],
+            text=True,
+            check=True,
+        )
+        assert spec_file.read_text() == revised
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            compact_output(make_output(), INPUT, spec_format="xml")
+
+
+class TestCLICompact:
+    @patch("debate.validate_models_before_run")
+    @patch("debate.call_models_parallel")
+    def test_compact_output_is_smaller(self, mock_call, mock_validate):
+        import debate
+        from models import ModelResponse
+
+        spec = "# Spec\n" + "".join(f"Requirement {i}.\n" for i in range(500))
+        revised = spec + "Requirement 500.\n"
+        mock_call.return_value = [
+            ModelResponse(m, f"Add one.\n[SPEC]\n{revised}[/SPEC]", False, revised)
+            for m in ("gpt-4o", "gemini/gemini-pro", "xai/grok-3")
+        ]
+        sizes = {}
+        for flag in ("--json", "--compact"):
+            argv = ["critique", "--models", "gpt-4o,gemini/gemini-pro,xai/grok-3"]
+            with (
+                patch("sys.stdin", StringIO(spec)),
+                patch("sys.stdout", new_callable=StringIO) as mock_stdout,
+                patch("sys.stderr", new_callable=StringIO),
+            ):
+                debate.main(argv + [flag])
+            sizes[flag] = len(mock_stdout.getvalue())
+            data = json.loads(mock_stdout.getvalue())
+        assert sizes["--compact"] * 10 < sizes["--json"]
+        assert len(data["specs"]) == 1
+        assert "+Requirement 500." in next(iter(data["specs"].values()))["diff"]
+        assert data["results"][0]["critique"] == "Add one."
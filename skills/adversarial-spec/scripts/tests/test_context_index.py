@@ -0,0 +1,112 @@
+"""Tests for context_index module."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from context_index import (
+    MAX_CHUNK_LINES,
+    ContextIndex,
+    build_index,
+    chunk_file,
+    select_chunks,
+    tokenize,
+)
+
+
+@pytest.fixture
+def docs(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "auth.md").write_text(
+        "# Authentication\n\nTokens are issued by the OAuth server.\n\n"
+        "## Rate limiting\n\nLogin attempts are rate limited per IP address.\n"
+    )
+    (docs / "billing.md").write_text(
+        "# Billing\n\nInvoices are generated monthly from usage records.\n"
+    )
+    (docs / "schema.sql").write_text("create table invoices (id int, amount int);\n")
+    return docs
+
+
+class TestTokenize:
+    def test_splits_identifiers_and_drops_stop_words(self):
+        assert tokenize("The rateLimit for user_id is 5") == [
+            "rate",
+            "limit",
+            "user",
+            "id",
+        ]
+
+
+class TestChunkFile:
+    def test_markdown_split_at_headings(self):
+        text = "# A\nalpha\n```\n# not a heading\n```\n## B\nbeta\n"
+        chunks = chunk_file("doc.md", text)
+        assert [(c.heading, c.start, c.end) for c in chunks] == [
+            ("# A", 1, 5),
+            ("## B", 6, 7),
+        ]
+
+    def test_long_files_split_into_windows(self):
+        text = "\n".join(f"line {i}" for i in range(MAX_CHUNK_LINES + 5))
+        chunks = chunk_file("code.py", text)
+        assert [(c.start, c.end) for c in chunks] == [
+            (1, MAX_CHUNK_LINES),
+            (MAX_CHUNK_LINES + 1, MAX_CHUNK_LINES + 5),
+        ]
+
+
+class TestContextIndex:
+    def test_search_ranks_relevant_chunks_first(self, docs):
+        index, _ = build_index([str(docs)])
+        results = index.search("Add rate limiting to the login endpoint")
+        assert results[0][1].heading == "## Rate limiting"
+        assert all(chunk.path != str(docs / "billing.md") for _, chunk in results)
+
+    def test_round_trips_through_disk(self, docs, tmp_path):
+        index, _ = build_index([str(docs)])
+        path = tmp_path / "index" / "context-index.json"
+        index.save(path)
+        loaded = ContextIndex.load(path)
+        assert (
+            loaded.search("invoices")[0][1].label
+            == index.search("invoices")[0][1].label
+        )
+
+    def test_invalid_index(self, tmp_path):
+        path = tmp_path / "index.json"
+        path.write_text('{"format": 99}')
+        with pytest.raises(ValueError, match="rebuild"):
+            ContextIndex.load(path)
+        with pytest.raises(FileNotFoundError):
+            ContextIndex.load(tmp_path / "missing.json")
+
+    def test_rebuild_reuses_unchanged_files(self, docs):
+        index, reused = build_index([str(docs)])
+        assert reused == 0
+        (docs / "billing.md").write_text("# Billing\n\nRefunds are manual.\n")
+        with patch("context_index.chunk_file", wraps=chunk_file) as mock_chunk:
+            rebuilt, reused = build_index([str(docs)], index)
+        assert reused == 2
+        mock_chunk.assert_called_once()
+        assert rebuilt.search("refunds")
+
+
+class TestSelectChunks:
+    def test_respects_budget_k_and_exclusions(self, docs):
+        index, _ = build_index([str(docs)])
+        query = "rate limiting login tokens invoices"
+        chunks = select_chunks(index, query, max_tokens=10_000, top_k=2)
+        assert len(chunks) == 2
+        assert chunks[0].path.startswith(str(docs / "auth.md") + ":")
+
+        smallest = min(c.tokens for c in index.chunks)
+        assert len(select_chunks(index, query, max_tokens=smallest)) <= 1
+
+        excluded = select_chunks(index, query, exclude=[str(docs / "auth.md")])
+        assert not any("auth.md" in c.path for c in excluded)
@@ -0,0 +1,229 @@
+"""Tests for context_pack module."""
+
+import mmap
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from context_pack import (
+    CONTEXT_HEADER,
+    PROMPT_OVERHEAD_TOKENS,
+    ContextFile,
+    clear_context_cache,
+    context_budget,
+    count_tokens,
+    expand_context_paths,
+    format_pack_warning,
+    pack_context,
+    pack_for_models,
+    read_context_files,
+    truncate_to_tokens,
+)
+from pricing import ModelInfo
+
+
+def fake_count(text):
+    """One token per word keeps the arithmetic readable."""
+    return len(text.split())
+
+
+@pytest.fixture
+def words():
+    with patch("context_pack.count_tokens", side_effect=fake_count):
+        yield
+
+
+def window(context_window, max_output_tokens=1000):
+    info = ModelInfo(
+        1.0, 1.0, context_window=context_window, max_output_tokens=max_output_tokens
+    )
+    return patch("context_pack.get_model_info", return_value=info)
+
+
+def context_file(path, words_count, prefix="w"):
+    content = "\n".join(f"{prefix}{i}" for i in range(words_count))
+    return ContextFile(path, content, tokens=words_count)
+
+
+class TestCountTokens:
+    def test_counts_tokens(self):
+        assert 0 < count_tokens("hello world") < 10
+
+    def test_falls_back_without_tokenizer(self):
+        with patch.dict("sys.modules", {"litellm": None}):
+            assert count_tokens("x" * 40) == 11
+
+
+class TestReadContextFiles:
+    def test_reads_and_measures(self, tmp_path):
+        path = tmp_path / "a.md"
+        path.write_text("# A\n\nSome context.")
+        (file,) = read_context_files([str(path)])
+        assert file.content == "# A\n\nSome context."
+        assert file.tokens > 0
+        assert file.section().startswith(f"### Context: {path}\n```")
+
+    def test_records_errors(self):
+        (file,) = read_context_files(["/nonexistent/file.md"])
+        assert file.error is not None
+        assert "[Error loading file:" in file.section()
+
+
+class TestContextBudget:
+    def test_reserves_output_margin_and_prompt(self):
+        with window(100_000, max_output_tokens=8000):
+            budget = context_budget("m", 5000)
+        assert budget == 90_000 - 8000 - 5000 - PROMPT_OVERHEAD_TOKENS
+
+    def test_output_reserve_capped_at_quarter_window(self):
+        with window(40_000, max_output_tokens=64_000):
+            assert context_budget("m", 0) == 36_000 - 10_000 - PROMPT_OVERHEAD_TOKENS
+
+    def test_unknown_window(self):
+        with window(None):
+            assert context_budget("m", 0) is None
+
+
+class TestPackContext:
+    def test_everything_fits(self, words):
+        files = [context_file("a.md", 100), context_file("b.md", 100)]
+        with window(None):
+            pack = pack_context(files, "m", 0)
+        assert not pack.reduced
+        assert pack.context.startswith(CONTEXT_HEADER)
+        assert "### Context: b.md" in pack.context
+
+    def test_truncates_then_drops_in_priority_order(self, words):
+        files = [
+            context_file("first.md", 300),
+            context_file("second.txt", 2000),
+            context_file("third.md", 50),
+        ]
+        with patch("context_pack.context_budget", return_value=1000):
+            pack = pack_context(files, "m", 0)
+        assert pack.budget == 1000
+        assert "w299" in pack.context
+        assert pack.truncated[0]["path"] == "second.txt"
+        assert pack.truncated[0]["kept_tokens"] <= 700
+        assert "[... truncated:" in pack.context
+        assert pack.dropped == [{"path": "third.md", "tokens": 50}]
+        assert "third.md" not in pack.context
+        assert pack.tokens <= 1000
+
+    def test_too_little_room_drops_instead_of_truncating(self, words):
+        files = [context_file("a.md", 900), context_file("b.md", 500)]
+        with patch("context_pack.context_budget", return_value=1000):
+            pack = pack_context(files, "m", 0)
+        assert pack.truncated == []
+        assert [d["path"] for d in pack.dropped] == ["b.md"]
+
+    def test_truncated_markdown_lists_omitted_headings(self, words):
+        body = "\n".join(["# Intro"] + ["text"] * 400 + ["## Later section", "more"])
+        files = [ContextFile("doc.md", body, tokens=fake_count(body))]
+        with patch("context_pack.context_budget", return_value=300):
+            pack = pack_context(files, "m", 0)
+        assert "omitted sections:\n## Later section" in pack.context
+
+    def test_error_files_kept(self, words):
+        files = [ContextFile("missing.md", error="gone"), context_file("a.md", 2000)]
+        with patch("context_pack.context_budget", return_value=500):
+            pack = pack_context(files, "m", 0)
+        assert "[Error loading file: gone]" in pack.context
+        assert pack.truncated[0]["path"] == "a.md"
+
+
+class TestPackForModels:
+    def test_packs_per_model(self, words):
+        files = [context_file("a.md", 5000)]
+        budgets = {"small": 1000, "large": None}
+        with patch("context_pack.context_budget", side_effect=lambda m, _: budgets[m]):
+            packs = pack_for_models(files, ["small", "large"], "spec text")
+        assert packs["small"].reduced
+        assert not packs["large"].reduced
+        warning = format_pack_warning(packs["small"])
+        assert warning.startswith("Warning: context for small trimmed to fit 1,000")
+        assert "truncated a.md" in warning
+
+
+class TestTruncateToTokens:
+    def test_cuts_at_line_boundary(self, words):
+        text = "\n".join(f"line {i}" for i in range(100))
+        head = truncate_to_tokens(text, 50, 200)
+        assert fake_count(head) <= 50
+        assert head.endswith(tuple("0123456789"))
+
+    def test_short_text_unchanged(self, words):
+        assert truncate_to_tokens("a b", 10, 2) == "a b"
+
+
+class TestContextLoading:
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        clear_context_cache()
+        yield
+        clear_context_cache()
+
+    def test_expands_directories_and_globs(self, tmp_path):
+        docs = tmp_path / "docs"
+        (docs / "api").mkdir(parents=True)
+        (docs / "b.md").write_text("b")
+        (docs / "api" / "a.md").write_text("a")
+        (docs / ".hidden.md").write_text("hidden")
+        (docs / "logo.png").write_bytes(b"\x89PNG\0\0")
+        (tmp_path / "schema.sql").write_text("create table t;")
+
+        paths = expand_context_paths([str(docs), str(tmp_path / "*.sql")])
+        assert paths == [
+            str(docs / "api" / "a.md"),
+            str(docs / "b.md"),
+            str(tmp_path / "schema.sql"),
+        ]
+        assert expand_context_paths([str(tmp_path / "**" / "*.md")]) == [
+            str(docs / "api" / "a.md"),
+            str(docs / "b.md"),
+        ]
+
+    def test_files_named_twice_included_once(self, tmp_path):
+        path = tmp_path / "a.md"
+        path.write_text("a")
+        assert expand_context_paths([str(path), str(tmp_path)]) == [str(path)]
+
+    def test_unmatched_pattern_reports_error(self, tmp_path):
+        (file,) = read_context_files([str(tmp_path / "*.nothing")])
+        assert file.error == "No files match pattern"
+
+    def test_reads_many_files_in_order(self, tmp_path):
+        paths = []
+        for i in range(20):
+            path = tmp_path / f"f{i:02d}.md"
+            path.write_text(f"file {i}")
+            paths.append(str(path))
+        files = read_context_files(paths)
+        assert [f.content for f in files] == [f"file {i}" for i in range(20)]
+
+    def test_unchanged_files_served_from_cache(self, tmp_path):
+        path = tmp_path / "a.md"
+        path.write_text("first")
+        (first,) = read_context_files([str(path)])
+        with patch("context_pack._read_text") as mock_read:
+            (second,) = read_context_files([str(path)])
+        mock_read.assert_not_called()
+        assert second is first
+        assert second.section() is first.section()
+
+        path.write_text("changed!")
+        (third,) = read_context_files([str(path)])
+        assert third.content == "changed!"
+
+    def test_large_files_memory_mapped(self, tmp_path):
+        path = tmp_path / "dump.sql"
+        path.write_text("insert into t values (1);\n" * 100)
+        with patch("context_pack.MMAP_THRESHOLD", 1):
+            with patch("context_pack.mmap.mmap", wraps=mmap.mmap) as mock_mmap:
+                (file,) = read_context_files([str(path)])
+        mock_mmap.assert_called_once()
+        assert file.content == path.read_text()
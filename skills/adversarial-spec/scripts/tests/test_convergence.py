@@ -0,0 +1,153 @@
+"""Tests for convergence module."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from convergence import (
+    compute_round_metrics,
+    critique_overlap,
+    critique_text,
+    format_convergence,
+    line_edit_distance,
+    predict_convergence,
+    sparkline,
+)
+from models import ModelResponse
+
+
+def metrics(change_ratio, agreement, round_num=1, responses=2):
+    return {
+        "round": round_num,
+        "edit_distance": 0,
+        "change_ratio": change_ratio,
+        "sections_changed": 0,
+        "agreement": agreement,
+        "critique_overlap": 0.0,
+        "responses": responses,
+    }
+
+
+class TestLexicalMetrics:
+    def test_critique_text_strips_spec(self):
+        assert critique_text("issues here\n[SPEC]\nbody\n[/SPEC]") == "issues here\n"
+        assert critique_text("no spec") == "no spec"
+
+    def test_critique_overlap(self):
+        same = "the api lacks rate limiting on login"
+        assert critique_overlap([same, same]) == 1.0
+        assert critique_overlap([same, "completely different words appear here"]) == 0
+        assert critique_overlap([same]) == 0.0
+        assert critique_overlap(["short", "short"]) == 1.0
+
+    def test_line_edit_distance(self):
+        assert line_edit_distance("a\nb\n", "a\nb\n") == 0
+        assert line_edit_distance("a\nb\nc\n", "a\nx\nc\n") == 2
+        assert line_edit_distance("a\n", "a\nb\n") == 1
+
+
+class TestComputeRoundMetrics:
+    def test_metrics_from_results(self):
+        results = [
+            ModelResponse(model="a", response="[AGREE]", agreed=True, spec=None),
+            ModelResponse(
+                model="b", response="add caching layer now", agreed=False, spec="x"
+            ),
+            ModelResponse(
+                model="c", response="add caching layer now", agreed=False, spec="x"
+            ),
+            ModelResponse(model="d", response="", agreed=False, spec=None, error="e"),
+        ]
+        spec = "# A\none\ntwo\n# B\nthree\n"
+        latest = "# A\none\n2\n# B\nthree\n"
+        m = compute_round_metrics(3, spec, latest, results, sections_changed=1)
+        assert m.round == 3
+        assert m.edit_distance == 2
+        assert m.change_ratio == 0.2
+        assert m.sections_changed == 1
+        assert m.agreement == round(1 / 3, 4)
+        assert m.critique_overlap == 1.0
+        assert m.to_dict()["round"] == 3
+
+    def test_no_successful_results(self):
+        results = [
+            ModelResponse(model="a", response="", agreed=False, spec=None, error="x")
+        ]
+        m = compute_round_metrics(1, "a\n", "a\n", results)
+        assert m.agreement == 0.0
+        assert m.change_ratio == 0.0
+        assert m.responses == 0
+
+
+class TestPredictConvergence:
+    def test_empty_history(self):
+        assert predict_convergence([]).recommendation == "continue"
+
+    def test_all_agree_and_cosmetic_stops(self):
+        assert predict_convergence([metrics(0.0, 1.0)]).recommendation == "stop"
+
+    def test_large_changes_continue(self):
+        prediction = predict_convergence([metrics(0.3, 0.5)])
+        assert prediction.recommendation == "continue"
+        assert "30.0%" in prediction.reason
+
+    def test_growing_changes_continue(self):
+        history = [metrics(0.1, 0.0), metrics(0.2, 0.0, 2)]
+        assert "grew" in predict_convergence(history).reason
+
+    def test_majority_agreement_with_cosmetic_changes_presses(self):
+        assert predict_convergence([metrics(0.01, 0.5)]).recommendation == "press"
+
+    def test_two_cosmetic_rounds_stop(self):
+        history = [metrics(0.01, 0.5), metrics(0.005, 0.5, 2)]
+        assert predict_convergence(history).recommendation == "stop"
+
+    def test_two_cosmetic_rounds_with_disagreement_continue(self):
+        history = [metrics(0.01, 0.0), metrics(0.005, 0.0, 2)]
+        assert predict_convergence(history).recommendation == "continue"
+
+    def test_all_error_rounds_are_insufficient_data(self):
+        failed = [metrics(0.0, 0.0, 1, responses=0), metrics(0.0, 0.0, 2, responses=0)]
+        prediction = predict_convergence(failed)
+        assert prediction.recommendation == "continue"
+        assert "Insufficient data" in prediction.reason
+        # A failed round does not count toward a cosmetic streak
+        history = [metrics(0.0, 0.5, 1, responses=0), metrics(0.01, 0.5, 2)]
+        assert predict_convergence(history).recommendation == "press"
+
+    def test_old_metrics_without_responses(self):
+        old = metrics(0.0, 1.0)
+        del old["responses"]
+        assert predict_convergence([old]).recommendation == "stop"
+
+    def test_cosmetic_but_disagreeing_continues(self):
+        assert predict_convergence([metrics(0.01, 0.0)]).recommendation == "continue"
+
+    def test_custom_threshold(self):
+        assert predict_convergence([metrics(0.1, 1.0)], 0.2).recommendation == "stop"
+
+
+class TestFormatting:
+    def test_sparkline(self):
+        assert sparkline([]) == ""
+        assert sparkline([0.0, 0.0]) == "▁▁"
+        assert sparkline([0.0, 0.5, 1.0]) == "▁▄█"
+        assert sparkline([0.5], ceiling=1.0) == "▄"
+
+    def test_format_convergence(self):
+        history = [
+            {"round": 1, "metrics": metrics(0.2, 0.0, 1)},
+            {
+                "round": 2,
+                "metrics": metrics(0.01, 1.0, 2),
+                "convergence": {"recommendation": "stop", "reason": "done"},
+            },
+        ]
+        output = format_convergence(history)
+        assert "20.0%" in output
+        assert "change" in output
+        assert "Recommendation: stop - done" in output
+
+    def test_format_without_metrics(self):
+        assert "No convergence metrics" in format_convergence([{"round": 1}])
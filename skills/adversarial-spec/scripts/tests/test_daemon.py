@@ -0,0 +1,236 @@
+"""Tests for daemon and daemon_client modules."""
+
+import json
+import socket
+import sys
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import daemon_client
+from daemon import (
+    INVALID_PARAMS,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    DebateDaemon,
+    create_server,
+)
+from daemon_client import DaemonError, call, forward_to_daemon
+from models import ModelResponse, cost_tracker
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to ~100 bytes, so avoid pytest's tmp_path
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir) / "daemon.sock"
+
+
+@pytest.fixture
+def server(socket_path):
+    server = create_server(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(method, params=None, request_id=1):
+    req = {"jsonrpc": "2.0", "id": request_id, "method": method}
+    if params is not None:
+        req["params"] = params
+    return req
+
+
+class TestDebateDaemon:
+    def test_unknown_method_and_bad_params(self):
+        daemon = DebateDaemon()
+        assert daemon.handle(request("nope"))["error"]["code"] == METHOD_NOT_FOUND
+        assert daemon.handle({"id": 1})["error"]["code"] == -32600
+        response = daemon.handle(request("diff", {"args": "--previous"}))
+        assert response["error"]["code"] == INVALID_PARAMS
+        response = daemon.handle(request("resume", {}))
+        assert response["error"]["code"] == INVALID_PARAMS
+        response = daemon.handle(request("diff", {"cwd": "/nonexistent/dir"}))
+        assert response["error"]["code"] == INVALID_PARAMS
+        response = daemon.handle(request("diff", {"env": {"LD_PRELOAD": "x.so"}}))
+        assert response["error"]["code"] == INVALID_PARAMS
+
+    def test_runs_cli_in_request_cwd(self, tmp_path):
+        (tmp_path / "old.md").write_text("# Spec\nold line\n")
+        (tmp_path / "new.md").write_text("# Spec\nnew line\n")
+        daemon = DebateDaemon()
+        args = ["--previous", "old.md", "--current", "new.md"]
+        response = daemon.handle(request("diff", {"args": args, "cwd": str(tmp_path)}))
+        result = response["result"]
+        assert result["exit_code"] == 0
+        assert "+new line" in result["stdout"]
+        assert Path.cwd() != tmp_path
+
+    def test_captures_errors_and_exit_codes(self):
+        daemon = DebateDaemon()
+        result = daemon.handle(request("diff", {"args": []}))["result"]
+        assert result["exit_code"] == 1
+        assert "--previous and --current required" in result["stderr"]
+
+    @patch("debate.validate_models_before_run")
+    @patch("debate.call_models_parallel")
+    def test_critique_reads_stdin_and_tracks_cost(self, mock_call, mock_validate):
+        def respond(models, spec, *args, **kwargs):
+            assert spec == "# Spec from client"
+            cost_tracker.add("gpt-4o", 1000, 100)
+            return [ModelResponse("gpt-4o", "[AGREE]", True, None, cost=0.1)]
+
+        mock_call.side_effect = respond
+        daemon = DebateDaemon()
+        params = {
+            "args": ["--models", "gpt-4o", "--json"],
+            "stdin": "# Spec from client",
+        }
+        for _ in range(2):
+            result = daemon.handle(request("critique", params))["result"]
+            assert result["exit_code"] == 0
+            assert json.loads(result["stdout"])["all_agreed"] is True
+        cost = daemon.handle(request("cost"))["result"]
+        assert cost["input_tokens"] == 2000
+        assert cost["by_model"]["gpt-4o"]["output_tokens"] == 200
+        assert cost_tracker.total_input_tokens == 0
+        assert daemon.handle(request("ping"))["result"]["requests"] == 2
+
+    @patch("debate.validate_models_before_run")
+    @patch("debate.call_models_parallel")
+    def test_request_runs_with_caller_env(self, mock_call, mock_validate):
+        import os
+
+        seen = {}
+
+        def respond(models, *args, **kwargs):
+            seen.update(
+                key=os.environ.get("OPENAI_API_KEY"),
+                telegram=os.environ.get("TELEGRAM_BOT_TOKEN"),
+            )
+            return [ModelResponse("gpt-4o", "[AGREE]", True, None)]
+
+        mock_call.side_effect = respond
+        daemon_env = {"OPENAI_API_KEY": "daemon-key", "TELEGRAM_BOT_TOKEN": "daemon"}
+        params = {
+            "args": ["--models", "gpt-4o"],
+            "stdin": "# Spec",
+            "env": {"OPENAI_API_KEY": "caller-key"},
+        }
+        with patch.dict("os.environ", daemon_env):
+            result = DebateDaemon().handle(request("critique", params))["result"]
+            assert os.environ["OPENAI_API_KEY"] == "daemon-key"
+            assert os.environ["TELEGRAM_BOT_TOKEN"] == "daemon"
+        assert result["exit_code"] == 0
+        assert seen == {"key": "caller-key", "telegram": None}
+
+    @patch("debate.validate_models_before_run")
+    @patch("debate.call_models_parallel")
+    def test_resume_maps_to_critique(self, mock_call, mock_validate):
+        daemon = DebateDaemon()
+        with patch("debate.SessionState.load", side_effect=FileNotFoundError("gone")):
+            result = daemon.handle(request("resume", {"session": "s1"}))["result"]
+        assert result["exit_code"] == 2
+        assert "gone" in result["stderr"]
+
+
+class TestSocketServer:
+    def test_call_over_socket(self, server, socket_path):
+        result = call("ping", path=socket_path)
+        assert result["requests"] == 0
+        with pytest.raises(DaemonError, match="Unknown method"):
+            call("nope", path=socket_path)
+
+    def test_parse_error(self, server, socket_path):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(str(socket_path))
+        with sock, sock.makefile("rwb") as stream:
+            stream.write(b"not json\n")
+            stream.flush()
+            assert json.loads(stream.readline())["error"]["code"] == PARSE_ERROR
+
+    def test_socket_private_to_user(self, server, socket_path):
+        assert socket_path.stat().st_mode & 0o077 == 0
+
+    def test_refuses_second_daemon_and_replaces_stale_socket(self, server, socket_path):
+        with pytest.raises(RuntimeError, match="already listening"):
+            create_server(socket_path)
+
+        stale = socket_path.with_name("stale.sock")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(str(stale))
+        sock.close()
+        replacement = create_server(stale)
+        replacement.server_close()
+
+
+class TestForwardToDaemon:
+    def test_forwards_cli_invocation(self, server, socket_path, tmp_path):
+        (tmp_path / "a.md").write_text("a\n")
+        (tmp_path / "b.md").write_text("b\n")
+        argv = ["diff", "--previous", "a.md", "--current", "b.md"]
+        with patch.dict("os.environ", {"ADVERSARIAL_SPEC_SOCKET": str(socket_path)}):
+            with patch("os.getcwd", return_value=str(tmp_path)):
+                with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                    assert forward_to_daemon(argv) == 0
+        assert "+b" in mock_stdout.getvalue()
+
+    def test_sends_caller_env(self, socket_path):
+        env = {
+            "ADVERSARIAL_SPEC_SOCKET": str(socket_path),
+            "GEMINI_API_KEY": "g",
+            "TELEGRAM_CHAT_ID": "1",
+            "HOME_SECRET": "not sent",
+        }
+        with (
+            patch.dict("os.environ", env, clear=True),
+            patch("daemon_client.connect"),
+            patch("daemon_client.call", return_value={"exit_code": 0}) as mock_call,
+        ):
+            assert forward_to_daemon(["sessions"]) == 0
+        sent = mock_call.call_args[0][1]["env"]
+        assert sent == {
+            "ADVERSARIAL_SPEC_SOCKET": str(socket_path),
+            "GEMINI_API_KEY": "g",
+            "TELEGRAM_CHAT_ID": "1",
+        }
+
+    def test_runs_locally_without_daemon(self, socket_path):
+        env = {"ADVERSARIAL_SPEC_SOCKET": str(socket_path)}
+        with patch.dict("os.environ", env):
+            assert forward_to_daemon(["sessions"]) is None
+
+    def test_skips_disabled_and_local_only_actions(self, server, socket_path):
+        env = {"ADVERSARIAL_SPEC_SOCKET": str(socket_path)}
+        with patch.dict("os.environ", env):
+            assert forward_to_daemon(["serve"]) is None
+            assert forward_to_daemon(["providers"]) is None
+            assert forward_to_daemon([]) is None
+        env["ADVERSARIAL_SPEC_NO_DAEMON"] = "1"
+        with patch.dict("os.environ", env):
+            assert forward_to_daemon(["sessions"]) is None
+
+    def test_streaming_flags_run_locally(self, server, socket_path):
+        env = {"ADVERSARIAL_SPEC_SOCKET": str(socket_path)}
+        with patch.dict("os.environ", env):
+            for flags in (
+                ["--events", "jsonl"],
+                ["--events=jsonl"],
+                ["--telegram"],
+                ["-t"],
+                ["--tele"],
+            ):
+                assert forward_to_daemon(["critique", *flags]) is None
+        assert not daemon_client.needs_local_run(["--telegram-async", "--json"])
+
+    def test_default_socket_path(self):
+        with patch.dict("os.environ", {}, clear=True):
+            assert daemon_client.get_socket_path() == daemon_client.DEFAULT_SOCKET_PATH
@@ -0,0 +1,222 @@
+"""Tests for diff_engine module."""
+
+import random
+import sys
+from io import StringIO
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from diff_engine import (
+    DIFF_ENGINES,
+    _myers_region,
+    available_engines,
+    benchmark_engines,
+    format_benchmark,
+    generate_diff,
+    git_diff,
+    myers_opcodes,
+    patch_diff,
+    word_diff,
+)
+
+
+def apply_opcodes(a, b, opcodes):
+    """Rebuild b from a using opcodes, asserting they are consistent."""
+    result = []
+    i_pos = j_pos = 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (i1, j1) == (i_pos, j_pos)
+        if tag == "equal":
+            assert a[i1:i2] == b[j1:j2]
+            result.extend(a[i1:i2])
+        else:
+            result.extend(b[j1:j2])
+        i_pos, j_pos = i2, j2
+    assert (i_pos, j_pos) == (len(a), len(b))
+    return result
+
+
+def lcs_length(a, b):
+    """Reference longest common subsequence length."""
+    table = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) - 1, -1, -1):
+        for j in range(len(b) - 1, -1, -1):
+            if a[i] == b[j]:
+                table[i][j] = table[i + 1][j + 1] + 1
+            else:
+                table[i][j] = max(table[i + 1][j], table[i][j + 1])
+    return table[0][0]
+
+
+class TestMyersOpcodes:
+    def test_identical(self):
+        lines = ["a\n", "b\n"]
+        assert myers_opcodes(lines, lines) == [("equal", 0, 2, 0, 2)]
+
+    def test_empty_sides(self):
+        assert myers_opcodes([], ["a\n"]) == [("insert", 0, 0, 0, 1)]
+        assert myers_opcodes(["a\n"], []) == [("delete", 0, 1, 0, 0)]
+        assert myers_opcodes([], []) == []
+
+    def test_replace(self):
+        opcodes = myers_opcodes(["a\n", "b\n", "c\n"], ["a\n", "x\n", "c\n"])
+        assert opcodes == [
+            ("equal", 0, 1, 0, 1),
+            ("replace", 1, 2, 1, 2),
+            ("equal", 2, 3, 2, 3),
+        ]
+
+    def test_random_inputs_are_consistent(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            a = [rng.choice("abc") for _ in range(rng.randint(0, 20))]
+            b = [rng.choice("abc") for _ in range(rng.randint(0, 20))]
+            assert apply_opcodes(a, b, myers_opcodes(a, b)) == b
+
+    def test_myers_region_is_minimal(self):
+        rng = random.Random(11)
+        for _ in range(200):
+            a = [rng.randint(0, 3) for _ in range(rng.randint(0, 15))]
+            b = [rng.randint(0, 3) for _ in range(rng.randint(0, 15))]
+            deleted, inserted = bytearray(len(a)), bytearray(len(b))
+            _myers_region(a, b, 0, len(a), 0, len(b), deleted, inserted)
+            kept_a = [x for x, gone in zip(a, deleted) if not gone]
+            kept_b = [x for x, new in zip(b, inserted) if not new]
+            assert kept_a == kept_b
+            assert len(kept_a) == lcs_length(a, b)
+
+    def test_moved_block_with_unique_lines(self):
+        a = [f"line {i}\n" for i in range(100)]
+        b = a[50:] + a[:50]
+        assert apply_opcodes(a, b, myers_opcodes(a, b)) == b
+
+
+class TestWordDiff:
+    def test_marks_changed_words(self):
+        assert (
+            word_diff("the quick brown fox", "the slow brown dog")
+            == "the [-quick-]{+slow+} brown [-fox-]{+dog+}"
+        )
+
+    def test_unchanged(self):
+        assert word_diff("same line", "same line") == "same line"
+
+
+class TestGenerateDiff:
+    def test_engines_agree_on_simple_change(self):
+        previous = "line1\nline2\nline3"
+        current = "line1\nmodified\nline3"
+        expected = generate_diff(previous, current, engine="difflib")
+        assert "--- previous\n+++ current\n@@ -1,3 +1,3 @@" in expected
+        assert generate_diff(previous, current, engine="myers") == expected
+
+    def test_identical_returns_empty(self):
+        for engine in DIFF_ENGINES:
+            assert generate_diff("same", "same", engine=engine) == ""
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError, match="Unknown diff engine"):
+            generate_diff("a", "b", engine="bogus")
+
+    def test_hunks_are_separated_by_context(self):
+        previous = "".join(f"{i}\n" for i in range(30))
+        current = previous.replace("2\n", "two\n", 1).replace("25\n", "x\n")
+        diff = generate_diff(previous, current, engine="myers")
+        assert diff.count("@@ -") == 2
+        assert diff == generate_diff(previous, current, engine="difflib")
+
+    def test_word_level_output(self):
+        diff = generate_diff("a\nb c\n", "a\nb d\n", engine="myers", word_level=True)
+        assert "~b [-c-]{+d+}" in diff
+
+    def test_word_level_unpaired_lines(self):
+        diff = generate_diff("a\nb\n", "a\nc\nd\n", engine="myers", word_level=True)
+        assert "~[-b-]{+c+}" in diff
+        assert "+d" in diff
+
+    def test_git_falls_back_when_unavailable(self):
+        with patch("diff_engine.GIT_AVAILABLE", False):
+            with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+                diff = generate_diff("a\n", "b\n", engine="git")
+        assert "+b" in diff
+        assert "Falling back to myers" in mock_stderr.getvalue()
+
+    def test_git_falls_back_on_error(self):
+        with patch("diff_engine.GIT_AVAILABLE", True):
+            with patch("diff_engine.git_diff", side_effect=RuntimeError("boom")):
+                with patch("sys.stderr", new_callable=StringIO):
+                    assert "+b" in generate_diff("a\n", "b\n", engine="git")
+
+
+class TestGitDiff:
+    def test_normalizes_headers(self):
+        output = (
+            "diff --git a/tmp/previous b/tmp/current\n"
+            "index 1..2 100644\n"
+            "--- a/tmp/previous\n"
+            "+++ b/tmp/current\n"
+            "@@ -1 +1 @@\n"
+            "-a\n"
+            "+b\n"
+        )
+        with patch("diff_engine.GIT_AVAILABLE", True):
+            with patch("subprocess.run") as mock_run:
+                mock_run.return_value = MagicMock(returncode=1, stdout=output)
+                diff = git_diff("a\n", "b\n")
+        assert diff == "--- previous\n+++ current\n@@ -1 +1 @@\n-a\n+b"
+        cmd = mock_run.call_args[0][0]
+        assert "--no-index" in cmd
+        assert "--histogram" in cmd
+
+    def test_word_diff_flag(self):
+        with patch("diff_engine.GIT_AVAILABLE", True):
+            with patch("subprocess.run") as mock_run:
+                mock_run.return_value = MagicMock(returncode=0, stdout="")
+                assert git_diff("a\n", "a\n", word_level=True) == ""
+        assert "--word-diff=plain" in mock_run.call_args[0][0]
+
+    def test_error_exit_code(self):
+        with patch("diff_engine.GIT_AVAILABLE", True):
+            with patch("subprocess.run") as mock_run:
+                mock_run.return_value = MagicMock(returncode=128, stderr="fatal")
+                with pytest.raises(RuntimeError, match="fatal"):
+                    git_diff("a\n", "b\n")
+
+    def test_unavailable(self):
+        with patch("diff_engine.GIT_AVAILABLE", False):
+            with pytest.raises(RuntimeError, match="git not found"):
+                git_diff("a", "b")
+
+
+class TestPatchDiff:
+    def test_trailing_newline_and_markers(self):
+        diff = patch_diff("a\nb", "a\nc\n")
+        assert diff.endswith("+c\n")
+        assert "-b\n\\ No newline at end of file\n+c" in diff
+
+    def test_identical_and_unknown_engine(self):
+        assert patch_diff("a", "a") == ""
+        with pytest.raises(ValueError):
+            patch_diff("a", "b", engine="nope")
+
+    def test_generate_diff_unchanged(self):
+        assert "No newline" not in generate_diff("a\nb", "a\nc")
+
+
+class TestBenchmark:
+    def test_benchmark_rows(self):
+        rows = benchmark_engines("a\nb\n", "a\nc\n", engines=["difflib", "myers"])
+        assert [r["engine"] for r in rows] == ["difflib", "myers"]
+        assert all(r["diff_lines"] == 6 for r in rows)
+        assert all(r["best_seconds"] <= r["mean_seconds"] for r in rows)
+        table = format_benchmark(rows, "a\nb\n", "a\nc\n")
+        assert "Diff Engine Benchmark" in table
+        assert "myers" in table
+
+    def test_available_engines(self):
+        with patch("diff_engine.GIT_AVAILABLE", False):
+            assert available_engines() == ["difflib", "myers"]
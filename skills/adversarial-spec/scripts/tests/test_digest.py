@@ -0,0 +1,133 @@
+"""Tests for digest module."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from digest import (
+    CritiqueCluster,
+    cluster_critiques,
+    estimate_similarity,
+    format_digest,
+    minhash,
+    point_shingles,
+    split_points,
+)
+
+GPT = """## Issues
+- The login endpoint lacks rate limiting, which allows brute force attacks.
+- No pagination is defined for the list items endpoint.
+"""
+
+GEMINI = """1. Login endpoint has no rate limiting; brute force attacks are possible.
+2. Database migration strategy is missing entirely from the document.
+"""
+
+GROK = "* Login endpoint lacks rate limiting (brute force attacks).\n"
+
+
+class TestSplitPoints:
+    def test_bullets_and_numbers(self):
+        points = split_points(GPT + "\n" + GEMINI)
+        assert len(points) == 4
+        assert points[0].startswith("The login endpoint")
+        assert points[2].startswith("Login endpoint")
+
+    def test_wrapped_lines_join_point(self):
+        text = "- First point spans\n  two lines of text\n- Second point is here"
+        assert split_points(text) == [
+            "First point spans two lines of text",
+            "Second point is here",
+        ]
+
+    def test_paragraphs_headings_and_code(self):
+        text = (
+            "# Heading\nA paragraph point with enough words.\n\n"
+            "```\ncode block ignored entirely here\n```\n[AGREE]\nok"
+        )
+        assert split_points(text) == ["A paragraph point with enough words."]
+
+
+class TestMinHash:
+    def test_identical_sets_match(self):
+        shingles = point_shingles("rate limiting is missing on login")
+        assert estimate_similarity(minhash(shingles), minhash(shingles)) == 1.0
+
+    def test_unrelated_sets_differ(self):
+        a = minhash(point_shingles("rate limiting is missing on login"))
+        b = minhash(point_shingles("database migrations need a rollback plan"))
+        assert estimate_similarity(a, b) < 0.2
+
+    def test_empty(self):
+        assert minhash(set()) == ()
+        assert estimate_similarity((), (1,)) == 0.0
+
+    def test_shingles_ignore_stopwords_and_case(self):
+        assert point_shingles("The API is SLOW") == {"api slow"}
+        assert point_shingles("the") == set()
+
+
+class TestClusterCritiques:
+    def test_groups_equivalent_points_and_ranks(self):
+        clusters = cluster_critiques(
+            [("gpt-4o", GPT), ("gemini", GEMINI), ("grok", GROK)]
+        )
+        top = clusters[0]
+        assert top.models == ["gpt-4o", "gemini", "grok"]
+        assert "rate limiting" in top.point.lower()
+        assert len(top.members) == 3
+        assert len(clusters) == 3
+        assert all(len(c.models) == 1 for c in clusters[1:])
+
+    def test_same_model_counts_once(self):
+        text = (
+            "- Add retries to the payment webhook\n- Add retries to the payment webhook"
+        )
+        clusters = cluster_critiques([("gpt-4o", text)])
+        assert len(clusters) == 1
+        assert clusters[0].models == ["gpt-4o"]
+        assert len(clusters[0].members) == 2
+
+    def test_chained_points_do_not_merge(self):
+        words = (
+            "token session cache quota audit retry webhook ledger schema "
+            "replica shard backup vault cipher gateway proxy broker"
+        ).split()
+        a, b, c = (" ".join(words[i : i + 10]) for i in (0, 3, 7))
+        signatures = [minhash(point_shingles(p)) for p in (a, b, c)]
+        assert estimate_similarity(signatures[0], signatures[1]) >= 0.3
+        assert estimate_similarity(signatures[1], signatures[2]) >= 0.3
+        assert estimate_similarity(signatures[0], signatures[2]) < 0.3
+
+        clusters = cluster_critiques([("m1", a), ("m2", b), ("m3", c)])
+        assert not any({"m1", "m3"} <= set(cl.models) for cl in clusters)
+
+    def test_json_members_are_excerpts(self):
+        long_point = "Rate limiting is missing on the login endpoint " * 5
+        cluster = CritiqueCluster(
+            point=long_point,
+            models=["a"],
+            members=[{"model": "a", "point": long_point}],
+        )
+        member = cluster.to_dict()["members"][0]
+        assert member["model"] == "a"
+        assert member["excerpt"].endswith("…")
+        assert len(member["excerpt"]) <= 81
+        assert "point" not in member
+
+    def test_empty_input(self):
+        assert cluster_critiques([]) == []
+
+
+class TestFormatDigest:
+    def test_format(self):
+        clusters = [
+            CritiqueCluster(point="Add rate limiting", models=["a", "b"]),
+            CritiqueCluster(point="Add pagination", models=["a"]),
+        ]
+        output = format_digest(clusters, 3)
+        assert "=== Critique Digest ===" in output
+        assert "2 distinct point(s), 1 raised by more than one model" in output
+        assert "[2/3] Add rate limiting (a, b)" in output
+        assert clusters[0].to_dict()["models"] == ["a", "b"]
@@ -0,0 +1,117 @@
+"""Tests for events module and critique --events jsonl."""
+
+import json
+import sys
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from events import configure_events, emit, events_enabled
+
+
+@pytest.fixture(autouse=True)
+def reset_events():
+    yield
+    configure_events(None)
+
+
+class TestEmit:
+    def test_disabled_by_default(self, capsys):
+        assert not events_enabled()
+        emit("call_started", model="gpt-4o")
+        assert capsys.readouterr().out == ""
+
+    def test_writes_one_json_line(self, capsys):
+        configure_events("jsonl")
+        emit("call_started", model="gpt-4o", round=2)
+        line = json.loads(capsys.readouterr().out)
+        assert line["event"] == "call_started"
+        assert line["model"] == "gpt-4o" and line["round"] == 2
+        assert "ts" in line
+
+    def test_rejects_unknown_format(self):
+        with pytest.raises(ValueError):
+            configure_events("xml")
+
+
+class TestCritiqueEvents:
+    @patch("debate.validate_models_before_run")
+    def test_streams_events_in_order(self, mock_validate, tmp_path):
+        import debate
+
+        calls = {"gemini/gemini-pro": 0}
+
+        def fake_call(model, system_prompt, user_message, timeout):
+            if model in calls:
+                calls[model] += 1
+                if calls[model] == 1:
+                    raise RuntimeError("rate limited")
+                return "[AGREE]", 500, 10, 0
+            return "Fix auth.\n[SPEC]\n# Spec\nrevised\n[/SPEC]", 1000, 200, 0
+
+        argv = ["critique", "--models", "gpt-4o,gemini/gemini-pro"]
+        argv += ["--events", "jsonl", "--session", "evt"]
+        with (
+            patch("models._litellm_call", side_effect=fake_call),
+            patch("models.RETRY_BASE_DELAY", 0),
+            patch("session.SESSIONS_DIR", tmp_path / "sessions"),
+            patch("session.CHECKPOINTS_DIR", tmp_path / "checkpoints"),
+            patch("sys.stdin", StringIO("# Spec\ndraft\n")),
+            patch("sys.stdout", new_callable=StringIO) as mock_stdout,
+            patch("sys.stderr", new_callable=StringIO),
+        ):
+            debate.main(argv)
+
+        events = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+        names = [e["event"] for e in events]
+        assert names.count("call_started") == 2
+        assert names.count("call_completed") == 2
+        assert names[-1] == "round_completed"
+
+        retry = next(e for e in events if e["event"] == "retry")
+        assert retry["model"] == "gemini/gemini-pro" and retry["attempt"] == 1
+        assert names.index("retry") < max(
+            i for i, e in enumerate(events) if e["event"] == "call_completed"
+        )
+
+        completed = {e["model"]: e for e in events if e["event"] == "call_completed"}
+        assert completed["gpt-4o"]["spec"] == "# Spec\nrevised"
+        assert completed["gpt-4o"]["input_tokens"] == 1000
+        assert completed["gemini/gemini-pro"]["agreed"] is True
+        assert completed["gpt-4o"]["latency"] >= 0
+
+        kinds = [e["kind"] for e in events if e["event"] == "checkpoint_saved"]
+        assert kinds == ["checkpoint", "session"]
+        assert names.index("call_completed") < names.index("checkpoint_saved")
+
+        final = events[-1]
+        assert final["all_agreed"] is False
+        assert final["session"] == "evt"
+        assert {r["model"] for r in final["results"]} == {
+            "gpt-4o",
+            "gemini/gemini-pro",
+        }
+
+    @patch("debate.validate_models_before_run")
+    @patch("debate.call_models_parallel")
+    @patch("debate.send_telegram_notification", return_value="Keep the cache")
+    def test_feedback_event(self, mock_notify, mock_call, mock_validate):
+        import debate
+        from models import ModelResponse
+
+        mock_call.return_value = [ModelResponse("gpt-4o", "[AGREE]", True, None)]
+        argv = ["critique", "--models", "gpt-4o", "--events", "jsonl", "--telegram"]
+        with (
+            patch("sys.stdin", StringIO("# Spec\n")),
+            patch("sys.stdout", new_callable=StringIO) as mock_stdout,
+            patch("sys.stderr", new_callable=StringIO),
+        ):
+            debate.main(argv)
+        events = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+        feedback = next(e for e in events if e["event"] == "feedback_received")
+        assert feedback["text"] == "Keep the cache" and feedback["late"] is False
+        assert events[-1]["user_feedback"] == "Keep the cache"
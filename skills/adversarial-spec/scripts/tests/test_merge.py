@@ -0,0 +1,167 @@
+"""Tests for merge module."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from merge import format_merge_report, merge_specs
+
+BASE = """# Spec
+
+## Auth
+Use sessions.
+
+## Storage
+Postgres.
+
+## API
+REST.
+"""
+
+
+class TestMergeSpecs:
+    def test_non_conflicting_edits_are_combined(self):
+        a = BASE.replace("Use sessions.", "Use OAuth2.")
+        b = BASE.replace("Postgres.", "Postgres with replicas.")
+        result = merge_specs(BASE, [("model-a", a), ("model-b", b)])
+        assert "Use OAuth2." in result.spec
+        assert "Postgres with replicas." in result.spec
+        assert result.conflicts == []
+        assert {c["key"]: c["models"] for c in result.applied} == {
+            "Spec > Auth": ["model-a"],
+            "Spec > Storage": ["model-b"],
+        }
+
+    def test_identical_edits_are_not_conflicts(self):
+        a = BASE.replace("REST.", "gRPC.")
+        result = merge_specs(BASE, [("model-a", a), ("model-b", a)])
+        assert result.conflicts == []
+        assert result.applied == [
+            {"key": "Spec > API", "kind": "edited", "models": ["model-a", "model-b"]}
+        ]
+        assert result.spec == a
+
+    def test_conflicting_edits_keep_first_and_attribute(self):
+        a = BASE.replace("REST.", "gRPC.")
+        b = BASE.replace("REST.", "GraphQL.")
+        result = merge_specs(BASE, [("model-a", a), ("model-b", b)])
+        assert "gRPC." in result.spec
+        assert "GraphQL." not in result.spec
+        assert len(result.conflicts) == 1
+        conflict = result.conflicts[0].to_dict()
+        assert conflict == {
+            "key": "Spec > API",
+            "chosen": "model-a",
+            "models": ["model-a", "model-b"],
+        }
+
+    def test_edit_wins_over_removal_in_conflict(self):
+        removed = BASE.replace("## Storage\nPostgres.\n\n", "")
+        edited = BASE.replace("Postgres.", "MySQL.")
+        result = merge_specs(BASE, [("remover", removed), ("editor", edited)])
+        assert "MySQL." in result.spec
+        assert result.conflicts[0].removed_by == ["remover"]
+        assert result.conflicts[0].chosen == "editor"
+
+    def test_added_section_placed_after_anchor(self):
+        a = BASE.replace("## Storage", "## Rate Limits\n100 rps.\n\n## Storage")
+        b = BASE.replace("Use sessions.", "Use OAuth2.")
+        result = merge_specs(BASE, [("model-a", a), ("model-b", b)])
+        assert result.spec.index("## Rate Limits") < result.spec.index("## Storage")
+        assert result.spec.index("## Auth") < result.spec.index("## Rate Limits")
+        assert "Use OAuth2." in result.spec
+        assert {
+            "key": "Spec > Rate Limits",
+            "kind": "added",
+            "models": ["model-a"],
+        } in (result.applied)
+
+    def test_removal_by_quorum_is_applied(self):
+        removed = BASE.replace("## API\nREST.\n", "")
+        result = merge_specs(BASE, [("model-a", removed), ("model-b", removed)])
+        assert "## API" not in result.spec
+        assert result.applied[0] == {
+            "key": "Spec > API",
+            "kind": "removed",
+            "models": ["model-a", "model-b"],
+        }
+
+    def test_single_model_removal_is_a_conflict(self):
+        truncated = BASE.replace("## API\nREST.\n", "")
+        edited = BASE.replace("Use sessions.", "Use OAuth2.")
+        result = merge_specs(BASE, [("model-a", truncated), ("model-b", edited)])
+        assert "## API\nREST." in result.spec
+        assert "Use OAuth2." in result.spec
+        conflict = result.conflicts[0].to_dict()
+        assert conflict == {
+            "key": "Spec > API",
+            "chosen": "input",
+            "models": ["model-a"],
+            "removed_by": ["model-a"],
+        }
+
+    def test_renamed_leaf_is_an_edit(self):
+        renamed = BASE.replace("## Auth\n", "## Authentication\n")
+        edited = BASE.replace("Postgres.", "MySQL.")
+        result = merge_specs(BASE, [("model-a", renamed), ("model-b", edited)])
+        assert "## Authentication\nUse sessions." in result.spec
+        assert "## Auth\n" not in result.spec
+        assert "MySQL." in result.spec
+        assert result.conflicts == []
+        assert {
+            "key": "Spec > Auth",
+            "kind": "renamed",
+            "models": ["model-a"],
+            "new_key": "Spec > Authentication",
+        } in result.applied
+
+    def test_renamed_and_edited_leaf(self):
+        revised = BASE.replace(
+            "## Auth\nUse sessions.", "## Authentication\nUse sessions, 1h expiry."
+        )
+        result = merge_specs(BASE, [("model-a", revised)])
+        assert result.spec == revised
+        assert result.applied[0]["kind"] == "renamed"
+
+    def test_renamed_parent_keeps_subtree(self):
+        renamed = BASE.replace("# Spec\n", "# Specification\n")
+        result = merge_specs(BASE, [("model-a", renamed)])
+        assert result.spec == renamed
+        assert result.conflicts == []
+        assert result.applied == [
+            {
+                "key": "Spec",
+                "kind": "renamed",
+                "models": ["model-a"],
+                "new_key": "Specification",
+            }
+        ]
+        report = format_merge_report(result)
+        assert "renamed Spec -> Specification (model-a)" in report
+
+    def test_full_rewrite_is_skipped(self):
+        result = merge_specs(BASE, [("rewriter", "# Totally\nDifferent doc.\n")])
+        assert result.skipped == ["rewriter"]
+        assert result.spec == BASE
+        assert result.summary()["skipped"] == ["rewriter"]
+
+    def test_unchanged_revisions_return_base(self):
+        result = merge_specs(BASE, [("model-a", BASE)])
+        assert result.spec is BASE
+        assert result.applied == []
+
+
+class TestFormatMergeReport:
+    def test_report_lists_changes_and_conflicts(self):
+        a = BASE.replace("REST.", "gRPC.").replace("Postgres.", "SQLite.")
+        b = BASE.replace("REST.", "GraphQL.")
+        report = format_merge_report(merge_specs(BASE, [("a", a), ("b", b)]))
+        assert "Applied 1 section change(s), 1 conflict(s)" in report
+        assert "edited  Spec > Storage (a)" in report
+        assert "CONFLICT Spec > API: a, b (kept a)" in report
+
+    def test_report_skipped(self):
+        report = format_merge_report(merge_specs(BASE, [("x", "# Other\n")]))
+        assert "Skipped full rewrites from: x" in report
+        assert "Sources: (none)" in report
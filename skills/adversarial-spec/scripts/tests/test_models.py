@@ -12,12 +12,15 @@ from models import (
     RETRY_BASE_DELAY,
     CostTracker,
     ModelResponse,
-    call_claude_cli_model,
+    RoundPrompts,
     build_constitution_section,
+    build_focus_section,
+    call_claude_cli_model,
     call_codex_model,
     call_gemini_cli_model,
     call_models_parallel,
     call_single_model,
+    compile_prompt,
     detect_agreement,
     extract_spec,
     extract_tasks,
@@ -531,6 +534,43 @@ class TestBuildConstitutionSection:
         assert "Do not invent project scope assumptions" in section
 
 
+class TestPromptAssembly:
+    def test_matches_direct_template_formatting(self):
+        from prompts import REVIEW_PROMPT_TEMPLATE, SYSTEM_PROMPT_TECH
+
+        focus = "latency {p99}"
+        system, user = RoundPrompts("spec {x}", 3, "tech", focus=focus).messages("ctx")
+        assert system is SYSTEM_PROMPT_TECH
+        assert user == REVIEW_PROMPT_TEMPLATE.format(
+            round=3,
+            doc_type_name="Technical Specification",
+            spec="spec {x}",
+            focus_section=build_focus_section(focus, False),
+            context_section="ctx",
+            constitution_section=build_constitution_section("ctx"),
+        )
+
+    def test_compiled_prompt_cached_per_settings(self):
+        first = compile_prompt("prd", None, "security", True, False)
+        assert compile_prompt("prd", None, "security", True, False) is first
+        assert compile_prompt("prd", None, "security", False, False) is not first
+
+    def test_user_message_built_once_per_context(self):
+        prompts = RoundPrompts("spec", 1, "prd")
+        assert prompts.messages("a")[1] is prompts.messages("a")[1]
+        assert prompts.messages(None)[1] is prompts.messages("")[1]
+        assert prompts.messages("a")[1] != prompts.messages("b")[1]
+
+    @patch("models._litellm_call")
+    def test_models_in_a_round_share_messages(self, mock_call):
+        mock_call.return_value = ("[AGREE]", 1, 1)
+        call_models_parallel(["gpt-4o", "xai/grok-3", "mistral/m"], "spec", 1, "prd")
+        user_messages = {id(call[0][2]) for call in mock_call.call_args_list}
+        system_prompts = {id(call[0][1]) for call in mock_call.call_args_list}
+        assert len(user_messages) == 1
+        assert len(system_prompts) == 1
+
+
 class TestCallCodexModel:
     @patch("models.CODEX_AVAILABLE", False)
     def test_raises_when_codex_unavailable(self):
@@ -859,6 +899,7 @@ class TestCallClaudeCliModel:
     @patch("models.subprocess.run")
     def test_timeout_raises_runtime_error(self, mock_run):
         import subprocess
+
         import pytest
 
         mock_run.side_effect = subprocess.TimeoutExpired("claude", 600)
@@ -1270,6 +1311,54 @@ class TestCallModelsParallel:
         assert call_args[0][3] == "rfc"  # doc_type
 
 
+class TestProviderRouting:
+    @patch("models.time.sleep")
+    def test_routes_to_registered_provider_call(self, mock_sleep):
+        import providers
+
+        calls = []
+
+        def fake_call(**kwargs):
+            calls.append(kwargs)
+            return "[AGREE]\n[SPEC]spec[/SPEC]", 10, 5
+
+        provider = providers.get_provider("claude-cli/sonnet")
+        with patch.object(provider, "call", fake_call):
+            result = call_single_model("claude-cli/sonnet", "spec", 1, "prd", timeout=9)
+        assert result.agreed is True
+        assert calls[0]["model"] == "claude-cli/sonnet"
+        assert calls[0]["timeout"] == 9
+
+    @patch("models.call_single_model")
+    def test_parallel_calls_respect_provider_concurrency(self, mock_single):
+        import threading
+        import time
+
+        import providers
+
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_call(model, *args, **kwargs):
+            with lock:
+                active.append(model)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(model)
+            return ModelResponse(model=model, response="", agreed=True, spec=None)
+
+        mock_single.side_effect = slow_call
+        provider = providers.get_provider("codex/gpt-5.3-codex")
+        with patch.object(provider, "max_concurrency", 2):
+            results = call_models_parallel(
+                [f"codex/m{i}" for i in range(6)], "spec", 1, "prd"
+            )
+        assert len(results) == 6
+        assert max(peak) <= 2
+
+
 class TestConstants:
     def test_max_retries_is_reasonable(self):
         # Mutation: 3 -> 4 would be caught
@@ -0,0 +1,188 @@
+"""Tests for pricing module."""
+
+import json
+import sys
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pricing
+from pricing import (
+    DEFAULT_MAX_OUTPUT_TOKENS,
+    ModelInfo,
+    get_max_output_tokens,
+    get_model_info,
+    load_litellm_table,
+)
+from providers import DEFAULT_COST
+
+TABLE = {
+    "gpt-4o": {
+        "input": 2.5,
+        "output": 10.0,
+        "cached_input": 1.25,
+        "context_window": 128000,
+        "max_output_tokens": 16384,
+    },
+    "gemini-3-pro-preview": {
+        "input": 2.0,
+        "output": 12.0,
+        "cached_input": None,
+        "context_window": 1048576,
+        "max_output_tokens": 65535,
+    },
+}
+
+
+@pytest.fixture
+def table():
+    with patch("pricing._litellm_table", TABLE):
+        yield
+
+
+@pytest.fixture
+def config_path():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "config.json"
+        with patch("providers.GLOBAL_CONFIG_PATH", path):
+            yield path
+
+
+class TestModelInfo:
+    def test_cost_bills_cached_tokens_at_cached_rate(self):
+        info = ModelInfo(input=2.0, output=10.0, cached_input=0.5)
+        assert info.cost(1_000_000, 0) == pytest.approx(2.0)
+        assert info.cost(1_000_000, 1_000_000, cached_tokens=500_000) == pytest.approx(
+            1.0 + 0.25 + 10.0
+        )
+
+    def test_cached_tokens_without_cached_rate_bill_full_price(self):
+        info = ModelInfo(input=2.0, output=0.0)
+        assert info.cost(1_000_000, 0, cached_tokens=2_000_000) == pytest.approx(2.0)
+
+
+class TestLitellmTable:
+    def test_normalizes_per_token_prices(self):
+        entry = {
+            "input_cost_per_token": 2.5e-06,
+            "output_cost_per_token": 1e-05,
+            "cache_read_input_token_cost": 1.25e-06,
+            "max_input_tokens": 128000,
+            "max_output_tokens": 16384,
+        }
+        assert pricing._normalize_litellm_entry(entry) == TABLE["gpt-4o"]
+        assert pricing._normalize_litellm_entry({"mode": "embedding"}) is None
+
+    def test_table_cached_on_disk_per_litellm_version(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_path = Path(tmpdir) / "cache" / "pricing.json"
+            with patch("pricing.PRICING_CACHE_PATH", cache_path):
+                with patch("pricing._litellm_table", None):
+                    with patch("pricing._litellm_version", return_value="1.0"):
+                        with patch(
+                            "pricing._build_litellm_table", return_value=TABLE
+                        ) as mock_build:
+                            assert load_litellm_table() == TABLE
+                            pricing.clear_pricing_cache()
+                            assert load_litellm_table() == TABLE
+                            assert mock_build.call_count == 1
+                            assert json.loads(cache_path.read_text())["models"] == TABLE
+
+                    pricing.clear_pricing_cache()
+                    with patch("pricing._litellm_version", return_value="2.0"):
+                        with patch(
+                            "pricing._build_litellm_table", return_value={}
+                        ) as mock_build:
+                            assert load_litellm_table() == {}
+                            mock_build.assert_called_once()
+
+    def test_unwritable_cache_is_ignored(self):
+        with patch("pricing.PRICING_CACHE_PATH", Path("/dev/null/pricing.json")):
+            with patch("pricing._litellm_table", None):
+                with patch("pricing._build_litellm_table", return_value=TABLE):
+                    assert load_litellm_table() == TABLE
+
+
+class TestGetModelInfo:
+    def test_litellm_entry(self, table, config_path):
+        info = get_model_info("gpt-4o")
+        assert info.source == "litellm"
+        assert info.cached_input == 1.25
+        assert info.context_window == 128000
+
+    def test_provider_prefix_stripped_for_lookup(self, table, config_path):
+        assert get_model_info("openai/gpt-4o").input == 2.5
+
+    def test_builtin_table_fills_gaps(self, table, config_path):
+        info = get_model_info("zhipu/glm-4")
+        assert (info.input, info.source) == (1.40, "builtin")
+
+    def test_cli_models_are_free_but_keep_limits(self, table, config_path):
+        info = get_model_info("gemini-cli/gemini-3-pro-preview")
+        assert (info.input, info.output) == (0.0, 0.0)
+        assert info.max_output_tokens == 65535
+
+    def test_unknown_models_fall_back(self, table, config_path):
+        assert get_model_info("codex/gpt-9").input == 0.0
+        info = get_model_info("xai/grok-9")
+        assert (info.input, info.output, info.source) == (
+            DEFAULT_COST["input"],
+            DEFAULT_COST["output"],
+            "default",
+        )
+
+    def test_config_overrides_win(self, table, config_path):
+        config_path.write_text(
+            json.dumps(
+                {"pricing": {"gpt-4o": {"input": 1.0, "max_output_tokens": "4096"}}}
+            )
+        )
+        info = get_model_info("gpt-4o")
+        assert (info.input, info.output, info.max_output_tokens) == (1.0, 10.0, 4096)
+        assert info.source == "override"
+
+    def test_invalid_override_warns(self, table, config_path):
+        config_path.write_text(json.dumps({"pricing": {"gpt-4o": {"input": "x"}}}))
+        with patch("sys.stderr", new_callable=StringIO) as mock_err:
+            assert get_model_info("gpt-4o").input == 2.5
+        assert "invalid pricing override" in mock_err.getvalue()
+
+    def test_max_output_tokens(self, table, config_path):
+        assert get_max_output_tokens("gpt-4o") == 16384
+        assert get_max_output_tokens("mystery") == DEFAULT_MAX_OUTPUT_TOKENS
+
+
+class TestModelCalls:
+    @patch("models.completion")
+    def test_max_tokens_sized_per_model(self, mock_completion, table, config_path):
+        from models import call_single_model
+
+        response = Mock()
+        response.choices = [Mock(message=Mock(content="[AGREE]"))]
+        response.usage = Mock(prompt_tokens=10, completion_tokens=5)
+        mock_completion.return_value = response
+
+        call_single_model("gpt-4o", "spec", 1, "prd")
+        assert mock_completion.call_args[1]["max_tokens"] == 16384
+
+    @patch("models.completion")
+    def test_cached_input_tokens_billed(self, mock_completion, table, config_path):
+        from models import CostTracker, call_single_model
+
+        response = Mock()
+        response.choices = [Mock(message=Mock(content="[AGREE]"))]
+        response.usage = Mock(
+            prompt_tokens=1_000_000,
+            completion_tokens=0,
+            prompt_tokens_details=Mock(cached_tokens=1_000_000),
+        )
+        mock_completion.return_value = response
+
+        with patch("models.cost_tracker", CostTracker()):
+            result = call_single_model("gpt-4o", "spec", 1, "prd")
+        assert result.cost == pytest.approx(1.25)
@@ -0,0 +1,135 @@
+"""Tests for prompt_library module."""
+
+import os
+import sys
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import prompt_library
+from prompt_library import (
+    builtin_library,
+    clear_library_cache,
+    get_library,
+    load_library,
+    validate_template,
+)
+from prompts import FOCUS_AREAS, REVIEW_PROMPT_TEMPLATE, SYSTEM_PROMPT_TECH
+
+
+@pytest.fixture
+def prompts_dir(tmp_path):
+    directory = tmp_path / "prompts"
+    for kind in ("focus", "personas", "system", "templates"):
+        (directory / kind).mkdir(parents=True)
+    clear_library_cache()
+    with patch("prompt_library.PROMPTS_DIR", directory):
+        yield directory
+    clear_library_cache()
+
+
+class TestValidateTemplate:
+    def test_builtin_templates_are_valid(self):
+        for name, text in builtin_library().templates.items():
+            assert validate_template(name, text) is None
+
+    def test_rejects_unknown_and_missing_placeholders(self):
+        assert "unknown placeholders ['specc']" in validate_template(
+            "review", "{specc}"
+        )
+        assert "missing required" in validate_template("review", "{round}")
+        assert "invalid placeholder" in validate_template("review", "{spec")
+
+
+class TestLoadLibrary:
+    def test_builtins_without_directory(self, tmp_path):
+        library = load_library(tmp_path / "missing")
+        assert library.focus_areas == FOCUS_AREAS
+        assert library.system_prompt("tech") == SYSTEM_PROMPT_TECH
+        assert library.templates["review"] == REVIEW_PROMPT_TEMPLATE
+
+    def test_user_files_add_and_override(self, prompts_dir):
+        (prompts_dir / "focus" / "payments.md").write_text("Check idempotency.\n")
+        (prompts_dir / "personas" / "sre-lead.md").write_text("You are an SRE lead.")
+        (prompts_dir / "system" / "tech.md").write_text("Custom tech reviewer.")
+        (prompts_dir / "templates" / "review.md").write_text("R{round}: {spec}")
+
+        library = load_library(prompts_dir)
+        assert library.focus_areas["payments"] == "Check idempotency."
+        assert library.focus_areas["security"] == FOCUS_AREAS["security"]
+        assert library.system_prompt("tech", "SRE lead") == "You are an SRE lead."
+        assert library.system_prompt("tech") == "Custom tech reviewer."
+        assert library.templates["review"] == "R{round}: {spec}"
+        assert library.is_custom("focus", "payments")
+        assert not library.is_custom("focus", "security")
+
+    def test_invalid_files_warn_and_keep_builtins(self, prompts_dir):
+        (prompts_dir / "templates" / "review.md").write_text("no spec here {oops}")
+        (prompts_dir / "templates" / "unknown.md").write_text("{spec}")
+        (prompts_dir / "system" / "rfc.md").write_text("RFC reviewer")
+        (prompts_dir / "focus" / "empty.md").write_text("  \n")
+        with patch("sys.stderr", new_callable=StringIO) as mock_err:
+            library = load_library(prompts_dir)
+        assert library.templates["review"] == REVIEW_PROMPT_TEMPLATE
+        assert "empty" not in library.focus_areas
+        assert mock_err.getvalue().count("Warning: Ignoring prompt file") == 4
+
+
+class TestHotReload:
+    def test_reloads_when_files_change(self, prompts_dir):
+        first = get_library()
+        assert get_library() is first
+
+        path = prompts_dir / "focus" / "payments.md"
+        path.write_text("v1")
+        with patch("prompt_library.RELOAD_CHECK_INTERVAL", 0):
+            second = get_library()
+            assert second is not first
+            assert second.focus_areas["payments"] == "v1"
+            assert get_library() is second
+
+            path.write_text("version 2")
+            os.utime(path, ns=(1, 1))
+            assert get_library().focus_areas["payments"] == "version 2"
+
+            path.unlink()
+            assert "payments" not in get_library().focus_areas
+
+    def test_checks_throttled(self, prompts_dir):
+        get_library()
+        with patch("prompt_library._directory_signature") as mock_signature:
+            get_library()
+        mock_signature.assert_not_called()
+
+    def test_compiled_prompts_follow_reload(self, prompts_dir):
+        from models import RoundPrompts
+
+        with patch("prompt_library.RELOAD_CHECK_INTERVAL", 0):
+            before = RoundPrompts("spec", 1, "tech", focus="payments").messages()[1]
+            assert "CRITICAL FOCUS: PAYMENTS" in before
+            (prompts_dir / "focus" / "payments.md").write_text("Check idempotency.")
+            after = RoundPrompts("spec", 1, "tech", focus="payments").messages()[1]
+        assert "Check idempotency." in after
+
+    def test_custom_template_keeps_literal_braces(self, prompts_dir):
+        from models import RoundPrompts
+
+        (prompts_dir / "templates" / "review.md").write_text(
+            'Round {round} of a {doc_type_name}. Reply as {{"a": 1}}.\n{spec}'
+        )
+        prompt_library.clear_library_cache()
+        user = RoundPrompts("spec {x}", 2, "tech").messages()[1]
+        assert user.startswith("Round 2 of a ")
+        assert 'Reply as {"a": 1}.\nspec {x}' in user
+
+    def test_focus_listing_marks_custom(self, prompts_dir, capsys):
+        from providers import list_focus_areas
+
+        (prompts_dir / "focus" / "payments.md").write_text("Payments\nIdempotency.")
+        prompt_library.clear_library_cache()
+        list_focus_areas()
+        assert "payments        Idempotency. (custom)" in capsys.readouterr().out
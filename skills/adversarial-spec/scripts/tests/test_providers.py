@@ -13,6 +13,7 @@ from providers import (
     BEDROCK_MODEL_MAP,
     DEFAULT_COST,
     MODEL_COSTS,
+    get_bedrock_index,
     is_bedrock_enabled,
     load_global_config,
     load_profile,
@@ -164,6 +165,124 @@ class TestProfiles:
                 assert loaded["focus"] == "security"
 
 
+class TestConfigCache:
+    """Tests for the mtime-validated config and profile cache."""
+
+    def write(self, path, data):
+        path.write_text(json.dumps(data))
+
+    def test_config_parsed_once_until_file_changes(self):
+        import os
+
+        import providers
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.json"
+            self.write(config_path, {"bedrock": {"enabled": True}})
+
+            with patch("providers.GLOBAL_CONFIG_PATH", config_path):
+                with patch(
+                    "providers._parse_global_config",
+                    wraps=providers._parse_global_config,
+                ) as mock_parse:
+                    assert is_bedrock_enabled() is True
+                    load_global_config()
+                    providers.get_bedrock_config()
+                    assert mock_parse.call_count == 1
+
+                    self.write(config_path, {"bedrock": {"enabled": False}})
+                    stat = config_path.stat()
+                    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+                    assert is_bedrock_enabled() is False
+                    assert mock_parse.call_count == 2
+
+    def test_load_global_config_returns_private_copy(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.json"
+            self.write(config_path, {"bedrock": {"available_models": ["a"]}})
+
+            with patch("providers.GLOBAL_CONFIG_PATH", config_path):
+                load_global_config()["bedrock"]["available_models"].append("b")
+                assert load_global_config()["bedrock"]["available_models"] == ["a"]
+
+    def test_save_invalidates_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.json"
+
+            with patch("providers.GLOBAL_CONFIG_PATH", config_path):
+                assert is_bedrock_enabled() is False
+                save_global_config({"bedrock": {"enabled": True}})
+                assert is_bedrock_enabled() is True
+                config_path.unlink()
+                assert load_global_config() == {}
+
+    def test_invalid_json_warns_once(self):
+        from io import StringIO
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.json"
+            config_path.write_text("{ invalid")
+
+            with patch("providers.GLOBAL_CONFIG_PATH", config_path):
+                with patch("sys.stderr", new_callable=StringIO) as mock_err:
+                    assert load_global_config() == {}
+                    assert load_global_config() == {}
+        assert mock_err.getvalue().count("Invalid JSON") == 1
+
+    def test_profile_cached_and_invalidated_on_save(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            profiles_dir = Path(tmpdir)
+
+            with patch("providers.PROFILES_DIR", profiles_dir):
+                with patch("builtins.print"):
+                    save_profile("p", {"models": "gpt-4o"})
+                    first = load_profile("p")
+                    first["models"] = "mutated"
+                    with patch.object(Path, "read_text") as mock_read:
+                        assert load_profile("p")["models"] == "gpt-4o"
+                        mock_read.assert_not_called()
+                    save_profile("p", {"models": "claude-3"})
+                    assert load_profile("p")["models"] == "claude-3"
+
+
+class TestBedrockIndex:
+    """Tests for the precomputed Bedrock alias index."""
+
+    def test_index_resolves_available_models(self):
+        config = {
+            "available_models": ["claude-3-sonnet", "mine"],
+            "custom_aliases": {"mine": "custom.model-v1"},
+        }
+        index = get_bedrock_index(config)
+        assert index.available_ids == {
+            BEDROCK_MODEL_MAP["claude-3-sonnet"],
+            "custom.model-v1",
+        }
+        assert index.resolve("mine") == "custom.model-v1"
+        valid, invalid = validate_bedrock_models(
+            ["custom.model-v1", "mine", "llama-3-8b"], config
+        )
+        assert valid == ["custom.model-v1", "custom.model-v1"]
+        assert invalid == ["llama-3-8b"]
+
+    def test_global_index_reused_until_config_changes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.json"
+
+            with patch("providers.GLOBAL_CONFIG_PATH", config_path):
+                save_global_config({"bedrock": {"available_models": ["llama-3-8b"]}})
+                index = get_bedrock_index()
+                assert get_bedrock_index() is index
+                with patch("providers.build_bedrock_index") as mock_build:
+                    validate_bedrock_models(["llama-3-8b"] * 50)
+                    mock_build.assert_not_called()
+
+                save_global_config({"bedrock": {"available_models": ["mistral-7b"]}})
+                assert get_bedrock_index() is not index
+                valid, _ = validate_bedrock_models(["mistral-7b"])
+                assert valid == [BEDROCK_MODEL_MAP["mistral-7b"]]
+
+
 class TestLoadGlobalConfigInvalidJson:
     """Tests for load_global_config with invalid JSON.
 
@@ -912,3 +1031,114 @@ class TestValidateModelCredentials:
                 assert valid == ["model1"]
                 assert invalid == ["model2"]
                 mock_validate.assert_called_once()
+
+
+class TestProviderRegistry:
+    """Tests for the provider registry and prefix-trie routing."""
+
+    def test_trie_returns_longest_prefix(self):
+        from providers import PrefixTrie
+
+        trie = PrefixTrie()
+        trie.insert("claude-", "api")
+        trie.insert("claude-cli/", "cli")
+        assert trie.longest_match("claude-cli/opus") == "cli"
+        assert trie.longest_match("claude-3-opus") == "api"
+        assert trie.longest_match("claude") is None
+        assert trie.longest_match("gpt-4o") is None
+
+    def test_get_provider_routes_overlapping_prefixes(self):
+        from providers import get_provider
+
+        assert get_provider("claude-cli/sonnet").name == "Claude CLI"
+        assert get_provider("claude-sonnet-4-20250514").name == "Anthropic"
+        assert get_provider("gemini-cli/gemini-3-pro-preview").name == "Gemini CLI"
+        assert get_provider("gemini/gemini-pro").name == "Google"
+        assert get_provider("o1-mini").name == "OpenAI"
+        assert get_provider("bedrock/claude-3-sonnet") is None
+
+    def test_requirements_describe_missing_credentials(self):
+        from providers import get_provider
+
+        assert get_provider("xai/grok-3").requirement() == "requires XAI_API_KEY"
+        assert get_provider("codex/gpt-5.3-codex").requirement() == (
+            "requires Codex CLI: npm install -g @openai/codex && codex login"
+        )
+
+    def test_registered_provider_is_routed_and_validated(self):
+        import providers
+        from providers import Provider, get_provider, register_provider
+
+        with patch("providers.PROVIDERS", list(providers.PROVIDERS)):
+            with patch("providers._provider_trie", providers.PrefixTrie()):
+                register_provider(
+                    Provider(
+                        "Local",
+                        ("local/",),
+                        "local/llama",
+                        env_var="LOCAL_API_KEY",
+                        default_model="local/llama",
+                    )
+                )
+                assert get_provider("local/llama").name == "Local"
+                with patch.dict("os.environ", {}, clear=True):
+                    from providers import validate_model_credentials
+
+                    assert validate_model_credentials(["local/llama"]) == (
+                        [],
+                        ["local/llama"],
+                    )
+                with patch.dict("os.environ", {"LOCAL_API_KEY": "k"}, clear=True):
+                    with patch("providers.CODEX_AVAILABLE", False):
+                        with patch("providers.CLAUDE_CLI_AVAILABLE", False):
+                            with patch("providers.GEMINI_CLI_AVAILABLE", False):
+                                from providers import get_available_providers
+
+                                assert get_available_providers() == [
+                                    ("Local", "LOCAL_API_KEY", "local/llama")
+                                ]
+
+    def test_trie_remove_only_drops_matching_value(self):
+        from providers import PrefixTrie
+
+        trie = PrefixTrie()
+        trie.insert("claude-", "api")
+        trie.insert("claude-cli/", "cli")
+        trie.remove("claude-cli/", "other")
+        assert trie.longest_match("claude-cli/opus") == "cli"
+        trie.remove("claude-cli/", "cli")
+        assert trie.longest_match("claude-cli/opus") == "api"
+        trie.remove("claude-", "api")
+        assert trie.longest_match("claude-3-opus") is None
+        assert trie._root == {}
+
+    def test_replacing_provider_drops_old_prefixes(self):
+        import providers
+        from providers import Provider, get_provider, register_provider
+
+        with patch("providers.PROVIDERS", list(providers.PROVIDERS)):
+            with patch("providers._provider_trie", providers.PrefixTrie()):
+                register_provider(Provider("Shared", ("shared/",), "shared/a"))
+                register_provider(Provider("Local", ("local/",), "local/llama"))
+                register_provider(
+                    Provider("Local", ("local/", "shared/"), "local/llama")
+                )
+                register_provider(Provider("Local", ("lan/",), "lan/llama"))
+                assert get_provider("lan/llama") is providers.PROVIDERS[-1]
+                assert get_provider("local/llama") is None
+                # A prefix the replaced provider shadowed routes to its owner again
+                assert get_provider("shared/a").name == "Shared"
+
+    def test_register_call_requires_known_provider(self):
+        import pytest
+        from providers import register_provider_call
+
+        with pytest.raises(KeyError):
+            register_provider_call("Nope", lambda **kwargs: ("", 0, 0))
+
+    def test_openrouter_requires_key(self):
+        from providers import validate_model_credentials
+
+        with patch.dict("os.environ", {}, clear=True):
+            valid, invalid = validate_model_credentials(["openrouter/openai/gpt-4o"])
+        assert invalid == ["openrouter/openai/gpt-4o"]
@@ -0,0 +1,118 @@
+"""Tests for response_cache module."""
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import response_cache
+from response_cache import SharedCache, cache_key, configure_shared_cache
+
+
+def slow_upstream(directory: str, counter: str, results) -> None:
+    """Child process: fetch one key through the cache, counting upstream calls."""
+
+    def call():
+        with open(counter, "a") as f:
+            f.write("call\n")
+        time.sleep(0.5)
+        return {"response": "critique"}
+
+    entry, hit = SharedCache(Path(directory)).fetch("ab" * 32, call)
+    results.put((entry["response"], hit))
+
+
+@pytest.fixture
+def shared_cache(tmp_path):
+    with patch.dict("os.environ", {"ADVERSARIAL_SPEC_CACHE_DIR": str(tmp_path)}):
+        cache = configure_shared_cache(True)
+        yield cache
+    configure_shared_cache(False)
+
+
+class TestSharedCache:
+    def test_miss_then_hit(self, tmp_path):
+        cache = SharedCache(tmp_path)
+        key = cache_key("gpt-4o", "system", "user")
+        calls = []
+        entry, hit = cache.fetch(key, lambda: calls.append(1) or {"response": "r"})
+        assert (entry, hit) == ({"response": "r"}, False)
+        entry, hit = cache.fetch(key, lambda: calls.append(1) or {"response": "x"})
+        assert (entry, hit) == ({"response": "r"}, True)
+        assert len(calls) == 1
+
+    def test_errors_not_cached_and_entries_expire(self, tmp_path):
+        cache = SharedCache(tmp_path, ttl=60)
+        key = cache_key("m", "p")
+        cache.fetch(key, lambda: {"response": "", "error": "rate limited"})
+        assert cache.get(key) is None
+
+        cache.put(key, {"response": "old"})
+        path = tmp_path / key[:2] / f"{key}.json"
+        data = json.loads(path.read_text())
+        data["created"] -= 120
+        path.write_text(json.dumps(data))
+        assert cache.get(key) is None
+        os.utime(path, (time.time() - 120, time.time() - 120))
+        assert cache.prune() >= 1
+        assert not path.exists()
+
+    def test_key_covers_every_part(self):
+        assert cache_key("m", "a", "b") != cache_key("m", "ab", "")
+        assert cache_key("m", "p", False) != cache_key("m", "p", True)
+
+    @pytest.mark.skipif(response_cache.fcntl is None, reason="needs fcntl")
+    def test_concurrent_processes_share_one_call(self, tmp_path):
+        counter = tmp_path / "calls.txt"
+        ctx = multiprocessing.get_context("fork")
+        results = ctx.Queue()
+        workers = [
+            ctx.Process(
+                target=slow_upstream, args=(str(tmp_path / "c"), str(counter), results)
+            )
+            for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(10)
+        outcomes = [results.get(timeout=1) for _ in workers]
+        assert counter.read_text().count("call") == 1
+        assert sorted(hit for _, hit in outcomes) == [False, True, True, True]
+        assert {response for response, _ in outcomes} == {"critique"}
+
+
+class TestModelCalls:
+    def test_cached_response_costs_nothing(self, shared_cache):
+        from models import call_single_model, cost_tracker
+
+        content = "Critique.\n[SPEC]\n# Revised\n[/SPEC]"
+        with patch(
+            "models._litellm_call", return_value=(content, 1000, 200, 0)
+        ) as mock_call:
+            first = call_single_model("gpt-4o", "# Spec", 1, "tech")
+            before = cost_tracker.total_cost
+            second = call_single_model("gpt-4o", "# Spec", 1, "tech")
+            third = call_single_model("gpt-4o", "# Spec", 2, "tech")
+        assert mock_call.call_count == 2  # round 2 is a different prompt
+        assert not first.cached and first.cost > 0
+        assert second.cached and second.cost == 0.0
+        assert second.spec == "# Revised" and second.response == content
+        assert not third.cached
+        assert cost_tracker.total_cost > before  # only the round 2 call
+
+    def test_disabled_by_default(self):
+        configure_shared_cache(False)
+        from models import call_single_model
+
+        with patch("models._litellm_call", return_value=("[AGREE]", 1, 1, 0)) as m:
+            call_single_model("gpt-4o", "# Spec", 1, "tech")
+            call_single_model("gpt-4o", "# Spec", 1, "tech")
+        assert m.call_count == 2
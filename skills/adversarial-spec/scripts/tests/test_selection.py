@@ -0,0 +1,266 @@
+"""Tests for selection module and critique --adaptive."""
+
+import json
+import sys
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from selection import (
+    REVALIDATE_AFTER,
+    critique_novelty,
+    model_stats,
+    select_models,
+)
+
+MODELS = ["gpt-4o", "gemini/gemini-pro", "xai/grok-3", "mistral/mistral-large"]
+
+
+def record(model, agreed=False, novelty=0.5, cost=0.01, latency=2.0, error=None):
+    return {
+        "model": model,
+        "agreed": agreed,
+        "error": error,
+        "cost": cost,
+        "latency": latency,
+        "novelty": None if agreed or error else novelty,
+    }
+
+
+def entry(*records, all_agreed=False, skipped=None):
+    data = {"round": 1, "all_agreed": all_agreed, "models": list(records)}
+    if skipped is not None:
+        data["selection"] = {"skipped": skipped}
+    return data
+
+
+class TestCritiqueNovelty:
+    def test_repeated_critique_scores_low(self):
+        shared = "tokens must expire after one hour and refresh on use"
+        novelty = critique_novelty(
+            {
+                "a": shared,
+                "b": shared + " also rate limit the login endpoint per account",
+                "c": "",
+            }
+        )
+        assert novelty["a"] == 0.0
+        assert novelty["b"] > 0.4
+        assert novelty["c"] == 0.0
+
+    def test_single_critique_is_fully_novel(self):
+        assert critique_novelty({"a": "add an audit log for admin actions"}) == {
+            "a": 1.0
+        }
+
+
+class TestModelStats:
+    def test_aggregates_history(self):
+        history = [
+            entry(record("gpt-4o", novelty=0.6, cost=0.02, latency=4.0)),
+            entry(record("gpt-4o", agreed=True, cost=0.04, latency=2.0)),
+        ]
+        stats = model_stats(["gpt-4o", "o1"], history)["gpt-4o"]
+        assert stats.rounds == 2
+        assert stats.agreement_rate == 0.5
+        assert stats.novelty == 0.6
+        assert stats.cost == 0.03 and stats.latency == 3.0
+        assert stats.last_agreed is True
+        assert "recent_novelty" not in stats.to_dict()
+
+    def test_old_history_without_costs(self):
+        history = [{"round": 1, "models": [{"model": "gpt-4o", "agreed": False}]}]
+        stats = model_stats(["gpt-4o"], history)["gpt-4o"]
+        assert stats.cost == 0.0 and stats.novelty is None
+        assert stats.last_agreed is False
+
+
+class TestSelectModels:
+    def test_all_models_without_history_or_when_pressing(self):
+        assert select_models(MODELS, []).selected == MODELS
+        history = [entry(*(record(m, agreed=True) for m in MODELS[:2]))]
+        assert select_models(MODELS, history, press=True).skipped == {}
+
+    def test_dissenters_plus_one_verifier(self):
+        history = [
+            entry(
+                record("gpt-4o"),
+                record("gemini/gemini-pro", agreed=True, cost=0.05),
+                record("xai/grok-3", agreed=True, cost=0.01),
+                record("mistral/mistral-large", error="timeout"),
+            )
+        ]
+        decision = select_models(MODELS, history)
+        assert decision.selected == ["gpt-4o", "xai/grok-3", "mistral/mistral-large"]
+        assert decision.verifier == "xai/grok-3"
+        assert "xai/grok-3 verifies" in decision.skipped["gemini/gemini-pro"]
+        data = decision.to_dict()
+        assert data["stats"]["gpt-4o"]["rounds"] == 1
+        assert "Asking 3 of 4 models" in data["reason"]
+
+    def test_verifier_prefers_most_critical_model(self):
+        history = [
+            entry(record("gpt-4o", novelty=0.9), record("gemini/gemini-pro")),
+            entry(
+                record("gpt-4o", agreed=True),
+                record("gemini/gemini-pro", agreed=True),
+                record("xai/grok-3"),
+            ),
+        ]
+        decision = select_models(MODELS[:3], history)
+        assert decision.verifier == "gpt-4o"
+        assert list(decision.skipped) == ["gemini/gemini-pro"]
+
+    def test_redundant_dissenter_skipped(self):
+        round_records = [
+            record("gpt-4o", novelty=0.7),
+            record("gemini/gemini-pro", novelty=0.05),
+        ]
+        history = [entry(*round_records), entry(*round_records)]
+        decision = select_models(MODELS[:2], history)
+        assert decision.selected == ["gpt-4o"]
+        assert "repeated other models" in decision.skipped["gemini/gemini-pro"]
+
+    def test_keeps_one_dissenter_when_all_redundant(self):
+        round_records = [
+            record("gpt-4o", novelty=0.02),
+            record("gemini/gemini-pro", novelty=0.05),
+        ]
+        history = [entry(*round_records), entry(*round_records)]
+        decision = select_models(MODELS[:2], history)
+        assert decision.selected == ["gemini/gemini-pro"]
+
+    def test_revalidates_after_skipped_rounds(self):
+        history = [
+            entry(record("gpt-4o"), record("gemini/gemini-pro", agreed=True)),
+        ]
+        history += [
+            entry(record("gpt-4o"), skipped={"gemini/gemini-pro": "agreed"})
+            for _ in range(REVALIDATE_AFTER)
+        ]
+        decision = select_models(MODELS[:2], history)
+        assert decision.selected == MODELS[:2]
+
+    def test_everyone_after_full_agreement(self):
+        history = [entry(record("gpt-4o", agreed=True), all_agreed=True)]
+        assert select_models(MODELS[:2], history).selected == MODELS[:2]
+
+    def test_everyone_after_pending_confirmation(self):
+        history = [
+            entry(record("gpt-4o"), record("gemini/gemini-pro", agreed=True)),
+            {
+                **entry(
+                    record("gpt-4o", agreed=True),
+                    skipped={"gemini/gemini-pro": "agreed"},
+                ),
+                "confirmation_pending": True,
+            },
+        ]
+        assert select_models(MODELS[:2], history).selected == MODELS[:2]
+
+
+class TestCLIAdaptive:
+    @patch("debate.validate_models_before_run")
+    def test_later_round_skips_agreeing_models(self, mock_validate, tmp_path):
+        import debate
+
+        agreeing = {"gemini/gemini-pro", "xai/grok-3"}
+        asked = []
+
+        def fake_call(model, system_prompt, user_message, timeout):
+            asked.append(model)
+            if model in agreeing:
+                return "[AGREE]", 500, 10, 0
+            return "Fix auth.\n[SPEC]\n# Spec\nrevised\n[/SPEC]", 1000, 200, 0
+
+        models = "gpt-4o,gemini/gemini-pro,xai/grok-3"
+        with (
+            patch("models._litellm_call", side_effect=fake_call),
+            patch("session.SESSIONS_DIR", tmp_path / "sessions"),
+            patch("session.CHECKPOINTS_DIR", tmp_path / "checkpoints"),
+            patch("sys.stderr", new_callable=StringIO) as mock_stderr,
+        ):
+            with (
+                patch("sys.stdin", StringIO("# Spec\ndraft\n")),
+                patch("sys.stdout", new_callable=StringIO),
+            ):
+                debate.main(
+                    ["critique", "--models", models, "--session", "ad", "--adaptive"]
+                )
+            assert sorted(asked) == sorted(models.split(","))
+            asked.clear()
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                debate.main(["critique", "--resume", "ad", "--adaptive", "--json"])
+
+        assert sorted(asked) == ["gemini/gemini-pro", "gpt-4o"]
+        output = json.loads(mock_stdout.getvalue())
+        assert output["selection"]["skipped"] == {
+            "xai/grok-3": "agreed in its last round; gemini/gemini-pro verifies"
+        }
+        assert output["selection"]["verifier"] == "gemini/gemini-pro"
+        assert "Adaptive selection: Asking 2 of 3 models" in mock_stderr.getvalue()
+
+        session = json.loads((tmp_path / "sessions" / "ad.json").read_text())
+        first, second = session["history"]
+        assert first["models"][0]["latency"] >= 0
+        assert second["selection"]["selected"] == ["gpt-4o", "gemini/gemini-pro"]
+        assert session["models"] == models.split(",")
+
+    @patch("debate.validate_models_before_run")
+    def test_subset_agreement_is_not_all_agreed(self, mock_validate, tmp_path):
+        import debate
+
+        critiqued = set()
+
+        def fake_call(model, system_prompt, user_message, timeout):
+            # gpt-4o critiques once, then everyone agrees
+            if model == "gpt-4o" and model not in critiqued:
+                critiqued.add(model)
+                return "Fix auth.\n[SPEC]\n# Spec\nrevised\n[/SPEC]", 1000, 200, 0
+            return "[AGREE]", 500, 10, 0
+
+        models = "gpt-4o,gemini/gemini-pro,xai/grok-3"
+        with (
+            patch("models._litellm_call", side_effect=fake_call),
+            patch("session.SESSIONS_DIR", tmp_path / "sessions"),
+            patch("session.CHECKPOINTS_DIR", tmp_path / "checkpoints"),
+            patch("sys.stderr", new_callable=StringIO),
+        ):
+            with (
+                patch("sys.stdin", StringIO("# Spec\ndraft\n")),
+                patch("sys.stdout", new_callable=StringIO),
+            ):
+                debate.main(
+                    ["critique", "--models", models, "--session", "ad", "--adaptive"]
+                )
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                debate.main(["critique", "--resume", "ad", "--adaptive", "--json"])
+            pending = json.loads(mock_stdout.getvalue())
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                debate.main(["critique", "--resume", "ad", "--adaptive"])
+            final = mock_stdout.getvalue()
+
+        assert pending["selection"]["skipped"]
+        assert pending["all_agreed"] is False
+        assert pending["confirmation_pending"] is True
+        session = json.loads((tmp_path / "sessions" / "ad.json").read_text())
+        assert session["history"][1]["confirmation_pending"] is True
+        assert session["history"][2]["selection"]["skipped"] == {}
+        assert "=== ALL MODELS AGREE ===" in final
+
+    @patch("debate.validate_models_before_run")
+    @patch("debate.call_models_parallel")
+    def test_without_session_warns(self, mock_call, mock_validate):
+        import debate
+        from models import ModelResponse
+
+        mock_call.return_value = [ModelResponse("gpt-4o", "[AGREE]", True, None)]
+        with (
+            patch("sys.stdin", StringIO("# Spec\n")),
+            patch("sys.stdout", new_callable=StringIO),
+            patch("sys.stderr", new_callable=StringIO) as mock_stderr,
+        ):
+            debate.main(["critique", "--models", "gpt-4o", "--adaptive"])
+        assert "Warning: --adaptive needs --session" in mock_stderr.getvalue()
@@ -0,0 +1,342 @@
+"""Tests for the HTTP job service."""
+
+import http.client
+import json
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import providers
+from providers import Provider, register_provider
+from service import (
+    BudgetExceededError,
+    JobError,
+    JobQueue,
+    JobService,
+    ServiceUser,
+    load_users,
+    parse_job,
+)
+from session import SessionState
+
+MOCK_COST = {"input": 10.0, "output": 10.0}
+
+
+def mock_call(system_prompt, user_message, model, **kwargs):
+    if model == "mock/broken":
+        raise RuntimeError("mock outage")
+    if "[TASK]" in user_message:
+        return "[TASK]\ntitle: Build it\ntype: task\n[/TASK]", 1000, 100
+    if model == "mock/agree":
+        return "[AGREE]\n[SPEC]\n# Spec\nfinal\n[/SPEC]", 1000, 100
+    return "Needs work.\n[SPEC]\n# Spec\nrevised\n[/SPEC]", 1000, 100
+
+
+@pytest.fixture(autouse=True)
+def mock_provider(tmp_path):
+    with (
+        patch("providers.PROVIDERS", list(providers.PROVIDERS)),
+        patch("providers._provider_trie", providers.PrefixTrie()),
+        patch("session.SESSIONS_DIR", tmp_path / "sessions"),
+        patch("models.RETRY_BASE_DELAY", 0),
+    ):
+        register_provider(
+            Provider(
+                "Mock",
+                ("mock/",),
+                "mock/agree",
+                cli_available=lambda: True,
+                default_cost=MOCK_COST,
+                call=mock_call,
+            )
+        )
+        register_provider(
+            Provider("Keyed", ("keyed/",), "keyed/x", env_var="KEYED_API_KEY")
+        )
+        yield
+
+
+@pytest.fixture
+def service():
+    service = JobService(
+        {
+            "alice-token": ServiceUser("alice", "alice-token", budget=100.0),
+            "bob-token": ServiceUser("bob", "bob-token", budget=0.0),
+        },
+        port=0,
+        workers=2,
+    ).start()
+    yield service
+    service.stop()
+
+
+def request(service, method, path, body=None, token="alice-token", headers=None):
+    host, port = service.server.server_address[:2]
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    all_headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json",
+        **(headers or {}),
+    }
+    payload = json.dumps(body).encode() if body is not None else None
+    conn.request(method, path, body=payload, headers=all_headers)
+    response = conn.getresponse()
+    data = response.read().decode()
+    conn.close()
+    return response.status, data
+
+
+def read_events(stream: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in stream.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestParseJob:
+    def test_defaults_and_validation(self):
+        params = parse_job("critique", {"spec": "# S", "models": "mock/a, mock/b"})
+        assert params["models"] == ["mock/a", "mock/b"]
+        assert params["round"] is None and params["doc_type"] == "tech"
+
+        with pytest.raises(JobError, match="type must be"):
+            parse_job("deploy", {})
+        with pytest.raises(JobError, match="spec is required"):
+            parse_job("critique", {"models": ["mock/a"]})
+        with pytest.raises(JobError, match="round"):
+            parse_job("critique", {"spec": "s", "models": ["mock/a"], "round": 0})
+        with pytest.raises(JobError, match="session may only"):
+            parse_job(
+                "critique", {"spec": "s", "models": ["mock/a"], "session": "../x"}
+            )
+        with patch.dict("os.environ", {}, clear=True):
+            with pytest.raises(JobError, match="No credentials"):
+                parse_job("critique", {"spec": "s", "models": ["keyed/x"]})
+
+    def test_continues_existing_session(self):
+        SessionState(
+            "alice-team", "# Saved", 3, "prd", ["mock/agree"], owner="alice"
+        ).save()
+        params = parse_job("critique", {"session": "team"}, "alice")
+        # Spec and round are read from the session when the job starts
+        assert params["spec"] is None and params["round"] is None
+        assert params["models"] == ["mock/agree"]
+        assert params["session"] == "team"
+
+    def test_sessions_scoped_to_user(self):
+        SessionState(
+            "alice-team", "# Secret", 3, "prd", ["mock/agree"], owner="alice"
+        ).save()
+        with pytest.raises(JobError, match="spec is required"):
+            parse_job("critique", {"session": "team"}, "bob")
+        # User "alice-team" asking for "x" maps onto alice's "team-x"
+        SessionState(
+            "alice-team-x", "# Secret", 1, "prd", ["mock/agree"], owner="alice"
+        ).save()
+        with pytest.raises(JobError, match="belongs to another user"):
+            parse_job("critique", {"session": "x"}, "alice-team")
+        SessionState("cli-run", "# Host", 1, "tech", ["mock/agree"]).save()
+        with pytest.raises(JobError, match="belongs to another user"):
+            parse_job("critique", {"session": "run"}, "cli")
+
+
+class TestLoadUsers:
+    def test_loads_and_rejects_bad_entries(self, tmp_path):
+        path = tmp_path / "users.json"
+        path.write_text(json.dumps({"users": {"a": {"token": "t", "budget": 5}}}))
+        users = load_users(path)
+        assert users["t"].name == "a" and users["t"].budget == 5
+
+        path.write_text(json.dumps({"users": {"a": {"max_concurrent": 1}}}))
+        with pytest.raises(ValueError, match="needs a token"):
+            load_users(path)
+        with pytest.raises(ValueError, match="Cannot read"):
+            load_users(tmp_path / "missing.json")
+
+
+class TestJobQueue:
+    def test_per_user_concurrency(self):
+        release = threading.Event()
+        running: list[str] = []
+        lock = threading.Lock()
+        peak = {"alice": 0}
+
+        def runner(job, emit):
+            with lock:
+                running.append(job.user)
+                peak[job.user] = max(peak.get(job.user, 0), running.count(job.user))
+            release.wait(5)
+            with lock:
+                running.remove(job.user)
+            return {}
+
+        queue = JobQueue(runner, workers=3)
+        queue.start()
+        alice = ServiceUser("alice", max_concurrent=1)
+        bob = ServiceUser("bob", max_concurrent=2)
+        jobs = [queue.submit(alice, "critique", {}) for _ in range(2)]
+        jobs.append(queue.submit(bob, "critique", {}))
+        # bob's job starts even though alice's second job is ahead of it
+        queue.wait_events(jobs[2], 1, timeout=5)
+        assert jobs[2].status == "running"
+        assert jobs[1].status == "queued"
+        release.set()
+        for job in jobs:
+            while not job.done:
+                queue.wait_events(job, len(job.events), timeout=5)
+        queue.stop()
+        assert peak["alice"] == 1
+        assert [j.status for j in jobs] == ["completed"] * 3
+
+    def test_budget_checked_on_submit_and_start(self):
+        def runner(job, emit):
+            job.cost = 2.0
+            raise RuntimeError("provider down")
+
+        queue = JobQueue(runner, workers=1)
+        user = ServiceUser("alice", budget=1.0)
+        first = queue.submit(user, "critique", {})
+        second = queue.submit(user, "critique", {})
+        queue.start()
+        while not second.done:
+            queue.wait_events(second, len(second.events), timeout=5)
+        queue.stop()
+        assert first.error == "provider down"
+        assert user.spent == 2.0
+        assert "Budget spent" in second.error
+        with pytest.raises(BudgetExceededError):
+            queue.submit(user, "critique", {})
+
+
+class TestJobService:
+    def test_critique_job_streams_events_and_saves_session(self, service):
+        body = {"spec": "# Spec\ndraft", "models": ["mock/agree", "mock/critic"]}
+        status, data = request(service, "POST", "/jobs", body)
+        assert status == 202
+        job_id = json.loads(data)["id"]
+
+        status, stream = request(service, "GET", f"/jobs/{job_id}/events")
+        assert status == 200
+        events = read_events(stream)
+        names = [name for name, _ in events]
+        assert names[:2] == ["queued", "started"]
+        assert names.count("model_completed") == 2
+        assert names[-1] == "completed"
+        result = events[-1][1]["result"]
+        assert result["all_agreed"] is False
+        assert result["session"] == f"job-{job_id}"
+        assert events[-1][1]["cost"] > 0
+
+        session = SessionState.load(f"alice-job-{job_id}")
+        assert session.round == 2
+        entry = session.history[0]
+        assert entry["job"] == job_id
+        assert entry["user"] == "alice"
+        assert entry["metrics"]["responses"] == 2
+        assert entry["convergence"]["recommendation"] in ("stop", "press", "continue")
+        assert entry["section_changes"]["sections"]
+        critic = next(m for m in entry["models"] if m["model"] == "mock/critic")
+        assert critic["cost"] > 0 and critic["novelty"] is not None
+
+        status, data = request(service, "GET", f"/jobs/{job_id}")
+        assert json.loads(data)["result"]["round"] == 1
+        status, data = request(service, "GET", "/usage")
+        assert json.loads(data)["spent"] == pytest.approx(events[-1][1]["cost"])
+
+        status, stream = request(
+            service,
+            "GET",
+            f"/jobs/{job_id}/events",
+            headers={"Last-Event-ID": str(len(events) - 2)},
+        )
+        assert [name for name, _ in read_events(stream)] == ["completed"]
+
+    def test_continuing_a_session(self, service):
+        body = {"spec": "# Spec\nold", "models": ["mock/agree"], "session": "team"}
+        job_id = json.loads(request(service, "POST", "/jobs", body)[1])["id"]
+        request(service, "GET", f"/jobs/{job_id}/events")
+        status, data = request(service, "POST", "/jobs", {"session": "team"})
+        job_id = json.loads(data)["id"]
+        _, stream = request(service, "GET", f"/jobs/{job_id}/events")
+        result = read_events(stream)[-1][1]["result"]
+        assert result["all_agreed"] is True and result["session"] == "team"
+        session = SessionState.load("alice-team")
+        assert session.owner == "alice"
+        assert session.round == 3
+        assert session.spec == "# Spec\nfinal"
+
+        status, data = request(
+            service, "POST", "/jobs", {"session": "team"}, token="bob-token"
+        )
+        assert status == 400
+
+    def test_queued_jobs_on_one_session_run_consecutive_rounds(self, service):
+        SessionState(
+            "alice-team", "# Spec\nold", 3, "tech", ["mock/critic"], owner="alice"
+        ).save()
+        job_ids = [
+            json.loads(request(service, "POST", "/jobs", {"session": "team"})[1])["id"]
+            for _ in range(2)
+        ]
+        rounds = []
+        for job_id in job_ids:
+            _, stream = request(service, "GET", f"/jobs/{job_id}/events")
+            rounds.append(read_events(stream)[-1][1]["result"]["round"])
+        assert sorted(rounds) == [3, 4]
+        session = SessionState.load("alice-team")
+        assert session.round == 5
+        assert [h["round"] for h in session.history] == [3, 4]
+        assert all("metrics" in h for h in session.history)
+
+    def test_post_requires_json_content_type(self, service):
+        body = {"spec": "# S", "models": ["mock/agree"]}
+        status, _ = request(
+            service, "POST", "/jobs", body, headers={"Content-Type": "text/plain"}
+        )
+        assert status == 415
+
+    def test_all_models_failing_fails_job(self, service):
+        body = {"spec": "# S", "models": ["mock/broken"]}
+        job_id = json.loads(request(service, "POST", "/jobs", body)[1])["id"]
+        _, stream = request(service, "GET", f"/jobs/{job_id}/events")
+        name, data = read_events(stream)[-1]
+        assert name == "failed"
+        assert "mock outage" in data["error"]
+
+    def test_export_job(self, service):
+        body = {"type": "export-tasks", "spec": "# S", "models": ["mock/agree"]}
+        job_id = json.loads(request(service, "POST", "/jobs", body)[1])["id"]
+        _, stream = request(service, "GET", f"/jobs/{job_id}/events")
+        name, data = read_events(stream)[-1]
+        assert name == "completed"
+        assert data["result"]["tasks"][0]["title"] == "Build it"
+
+    def test_auth_budget_and_isolation(self, service):
+        body = {"spec": "# S", "models": ["mock/agree"]}
+        assert request(service, "POST", "/jobs", body, token="wrong")[0] == 401
+        assert request(service, "GET", "/jobs", token="")[0] == 401
+        assert request(service, "GET", "/health", token="")[0] == 200
+        status, data = request(service, "POST", "/jobs", body, token="bob-token")
+        assert status == 402 and "Budget" in json.loads(data)["error"]
+        status, data = request(service, "POST", "/jobs", {"models": ["mock/a"]})
+        assert status == 400
+
+        job_id = json.loads(request(service, "POST", "/jobs", body)[1])["id"]
+        assert request(service, "GET", f"/jobs/{job_id}", token="bob-token")[0] == 404
+        _, data = request(service, "GET", "/jobs")
+        assert [j["id"] for j in json.loads(data)["jobs"]] == [job_id]
+        _, data = request(service, "GET", "/jobs", token="bob-token")
+        assert json.loads(data)["jobs"] == []
+
+    def test_requires_users_off_loopback(self):
+        with pytest.raises(ValueError, match="users file is required"):
+            JobService(host="0.0.0.0", port=0)
+        local = JobService(port=0)
+        assert local.authenticate("").name == "local"
+        local.server.server_close()
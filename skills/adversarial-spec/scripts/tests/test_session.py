@@ -8,7 +8,8 @@ from unittest.mock import patch
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from session import SessionState, save_checkpoint
+from models import ModelResponse
+from session import SessionState, round_history_entry, save_checkpoint
 
 
 class TestSessionState:
@@ -201,6 +202,24 @@ class TestSessionState:
         assert session.history[0]["round"] == 1
 
 
+class TestRoundHistoryEntry:
+    def test_entry_fields(self):
+        spec = "# Spec\n\n## API\n\nold\n"
+        latest = "# Spec\n\n## API\n\nnew\n"
+        results = [
+            ModelResponse("a", "Fix the API.", False, latest, cost=0.5, latency=1.0),
+            ModelResponse("b", "", False, None, error="timeout"),
+        ]
+        entry = round_history_entry(2, spec, latest, results, False, [])
+        assert entry["round"] == 2 and entry["all_agreed"] is False
+        assert entry["models"][0]["cost"] == 0.5
+        assert entry["models"][0]["novelty"] is not None
+        assert entry["models"][1]["error"] == "timeout"
+        assert entry["section_changes"]["sections"][0]["kind"] == "edited"
+        assert entry["metrics"]["responses"] == 1
+        assert entry["convergence"]["recommendation"] == "continue"
+
+
 class TestSaveCheckpoint:
     def test_save_checkpoint_creates_file(self):
         with tempfile.TemporaryDirectory() as tmpdir:
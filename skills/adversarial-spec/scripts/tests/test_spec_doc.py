@@ -0,0 +1,168 @@
+"""Tests for spec_doc module."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from spec_doc import (
+    PREAMBLE_KEY,
+    SpecDocument,
+    content_hash,
+    diff_sections,
+    format_section_changes,
+    summarize_changes,
+)
+
+SPEC = """Intro text.
+
+# Overview
+Overview body.
+
+## Goals
+- fast
+
+## Non-Goals
+- slow
+
+# API
+GET /items
+"""
+
+
+class TestSpecDocumentParse:
+    def test_builds_heading_tree(self):
+        doc = SpecDocument.parse(SPEC)
+        keys = [s.key for s in doc.sections]
+        assert keys == [
+            PREAMBLE_KEY,
+            "Overview",
+            "Overview > Goals",
+            "Overview > Non-Goals",
+            "API",
+        ]
+        by_key = doc.by_key()
+        assert by_key["Overview"].children == [
+            "Overview > Goals",
+            "Overview > Non-Goals",
+        ]
+        assert by_key["Overview > Goals"].parent == "Overview"
+        assert by_key["API"].level == 1
+
+    def test_section_text_and_lines(self):
+        doc = SpecDocument.parse(SPEC)
+        goals = doc.by_key()["Overview > Goals"]
+        assert goals.text == "## Goals\n- fast\n\n"
+        assert goals.body == "- fast\n\n"
+        assert goals.start_line == 6
+        assert goals.digest == content_hash(goals.text)
+
+    def test_sections_reassemble_document(self):
+        doc = SpecDocument.parse(SPEC)
+        assert "".join(s.text for s in doc.sections) == SPEC
+
+    def test_ignores_headings_in_code_fences(self):
+        text = "# Real\n```\n# not a heading\n```\n# Second\n"
+        doc = SpecDocument.parse(text)
+        assert [s.key for s in doc.sections] == ["Real", "Second"]
+
+    def test_disambiguates_duplicate_keys(self):
+        doc = SpecDocument.parse("# A\n## Notes\nx\n## Notes\ny\n")
+        assert [s.key for s in doc.sections] == ["A", "A > Notes", "A > Notes#2"]
+
+    def test_no_preamble_for_whitespace(self):
+        doc = SpecDocument.parse("\n\n# Title\n")
+        assert doc.sections[0].key == "Title"
+
+    def test_outline(self):
+        doc = SpecDocument.parse("# A\n## B\n")
+        assert doc.outline() == ["A", "  B"]
+
+
+class TestDiffSections:
+    def test_identical_documents(self):
+        assert diff_sections(SPEC, SPEC) == []
+
+    def test_edited_section_only(self):
+        current = SPEC.replace("- fast", "- very fast")
+        changes = diff_sections(SPEC, current)
+        assert [(c.kind, c.key) for c in changes] == [("edited", "Overview > Goals")]
+        assert "-- fast" in changes[0].diff
+        assert "+- very fast" in changes[0].diff
+        # Hunk line numbers point into the full document
+        assert "@@ -6," in changes[0].diff
+
+    def test_added_and_removed(self):
+        current = SPEC.replace("## Non-Goals\n- slow\n\n", "") + "\n# Security\nTLS\n"
+        changes = diff_sections(SPEC, current)
+        kinds = {(c.kind, c.key) for c in changes}
+        assert ("removed", "Overview > Non-Goals") in kinds
+        assert ("added", "Security") in kinds
+
+    def test_reordered_section_is_moved(self):
+        current = """Intro text.
+
+# API
+GET /items
+
+# Overview
+Overview body.
+
+## Goals
+- fast
+
+## Non-Goals
+- slow
+
+"""
+        changes = diff_sections(SPEC, current)
+        moved = [c for c in changes if c.kind == "moved"]
+        assert [c.key for c in moved] == ["API"]
+        assert all(c.kind != "added" and c.kind != "removed" for c in changes)
+
+    def test_reparented_section_is_moved_not_added(self):
+        current = (
+            SPEC.replace("## Non-Goals\n- slow\n\n", "") + "\n## Non-Goals\n- slow\n"
+        )
+        changes = diff_sections(SPEC, current)
+        moved = [c for c in changes if c.kind == "moved"]
+        assert len(moved) == 1
+        assert moved[0].old_key == "Overview > Non-Goals"
+        assert moved[0].key == "API > Non-Goals"
+        assert moved[0].to_dict()["old_key"] == "Overview > Non-Goals"
+
+    def test_include_diff_false(self):
+        current = SPEC.replace("- fast", "- very fast")
+        changes = diff_sections(SPEC, current, include_diff=False)
+        assert changes[0].diff == ""
+
+    def test_large_document_skips_unchanged_sections(self):
+        body = "\n".join(f"line {i}" for i in range(50))
+        sections = [f"# Section {i}\n{body}\n" for i in range(2000)]
+        previous = "".join(sections)
+        sections[1000] = sections[1000].replace("line 7\n", "line seven\n")
+        changes = diff_sections(previous, "".join(sections))
+        assert [(c.kind, c.key) for c in changes] == [("edited", "Section 1000")]
+
+
+class TestSummaries:
+    def test_summarize_changes(self):
+        current = SPEC.replace("- fast", "- faster") + "\n# New\nx\n"
+        summary = summarize_changes(diff_sections(SPEC, current))
+        assert summary == {
+            "added": 1,
+            "removed": 0,
+            "moved": 0,
+            "edited": 1,
+            "changed": 2,
+        }
+
+    def test_format_section_changes(self):
+        current = SPEC.replace("- fast", "- faster")
+        report = format_section_changes(diff_sections(SPEC, current))
+        assert "=== Section Changes ===" in report
+        assert "edited  Overview > Goals" in report
+        assert "+- faster" in report
+
+    def test_format_empty(self):
+        assert format_section_changes([]) == ""
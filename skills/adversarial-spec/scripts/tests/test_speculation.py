@@ -0,0 +1,239 @@
+"""Tests for speculation module and critique --speculate."""
+
+import json
+import sys
+from io import StringIO
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import speculation
+from speculation import (
+    claim_speculation,
+    format_speculation,
+    prefetched_usage,
+    run_worker,
+    speculation_key,
+    start_speculation,
+)
+
+SPEC = "# Spec\n\n## Auth\nTokens expire after 1h.\n"
+OPTIONS = {
+    "models": ["gpt-4o", "gemini/gemini-pro"],
+    "doc_type": "tech",
+    "press": False,
+    "focus": None,
+    "persona": None,
+    "context": None,
+    "preserve_intent": False,
+    "codex_reasoning": "medium",
+    "codex_search": False,
+    "timeout": 60,
+    "bedrock_mode": False,
+    "bedrock_region": None,
+    "contexts": None,
+}
+
+
+@pytest.fixture(autouse=True)
+def speculation_dir(tmp_path):
+    with patch("speculation.SPECULATION_DIR", tmp_path / "speculation"):
+        yield tmp_path / "speculation"
+
+
+@pytest.fixture
+def popen():
+    with patch("speculation.subprocess.Popen") as mock_popen:
+        mock_popen.return_value = MagicMock(pid=4321)
+        yield mock_popen
+
+
+def run_prefetch(key, popen):
+    """Start a speculation and run its worker in this process."""
+    start_speculation(key, SPEC, 3, OPTIONS)
+    state_path = Path(popen.call_args[0][0][2])
+    with patch(
+        "models._litellm_call", return_value=("[AGREE]", 1000, 200, 0)
+    ) as upstream:
+        run_worker(state_path)
+    return upstream
+
+
+class TestStartSpeculation:
+    def test_launches_detached_worker(self, popen, speculation_dir):
+        pid = start_speculation("session-auth", SPEC, 3, OPTIONS)
+        assert pid == 4321
+        argv = popen.call_args[0][0]
+        assert argv[1].endswith("speculation.py")
+        assert popen.call_args[1]["start_new_session"] is True
+        state = json.loads((speculation_dir / "session-auth.json").read_text())
+        assert state["round"] == 3 and state["pid"] == 4321
+        assert state["spec"] == SPEC
+
+    def test_replaces_previous_worker(self, popen):
+        start_speculation("session-auth", SPEC, 3, OPTIONS)
+        with patch("speculation.os.killpg") as killpg:
+            start_speculation("session-auth", SPEC + "More.\n", 3, OPTIONS)
+        killpg.assert_called_once()
+        assert killpg.call_args[0][0] == 4321
+
+    def test_start_failure_is_a_warning(self, speculation_dir):
+        with (
+            patch("speculation.subprocess.Popen", side_effect=OSError("no fork")),
+            patch("sys.stderr", new_callable=StringIO) as mock_stderr,
+        ):
+            assert start_speculation("session-auth", SPEC, 3, OPTIONS) is None
+        assert "Warning: Could not start speculative round" in mock_stderr.getvalue()
+        assert not (speculation_dir / "session-auth.json").exists()
+
+
+class TestClaimSpeculation:
+    def test_nothing_pending(self):
+        assert claim_speculation("session-auth", SPEC, 3, OPTIONS) == (None, None)
+
+    def test_hit_reuses_prefetched_responses(self, popen):
+        from models import call_models_parallel
+        from response_cache import SharedCache, using_cache
+
+        upstream = run_prefetch("session-auth", popen)
+        assert upstream.call_count == 2
+
+        report, cache_dir = claim_speculation("session-auth", SPEC, 3, dict(OPTIONS))
+        assert report["status"] == "hit"
+        assert sorted(report["models_completed"]) == sorted(OPTIONS["models"])
+        assert report["cost"] > 0
+        assert "matched: 2 response(s)" in format_speculation(report)
+        usage = prefetched_usage("session-auth", ["gpt-4o", "o1"], timeout=0)
+        assert list(usage) == ["gpt-4o"]
+        assert usage["gpt-4o"]["input_tokens"] == 1000
+        assert usage["gpt-4o"]["latency"] >= 0
+
+        with (
+            patch("models._litellm_call") as second,
+            using_cache(SharedCache(cache_dir)),
+        ):
+            results = call_models_parallel(spec=SPEC, round_num=3, **OPTIONS)
+        second.assert_not_called()
+        assert all(r.cached and r.agreed for r in results)
+
+    def test_changed_spec_is_wasted(self, popen, speculation_dir):
+        run_prefetch("session-auth", popen)
+        with patch("speculation.os.killpg") as killpg:
+            report, cache_dir = claim_speculation(
+                "session-auth", SPEC + "Edited.\n", 3, OPTIONS
+            )
+        assert cache_dir is None
+        assert report["status"] == "wasted"
+        assert report["calls_cancelled"] == 0
+        killpg.assert_not_called()
+        assert "$" in format_speculation(report)
+        assert list(speculation_dir.iterdir()) == []
+
+    def test_unfinished_worker_is_stopped(self, popen):
+        start_speculation("session-auth", SPEC, 3, OPTIONS)
+        changed = {**OPTIONS, "focus": "security"}
+        with patch("speculation.os.killpg") as killpg:
+            report, _ = claim_speculation("session-auth", SPEC, 3, changed)
+        killpg.assert_called_once()
+        assert report["status"] == "wasted"
+        assert report["calls_cancelled"] == 2
+        assert "2 call(s) cancelled" in format_speculation(report)
+
+    def test_stale_speculation_expires(self, popen, speculation_dir):
+        start_speculation("session-auth", SPEC, 3, OPTIONS)
+        state_path = speculation_dir / "session-auth.json"
+        state = json.loads(state_path.read_text())
+        state["created"] -= speculation.MAX_AGE + 1
+        state_path.write_text(json.dumps(state))
+        with patch("speculation.os.killpg"):
+            report, cache_dir = claim_speculation("session-auth", SPEC, 3, OPTIONS)
+        assert report["status"] == "expired" and cache_dir is None
+
+
+def test_speculation_key():
+    assert speculation_key("auth") == "session-auth"
+    assert speculation_key(None).startswith("cwd-")
+
+
+class TestCLISpeculate:
+    @patch("debate.validate_models_before_run")
+    @patch("debate.call_models_parallel")
+    @patch("debate.start_speculation", return_value=999)
+    def test_revised_round_starts_speculation(self, mock_start, mock_call, _):
+        import debate
+        from models import ModelResponse
+
+        revised = "# Spec\nrevised\n"
+        mock_call.return_value = [
+            ModelResponse("gpt-4o", f"Fix.\n[SPEC]\n{revised}[/SPEC]", False, revised)
+        ]
+        argv = ["critique", "--models", "gpt-4o", "--speculate", "--json"]
+        with (
+            patch("sys.stdin", StringIO("# Spec\ndraft\n")),
+            patch("sys.stdout", new_callable=StringIO) as mock_stdout,
+            patch("sys.stderr", new_callable=StringIO) as mock_stderr,
+        ):
+            debate.main(argv)
+        key, spec, round_num, options = mock_start.call_args[0]
+        assert key.startswith("cwd-")
+        assert spec.strip() == revised.strip() and round_num == 2
+        assert options["models"] == ["gpt-4o"]
+        assert "Speculating round 2" in mock_stderr.getvalue()
+        assert json.loads(mock_stdout.getvalue())["speculation"]["next_round"] == 2
+
+    @patch("debate.validate_models_before_run")
+    def test_hit_credits_worker_usage(self, _, popen, speculation_dir):
+        import debate
+        from models import cost_tracker
+
+        models = ",".join(OPTIONS["models"])
+        revised = "Fix.\n[SPEC]\n# Spec\nrevised\n[/SPEC]"
+        with (
+            patch("models._litellm_call", return_value=(revised, 10, 10, 0)),
+            patch("sys.stdin", StringIO("# Spec\ndraft\n")),
+            patch("sys.stdout", new_callable=StringIO),
+            patch("sys.stderr", new_callable=StringIO),
+        ):
+            debate.main(["critique", "--models", models, "--speculate"])
+        state_path = Path(popen.call_args[0][0][2])
+        with patch("models._litellm_call", return_value=("[AGREE]", 1000, 200, 0)):
+            run_worker(state_path)
+        spec = json.loads(state_path.read_text())["spec"]
+
+        cost_tracker.reset()
+        argv = ["critique", "--models", models, "--round", "2", "--json"]
+        with (
+            patch("models._litellm_call") as upstream,
+            patch("sys.stdin", StringIO(spec)),
+            patch("sys.stdout", new_callable=StringIO) as mock_stdout,
+            patch("sys.stderr", new_callable=StringIO),
+        ):
+            debate.main(argv)
+        upstream.assert_not_called()
+        output = json.loads(mock_stdout.getvalue())
+        spent = output["speculation"]["previous"]["cost"]
+        assert output["speculation"]["previous"]["status"] == "hit"
+        for r in output["results"]:
+            assert r["cached"] and r["input_tokens"] == 1000 and r["cost"] > 0
+        assert output["cost"]["total"] == pytest.approx(spent)
+        assert output["cost"]["input_tokens"] == 2000
+
+    @patch("debate.validate_models_before_run")
+    @patch("debate.call_models_parallel")
+    @patch("debate.start_speculation")
+    def test_agreement_does_not_speculate(self, mock_start, mock_call, _):
+        import debate
+        from models import ModelResponse
+
+        mock_call.return_value = [ModelResponse("gpt-4o", "[AGREE]", True, None)]
+        argv = ["critique", "--models", "gpt-4o", "--speculate"]
+        with (
+            patch("sys.stdin", StringIO("# Spec\n")),
+            patch("sys.stdout", new_callable=StringIO),
+            patch("sys.stderr", new_callable=StringIO),
+        ):
+            debate.main(argv)
+        mock_start.assert_not_called()
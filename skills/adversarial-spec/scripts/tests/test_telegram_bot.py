@@ -9,13 +9,23 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from telegram_bot import (
     MAX_MESSAGE_LENGTH,
+    MAX_RATE_LIMIT_RETRIES,
+    REQUEST_TIMEOUT,
+    UPLOAD_TIMEOUT,
+    FeedbackWorker,
+    TelegramClient,
     api_call,
+    encode_multipart,
     get_config,
     get_last_update_id,
     poll_for_reply,
+    send_document,
     send_long_message,
+    send_long_message_ids,
     send_message,
+    set_webhook,
     split_message,
+    wait_for_reply,
 )
 
 
@@ -77,33 +87,189 @@ class TestSplitMessage:
         assert len(result) >= 2
         assert all(len(chunk) <= 2000 for chunk in result)
 
+    def test_each_chunk_sent_once(self):
+        paragraphs = [f"paragraph {i} " + "x" * 300 for i in range(40)]
+        result = split_message("\n\n".join(paragraphs), max_length=1000)
+        assert "\n\n".join(result) == "\n\n".join(paragraphs)
+
+    def test_packs_chunks_close_to_limit(self):
+        text = "\n".join("line %04d " % i + "y" * 40 for i in range(400))
+        result = split_message(text, max_length=1000)
+        assert all(len(chunk) > 900 for chunk in result[:-1])
+
+    def test_does_not_split_inside_code_fence(self):
+        block = "```\n" + "\n".join(f"code {i}" for i in range(30)) + "\n```"
+        text = "intro " * 100 + "\n\n" + block + "\n\nafter"
+        result = split_message(text, max_length=700)
+        assert any(chunk.startswith(block) for chunk in result)
+        assert all(chunk.count("```") % 2 == 0 for chunk in result)
+
+    def test_long_code_fence_is_closed_and_reopened(self):
+        block = "```python\n" + "\n".join(f"x = {i}" for i in range(400)) + "\n```"
+        result = split_message(block, max_length=500)
+        assert len(result) > 1
+        assert all(len(chunk) <= 500 for chunk in result)
+        assert all(chunk.startswith("```python\n") for chunk in result)
+        assert all(chunk.endswith("```") for chunk in result)
+
+    def test_long_fence_opener_terminates(self):
+        text = "```" + " note" * 1000 + "\n" + "code\n" * 2000 + "```"
+        result = split_message(text)
+        assert len(result) > 1
+        assert all(len(chunk) <= MAX_MESSAGE_LENGTH for chunk in result)
+        assert all(chunk.startswith("```note\n") for chunk in result[1:])
+        assert sum(chunk.count("code\n") for chunk in result) == 2000
+
+    def test_does_not_split_inside_inline_entity(self):
+        text = "a" * 80 + " `inline code with spaces` " + "b" * 30
+        result = split_message(text, max_length=100)
+        assert all(chunk.count("`") % 2 == 0 for chunk in result)
+
+    def test_large_text_is_linear(self):
+        import time
+
+        text = "word " * 1_000_000
+        start = time.perf_counter()
+        result = split_message(text)
+        assert time.perf_counter() - start < 2
+        assert all(len(chunk) <= MAX_MESSAGE_LENGTH for chunk in result)
+
 
 class TestApiCall:
-    @patch("telegram_bot.urlopen")
-    def test_successful_api_call(self, mock_urlopen):
-        mock_response = MagicMock()
-        mock_response.read.return_value = b'{"ok": true, "result": []}'
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+    @patch("telegram_bot._client")
+    def test_successful_api_call(self, mock_client):
+        mock_client.post.return_value = (200, b'{"ok": true, "result": []}')
 
         result = api_call("test-token", "getMe")
         assert result == {"ok": True, "result": []}
 
-    @patch("telegram_bot.urlopen")
-    def test_api_call_with_params(self, mock_urlopen):
-        mock_response = MagicMock()
-        mock_response.read.return_value = b'{"ok": true}'
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+    @patch("telegram_bot._client")
+    def test_api_call_with_params(self, mock_client):
+        mock_client.post.return_value = (200, b'{"ok": true}')
 
         result = api_call("test-token", "sendMessage", {"chat_id": "123", "text": "hi"})
         assert result == {"ok": True}
 
-        called_request = mock_urlopen.call_args[0][0]
-        assert "chat_id=123" in called_request.full_url
-        assert "text=hi" in called_request.full_url
+        path, payload = mock_client.post.call_args[0]
+        assert path == "/bottest-token/sendMessage"
+        assert payload == {"chat_id": "123", "text": "hi"}
+
+    @patch("telegram_bot._client")
+    def test_long_poll_extends_timeout(self, mock_client):
+        mock_client.post.return_value = (200, b'{"ok": true}')
+        api_call("token", "getUpdates", {"timeout": 30})
+        assert mock_client.post.call_args[1]["timeout"] == REQUEST_TIMEOUT + 30
+
+    @patch("telegram_bot.time.sleep")
+    @patch("telegram_bot._client")
+    def test_retries_after_rate_limit(self, mock_client, mock_sleep):
+        limited = b'{"ok": false, "parameters": {"retry_after": 7}}'
+        mock_client.post.side_effect = [(429, limited), (200, b'{"ok": true}')]
+
+        assert api_call("token", "sendMessage", {"text": "hi"}) == {"ok": True}
+        mock_sleep.assert_called_once_with(7)
+
+    @patch("telegram_bot.time.sleep")
+    @patch("telegram_bot._client")
+    def test_gives_up_after_max_retries(self, mock_client, mock_sleep):
+        import pytest
+
+        mock_client.post.return_value = (429, b"{}")
+        with pytest.raises(RuntimeError, match="429"):
+            api_call("token", "sendMessage")
+        assert mock_sleep.call_count == MAX_RATE_LIMIT_RETRIES
+
+
+class TestTelegramClient:
+    def make_conn(self, status=200, body=b"{}", sock=None):
+        conn = MagicMock()
+        conn.sock = sock
+        conn.getresponse.return_value = MagicMock(
+            status=status, read=MagicMock(return_value=body)
+        )
+        return conn
+
+    def test_reuses_connection(self):
+        conn = self.make_conn()
+        factory = MagicMock(return_value=conn)
+        client = TelegramClient(connection_factory=factory)
+
+        client.post("/a", {})
+        client.post("/b", {"x": 1})
+        assert factory.call_count == 1
+        method, path = conn.request.call_args[0]
+        assert (method, path) == ("POST", "/b")
+        assert conn.request.call_args[1]["body"] == b'{"x": 1}'
+
+    def test_retries_stale_keep_alive_connection(self):
+        import http.client
+
+        stale = self.make_conn(sock=MagicMock())
+        stale.getresponse.side_effect = http.client.RemoteDisconnected("closed")
+        fresh = self.make_conn(body=b"ok")
+        client = TelegramClient(connection_factory=MagicMock(return_value=fresh))
+        client._idle.append(stale)
+
+        assert client.post("/a", {}) == (200, b"ok")
+        stale.close.assert_called_once()
+
+    def test_fresh_connection_errors_propagate(self):
+        import pytest
+
+        conn = self.make_conn()
+        conn.request.side_effect = ConnectionRefusedError("refused")
+        client = TelegramClient(connection_factory=MagicMock(return_value=conn))
+        with pytest.raises(OSError):
+            client.post("/a", {})
+        assert client._idle == []
+
+    def test_close_closes_idle_connections(self):
+        conn = self.make_conn()
+        client = TelegramClient(connection_factory=MagicMock(return_value=conn))
+        client.post("/a", {})
+        client.close()
+        conn.close.assert_called_once()
+
+    def test_keep_alive_against_local_server(self):
+        import http.client
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        connections = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                connections.append(self.client_address)
+
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                payload = self.rfile.read(length)
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            host, port = server.server_address
+            client = TelegramClient(
+                connection_factory=lambda: http.client.HTTPConnection(host, port)
+            )
+            for i in range(3):
+                assert client.post("/m", {"i": i}) == (200, f'{{"i": {i}}}'.encode())
+            client.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert len(connections) == 1
 
 
 class TestSendMessage:
@@ -121,6 +287,78 @@ class TestSendMessage:
         assert result is False
 
 
+class TestSendDocument:
+    def parse_multipart(self, body, content_type):
+        from email.parser import BytesParser
+        from email.policy import HTTP
+
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body
+        )
+        return {
+            part.get_param("name", header="content-disposition"): part
+            for part in message.iter_parts()
+        }
+
+    def test_encode_multipart(self):
+        body, content_type = encode_multipart(
+            {"chat_id": "123"}, {"document": ("spec.md", b"# Spec\n", "text/markdown")}
+        )
+        parts = self.parse_multipart(body, content_type)
+        assert parts["chat_id"].get_content() == "123"
+        assert parts["document"].get_filename() == "spec.md"
+        assert parts["document"].get_content_type() == "text/markdown"
+        assert parts["document"].get_payload(decode=True) == b"# Spec\n"
+
+    @patch("telegram_bot._client")
+    def test_uploads_single_request(self, mock_client):
+        mock_client.post.return_value = (200, b'{"ok": true}')
+        assert send_document("token", "123", "spec.md", "x" * 200_000, caption="Hi")
+        assert mock_client.post.call_count == 1
+        path, params = mock_client.post.call_args[0]
+        files = mock_client.post.call_args[1]["files"]
+        assert path == "/bottoken/sendDocument"
+        assert params == {"chat_id": "123", "caption": "Hi", "parse_mode": "Markdown"}
+        assert files["document"] == ("spec.md", b"x" * 200_000, "text/markdown")
+        assert mock_client.post.call_args[1]["timeout"] == UPLOAD_TIMEOUT
+
+    @patch("telegram_bot._client")
+    def test_gzip_compression(self, mock_client):
+        import gzip
+
+        mock_client.post.return_value = (200, b'{"ok": true}')
+        send_document("token", "123", "spec.md", "spec " * 1000, compress=True)
+        filename, data, content_type = mock_client.post.call_args[1]["files"][
+            "document"
+        ]
+        assert filename == "spec.md.gz"
+        assert content_type == "application/gzip"
+        assert gzip.decompress(data) == ("spec " * 1000).encode()
+        assert len(data) < 1000
+
+    @patch("telegram_bot._client")
+    def test_caption_truncated_and_failure_reported(self, mock_client):
+        mock_client.post.return_value = (200, b'{"ok": false}')
+        assert not send_document(
+            "token", "1", "d.diff", b"-a\n+b\n", caption="c" * 2000
+        )
+        params = mock_client.post.call_args[0][1]
+        assert len(params["caption"]) == 1024
+        assert mock_client.post.call_args[1]["files"]["document"][2] == "text/plain"
+
+    def test_multipart_request_over_connection(self):
+        conn = MagicMock()
+        conn.sock = None
+        conn.getresponse.return_value = MagicMock(
+            status=200, read=MagicMock(return_value=b"{}")
+        )
+        client = TelegramClient(connection_factory=MagicMock(return_value=conn))
+        client.post("/up", {"chat_id": 1}, files={"document": ("a.md", b"x", "t/p")})
+        headers = conn.request.call_args[1]["headers"]
+        assert headers["Content-Type"].startswith("multipart/form-data; boundary=")
+        assert b'filename="a.md"' in conn.request.call_args[1]["body"]
+
+
 class TestSendLongMessage:
     @patch("telegram_bot.send_message")
     def test_sends_short_message_directly(self, mock_send):
@@ -138,6 +376,14 @@ class TestSendLongMessage:
         assert result is True
         assert mock_send.call_count >= 2
 
+    @patch("telegram_bot.send_message")
+    def test_chunks_with_headers_fit_api_limit(self, mock_send):
+        mock_send.return_value = True
+        send_long_message("token", "123", "word " * 3000)
+        assert all(
+            len(call[0][2]) <= MAX_MESSAGE_LENGTH for call in mock_send.call_args_list
+        )
+
     @patch("telegram_bot.send_message")
     def test_returns_false_on_chunk_failure(self, mock_send):
         mock_send.side_effect = [True, False]
@@ -146,6 +392,104 @@ class TestSendLongMessage:
         assert result is False
 
 
+class TestFeedbackWorker:
+    def make_api(self, batches):
+        """Fake getUpdates: return each batch once, then block like a long poll."""
+        import threading
+
+        calls = []
+        idle = threading.Event()
+
+        def fake_api_call(token, method, params):
+            calls.append(params)
+            if batches:
+                return {"ok": True, "result": batches.pop(0)}
+            idle.wait(5)
+            return {"ok": True, "result": []}
+
+        return fake_api_call, calls, idle
+
+    def update(self, update_id, chat_id, text):
+        return {
+            "update_id": update_id,
+            "message": {"chat": {"id": chat_id}, "text": text},
+        }
+
+    def test_collects_replies_from_chat(self):
+        import time
+
+        batch = [self.update(5, 123, "fix auth"), self.update(6, 999, "other chat")]
+        fake_api_call, calls, idle = self.make_api([batch])
+        with patch("telegram_bot.api_call", side_effect=fake_api_call):
+            worker = FeedbackWorker("token", "123", offset=5).start()
+            deadline = time.time() + 2
+            while worker.offset != 7 and time.time() < deadline:
+                time.sleep(0.01)
+            worker.stop()
+            idle.set()
+        replies, offset = worker.drain()
+        assert (replies, offset) == (["fix auth"], 7)
+        assert calls[0]["offset"] == 5
+        assert calls[0]["timeout"] > 0
+
+    def test_drain_returns_replies_and_offset(self):
+        import time
+
+        fake_api_call, _, idle = self.make_api([[self.update(10, 1, "a")]])
+        with patch("telegram_bot.api_call", side_effect=fake_api_call):
+            worker = FeedbackWorker("token", "1", offset=10).start()
+            deadline = time.time() + 2
+            replies, offset = [], None
+            while not replies and time.time() < deadline:
+                replies, offset = worker.drain()
+                time.sleep(0.01)
+            worker.stop()
+            idle.set()
+        assert replies == ["a"]
+        assert offset == 11
+
+    def test_starts_after_last_update_without_offset(self):
+        import time
+
+        fake_api_call, calls, idle = self.make_api([])
+        with patch("telegram_bot.get_last_update_id", return_value=41):
+            with patch("telegram_bot.api_call", side_effect=fake_api_call):
+                worker = FeedbackWorker("token", "1").start()
+                time.sleep(0.2)
+                assert worker.drain() == ([], 42)
+                worker.stop()
+                idle.set()
+        assert calls[0]["offset"] == 42
+
+    def test_batch_after_stop_is_not_consumed(self):
+        worker = FeedbackWorker("token", "1", offset=3)
+
+        def stop_during_poll(token, method, params):
+            worker.stop()
+            return {"ok": True, "result": [self.update(3, 1, "late")]}
+
+        with patch("telegram_bot.api_call", side_effect=stop_during_poll):
+            worker._run()
+        assert worker.drain() == ([], 3)
+
+    def test_retries_after_network_error(self):
+        worker = FeedbackWorker("token", "1", offset=1)
+        responses = [RuntimeError("down"), {"ok": True, "result": []}]
+
+        def flaky(token, method, params):
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            worker.stop()
+            return response
+
+        with patch("telegram_bot.api_call", side_effect=flaky):
+            with patch.object(worker._stopped, "wait") as mock_wait:
+                worker._run()
+        mock_wait.assert_called_once_with(1)
+        assert responses == []
+
+
 class TestGetLastUpdateId:
     @patch("telegram_bot.api_call")
     def test_returns_update_id_when_present(self, mock_api_call):
@@ -216,8 +560,8 @@ class TestSplitMessageBoundaries:
 
     Mutation targets:
     - len(text) <= max_length boundary
-    - split_at == -1 checks
-    - split_at < max_length // 2 boundaries
+    - missing boundary fallbacks
+    - paragraph / line / space preference
     """
 
     def test_exactly_max_length_not_split(self):
@@ -299,15 +643,13 @@ class TestSendLongMessageBoundaries:
 
     @patch("telegram_bot.send_message")
     @patch("telegram_bot.time.sleep")
-    def test_no_sleep_after_last_chunk(self, mock_sleep, mock_send):
-        # Mutation: i < len(chunks) - 1 check
+    def test_no_fixed_sleep_between_chunks(self, mock_sleep, mock_send):
+        # Rate limiting is driven by retry_after in api_call instead
         mock_send.return_value = True
         long_text = "a" * 5000
         send_long_message("token", "123", long_text)
-        # Sleep called between chunks but not after last
-        # With 2 chunks, should sleep once
-        calls = mock_send.call_args_list
-        assert mock_sleep.call_count == len(calls) - 1
+        assert mock_send.call_count >= 2
+        mock_sleep.assert_not_called()
 
 
 class TestPollForReplyBoundaries:
@@ -367,29 +709,24 @@ class TestApiCallErrors:
     """Mutation-targeted tests for api_call error handling.
 
     Mutation targets:
-    - HTTPError handling
-    - URLError handling
+    - HTTP error status handling
+    - network error handling
     """
 
-    @patch("telegram_bot.urlopen")
-    def test_http_error_raises_runtime_error(self, mock_urlopen):
-        from urllib.error import HTTPError
-
-        mock_urlopen.side_effect = HTTPError(
-            "url", 400, "Bad Request", {}, MagicMock(read=lambda: b"error body")
-        )
+    @patch("telegram_bot._client")
+    def test_http_error_raises_runtime_error(self, mock_client):
+        mock_client.post.return_value = (400, b"error body")
 
         import pytest
 
         with pytest.raises(RuntimeError) as exc_info:
             api_call("token", "getMe")
         assert "400" in str(exc_info.value)
+        assert "error body" in str(exc_info.value)
 
-    @patch("telegram_bot.urlopen")
-    def test_url_error_raises_runtime_error(self, mock_urlopen):
-        from urllib.error import URLError
-
-        mock_urlopen.side_effect = URLError("Connection refused")
+    @patch("telegram_bot._client")
+    def test_network_error_raises_runtime_error(self, mock_client):
+        mock_client.post.side_effect = ConnectionRefusedError("Connection refused")
 
         import pytest
 
@@ -479,7 +816,7 @@ class TestCmdSend:
         from telegram_bot import cmd_send
 
         with patch.dict("os.environ", {}, clear=True):
-            args = MagicMock()
+            args = MagicMock(document=None)
             with pytest.raises(SystemExit) as exc_info:
                 cmd_send(args)
             assert exc_info.value.code == 2
@@ -494,11 +831,28 @@ class TestCmdSend:
             clear=True,
         ):
             with patch("sys.stdin", StringIO("")):
-                args = MagicMock()
+                args = MagicMock(document=None)
                 with pytest.raises(SystemExit) as exc_info:
                     cmd_send(args)
                 assert exc_info.value.code == 1
 
+    @patch("telegram_bot.send_document")
+    def test_sends_document_from_stdin(self, mock_send):
+        from telegram_bot import cmd_send
+
+        mock_send.return_value = True
+        with patch.dict(
+            "os.environ",
+            {"TELEGRAM_BOT_TOKEN": "test-token", "TELEGRAM_CHAT_ID": "123"},
+            clear=True,
+        ):
+            with patch("sys.stdin", StringIO("# Spec")):
+                with patch("sys.stdout", new_callable=StringIO):
+                    cmd_send(MagicMock(document="spec.md", gzip=True))
+        mock_send.assert_called_once_with(
+            "test-token", "123", "spec.md", "# Spec", compress=True
+        )
+
     @patch("telegram_bot.send_long_message")
     def test_sends_message_from_stdin(self, mock_send):
         from telegram_bot import cmd_send
@@ -511,7 +865,7 @@ class TestCmdSend:
         ):
             with patch("sys.stdin", StringIO("Hello world")):
                 with patch("sys.stdout", new_callable=StringIO):
-                    args = MagicMock()
+                    args = MagicMock(document=None)
                     cmd_send(args)
                     mock_send.assert_called_once()
 
@@ -527,7 +881,7 @@ class TestCmdSend:
             clear=True,
         ):
             with patch("sys.stdin", StringIO("Hello")):
-                args = MagicMock()
+                args = MagicMock(document=None)
                 with pytest.raises(SystemExit) as exc_info:
                     cmd_send(args)
                 assert exc_info.value.code == 1
@@ -667,6 +1021,140 @@ class TestCmdNotify:
                 assert exc_info.value.code == 1
 
 
+class TestWebhookMode:
+    """Tests for routing replies through the webhook relay."""
+
+    RELAY_ENV = {
+        "TELEGRAM_BOT_TOKEN": "test-token",
+        "TELEGRAM_CHAT_ID": "123",
+        "TELEGRAM_WEBHOOK_RELAY": "http://127.0.0.1:8787",
+        "TELEGRAM_WEBHOOK_SECRET": "s3cret",
+    }
+
+    @patch("telegram_bot.api_call")
+    def test_send_long_message_ids(self, mock_api_call):
+        mock_api_call.side_effect = [
+            {"ok": True, "result": {"message_id": 7}},
+            {"ok": True, "result": {"message_id": 8}},
+        ]
+        ids = send_long_message_ids("token", "123", "word " * 1000)
+        assert ids == [7, 8]
+
+    @patch("telegram_bot.api_call")
+    def test_send_long_message_ids_failure(self, mock_api_call):
+        mock_api_call.return_value = {"ok": False}
+        assert send_long_message_ids("token", "123", "hi") is None
+
+    @patch("telegram_bot.api_call")
+    def test_set_webhook_sends_secret(self, mock_api_call):
+        mock_api_call.return_value = {"ok": True}
+        assert set_webhook("token", "https://x/webhook", "s3cret")
+        params = mock_api_call.call_args[0][2]
+        assert params["secret_token"] == "s3cret"
+        assert params["allowed_updates"] == ["message"]
+
+    @patch("telegram_webhook.wait_via_relay")
+    @patch("telegram_bot.poll_for_reply")
+    def test_wait_for_reply_uses_relay(self, mock_poll, mock_wait):
+        mock_wait.return_value = "via relay"
+        with patch.dict("os.environ", self.RELAY_ENV, clear=True):
+            assert wait_for_reply("token", "123", 30, reply_to=[7]) == "via relay"
+        mock_wait.assert_called_once_with(
+            "http://127.0.0.1:8787", "s3cret", "123", [7], 30
+        )
+        mock_poll.assert_not_called()
+
+    @patch("telegram_bot.poll_for_reply")
+    def test_wait_for_reply_polls_without_relay(self, mock_poll):
+        mock_poll.return_value = "polled"
+        with patch.dict("os.environ", {}, clear=True):
+            assert wait_for_reply("token", "123", 30, 5) == "polled"
+        mock_poll.assert_called_once_with("token", "123", 30, 5)
+
+    @patch("telegram_bot.wait_for_reply")
+    @patch("telegram_bot.send_long_message_ids")
+    @patch("telegram_bot.get_last_update_id")
+    def test_notify_routes_by_message_ids(self, mock_last_id, mock_send, mock_wait):
+        import json
+
+        from telegram_bot import cmd_notify
+
+        mock_send.return_value = [41, 42]
+        mock_wait.return_value = "Feedback"
+        with patch.dict("os.environ", self.RELAY_ENV, clear=True):
+            with patch("sys.stdin", StringIO("Round 1")):
+                with patch("sys.stdout", new_callable=StringIO) as mock_out:
+                    cmd_notify(MagicMock(timeout=60))
+        mock_last_id.assert_not_called()
+        mock_wait.assert_called_once_with("test-token", "123", 60, 0, [41, 42])
+        assert json.loads(mock_out.getvalue())["feedback"] == "Feedback"
+
+    def test_worker_collects_from_relay(self):
+        import time
+
+        replies = ["from relay"]
+        calls = []
+
+        def fake_wait(relay_url, secret, chat_id, reply_to, timeout, replies_only):
+            calls.append((reply_to, replies_only))
+            if replies:
+                return replies.pop(0)
+            time.sleep(0.01)
+            return None
+
+        with patch("telegram_webhook.wait_via_relay", side_effect=fake_wait):
+            worker = FeedbackWorker(
+                "token", "123", relay=("http://relay", "s"), reply_to=[7, 8]
+            )
+            worker.start()
+            deadline = time.time() + 2
+            collected: list[str] = []
+            while not collected and time.time() < deadline:
+                collected = worker.drain()[0]
+                time.sleep(0.01)
+            worker.stop()
+        assert collected == ["from relay"]
+        assert calls[0] == ([7, 8], True)
+
+    def test_relay_worker_idle_without_notification(self):
+        with patch("telegram_webhook.wait_via_relay") as mock_wait:
+            worker = FeedbackWorker("token", "123", relay=("http://relay", "s"))
+            worker.start()
+            worker._thread.join(timeout=2)
+        mock_wait.assert_not_called()
+
+    def test_worker_requeues_reply_after_stop(self):
+        import threading
+
+        release = threading.Event()
+
+        def fake_wait(relay_url, secret, chat_id, reply_to, timeout, replies_only):
+            release.wait(5)
+            return "late"
+
+        with patch("telegram_webhook.wait_via_relay", side_effect=fake_wait):
+            with patch("telegram_webhook.requeue_via_relay") as mock_requeue:
+                worker = FeedbackWorker(
+                    "token", "123", relay=("http://relay", "s"), reply_to=[7]
+                )
+                worker.start()
+                worker.stop()
+                release.set()
+                worker._thread.join(timeout=2)
+        mock_requeue.assert_called_once_with("http://relay", "s", "123", "late", 7)
+        assert worker.drain()[0] == []
+
+    def test_cmd_webhook_requires_secret(self):
+        import pytest
+        from telegram_bot import cmd_webhook
+
+        with patch.dict("os.environ", {"TELEGRAM_BOT_TOKEN": "t"}, clear=True):
+            with patch("sys.stderr", new_callable=StringIO):
+                with pytest.raises(SystemExit) as exc_info:
+                    cmd_webhook(MagicMock())
+        assert exc_info.value.code == 2
+
+
 class TestMain:
     """Tests for main entry point."""
 
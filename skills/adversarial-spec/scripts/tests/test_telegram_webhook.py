@@ -0,0 +1,290 @@
+"""Tests for telegram_webhook module."""
+
+import http.client
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import telegram_bot
+from telegram_webhook import (
+    RELAY_SECRET_HEADER,
+    TELEGRAM_SECRET_HEADER,
+    UpdateRouter,
+    WebhookRelay,
+    requeue_via_relay,
+    run_relay,
+    wait_via_relay,
+)
+
+SECRET = "s3cret"
+
+
+def message(chat_id, text, reply_to=None, update_id=1):
+    msg = {"chat": {"id": chat_id}, "text": text}
+    if reply_to is not None:
+        msg["reply_to_message"] = {"message_id": reply_to}
+    return {"update_id": update_id, "message": msg}
+
+
+def post_update(relay_url, update, secret=SECRET):
+    """Deliver an update to the relay the way Telegram does."""
+    host, port = relay_url.removeprefix("http://").split(":")
+    conn = http.client.HTTPConnection(host, int(port), timeout=5)
+    conn.request(
+        "POST",
+        "/webhook",
+        body=json.dumps(update),
+        headers={TELEGRAM_SECRET_HEADER: secret, "Content-Type": "application/json"},
+    )
+    response = conn.getresponse()
+    body = json.loads(response.read())
+    conn.close()
+    return response.status, body
+
+
+def wait_in_thread(target, *args):
+    """Run target in a thread and return (thread, results list)."""
+    results = []
+    thread = threading.Thread(target=lambda: results.append(target(*args)))
+    thread.start()
+    return thread, results
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    assert predicate()
+
+
+@pytest.fixture
+def relay():
+    relay = WebhookRelay(SECRET, port=0).start()
+    yield relay
+    relay.stop()
+
+
+class TestUpdateRouter:
+    def test_reply_routed_to_matching_waiter(self):
+        router = UpdateRouter()
+        first, first_result = wait_in_thread(router.wait, "1", {10, 11}, 5)
+        second, second_result = wait_in_thread(router.wait, "1", {20}, 5)
+        wait_until(lambda: len(router._waiters) == 2)
+
+        assert router.dispatch(message(1, "for second", reply_to=20))
+        assert router.dispatch(message(1, "for first", reply_to=11))
+        first.join()
+        second.join()
+        assert first_result == ["for first"]
+        assert second_result == ["for second"]
+
+    def test_plain_message_goes_to_longest_waiting(self):
+        router = UpdateRouter()
+        first, first_result = wait_in_thread(router.wait, "1", {10}, 5)
+        wait_until(lambda: len(router._waiters) == 1)
+        second, second_result = wait_in_thread(router.wait, "1", {20}, 0.3)
+        wait_until(lambda: len(router._waiters) == 2)
+
+        assert router.dispatch(message(1, "plain"))
+        first.join()
+        second.join()
+        assert first_result == ["plain"]
+        assert second_result == [None]
+
+    def test_unclaimed_messages_are_kept_in_mailbox(self):
+        router = UpdateRouter()
+        assert not router.dispatch(message(1, "early"))
+        assert not router.dispatch(message(1, "for 7", reply_to=7))
+        assert router.wait("1", {7}, 0) == "early"
+        assert router.wait("1", set(), 0) is None
+        assert router.wait("1", {7}, 0) == "for 7"
+
+    def test_replies_only_waiter_skips_plain_messages(self):
+        router = UpdateRouter()
+        worker, worker_result = wait_in_thread(router.wait, "1", {10}, 5, True)
+        wait_until(lambda: len(router._waiters) == 1)
+
+        assert not router.dispatch(message(1, "plain"))
+        assert router.dispatch(message(1, "reply", reply_to=10))
+        worker.join()
+        assert worker_result == ["reply"]
+        assert router.wait("1", {10}, 0, replies_only=True) is None
+        assert router.wait("1", set(), 0) == "plain"
+
+    def test_other_chats_and_empty_messages_ignored(self):
+        router = UpdateRouter()
+        assert not router.dispatch({"update_id": 1})
+        router.dispatch(message(2, "other chat"))
+        assert router.wait("1", set(), 0.05) is None
+
+    def test_mailbox_expires(self):
+        router = UpdateRouter()
+        router.dispatch(message(1, "old"))
+        with patch("telegram_webhook.MAILBOX_TTL", -1):
+            assert router.wait("1", set(), 0) is None
+
+
+class TestWebhookRelay:
+    def test_requires_secret(self):
+        with pytest.raises(ValueError):
+            WebhookRelay("")
+
+    def test_concurrent_debates_over_http(self, relay):
+        first, first_result = wait_in_thread(
+            wait_via_relay, relay.url, SECRET, "1", [100], 5
+        )
+        second, second_result = wait_in_thread(
+            wait_via_relay, relay.url, SECRET, "1", [200], 5
+        )
+        wait_until(lambda: len(relay.router._waiters) == 2)
+
+        assert post_update(relay.url, message(1, "B", reply_to=200)) == (
+            200,
+            {"ok": True, "delivered": True},
+        )
+        post_update(relay.url, message(1, "A", reply_to=100))
+        first.join()
+        second.join()
+        assert first_result == ["A"]
+        assert second_result == ["B"]
+
+    def test_wait_times_out(self, relay):
+        assert wait_via_relay(relay.url, SECRET, "1", timeout=0.05) is None
+
+    def test_rejects_bad_secrets(self, relay):
+        assert post_update(relay.url, message(1, "x"), secret="wrong")[0] == 403
+        with pytest.raises(RuntimeError, match="403"):
+            wait_via_relay(relay.url, "wrong", "1", timeout=0)
+
+    def test_rejects_bad_requests(self, relay):
+        host, port = relay.server.server_address[:2]
+        conn = http.client.HTTPConnection(host, port, timeout=5)
+        conn.request("GET", "/wait?reply_to=x", headers={RELAY_SECRET_HEADER: SECRET})
+        assert conn.getresponse().status == 400
+        conn.close()
+        conn = http.client.HTTPConnection(host, port, timeout=5)
+        conn.request("GET", "/other")
+        assert conn.getresponse().status == 404
+        conn.close()
+        conn = http.client.HTTPConnection(host, port, timeout=5)
+        conn.request(
+            "POST",
+            "/webhook",
+            body=b"not json",
+            headers={TELEGRAM_SECRET_HEADER: SECRET},
+        )
+        assert conn.getresponse().status == 400
+        conn.close()
+
+    def test_requeue_returns_reply_to_mailbox(self, relay):
+        requeue_via_relay(relay.url, SECRET, "1", "again")
+        assert wait_via_relay(relay.url, SECRET, "1", timeout=0) == "again"
+        requeue_via_relay(relay.url, SECRET, "1", "mine", reply_to=9)
+        assert wait_via_relay(relay.url, SECRET, "1", timeout=0) is None
+        assert (
+            wait_via_relay(relay.url, SECRET, "1", [9], timeout=0, replies_only=True)
+            == "mine"
+        )
+
+    def test_unreachable_relay(self):
+        with pytest.raises(RuntimeError, match="unreachable"):
+            wait_via_relay("http://127.0.0.1:1", SECRET, "1", timeout=0)
+
+
+class FakeTelegram:
+    """Local stand-in for the Bot API that replies through the relay webhook."""
+
+    def __init__(self, relay_url, replies):
+        self.relay_url = relay_url
+        self.replies = replies  # text sent -> reply the user types
+        self.next_id = 100
+        self.lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                params = json.loads(self.rfile.read(length))
+                with fake.lock:
+                    fake.next_id += 1
+                    message_id = fake.next_id
+                body = json.dumps({"ok": True, "result": {"message_id": message_id}})
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body.encode())
+                for key, reply in fake.replies.items():
+                    if key in params.get("text", ""):
+                        threading.Timer(
+                            0.05,
+                            post_update,
+                            (fake.relay_url, message(1, reply, reply_to=message_id)),
+                        ).start()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def client(self):
+        host, port = self.server.server_address[:2]
+        return telegram_bot.TelegramClient(
+            connection_factory=lambda: http.client.HTTPConnection(host, port)
+        )
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestEndToEnd:
+    def test_two_debates_share_one_bot(self, relay):
+        fake = FakeTelegram(relay.url, {"debate A": "reply A", "debate B": "reply B"})
+        env = {"TELEGRAM_WEBHOOK_RELAY": relay.url, "TELEGRAM_WEBHOOK_SECRET": SECRET}
+        try:
+            with (
+                patch.dict("os.environ", env),
+                patch.object(telegram_bot, "_client", fake.client()),
+            ):
+
+                def debate(name):
+                    ids = telegram_bot.send_long_message_ids("t", "1", f"{name} round")
+                    return telegram_bot.wait_for_reply("t", "1", 5, reply_to=ids)
+
+                a, a_result = wait_in_thread(debate, "debate A")
+                b, b_result = wait_in_thread(debate, "debate B")
+                a.join()
+                b.join()
+        finally:
+            fake.stop()
+        assert a_result == ["reply A"]
+        assert b_result == ["reply B"]
+
+
+class TestRunRelay:
+    def test_registers_and_removes_webhook(self):
+        with patch("telegram_bot.set_webhook", return_value=True) as mock_set:
+            with patch("telegram_bot.delete_webhook") as mock_delete:
+                with patch.object(
+                    WebhookRelay, "serve_forever", side_effect=KeyboardInterrupt
+                ):
+                    with patch("sys.stdout"), patch("sys.stderr"):
+                        run_relay("t", SECRET, "https://x/webhook", "127.0.0.1", 0)
+        mock_set.assert_called_once_with("t", "https://x/webhook", SECRET)
+        mock_delete.assert_called_once_with("t")
+
+    def test_set_webhook_failure(self):
+        with patch("telegram_bot.set_webhook", return_value=False):
+            with pytest.raises(RuntimeError, match="setWebhook failed"):
+                run_relay("t", SECRET, "https://x/webhook", "127.0.0.1", 0)